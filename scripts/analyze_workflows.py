@@ -6,6 +6,11 @@ Usage:
     python scripts/analyze_workflows.py --days 1    # Last 24 hours
     python scripts/analyze_workflows.py --days 2    # Last 48 hours
     python scripts/analyze_workflows.py --days 7    # Last week
+    python scripts/analyze_workflows.py --days 30 --jobs 8
+
+Each run's log is streamed once through a single-pass parser; the parsed
+facts of finished runs are cached in data/cache/workflow_logs/, so repeat
+reports only download runs they haven't seen (--no-cache to re-parse).
 
 Analyzes:
 1. ViralShorts Factory - Auto Video Generator
@@ -22,14 +27,19 @@ Reports:
 """
 
 import argparse
+import hashlib
 import subprocess
 import json
 import re
 import os
 import sys
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 
 # ============================================================
@@ -45,7 +55,7 @@ class WorkflowRun:
     conclusion: str
     created_at: datetime
     event: str
-    log_content: str = ""
+    log_facts: Dict[str, Any] = field(default_factory=dict)  # Parsed log (LOG_PATTERNS)
     analysis: Dict[str, Any] = field(default_factory=dict)
 
 @dataclass
@@ -248,32 +258,419 @@ def get_scheduled_runs(days: int) -> List[WorkflowRun]:
     return scheduled_runs
 
 
-def download_log_in_batches(run_id: int, batch_size: int = 50000) -> str:
-    """Download workflow log with safety limits to avoid connection loss."""
-    safe_print(f"      Downloading log for run {run_id}...")
-    
-    try:
-        # Use shorter timeout and limit output size
-        output = run_gh_command([
-            "run", "view", str(run_id), "--log"
-        ], timeout=90, max_output_mb=3)
+# ============================================================
+# LOG PATTERN TABLE - everything the analyzers read from a log
+# ============================================================
+# Each run's log is parsed ONCE, line by line, into a dict of facts
+# (name -> value) that the analyzers below read instead of the raw text.
+#
+# (name, kind, pattern, needles)
+#   flag   - literal appears in the log (case-sensitive)
+#   iflag  - lowercase literal appears in the lowercased log
+#   any    - regex matches some line
+#   first  - groups of the first match (None if no match)
+#   all    - every match, like re.findall
+#   count  - number of matches
+#   lines  - the lines that match (patterns resolved after the pass)
+#   before - the 20 chars of log text preceding the literal's first occurrence
+# needles: lowercase substrings a line must contain for the regex to match
+# (flags use their literal). Patterns match within a single log line.
+
+PROVIDERS = ["GEMINI", "GROQ", "OPENROUTER", "PEXELS", "YOUTUBE"]
+STATE_FILE_NAMES = ["variety_state", "viral_patterns", "upload_state", "analytics_state", "learned_video_metrics"]
+PATTERN_UPDATES = [
+    "variety_state.json updated",
+    "viral_patterns.json updated",
+    "hook_word_performance.json updated",
+    "category_decay.json updated"
+]
+
+LOG_PATTERNS = [
+    # Video details
+    ("video_files", "all", r'output/(pro_[^\s]+\.mp4)', ("output/pro_",)),
+    ("video_size_lines", "lines", r'\.mp4\s*\(\d+MB\)', ("mb)",)),
+    ("virality_score", "first", r'[Vv]irality[_\s]?[Ss]core[:\s]*([\d.]+)', ("virality",)),
+    ("engagement_score", "first", r'[Ee]ngagement[_\s]?[Ss]core[:\s]*([\d.]+)', ("engagement",)),
+    ("retention_score", "first", r'[Rr]etention[_\s]?[Ss]core[:\s]*([\d.]+)', ("retention",)),
+    ("script_score", "first", r'[Ss]cript[_\s]?[Ss]core[:\s]*([\d.]+)', ("script",)),
+    ("quality_gate_passed", "flag", "Quality Gate: PASSED", None),
+    ("quality_gate_failed", "flag", "Quality Gate: FAILED", None),
+    ("quality_gate_passed_lower", "iflag", "quality_gate.*passed", None),
+    ("quality_gate", "first", r'[Qq]uality[_\s]?[Gg]ate[:\s]*(PASSED|FAILED)(?:[:\s]*(.+?))?[\n\r]', ("quality",)),
+    ("duration", "first", r'[Dd]uration[:\s]*([\d.]+)\s*(?:s|sec)', ("uration",)),
+    ("phrase_count", "first", r'(\d+)\s*phrases?', ("phrase",)),
+    ("hook_tag", "first", r'(?i)\[HOOK\][:\s]*"([^"]+)"', ("[hook]",)),
+    ("hook_quoted", "first", r'(?i)Hook[:\s]*"([^"]+)"', ("hook",)),
+    ("hook_text", "first", r'(?i)hook_text[:\s]*["\']([^"\']+)["\']', ("hook_text",)),
+    ("video_model", "first", r'(?i)(?:Using|Model)[:\s]*(gemini-[^\s,]+|llama[^\s,]+|gpt[^\s,]+)', ("using", "model")),
+    ("edge_tts", "iflag", "edge-tts", None),
+    ("gtts", "iflag", "gtts", None),
+    ("youtube_short", "first", r'youtube\.com/shorts/([a-zA-Z0-9_-]+)', ("youtube.com/shorts/",)),
+    ("uploaded", "any", r'Successfully uploaded to YouTube|Upload complete|\[YOUTUBE\] Uploading:|\[UPLOAD\] Title:', ("upload",)),
+    ("broll_count", "first", r'(?i)(\d+)\s*(?:b-?roll|video\s*clips?)', ("roll", "video")),
+
+    # Quota usage
+    ("gemini_models", "all", r'(?i)(?:Using|Model|model)[:\s]*(gemini-[^\s,\]]+)', ("using", "model")),
+    ("gemini_generate", "count", r'generateContent', ("generatecontent",)),
+    ("gemini_list_models", "count", r'/v1beta/models[^/]', ("/v1beta/models",)),
+    ("groq_models", "all", r'(?i)(?:llama-[^\s,\]]+|mixtral[^\s,\]]+)', ("llama-", "mixtral")),
+    ("groq_calls", "count", r'api\.groq\.com/openai/v1/chat', ("api.groq.com",)),
+    ("openrouter_calls", "count", r'openrouter\.ai/api/v1/chat', ("openrouter.ai",)),
+    ("pexels_calls", "count", r'api\.pexels\.com/videos', ("api.pexels.com",)),
+    ("youtube_calls", "count", r'googleapis\.com/youtube/v3', ("googleapis.com/youtube",)),
+    ("youtube_uploads", "count", r'\[YOUTUBE\] Uploading:', ("[youtube] uploading:",)),
+    ("has_429", "flag", "429", None),
+    ("has_http_429", "flag", "HTTP 429", None),
+    ("has_rate_limit", "iflag", "rate limit", None),
+    ("has_quota", "iflag", "quota", None),
+] + [
+    (f"rate_limited_{p.lower()}", "any", rf'(?i)({p}|{p.lower()})[^\n]*?(429|rate.?limit|quota.?exhaust)', (p.lower(),))
+    for p in PROVIDERS
+] + [
+    # Auto Video Generator
+    ("inflated_files", "all", r'inflating:\s*data/persistent/([^\s]+)', ("inflating:",)),
+    ("restored_from_artifact", "flag", "Restored patterns from artifact", None),
+    ("before_restored", "before", "Restored", None),
+    ("no_previous_state", "flag", "No previous state found", None),
+    ("no_previous_state_line", "any", r'^\[INFO\] No previous state found', ("[info] no previous state found",)),
+    ("persistent_state", "flag", "persistent-state", None),
+    ("artifact_valid", "flag", "Artifact name is valid", None),
+    ("successfully_uploaded", "iflag", "successfully uploaded", None),
+    ("loaded", "flag", "Loaded", None),
+    ("pre_generated_concepts", "flag", "pre-generated concepts", None),
+    ("prework_concepts_used", "first", r'Loaded (\d+) pre-generated concepts', ("pre-generated concepts",)),
+    ("no_upload", "iflag", "no-upload", None),
+    ("test_mode", "iflag", "test mode", None),
+    ("critical", "flag", "CRITICAL", None),
+    ("no_videos_generated", "flag", "No videos were generated", None),
+    ("critical_errors", "all", r'CRITICAL[:\s]+([^\n\[]+)', ("critical",)),
+    ("generation_time", "first", r'(?:Generation|Total)[^\d]*(\d+(?:\.\d+)?)\s*(?:s|sec|seconds)', ("generation", "total")),
+    ("primary_model", "first", r'\[MODEL\] Best Gemini: ([\w\.-]+) \((\d+)/day\)', ("[model] best gemini: ",)),
+    ("gemini_uses", "all", r'\[AI\] Using gemini:([\w\.-]+)', ("[ai] using gemini:",)),
+    ("groq_uses", "all", r'\[AI\] Using groq:([\w\.-]+)', ("[ai] using groq:",)),
+    ("gemini_init", "all", r'\[OK\] Gemini model: ([\w\.-]+)', ("[ok] gemini model: ",)),
+    ("fallback_successes", "count", r'\[OK\] Fallback succeeded with ([\w\.:/-]+)', ("[ok] fallback succeeded with ",)),
+    ("discovered_model", "first", r'([\w\.-]+): (\d+)/day \(discovered\)', ("/day (discovered)",)),
+    ("legacy_model", "first", r'(?i)(?:Using|Selected|Model)[:\s]*(gemini-[^\s,\]]+)', ("using", "selected", "model")),
+] + [
+    (f"{kind}_{name}", "flag", f"{prefix}{name}{suffix}", None)
+    for name in STATE_FILE_NAMES
+    for kind, prefix, suffix in (("saved", "Saved ", ""), ("updated", "Updated ", ""), ("mentioned", "", ".json"))
+] + [
+    ("mentions_variety_state", "flag", "variety_state", None),
+    ("mentions_viral_patterns", "flag", "viral_patterns", None),
+    ("mentions_upload_state", "flag", "upload_state", None),
+
+    # Pre-Work Data Fetcher
+    ("concepts_generated", "first", r'Concepts generated:\s*(\d+)', ("concepts generated:",)),
+    ("concepts_artifact", "flag", "pre-generated-concepts", None),
+    ("prework_committed", "flag", "Pre-work: Generated", None),
+    ("no_changes", "flag", "No changes to commit", None),
+    ("quota_exhausted", "flag", "QUOTA EXHAUSTED", None),
+    ("exit_78", "flag", "exit 78", None),
+
+    # Weekly Analytics Feedback / Monthly Viral Analysis
+    ("found", "flag", "Found", None),
+    ("videos", "flag", "videos", None),
+    ("videos_found", "first", r'Found (\d+) videos', ("found ",)),
+    ("restored_state", "flag", "[OK] Restored state", None),
+    ("key_insight", "flag", "Key insight:", None),
+    ("key_insight_text", "first", r'Key insight:\s*([^\n]+)', ("key insight:",)),
+    ("shadow_ban_concerning", "flag", "Status: concerning", None),
+    ("shadow_ban_normal", "flag", "Status: normal", None),
+    ("skipped_by_ai", "flag", "AI recommends skipping", None),
+    ("monthly_analysis", "flag", "Monthly Viral Analysis", None),
+    ("analyze_viral_channels", "flag", "analyze_viral_channels", None),
+] + [
+    (f"pattern_update_{i}", "flag", update, None) for i, update in enumerate(PATTERN_UPDATES)
+]
+
+# Cached facts are only reused if they were parsed with this exact table
+LOG_TABLE_VERSION = hashlib.sha1(repr(LOG_PATTERNS).encode()).hexdigest()[:12]
+
+BEFORE_CHARS = 20
+BLOCK_CHARS = 64 * 1024  # Lines are scanned in blocks of about this size
+
+
+class LogParser:
+    """
+    Single-pass, streaming parser: feed() log lines as they arrive, then
+    facts() returns the value of every LOG_PATTERNS entry.
+    
+    Buffered lines are scanned a block at a time: each needle is searched
+    once in the block's lowercased text, and patterns only run on the lines
+    that contain one of their needles.
+    """
+    
+    def __init__(self, patterns: List[tuple] = None):
+        self.lines = 0
+        self.chars = 0
+        self._facts: Dict[str, Any] = {}
+        self._by_needle: Dict[str, List[tuple]] = {}
+        self._before: List[tuple] = []
+        self._tail = ""
+        self._buffer: List[str] = []
+        self._buffered = 0
+        
+        for name, kind, pattern, needles in patterns or LOG_PATTERNS:
+            if kind == "before":
+                self._before.append((name, pattern))
+                self._facts[name] = None
+                continue
+            if kind in ("flag", "iflag"):
+                entry = (name, kind, pattern)
+                needles = (pattern.lower(),)
+            else:
+                entry = (name, kind, re.compile(pattern))
+            self._facts[name] = {"flag": False, "iflag": False, "any": False, "first": None,
+                                 "all": [], "count": 0, "lines": []}[kind]
+            for needle in needles:
+                self._by_needle.setdefault(needle, []).append(entry)
+    
+    def feed(self, line: str):
+        """Add one log line (with its line ending)."""
+        self.lines += 1
+        self.chars += len(line)
+        self._buffer.append(line)
+        self._buffered += len(line)
+        if self._buffered >= BLOCK_CHARS:
+            self._flush()
+    
+    def feed_text(self, text: str):
+        for line in text.splitlines(keepends=True):
+            self.feed(line)
+    
+    def facts(self) -> Dict[str, Any]:
+        self._flush()
+        return dict(self._facts)
+    
+    def _flush(self):
+        lines = self._buffer
+        if not lines:
+            return
+        self._buffer = []
+        self._buffered = 0
+        if self._before:
+            self._scan_before("".join(lines))
         
-        if not output:
-            # Try downloading failed logs only (smaller)
-            safe_print(f"      Retrying with --log-failed...")
-            output = run_gh_command([
-                "run", "view", str(run_id), "--log-failed"
-            ], timeout=60, max_output_mb=2)
+        lowers = [line.lower() for line in lines]
+        text = "".join(lowers)
+        ends = list(accumulate(len(lower) for lower in lowers))
         
-        if output:
-            lines = output.split('\n')
-            safe_print(f"      Downloaded {len(lines)} lines ({len(output)//1024}KB)")
-            return output
+        hits: Dict[int, List[str]] = {}
+        for needle in self._by_needle:
+            start = text.find(needle)
+            while start >= 0:
+                i = bisect_right(ends, start)
+                if needle in lowers[i]:
+                    hits.setdefault(i, []).append(needle)
+                    start = text.find(needle, ends[i])
+                else:  # Spans two lines
+                    start = text.find(needle, start + 1)
         
-        return ""
+        for i in sorted(hits):
+            self._match_line(lines[i], lowers[i], hits[i])
+    
+    def _match_line(self, line: str, lower: str, needles: List[str]):
+        facts = self._facts
+        done = set()
+        for needle in needles:
+            for name, kind, target in self._by_needle[needle]:
+                if name in done:
+                    continue
+                done.add(name)
+                if kind == "flag":
+                    facts[name] = facts[name] or target in line
+                elif kind == "iflag":
+                    facts[name] = facts[name] or target in lower
+                elif kind == "any":
+                    facts[name] = facts[name] or target.search(line) is not None
+                elif kind == "first":
+                    if facts[name] is None:
+                        match = target.search(line)
+                        if match:
+                            facts[name] = list(match.groups())
+                elif kind == "all":
+                    facts[name].extend(list(m) if isinstance(m, tuple) else m
+                                       for m in target.findall(line))
+                elif kind == "count":
+                    facts[name] += len(target.findall(line))
+                elif target.search(line):
+                    facts[name].append(line)
+    
+    def _scan_before(self, text: str):
+        remaining = []
+        for name, literal in self._before:
+            index = text.find(literal)
+            if index < 0:
+                remaining.append((name, literal))
+            else:
+                self._facts[name] = (self._tail + text[:index])[-BEFORE_CHARS:]
+        self._before = remaining
+        self._tail = (self._tail + text[-BEFORE_CHARS:])[-BEFORE_CHARS:]
+
+
+def parse_log(text: str) -> Dict[str, Any]:
+    """Facts for a complete log held in memory."""
+    parser = LogParser()
+    parser.feed_text(text)
+    return parser.facts()
+
+
+# ============================================================
+# LOG DOWNLOAD (streamed, concurrent, cached per run id)
+# ============================================================
+
+LOG_CACHE_DIR = Path("data/cache/workflow_logs")
+DEFAULT_LOG_JOBS = 4
+
+
+def stream_log_facts(run_id: int, args: List[str], timeout: int, max_output_mb: int) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Stream `gh run view <args>` through a LogParser without holding the log in memory.
+    
+    Returns:
+        (facts or None, whether the whole log was parsed - False if truncated)
+    """
+    parser = LogParser()
+    max_chars = max_output_mb * 1024 * 1024
+    truncated = False
+    try:
+        proc = subprocess.Popen(
+            ["gh", "run", "view", str(run_id)] + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
     except Exception as e:
-        safe_print(f"      [ERROR] Failed to download log: {e}")
-        return ""
+        safe_print(f"[ERROR] gh command error: {e}")
+        return None, False
+    
+    # Drain stderr alongside stdout so a chatty gh can't fill the pipe and stall
+    stderr_parts = []
+    drain = threading.Thread(target=lambda: stderr_parts.append(proc.stderr.read()), daemon=True)
+    drain.start()
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            # Limit output size to prevent memory/connection issues
+            if parser.chars + len(line) > max_chars:
+                parser.feed(line[:max_chars - parser.chars])
+                truncated = True
+                proc.kill()
+                break
+            parser.feed(line)
+        proc.wait()
+        drain.join()
+    finally:
+        timed_out = not timer.is_alive() and not truncated
+        timer.cancel()
+        proc.stdout.close()
+        proc.stderr.close()
+    stderr = "".join(stderr_parts)
+    
+    if truncated:
+        safe_print(f"      [WARN] Run {run_id}: truncating log at {max_output_mb}MB")
+    elif timed_out:
+        safe_print(f"[WARN] gh command timed out after {timeout}s")
+        return None, False
+    elif proc.returncode != 0:
+        safe_print(f"[WARN] gh command failed: {stderr[:200]}")
+        return None, False
+    
+    if parser.chars == 0:
+        return None, False
+    safe_print(f"      Run {run_id}: parsed {parser.lines} lines ({parser.chars//1024}KB)")
+    return parser.facts(), not truncated
+
+
+def _cache_path(run_id: int) -> Path:
+    return LOG_CACHE_DIR / f"{run_id}.json"
+
+
+def load_cached_facts(run: WorkflowRun) -> Optional[Dict[str, Any]]:
+    """Facts parsed by an earlier invocation (same pattern table), if any."""
+    try:
+        with open(_cache_path(run.run_id), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("table") != LOG_TABLE_VERSION:
+        return None
+    return cached.get("facts")
+
+
+def save_cached_facts(run: WorkflowRun, facts: Dict[str, Any]):
+    """Cache a finished run's facts - its log can no longer change."""
+    if run.status != "completed":
+        return
+    try:
+        LOG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _cache_path(run.run_id)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"table": LOG_TABLE_VERSION, "name": run.name, "facts": facts}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        safe_print(f"      [WARN] Could not cache run {run.run_id}: {e}")
+
+
+def fetch_log_facts(run: WorkflowRun, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Parsed facts for a run: from the cache, or by streaming its log once.
+    
+    Only a complete --log parse is cached. Truncated logs and --log-failed
+    fallbacks are used for this report but downloaded again next time.
+    """
+    if use_cache:
+        facts = load_cached_facts(run)
+        if facts is not None:
+            return facts
+    
+    facts, complete = stream_log_facts(run.run_id, ["--log"], timeout=90, max_output_mb=3)
+    if facts is None:
+        # Try downloading failed logs only (smaller)
+        safe_print(f"      Run {run.run_id}: retrying with --log-failed...")
+        facts, _ = stream_log_facts(run.run_id, ["--log-failed"], timeout=60, max_output_mb=2)
+        complete = False
+    
+    if facts is not None and complete:
+        save_cached_facts(run, facts)
+    return facts
+
+
+def fetch_all_log_facts(runs: List[WorkflowRun], jobs: int = DEFAULT_LOG_JOBS,
+                        use_cache: bool = True) -> int:
+    """
+    Fill run.log_facts for every run, downloading up to `jobs` logs at once.
+    
+    Returns:
+        Number of runs served from the cache
+    """
+    cached = {}
+    if use_cache:
+        for run in runs:
+            facts = load_cached_facts(run)
+            if facts is not None:
+                cached[run.run_id] = facts
+    
+    pending = [run for run in runs if run.run_id not in cached]
+    if pending:
+        safe_print(f"   Downloading {len(pending)} log(s), {max(1, jobs)} at a time...")
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            downloaded = dict(zip(
+                (run.run_id for run in pending),
+                pool.map(lambda run: fetch_log_facts(run, use_cache=False), pending)
+            ))
+    else:
+        downloaded = {}
+    
+    for run in runs:
+        run.log_facts = cached.get(run.run_id) or downloaded.get(run.run_id) or {}
+    return len(cached)
 
 
 # ============================================================
@@ -432,12 +829,22 @@ def download_persistent_data() -> Dict[str, PersistentDataAnalysis]:
     return results
 
 
-def extract_video_details(log: str) -> List[VideoInfo]:
-    """Extract detailed video characteristics from log."""
+def extract_video_details(facts: Dict[str, Any]) -> List[VideoInfo]:
+    """Extract detailed video characteristics from a log's facts."""
     videos = []
     
-    # Find video file mentions - use unique set to avoid duplicates
-    video_files = set(re.findall(r'output/(pro_[^\s]+\.mp4)', log))
+    # Find video file mentions - unique, in order of first mention
+    video_files = dict.fromkeys(facts["video_files"])
+    size_text = "".join(facts["video_size_lines"])
+    
+    # Scores and settings are read once per log, shared by its videos
+    gate = facts["quality_gate"]
+    hook = ""
+    for name in ("hook_tag", "hook_quoted", "hook_text"):
+        # Hook - look for actual content hooks, not filenames
+        if facts[name] and not facts[name][0].endswith('.json'):
+            hook = facts[name][0][:50]
+            break
     
     for vf in video_files:
         video = VideoInfo(title=vf)
@@ -448,112 +855,90 @@ def extract_video_details(log: str) -> List[VideoInfo]:
             video.category = cat_match.group(1)
         
         # Try to get size
-        size_match = re.search(rf'{re.escape(vf)}\s*\((\d+)MB\)', log)
+        size_match = re.search(rf'{re.escape(vf)}\s*\((\d+)MB\)', size_text)
         if size_match:
             video.file_size_mb = float(size_match.group(1))
         
         # Extract scores from log
-        # Virality score
-        virality_match = re.search(r'[Vv]irality[_\s]?[Ss]core[:\s]*([\d.]+)', log)
-        if virality_match:
-            video.virality_score = float(virality_match.group(1))
-        
-        # Engagement score
-        engage_match = re.search(r'[Ee]ngagement[_\s]?[Ss]core[:\s]*([\d.]+)', log)
-        if engage_match:
-            video.engagement_score = float(engage_match.group(1))
-        
-        # Retention score
-        retain_match = re.search(r'[Rr]etention[_\s]?[Ss]core[:\s]*([\d.]+)', log)
-        if retain_match:
-            video.retention_score = float(retain_match.group(1))
-        
-        # Script score
-        script_match = re.search(r'[Ss]cript[_\s]?[Ss]core[:\s]*([\d.]+)', log)
-        if script_match:
-            video.script_score = float(script_match.group(1))
+        if facts["virality_score"]:
+            video.virality_score = float(facts["virality_score"][0])
+        if facts["engagement_score"]:
+            video.engagement_score = float(facts["engagement_score"][0])
+        if facts["retention_score"]:
+            video.retention_score = float(facts["retention_score"][0])
+        if facts["script_score"]:
+            video.script_score = float(facts["script_score"][0])
         
         # Quality gate
-        if "Quality Gate: PASSED" in log or "quality_gate.*passed" in log.lower():
+        if facts["quality_gate_passed"] or facts["quality_gate_passed_lower"]:
             video.quality_gate_passed = True
-        gate_match = re.search(r'[Qq]uality[_\s]?[Gg]ate[:\s]*(PASSED|FAILED)(?:[:\s]*(.+?))?[\n\r]', log)
-        if gate_match:
-            video.quality_gate_passed = gate_match.group(1) == "PASSED"
-            video.quality_gate_reason = gate_match.group(2) or ""
+        if gate:
+            video.quality_gate_passed = gate[0] == "PASSED"
+            video.quality_gate_reason = gate[1] or ""
         
         # Duration
-        dur_match = re.search(r'[Dd]uration[:\s]*([\d.]+)\s*(?:s|sec)', log)
-        if dur_match:
-            video.duration = float(dur_match.group(1))
+        if facts["duration"]:
+            video.duration = float(facts["duration"][0])
         
         # Phrase count
-        phrase_match = re.search(r'(\d+)\s*phrases?', log)
-        if phrase_match:
-            video.phrase_count = int(phrase_match.group(1))
+        if facts["phrase_count"]:
+            video.phrase_count = int(facts["phrase_count"][0])
         
-        # Hook - look for actual content hooks, not filenames
-        hook_patterns = [
-            r'\[HOOK\][:\s]*"([^"]+)"',
-            r'Hook[:\s]*"([^"]+)"',
-            r'hook_text[:\s]*["\']([^"\']+)["\']',
-        ]
-        for pattern in hook_patterns:
-            hook_match = re.search(pattern, log, re.IGNORECASE)
-            if hook_match and not hook_match.group(1).endswith('.json'):
-                video.hook = hook_match.group(1)[:50]
-                break
+        video.hook = hook
         
         # AI Model used
-        model_match = re.search(r'(?:Using|Model)[:\s]*(gemini-[^\s,]+|llama[^\s,]+|gpt[^\s,]+)', log, re.IGNORECASE)
-        if model_match:
-            video.ai_model_used = model_match.group(1)
+        if facts["video_model"]:
+            video.ai_model_used = facts["video_model"][0]
         
         # TTS Engine
-        if "edge-tts" in log.lower():
+        if facts["edge_tts"]:
             video.tts_engine = "Edge-TTS"
-        elif "gtts" in log.lower():
+        elif facts["gtts"]:
             video.tts_engine = "gTTS"
         
         # YouTube URL
-        yt_match = re.search(r'youtube\.com/shorts/([a-zA-Z0-9_-]+)', log)
-        if yt_match:
-            video.video_id = yt_match.group(1)
+        if facts["youtube_short"]:
+            video.video_id = facts["youtube_short"][0]
             video.youtube_url = f"https://youtube.com/shorts/{video.video_id}"
         
         # Upload status
-        upload_patterns = [
-            "Successfully uploaded to YouTube",
-            "Upload complete",
-            "[YOUTUBE] Uploading:",
-            "[UPLOAD] Title:"
-        ]
-        if any(pattern in log for pattern in upload_patterns):
+        if facts["uploaded"]:
             video.uploaded = True
             video.platform = "YouTube"
         
         # B-roll count
-        broll_match = re.search(r'(\d+)\s*(?:b-?roll|video\s*clips?)', log, re.IGNORECASE)
-        if broll_match:
-            video.b_roll_count = int(broll_match.group(1))
+        if facts["broll_count"]:
+            video.b_roll_count = int(facts["broll_count"][0])
         
         videos.append(video)
     
     return videos
 
 
-def extract_detailed_quota(log: str, workflow_name: str) -> List[QuotaUsage]:
+def _flag_rate_limits(facts: Dict[str, Any], quota_list: List[QuotaUsage]) -> bool:
+    """Mark providers whose log lines mention 429 / rate limit / quota exhausted."""
+    limited = False
+    if facts["has_429"] or facts["has_rate_limit"] or facts["has_quota"]:
+        for q in quota_list:
+            if facts.get(f"rate_limited_{q.provider.lower()}"):
+                q.error_429 = True
+                q.limit_reached = True
+                limited = True
+    return limited
+
+
+def extract_detailed_quota(facts: Dict[str, Any], workflow_name: str) -> List[QuotaUsage]:
     """Extract detailed quota usage with model-level breakdown and percentages."""
     quota_list = []
     
     # Gemini - look for specific model usage
-    gemini_models = re.findall(r'(?:Using|Model|model)[:\s]*(gemini-[^\s,\]]+)', log, re.IGNORECASE)
     gemini_model_counts = {}
-    for model in gemini_models:
+    for model in facts["gemini_models"]:
         model_clean = model.lower().strip()
         gemini_model_counts[model_clean] = gemini_model_counts.get(model_clean, 0) + 1
     
     # Also count generateContent calls
-    generate_calls = len(re.findall(r'generateContent', log))
+    generate_calls = facts["gemini_generate"]
     if generate_calls > 0 and not gemini_model_counts:
         gemini_model_counts["generateContent"] = generate_calls
     
@@ -570,13 +955,12 @@ def extract_detailed_quota(log: str, workflow_name: str) -> List[QuotaUsage]:
         ))
     
     # Groq
-    groq_models = re.findall(r'(?:llama-[^\s,\]]+|mixtral[^\s,\]]+)', log, re.IGNORECASE)
     groq_model_counts = {}
-    for model in groq_models:
+    for model in facts["groq_models"]:
         model_clean = model.lower().strip()
         groq_model_counts[model_clean] = groq_model_counts.get(model_clean, 0) + 1
     
-    groq_calls = len(re.findall(r'api\.groq\.com/openai/v1/chat', log))
+    groq_calls = facts["groq_calls"]
     if groq_calls > 0 and not groq_model_counts:
         groq_model_counts["chat/completions"] = groq_calls
     
@@ -593,7 +977,7 @@ def extract_detailed_quota(log: str, workflow_name: str) -> List[QuotaUsage]:
         ))
     
     # OpenRouter
-    openrouter_calls = len(re.findall(r'openrouter\.ai/api/v1/chat', log))
+    openrouter_calls = facts["openrouter_calls"]
     if openrouter_calls > 0:
         limit = QUOTA_LIMITS["OPENROUTER"]["chat/completions"]
         quota_list.append(QuotaUsage(
@@ -605,7 +989,7 @@ def extract_detailed_quota(log: str, workflow_name: str) -> List[QuotaUsage]:
         ))
     
     # Pexels
-    pexels_calls = len(re.findall(r'api\.pexels\.com/videos', log))
+    pexels_calls = facts["pexels_calls"]
     if pexels_calls > 0:
         limit = QUOTA_LIMITS["PEXELS"]["videos/search"]
         quota_list.append(QuotaUsage(
@@ -617,8 +1001,8 @@ def extract_detailed_quota(log: str, workflow_name: str) -> List[QuotaUsage]:
         ))
     
     # YouTube
-    youtube_calls = len(re.findall(r'googleapis\.com/youtube/v3', log))
-    youtube_uploads = len(re.findall(r'\[YOUTUBE\] Uploading:', log))
+    youtube_calls = facts["youtube_calls"]
+    youtube_uploads = facts["youtube_uploads"]
     
     if youtube_calls > 0:
         quota_list.append(QuotaUsage(
@@ -641,12 +1025,7 @@ def extract_detailed_quota(log: str, workflow_name: str) -> List[QuotaUsage]:
         ))
     
     # Check for 429 errors
-    if "429" in log or "rate limit" in log.lower() or "quota" in log.lower():
-        for q in quota_list:
-            pattern = rf'({q.provider}|{q.provider.lower()})[^\n]*?(429|rate.?limit|quota.?exhaust)'
-            if re.search(pattern, log, re.IGNORECASE):
-                q.error_429 = True
-                q.limit_reached = True
+    _flag_rate_limits(facts, quota_list)
     
     return quota_list
 
@@ -655,7 +1034,7 @@ def extract_detailed_quota(log: str, workflow_name: str) -> List[QuotaUsage]:
 # WORKFLOW ANALYZERS (One per workflow type)
 # ============================================================
 
-def analyze_video_generator(log: str, run: WorkflowRun) -> WorkflowAnalysisResult:
+def analyze_video_generator(facts: Dict[str, Any], run: WorkflowRun) -> WorkflowAnalysisResult:
     """Analyze ViralShorts Factory - Auto Video Generator run."""
     result = WorkflowAnalysisResult(run=run)
     
@@ -667,29 +1046,26 @@ def analyze_video_generator(log: str, run: WorkflowRun) -> WorkflowAnalysisResul
     
     # v17.9.14: Fix false positive - check for ACTUAL file extraction, not script display
     # The log shows "inflating:" when files are actually extracted from the artifact
-    inflated_files = re.findall(r'inflating:\s*data/persistent/([^\s]+)', log)
+    inflated_files = facts["inflated_files"]
     if inflated_files:
         result.persistent_read_success = True
         persistent_read_files.append(f"persistent-state ({len(inflated_files)} files)")
         for f in inflated_files[:5]:  # Show first 5
             if f.endswith('.json'):
                 persistent_read_files.append(f)
-    elif "Restored patterns from artifact" in log and "[36;1m" not in log.split("Restored")[0][-20:]:
+    elif facts["restored_from_artifact"] and "[36;1m" not in (facts["before_restored"] or ""):
         # Only count as restored if it's actual output, not shell script display
         result.persistent_read_success = True
         persistent_read_files.append("persistent-state (artifact)")
     
-    if "variety_state" in log and "variety_state.json" not in persistent_read_files:
-        persistent_read_files.append("variety_state.json")
-    if "viral_patterns" in log and "viral_patterns.json" not in persistent_read_files:
-        persistent_read_files.append("viral_patterns.json")
-    if "upload_state" in log and "upload_state.json" not in persistent_read_files:
-        persistent_read_files.append("upload_state.json")
+    for fname in ["variety_state", "viral_patterns", "upload_state"]:
+        if facts[f"mentions_{fname}"] and f"{fname}.json" not in persistent_read_files:
+            persistent_read_files.append(f"{fname}.json")
     
     # Only mark as fresh start if NO files were actually inflated
-    if not inflated_files and "No previous state found" in log:
+    if not inflated_files and facts["no_previous_state"]:
         # Check it's not just script display by looking for actual execution (no color codes)
-        if re.search(r'^\[INFO\] No previous state found', log, re.MULTILINE):
+        if facts["no_previous_state_line"]:
             result.persistent_read_success = True  # Valid - fresh start
             result.warnings.append("Fresh state (no previous persistent data)")
     
@@ -697,41 +1073,39 @@ def analyze_video_generator(log: str, run: WorkflowRun) -> WorkflowAnalysisResul
     
     # Check persistent data write - what files were written
     persistent_write_files = []
-    if "persistent-state" in log and ("Artifact name is valid" in log or "successfully uploaded" in log.lower()):
+    if facts["persistent_state"] and (facts["artifact_valid"] or facts["successfully_uploaded"]):
         result.persistent_write_success = True
         persistent_write_files.append("persistent-state (artifact)")
     
     # Check for specific file saves
-    for fname in ["variety_state", "viral_patterns", "upload_state", "analytics_state", "learned_video_metrics"]:
-        if f"Saved {fname}" in log or f"Updated {fname}" in log or f"{fname}.json" in log:
+    for fname in STATE_FILE_NAMES:
+        if facts[f"saved_{fname}"] or facts[f"updated_{fname}"] or facts[f"mentioned_{fname}"]:
             persistent_write_files.append(f"{fname}.json")
     
     result.key_metrics["persistent_files_written"] = persistent_write_files
     
     # Check pre-generated concepts loaded
-    if "Loaded" in log and "pre-generated concepts" in log:
-        match = re.search(r'Loaded (\d+) pre-generated concepts', log)
-        if match:
-            result.key_metrics["prework_concepts_used"] = int(match.group(1))
+    if facts["loaded"] and facts["pre_generated_concepts"]:
+        if facts["prework_concepts_used"]:
+            result.key_metrics["prework_concepts_used"] = int(facts["prework_concepts_used"][0])
     
     # Extract detailed video information
-    result.videos = extract_video_details(log)
+    result.videos = extract_video_details(facts)
     
     # Check expected behavior
     if result.passed and len(result.videos) > 0:
-        if result.videos[0].uploaded or "no-upload" in log.lower() or "test mode" in log.lower():
+        if result.videos[0].uploaded or facts["no_upload"] or facts["test_mode"]:
             result.expected_behavior_met = True
     
     # Extract detailed quota usage
-    result.quota_usage = extract_detailed_quota(log, run.name)
+    result.quota_usage = extract_detailed_quota(facts, run.name)
     
     # Check for errors
-    if "CRITICAL" in log and "No videos were generated" in log and len(result.videos) == 0:
+    if facts["critical"] and facts["no_videos_generated"] and len(result.videos) == 0:
         result.errors.append("No videos were generated")
-    elif "CRITICAL" in log:
-        errors = re.findall(r'CRITICAL[:\s]+([^\n\[]+)', log)
+    elif facts["critical"]:
         clean_errors = list(set(
-            e.strip() for e in errors 
+            e.strip() for e in facts["critical_errors"]
             if e.strip() 
             and not e.startswith('[0m')
             and not (len(result.videos) > 0 and "No videos" in e)
@@ -739,29 +1113,20 @@ def analyze_video_generator(log: str, run: WorkflowRun) -> WorkflowAnalysisResul
         result.errors.extend(clean_errors[:5])
     
     # Extract generation timing
-    gen_time_match = re.search(r'(?:Generation|Total)[^\d]*(\d+(?:\.\d+)?)\s*(?:s|sec|seconds)', log)
-    if gen_time_match:
-        result.key_metrics["generation_time_sec"] = float(gen_time_match.group(1))
+    if facts["generation_time"]:
+        result.key_metrics["generation_time_sec"] = float(facts["generation_time"][0])
     
     # Extract AI model usage - shows 4-category system working
     # Primary model selection
-    primary_model_match = re.search(r'\[MODEL\] Best Gemini: ([\w\.-]+) \((\d+)/day\)', log)
-    if primary_model_match:
-        result.key_metrics["primary_model"] = primary_model_match.group(1)
-        result.key_metrics["primary_model_quota"] = int(primary_model_match.group(2))
+    if facts["primary_model"]:
+        result.key_metrics["primary_model"] = facts["primary_model"][0]
+        result.key_metrics["primary_model_quota"] = int(facts["primary_model"][1])
     
     # All models used during the run
     # Pattern 1: [AI] Using provider:model
-    gemini_uses = re.findall(r'\[AI\] Using gemini:([\w\.-]+)', log)
-    groq_uses = re.findall(r'\[AI\] Using groq:([\w\.-]+)', log)
-    
     # Pattern 2: [OK] Gemini model: model-name (for primary selection)
-    gemini_init = re.findall(r'\[OK\] Gemini model: ([\w\.-]+)', log)
-    gemini_uses.extend(gemini_init)
-    
-    # Pattern 3: Fallback events
-    fallback_uses = re.findall(r'\[FALLBACK\] Trying ([\w\.:/-]+)', log)
-    fallback_success = re.findall(r'\[OK\] Fallback succeeded with ([\w\.:/-]+)', log)
+    gemini_uses = facts["gemini_uses"] + facts["gemini_init"]
+    groq_uses = facts["groq_uses"]
     
     models_used = {}
     for m in gemini_uses:
@@ -770,143 +1135,133 @@ def analyze_video_generator(log: str, run: WorkflowRun) -> WorkflowAnalysisResul
         models_used[f"groq:{m}"] = models_used.get(f"groq:{m}", 0) + 1
     
     result.key_metrics["models_used"] = models_used
-    result.key_metrics["fallback_count"] = len(fallback_success)  # Count actual successful fallbacks
+    # Pattern 3: Fallback events
+    result.key_metrics["fallback_count"] = facts["fallback_successes"]  # Count actual successful fallbacks
     
     # Check if model discovery worked
-    discovered_match = re.search(r'([\w\.-]+): (\d+)/day \(discovered\)', log)
-    if discovered_match:
-        result.key_metrics["discovered_model"] = discovered_match.group(1)
-        result.key_metrics["discovered_quota"] = int(discovered_match.group(2))
+    if facts["discovered_model"]:
+        result.key_metrics["discovered_model"] = facts["discovered_model"][0]
+        result.key_metrics["discovered_quota"] = int(facts["discovered_model"][1])
     
     # Legacy model extraction
-    model_match = re.search(r'(?:Using|Selected|Model)[:\s]*(gemini-[^\s,\]]+)', log, re.IGNORECASE)
-    if model_match:
-        result.key_metrics["ai_model"] = model_match.group(1)
+    if facts["legacy_model"]:
+        result.key_metrics["ai_model"] = facts["legacy_model"][0]
     
     # Check for quality gate results
-    if "Quality Gate: PASSED" in log:
+    if facts["quality_gate_passed"]:
         result.key_metrics["quality_gate"] = "PASSED"
-    elif "Quality Gate: FAILED" in log:
+    elif facts["quality_gate_failed"]:
         result.key_metrics["quality_gate"] = "FAILED"
     
     return result
 
 
-def analyze_prework_fetcher(log: str, run: WorkflowRun) -> WorkflowAnalysisResult:
+def analyze_prework_fetcher(facts: Dict[str, Any], run: WorkflowRun) -> WorkflowAnalysisResult:
     """Analyze Pre-Work Data Fetcher run."""
     result = WorkflowAnalysisResult(run=run)
     
     result.passed = run.conclusion == "success"
     
     # Check if concepts were generated
-    concepts_match = re.search(r'Concepts generated:\s*(\d+)', log)
-    if concepts_match:
-        result.key_metrics["concepts_generated"] = int(concepts_match.group(1))
+    if facts["concepts_generated"]:
+        result.key_metrics["concepts_generated"] = int(facts["concepts_generated"][0])
         result.expected_behavior_met = True
     
     # Check artifact upload
-    if "pre-generated-concepts" in log and "Artifact name is valid" in log:
+    if facts["concepts_artifact"] and facts["artifact_valid"]:
         result.persistent_write_success = True
     
     # Check git commit
-    if "Pre-work: Generated" in log or "No changes to commit" in log:
+    if facts["prework_committed"] or facts["no_changes"]:
         result.key_metrics["git_committed"] = True
     
     # Extract quota usage
-    result.quota_usage = extract_detailed_quota(log, run.name)
+    result.quota_usage = extract_detailed_quota(facts, run.name)
     
     # Check for rate limit skip - but this shouldn't show as warning if concepts were generated
-    if ("QUOTA EXHAUSTED" in log or "exit 78" in log) and result.key_metrics.get("concepts_generated", 0) == 0:
+    if (facts["quota_exhausted"] or facts["exit_78"]) and result.key_metrics.get("concepts_generated", 0) == 0:
         result.warnings.append("Skipped due to quota exhaustion (will retry next schedule)")
         result.expected_behavior_met = True  # This is expected behavior
     
     return result
 
 
-def analyze_analytics_feedback(log: str, run: WorkflowRun) -> WorkflowAnalysisResult:
+def analyze_analytics_feedback(facts: Dict[str, Any], run: WorkflowRun) -> WorkflowAnalysisResult:
     """Analyze Weekly Analytics Feedback run."""
     result = WorkflowAnalysisResult(run=run)
     
     result.passed = run.conclusion == "success"
     
     # Check if YouTube data was fetched
-    if "Found" in log and "videos" in log:
-        match = re.search(r'Found (\d+) videos', log)
-        if match:
-            result.key_metrics["videos_analyzed"] = int(match.group(1))
+    if facts["found"] and facts["videos"]:
+        if facts["videos_found"]:
+            result.key_metrics["videos_analyzed"] = int(facts["videos_found"][0])
             result.expected_behavior_met = True
     
     # Check persistent state restored
-    if "[OK] Restored state" in log:
+    if facts["restored_state"]:
         result.persistent_read_success = True
     
     # Check persistent state saved
-    if "persistent-state" in log:
+    if facts["persistent_state"]:
         result.persistent_write_success = True
     
     # Check AI analysis
-    if "Key insight:" in log:
-        insight_match = re.search(r'Key insight:\s*([^\n]+)', log)
-        if insight_match:
-            result.key_metrics["ai_insight"] = insight_match.group(1)[:100]
+    if facts["key_insight"]:
+        if facts["key_insight_text"]:
+            result.key_metrics["ai_insight"] = facts["key_insight_text"][0][:100]
     
     # Check pattern updates
-    pattern_updates = [
-        "variety_state.json updated",
-        "viral_patterns.json updated",
-        "hook_word_performance.json updated",
-        "category_decay.json updated"
-    ]
-    updates_found = sum(1 for p in pattern_updates if p in log)
+    updates_found = sum(1 for i in range(len(PATTERN_UPDATES)) if facts[f"pattern_update_{i}"])
     result.key_metrics["pattern_files_updated"] = updates_found
     
     # Check shadow-ban status
-    if "Status: concerning" in log:
+    if facts["shadow_ban_concerning"]:
         result.warnings.append("Shadow-ban indicator detected!")
-    elif "Status: normal" in log:
+    elif facts["shadow_ban_normal"]:
         result.key_metrics["shadow_ban_status"] = "normal"
     
     # Check for schedule skip
-    if "AI recommends skipping" in log:
+    if facts["skipped_by_ai"]:
         result.key_metrics["skipped_by_ai"] = True
         result.expected_behavior_met = True  # Expected when not enough new videos
     
     # Extract quota usage
-    result.quota_usage = extract_detailed_quota(log, run.name)
+    result.quota_usage = extract_detailed_quota(facts, run.name)
     
     return result
 
 
-def analyze_monthly_analysis(log: str, run: WorkflowRun) -> WorkflowAnalysisResult:
+def analyze_monthly_analysis(facts: Dict[str, Any], run: WorkflowRun) -> WorkflowAnalysisResult:
     """Analyze Monthly Viral Analysis run."""
     result = WorkflowAnalysisResult(run=run)
     
     result.passed = run.conclusion == "success"
     
     # Check if analysis ran
-    if "Monthly Viral Analysis" in log or "analyze_viral_channels" in log:
+    if facts["monthly_analysis"] or facts["analyze_viral_channels"]:
         result.expected_behavior_met = True
     
     # Check persistent state
-    if "[OK] Restored state" in log:
+    if facts["restored_state"]:
         result.persistent_read_success = True
     
-    if "persistent-state" in log:
+    if facts["persistent_state"]:
         result.persistent_write_success = True
     
     # Extract quota usage
-    result.quota_usage = extract_detailed_quota(log, run.name)
+    result.quota_usage = extract_detailed_quota(facts, run.name)
     
     return result
 
 
-def extract_quota_usage(log: str) -> List[QuotaUsage]:
-    """Extract quota usage information from log."""
+def extract_quota_usage(facts: Dict[str, Any]) -> List[QuotaUsage]:
+    """Extract quota usage information from a log's facts."""
     quota_list = []
     
     # Gemini API calls (count actual API requests, not just URL mentions)
-    gemini_generate = len(re.findall(r'generateContent', log))
-    gemini_models = len(re.findall(r'/v1beta/models[^/]', log))
+    gemini_generate = facts["gemini_generate"]
+    gemini_models = facts["gemini_list_models"]
     if gemini_generate > 0:
         quota_list.append(QuotaUsage(
             provider="GEMINI",
@@ -920,57 +1275,27 @@ def extract_quota_usage(log: str) -> List[QuotaUsage]:
             calls=gemini_models
         ))
     
-    # Groq API calls
-    groq_calls = len(re.findall(r'api\.groq\.com/openai/v1/chat', log))
-    if groq_calls > 0:
-        quota_list.append(QuotaUsage(
-            provider="GROQ",
-            endpoint="chat/completions",
-            calls=groq_calls
-        ))
-    
-    # OpenRouter calls
-    openrouter_calls = len(re.findall(r'openrouter\.ai/api/v1/chat', log))
-    if openrouter_calls > 0:
-        quota_list.append(QuotaUsage(
-            provider="OPENROUTER",
-            endpoint="chat/completions",
-            calls=openrouter_calls
-        ))
-    
-    # Pexels calls
-    pexels_calls = len(re.findall(r'api\.pexels\.com/videos', log))
-    if pexels_calls > 0:
-        quota_list.append(QuotaUsage(
-            provider="PEXELS",
-            endpoint="videos/search",
-            calls=pexels_calls
-        ))
-    
-    # YouTube API calls
-    youtube_calls = len(re.findall(r'googleapis\.com/youtube/v3', log))
-    if youtube_calls > 0:
-        quota_list.append(QuotaUsage(
-            provider="YOUTUBE",
-            endpoint="v3/various",
-            calls=youtube_calls
-        ))
+    # Groq, OpenRouter, Pexels and YouTube API calls
+    for provider, endpoint, fact in [
+        ("GROQ", "chat/completions", "groq_calls"),
+        ("OPENROUTER", "chat/completions", "openrouter_calls"),
+        ("PEXELS", "videos/search", "pexels_calls"),
+        ("YOUTUBE", "v3/various", "youtube_calls"),
+    ]:
+        if facts[fact] > 0:
+            quota_list.append(QuotaUsage(
+                provider=provider,
+                endpoint=endpoint,
+                calls=facts[fact]
+            ))
     
     # Check for 429 errors - look for specific patterns
-    rate_limit_429 = False
-    if "429" in log or "rate limit" in log.lower() or "quota" in log.lower():
+    if facts["has_429"] or facts["has_rate_limit"] or facts["has_quota"]:
         # Check for specific provider rate limits
-        for provider in ["GEMINI", "GROQ", "OPENROUTER", "PEXELS", "YOUTUBE"]:
-            pattern = rf'({provider}|{provider.lower()})[^\n]*?(429|rate.?limit|quota.?exhaust)'
-            if re.search(pattern, log, re.IGNORECASE):
-                for q in quota_list:
-                    if q.provider == provider:
-                        q.error_429 = True
-                        q.limit_reached = True
-                        rate_limit_429 = True
+        rate_limit_429 = _flag_rate_limits(facts, quota_list)
         
         # Also check for generic 429 near API calls
-        if not rate_limit_429 and "HTTP 429" in log:
+        if not rate_limit_429 and facts["has_http_429"]:
             # Try to identify which provider
             for q in quota_list:
                 if q.calls > 5:  # Likely the one hitting limits
@@ -985,26 +1310,23 @@ def extract_quota_usage(log: str) -> List[QuotaUsage]:
 # ============================================================
 
 def analyze_workflow_run(run: WorkflowRun) -> WorkflowAnalysisResult:
-    """Analyze a single workflow run based on its type."""
-    
-    # Download log
-    log = download_log_in_batches(run.run_id)
-    run.log_content = log
+    """Analyze a single workflow run (run.log_facts fetched) based on its type."""
+    facts = run.log_facts
     
-    if not log:
+    if not facts:
         result = WorkflowAnalysisResult(run=run)
         result.errors.append("Failed to download log")
         return result
     
     # Route to appropriate analyzer
     if "Auto Video Generator" in run.name:
-        return analyze_video_generator(log, run)
+        return analyze_video_generator(facts, run)
     elif "Pre-Work" in run.name:
-        return analyze_prework_fetcher(log, run)
+        return analyze_prework_fetcher(facts, run)
     elif "Analytics Feedback" in run.name or "Weekly" in run.name:
-        return analyze_analytics_feedback(log, run)
+        return analyze_analytics_feedback(facts, run)
     elif "Monthly" in run.name or "Viral Analysis" in run.name:
-        return analyze_monthly_analysis(log, run)
+        return analyze_monthly_analysis(facts, run)
     else:
         result = WorkflowAnalysisResult(run=run)
         result.warnings.append(f"Unknown workflow type: {run.name}")
@@ -1100,12 +1422,12 @@ def generate_report(results: List[WorkflowAnalysisResult], days: int, persistent
     behavior_checks = {
         "Auto Video Generator": [
             ("Generate video", lambda r: len(r.videos) > 0),
-            ("Upload to YouTube", lambda r: any(v.uploaded for v in r.videos) or "no-upload" in str(r.run.log_content).lower()),
+            ("Upload to YouTube", lambda r: any(v.uploaded for v in r.videos) or r.run.log_facts.get("no_upload")),
             ("Read persistent state", lambda r: r.persistent_read_success),
             ("Write persistent state", lambda r: r.persistent_write_success),
         ],
         "Pre-Work": [
-            ("Generate concepts", lambda r: r.key_metrics.get("concepts_generated", 0) > 0 or "QUOTA EXHAUSTED" in str(r.run.log_content)),
+            ("Generate concepts", lambda r: r.key_metrics.get("concepts_generated", 0) > 0 or r.run.log_facts.get("quota_exhausted")),
             ("Save artifact", lambda r: r.persistent_write_success),
         ],
         "Analytics Feedback": [
@@ -1358,7 +1680,7 @@ def generate_report(results: List[WorkflowAnalysisResult], days: int, persistent
     for r in generator_results:
         if r.passed and r.videos:
             not_uploaded = [v for v in r.videos if not v.uploaded]
-            if not_uploaded and "no-upload" not in str(r.run.log_content).lower():
+            if not_uploaded and not r.run.log_facts.get("no_upload"):
                 hidden_issues.append(f"Run #{r.run.run_id}: {len(not_uploaded)} video(s) generated but not uploaded")
     
     # Issue 4: Stale persistent data
@@ -1962,6 +2284,7 @@ Examples:
   python scripts/analyze_workflows.py --days 1    # Last 24 hours
   python scripts/analyze_workflows.py --days 2    # Last 48 hours
   python scripts/analyze_workflows.py --days 7    # Last week
+  python scripts/analyze_workflows.py --days 30 --jobs 8 --no-cache
         """
     )
     parser.add_argument(
@@ -1976,6 +2299,17 @@ Examples:
         default=None,
         help="Generate HTML report to specified file (e.g., --html report.html)"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_LOG_JOBS,
+        help=f"Logs to download in parallel (default: {DEFAULT_LOG_JOBS})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-download and re-parse every log instead of using cached results"
+    )
     
     args = parser.parse_args()
     
@@ -1993,6 +2327,8 @@ Examples:
     
     # Step 2: Analyze each run
     safe_print(f"\n[2/6] Analyzing {len(runs)} workflow runs...")
+    cached = fetch_all_log_facts(runs, jobs=args.jobs, use_cache=not args.no_cache)
+    safe_print(f"   {cached} run(s) from cache ({LOG_CACHE_DIR}), {len(runs) - cached} downloaded")
     results = []
     
     for i, run in enumerate(runs, 1):
@@ -14,7 +14,10 @@ def run_tests():
     # TEST 1: All imports work
     print("\n[1] TESTING IMPORTS...")
     try:
-        from pro_video_generator import MasterAI, generate_pro_video, ENHANCEMENTS_V12_AVAILABLE, V12_MASTER_PROMPT
+        import pro_video_generator
+        from pro_video_generator import MasterAI, generate_pro_video, ENHANCEMENTS_V12_AVAILABLE
+        # v18.7: Optional modules load lazily - the master prompt is built on first use
+        V12_MASTER_PROMPT = pro_video_generator.v12_master_prompt()
         print("   - pro_video_generator imports: OK")
     except Exception as e:
         print(f"   - pro_video_generator imports: FAILED - {e}")
@@ -111,7 +114,7 @@ def run_tests():
     # TEST 8: V12 master prompt injected into stage1
     print("\n[8] TESTING V12 PROMPT IN STAGE1...")
     stage1_source = inspect.getsource(ai.stage1_decide_video_concept)
-    has_v12_in_stage1 = "v12_guidelines" in stage1_source or "V12_MASTER_PROMPT" in stage1_source
+    has_v12_in_stage1 = "v12_guidelines" in stage1_source or "v12_master_prompt" in stage1_source
     print(f"   - V12 guidelines in stage1: {has_v12_in_stage1}")
     if not has_v12_in_stage1:
         print("   - CRITICAL: V12 prompt not injected into stage1!")
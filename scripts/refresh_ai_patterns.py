@@ -7,15 +7,30 @@ This script is called by the refresh-ai-patterns workflow to
 regenerate viral patterns using AI.
 
 v17.8: AI-first architecture - patterns come from AI, not hardcoded.
+v18.7: Also regenerates the viral channel analyzer's patterns - video
+generation only reads saved patterns (boost_snapshots) and no longer
+regenerates stale ones mid-run.
 """
 
 import sys
 sys.path.insert(0, 'src')
 sys.path.insert(0, 'src/ai')
+sys.path.insert(0, 'src/utils')
+sys.path.insert(0, 'src/analytics')
 
 from ai_pattern_generator import get_pattern_generator
 
 
+def refresh_viral_analyzer():
+    """Regenerate the patterns behind get_viral_prompt_boost()."""
+    try:
+        from viral_channel_analyzer import ViralChannelAnalyzer
+        patterns = ViralChannelAnalyzer(refresh=False).refresh_patterns()
+        print(f'Viral analyzer formulas: {len(patterns.get("title_formulas", []))}')
+    except Exception as e:
+        print(f'INFO: Viral analyzer refresh skipped: {e}')
+
+
 def main():
     print('=== AI PATTERN REFRESH ===')
     gen = get_pattern_generator()
@@ -39,6 +54,8 @@ def main():
     if patterns.get('title_patterns'):
         print(f'Sample: {patterns["title_patterns"][0]}')
     
+    refresh_viral_analyzer()
+    
     print('=== REFRESH COMPLETE ===')
     
     # Inform but don't fail - next run will try again
@@ -456,7 +456,7 @@ class VersionVerifier:
         main_content = self._read_main_generator()
         
         checks = [
-            ("V12_MASTER_PROMPT" in main_content, "V12 master prompt loaded"),
+            ("v12_master_prompt" in main_content, "V12 master prompt loaded"),
             ("v12_guidelines" in main_content, "V12 guidelines injected"),
             ("enhancement_orch" in main_content, "V9 orchestrator used"),
             ("ENHANCEMENTS_V12_AVAILABLE" in main_content, "V12 availability check"),
@@ -14,6 +14,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     try:
@@ -70,9 +76,8 @@ class AIAudiencePersonaGenerator:
     
     def _load(self) -> Dict:
         try:
-            if PERSONA_FILE.exists():
-                with open(PERSONA_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(PERSONA_FILE):
+                return load_state(PERSONA_FILE)
         except:
             pass
         return {
@@ -83,8 +88,7 @@ class AIAudiencePersonaGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(PERSONA_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(PERSONA_FILE, self.data)
     
     def generate_persona(self, category: str, topic: str = None) -> Dict:
         """
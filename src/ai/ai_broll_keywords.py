@@ -21,6 +21,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -48,9 +54,8 @@ class AIBRollKeywordGenerator:
     
     def _load(self) -> Dict:
         try:
-            if BROLL_KEYWORDS_FILE.exists():
-                with open(BROLL_KEYWORDS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(BROLL_KEYWORDS_FILE):
+                return load_state(BROLL_KEYWORDS_FILE)
         except:
             pass
         return {
@@ -61,8 +66,7 @@ class AIBRollKeywordGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(BROLL_KEYWORDS_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(BROLL_KEYWORDS_FILE, self.data)
     
     def generate_keywords(self, phrase: str, category: str = None,
                          count: int = 5) -> List[str]:
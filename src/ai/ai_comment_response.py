@@ -9,13 +9,18 @@ Builds community and boosts engagement.
 
 import os
 from src.ai.model_helper import get_dynamic_gemini_model
-import json
 import re
 import random
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     try:
@@ -66,9 +71,8 @@ class AICommentResponseGenerator:
     
     def _load(self) -> Dict:
         try:
-            if COMMENT_FILE.exists():
-                with open(COMMENT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(COMMENT_FILE):
+                return load_state(COMMENT_FILE)
         except:
             pass
         return {
@@ -79,8 +83,7 @@ class AICommentResponseGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(COMMENT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(COMMENT_FILE, self.data)
     
     def generate_response(self, comment: str, video_topic: str = None) -> Dict:
         """
@@ -23,6 +23,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -50,9 +56,8 @@ class AIContentQualityChecker:
     
     def _load(self) -> Dict:
         try:
-            if QUALITY_HISTORY_FILE.exists():
-                with open(QUALITY_HISTORY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(QUALITY_HISTORY_FILE):
+                return load_state(QUALITY_HISTORY_FILE)
         except:
             pass
         return {
@@ -64,8 +69,7 @@ class AIContentQualityChecker:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(QUALITY_HISTORY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(QUALITY_HISTORY_FILE, self.data)
     
     def check_content(self, content: Dict) -> Dict:
         """
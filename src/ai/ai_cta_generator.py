@@ -18,13 +18,18 @@ This module:
 
 import os
 from src.ai.model_helper import get_dynamic_gemini_model
-import json
 import re
 import random
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -52,9 +57,8 @@ class AICTAGenerator:
     
     def _load(self) -> Dict:
         try:
-            if CTA_PERFORMANCE_FILE.exists():
-                with open(CTA_PERFORMANCE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(CTA_PERFORMANCE_FILE):
+                return load_state(CTA_PERFORMANCE_FILE)
         except:
             pass
         return {
@@ -66,8 +70,7 @@ class AICTAGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(CTA_PERFORMANCE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(CTA_PERFORMANCE_FILE, self.data)
     
     def generate_cta(self, topic: str, category: str,
                     style: str = "auto") -> str:
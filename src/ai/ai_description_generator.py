@@ -14,12 +14,17 @@ Descriptions are important for:
 
 import os
 from src.ai.model_helper import get_dynamic_gemini_model
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -47,9 +52,8 @@ class AIDescriptionGenerator:
     
     def _load(self) -> Dict:
         try:
-            if DESCRIPTION_FILE.exists():
-                with open(DESCRIPTION_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(DESCRIPTION_FILE):
+                return load_state(DESCRIPTION_FILE)
         except:
             pass
         return {
@@ -61,8 +65,7 @@ class AIDescriptionGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(DESCRIPTION_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(DESCRIPTION_FILE, self.data)
     
     def generate_description(self, title: str, topic: str, category: str,
                             hook: str = None, hashtags: List[str] = None,
@@ -14,12 +14,17 @@ Hashtag strategy:
 
 import os
 from src.ai.model_helper import get_dynamic_gemini_model
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -47,9 +52,8 @@ class AIHashtagGenerator:
     
     def _load(self) -> Dict:
         try:
-            if HASHTAG_FILE.exists():
-                with open(HASHTAG_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(HASHTAG_FILE):
+                return load_state(HASHTAG_FILE)
         except:
             pass
         return {
@@ -61,8 +65,7 @@ class AIHashtagGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(HASHTAG_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(HASHTAG_FILE, self.data)
     
     def generate_hashtags(self, topic: str, category: str, 
                          title: str = None, count: int = 5) -> List[str]:
@@ -19,12 +19,17 @@ This module:
 
 import os
 from src.ai.model_helper import get_dynamic_gemini_model
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -52,9 +57,8 @@ class AIHookGenerator:
     
     def _load(self) -> Dict:
         try:
-            if HOOK_PERFORMANCE_FILE.exists():
-                with open(HOOK_PERFORMANCE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(HOOK_PERFORMANCE_FILE):
+                return load_state(HOOK_PERFORMANCE_FILE)
         except:
             pass
         return {
@@ -67,8 +71,7 @@ class AIHookGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(HOOK_PERFORMANCE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(HOOK_PERFORMANCE_FILE, self.data)
     
     def generate_hook(self, topic: str, category: str, 
                      style: str = "auto") -> str:
@@ -293,9 +296,8 @@ Return ONLY the hook text (7-12 words max), no quotes, no explanation."""
         # 2. Load from variety_state.json (aggressive mode)
         try:
             variety_file = STATE_DIR / "variety_state.json"
-            if variety_file.exists():
-                with open(variety_file, 'r') as f:
-                    variety = json.load(f)
+            if state_exists(variety_file):
+                variety = load_state(variety_file)
                 
                 result["source"] = "variety_state"
                 
@@ -321,9 +323,8 @@ Return ONLY the hook text (7-12 words max), no quotes, no explanation."""
         # 3. Load from viral_patterns.json (virality research)
         try:
             viral_file = STATE_DIR / "viral_patterns.json"
-            if viral_file.exists():
-                with open(viral_file, 'r') as f:
-                    viral = json.load(f)
+            if state_exists(viral_file):
+                viral = load_state(viral_file)
                 
                 if not result["hook_templates"]:
                     result["hook_templates"] = viral.get("hook_patterns", [])
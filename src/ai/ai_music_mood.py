@@ -22,6 +22,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -49,9 +55,8 @@ class AIMusicMoodSelector:
     
     def _load(self) -> Dict:
         try:
-            if MUSIC_MOOD_FILE.exists():
-                with open(MUSIC_MOOD_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(MUSIC_MOOD_FILE):
+                return load_state(MUSIC_MOOD_FILE)
         except:
             pass
         return {
@@ -63,8 +68,7 @@ class AIMusicMoodSelector:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(MUSIC_MOOD_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(MUSIC_MOOD_FILE, self.data)
     
     def select_mood(self, topic: str, category: str, 
                    content_type: str = "educational") -> Tuple[str, str]:
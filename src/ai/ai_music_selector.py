@@ -21,6 +21,12 @@ from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Dynamic model selection
 try:
     from src.quota.quota_optimizer import get_gemini_model_for_rest_api
@@ -64,10 +70,9 @@ class AIMusicSelector:
     def _load_track_history(self) -> List[str]:
         """Load recently used tracks to avoid repetition."""
         try:
-            if TRACK_HISTORY_FILE.exists():
-                with open(TRACK_HISTORY_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get('recent_tracks', [])[-20:]  # Keep last 20
+            if state_exists(TRACK_HISTORY_FILE):
+                data = load_state(TRACK_HISTORY_FILE)
+                return data.get('recent_tracks', [])[-20:]  # Keep last 20
         except:
             pass
         return []
@@ -77,8 +82,7 @@ class AIMusicSelector:
         self.track_history.append(track_id)
         self.track_history = self.track_history[-20:]  # Keep last 20
         try:
-            with open(TRACK_HISTORY_FILE, 'w') as f:
-                json.dump({'recent_tracks': self.track_history}, f)
+            save_state(TRACK_HISTORY_FILE, {'recent_tracks': self.track_history})
         except:
             pass
     
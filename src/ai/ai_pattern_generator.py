@@ -16,6 +16,12 @@ NO HARDCODED PATTERNS - Everything comes from AI!
 import os
 import json
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Try both import styles for compatibility
 try:
     from model_helper import get_dynamic_gemini_model
@@ -63,9 +69,8 @@ class AIPatternGenerator:
     def _load_patterns(self) -> Dict:
         """Load existing patterns from file."""
         try:
-            if PATTERNS_FILE.exists():
-                with open(PATTERNS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(PATTERNS_FILE):
+                return load_state(PATTERNS_FILE)
         except:
             pass
         return self._get_minimal_fallback()
@@ -89,8 +94,7 @@ class AIPatternGenerator:
     def _save_patterns(self, patterns: Dict):
         """Save patterns to file."""
         patterns["last_saved"] = datetime.now().isoformat()
-        with open(PATTERNS_FILE, 'w') as f:
-            json.dump(patterns, f, indent=2)
+        save_state(PATTERNS_FILE, patterns)
         self.patterns = patterns
     
     def needs_refresh(self) -> bool:
@@ -13,6 +13,12 @@ Key factors for high-CTR thumbnails:
 """
 
 import os
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
 try:
     from model_helper import get_dynamic_gemini_model
 except ImportError:
@@ -70,9 +76,8 @@ class AIThumbnailTextOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if THUMBNAIL_FILE.exists():
-                with open(THUMBNAIL_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(THUMBNAIL_FILE):
+                return load_state(THUMBNAIL_FILE)
         except:
             pass
         return {
@@ -84,8 +89,7 @@ class AIThumbnailTextOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(THUMBNAIL_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(THUMBNAIL_FILE, self.data)
     
     def generate_thumbnail_text(self, title: str, topic: str, 
                                category: str) -> Dict:
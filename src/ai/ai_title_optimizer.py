@@ -14,6 +14,12 @@ This uses AI to generate and optimize titles based on performance data.
 """
 
 import os
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
 try:
     from model_helper import get_dynamic_gemini_model
 except ImportError:
@@ -21,12 +27,26 @@ except ImportError:
         from src.ai.model_helper import get_dynamic_gemini_model
     except ImportError:
         def get_dynamic_gemini_model(): return "gemini-2.5-flash"
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: Several titles from one AI call, best picked locally
+try:
+    from candidate_tournament import (
+        get_candidate_tournament, candidates_instruction, parse_candidates, TOURNAMENT_SIZE
+    )
+    CANDIDATE_TOURNAMENT_AVAILABLE = True
+except ImportError:
+    try:
+        from src.ai.candidate_tournament import (
+            get_candidate_tournament, candidates_instruction, parse_candidates, TOURNAMENT_SIZE
+        )
+        CANDIDATE_TOURNAMENT_AVAILABLE = True
+    except ImportError:
+        CANDIDATE_TOURNAMENT_AVAILABLE = False
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -54,9 +74,8 @@ class AITitleOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if TITLE_PERFORMANCE_FILE.exists():
-                with open(TITLE_PERFORMANCE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(TITLE_PERFORMANCE_FILE):
+                return load_state(TITLE_PERFORMANCE_FILE)
         except:
             pass
         return {
@@ -68,8 +87,7 @@ class AITitleOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(TITLE_PERFORMANCE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(TITLE_PERFORMANCE_FILE, self.data)
     
     def optimize_title(self, topic: str, category: str,
                       existing_title: str = None) -> str:
@@ -162,9 +180,26 @@ PROVEN PATTERNS:
 - "[number] Signs You [state]"
 - "I Tested [thing] for [time]"
 - "The Truth About [topic]"
+"""
 
-Return ONLY the title text, no quotes, no explanation."""
-
+        # v18.7: Ask for several titles at once and let the tournament pick
+        if CANDIDATE_TOURNAMENT_AVAILABLE and TOURNAMENT_SIZE > 1:
+            prompt += "\n" + candidates_instruction(TOURNAMENT_SIZE, '{"title": "the title"}')
+            result = self._call_ai(prompt, max_tokens=30 * TOURNAMENT_SIZE + 40)
+            if not result:
+                return None
+            titles = [self._clean_title(str(c.get("title", "") if isinstance(c, dict) else c))
+                      for c in parse_candidates(result)]
+            titles = [t for t in titles if t]
+            if not titles:
+                # Not JSON after all - treat the answer as a single title
+                return self._clean_title(result.split("\n")[0])
+            outcome = get_candidate_tournament().select(
+                "title", titles, text=str,
+                fields=lambda t: {"title": t, "topic": topic, "category": category})
+            return outcome["winner"] or titles[0]
+        
+        prompt += "\nReturn ONLY the title text, no quotes, no explanation."
         result = self._call_ai(prompt)
         
         if result:
@@ -172,7 +207,7 @@ Return ONLY the title text, no quotes, no explanation."""
         
         return None
     
-    def _call_ai(self, prompt: str) -> Optional[str]:
+    def _call_ai(self, prompt: str, max_tokens: int = 50) -> Optional[str]:
         """Call AI."""
         # Try Gemini (better for creative tasks)
         if self.gemini_key:
@@ -203,7 +238,7 @@ Return ONLY the title text, no quotes, no explanation."""
                 response = client.chat.completions.create(
                     model=model,
                     messages=[{"role": "user", "content": prompt}],
-                    max_tokens=50,
+                    max_tokens=max_tokens,
                     temperature=0.8
                 )
                 return response.choices[0].message.content.strip()
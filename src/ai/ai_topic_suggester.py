@@ -13,6 +13,12 @@ NO HARDCODED TOPICS - Everything is AI-generated!
 """
 
 import os
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
 try:
     from model_helper import get_dynamic_gemini_model
 except ImportError:
@@ -53,9 +59,8 @@ class AITopicSuggester:
     
     def _load(self) -> Dict:
         try:
-            if TOPIC_SUGGESTIONS_FILE.exists():
-                with open(TOPIC_SUGGESTIONS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(TOPIC_SUGGESTIONS_FILE):
+                return load_state(TOPIC_SUGGESTIONS_FILE)
         except:
             pass
         return {
@@ -66,8 +71,7 @@ class AITopicSuggester:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(TOPIC_SUGGESTIONS_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(TOPIC_SUGGESTIONS_FILE, self.data)
     
     def get_suggestions(self, count: int = 5, 
                        category: str = None,
@@ -111,9 +115,8 @@ class AITopicSuggester:
         # 1. Load variety_state (primary learning storage from aggressive mode)
         try:
             variety_file = STATE_DIR / "variety_state.json"
-            if variety_file.exists():
-                with open(variety_file, 'r') as f:
-                    variety = json.load(f)
+            if state_exists(variety_file):
+                variety = load_state(variety_file)
                 
                 # v18.6: Read from CORRECT paths (what aggressive mode saves)
                 # Learned category weights
@@ -149,9 +152,8 @@ class AITopicSuggester:
         # 2. Load self_learning.json (hook patterns with success data)
         try:
             learning_file = STATE_DIR / "self_learning.json"
-            if learning_file.exists():
-                with open(learning_file, 'r') as f:
-                    learning = json.load(f)
+            if state_exists(learning_file):
+                learning = load_state(learning_file)
                 
                 # Get hook patterns sorted by success
                 patterns = learning.get("patterns", {})
@@ -169,9 +171,8 @@ class AITopicSuggester:
         # 3. Load viral_patterns.json (general viral patterns)
         try:
             viral_file = STATE_DIR / "viral_patterns.json"
-            if viral_file.exists():
-                with open(viral_file, 'r') as f:
-                    viral = json.load(f)
+            if state_exists(viral_file):
+                viral = load_state(viral_file)
                 
                 insights["title_patterns"] = viral.get("title_patterns", [])[:5]
                 insights["hook_patterns"] = viral.get("hook_patterns", [])[:5]
@@ -7,6 +7,12 @@ Analyzes trends using AI to identify content opportunities.
 """
 
 import os
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
 try:
     from model_helper import get_dynamic_gemini_model
 except ImportError:
@@ -44,9 +50,8 @@ class AITrendAnalyzer:
     
     def _load(self) -> Dict:
         try:
-            if TREND_FILE.exists():
-                with open(TREND_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(TREND_FILE):
+                return load_state(TREND_FILE)
         except:
             pass
         return {
@@ -58,8 +63,7 @@ class AITrendAnalyzer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(TREND_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(TREND_FILE, self.data)
     
     def analyze_trend(self, topic: str, category: str = "general") -> Dict:
         """
@@ -8,12 +8,17 @@ Ensures natural pacing, emphasis, and timing.
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     try:
@@ -65,9 +70,8 @@ class AIVoiceScriptOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if VOICE_FILE.exists():
-                with open(VOICE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(VOICE_FILE):
+                return load_state(VOICE_FILE)
         except:
             pass
         return {
@@ -78,8 +82,7 @@ class AIVoiceScriptOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(VOICE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(VOICE_FILE, self.data)
     
     def optimize_script(self, content: Dict) -> Dict:
         """
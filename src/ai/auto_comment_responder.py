@@ -20,12 +20,17 @@ Why this matters:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     from src.ai.smart_ai_caller import smart_call_ai
 except ImportError:
@@ -120,9 +125,8 @@ class AutoCommentResponder:
     
     def _load(self) -> Dict:
         try:
-            if RESPONSES_FILE.exists():
-                with open(RESPONSES_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(RESPONSES_FILE):
+                return load_state(RESPONSES_FILE)
         except:
             pass
         return {
@@ -133,8 +137,7 @@ class AutoCommentResponder:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(RESPONSES_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(RESPONSES_FILE, self.data)
     
     def generate_response(self, comment: str, video_topic: str = None,
                           commenter_name: str = None) -> Dict:
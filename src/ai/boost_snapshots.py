@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Prompt Boost Snapshots v18.7
+===================================================
+
+Learned prompt additions, built once per state version.
+
+Every stage prompt used to rebuild its boosters from scratch:
+get_viral_prompt_boost() constructed a new ViralChannelAnalyzer (which could
+call the AI when saved patterns were stale) and re-read the variety state,
+and learning_engine.get_prompt_boost() / get_quality_boost_prompt() were
+re-formatted from their JSON data for every prompt.
+
+Each snapshot is keyed on the state_version() of the files it is derived
+from. A run builds each boost once and hands out the same string until one
+of those files is saved again (e.g. after record_result()).
+
+Snapshots never call the AI - stale viral patterns are regenerated by the
+refresh-ai-patterns workflow (scripts/refresh_ai_patterns.py), not during
+generation. Random pattern samples are drawn once per snapshot.
+
+Usage:
+    snapshots = get_boost_snapshots()
+    viral_boost = snapshots.viral()
+    learning_boost = snapshots.learning(self.learning_engine)
+"""
+
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# v18.7: State versions come from the shared SQLite state store
+try:
+    from state_store import state_version
+except ImportError:
+    from src.utils.state_store import state_version
+
+
+def safe_print(msg: str):
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+
+# Files each boost is derived from - a save to any of them rebuilds it
+SOURCES = {
+    "viral": (STATE_DIR / "variety_state.json", STATE_DIR / "viral_patterns.json"),
+    "learning": (STATE_DIR / "self_learning.json",),
+    "first_attempt": (STATE_DIR / "quality_history.json",),
+    "techniques": (),  # Static text
+}
+
+
+class BoostSnapshots:
+    """
+    Cached prompt boosts, rebuilt only when their source state changes.
+
+    version(path) gives each source's change marker (state_version).
+    """
+
+    def __init__(self, version: Callable[[Path], int] = state_version):
+        self.version = version
+        self._snapshots: Dict[str, Tuple[tuple, str]] = {}
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, name: str, build: Callable[[], str],
+            sources: Optional[Iterable[Path]] = None) -> str:
+        """
+        Snapshot `name`, calling build() only if its sources changed.
+
+        sources defaults to SOURCES[name]; errors from build() propagate
+        and leave the previous snapshot in place.
+        """
+        if sources is None:
+            sources = SOURCES.get(name, ())
+        key = tuple(self.version(path) for path in sources)
+        cached = self._snapshots.get(name)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+        text = build() or ""
+        self._snapshots[name] = (key, text)
+        self.builds += 1
+        return text
+
+    def invalidate(self, name: str = None):
+        """Drop one snapshot (or all) so the next get() rebuilds it."""
+        if name is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(name, None)
+
+    # =========================================================================
+    # BOOSTS
+    # =========================================================================
+
+    def viral(self) -> str:
+        """get_viral_prompt_boost() from saved patterns - never calls the AI."""
+        return self.get("viral", _viral_prompt_boost)
+
+    def learning(self, engine) -> str:
+        """SelfLearningEngine.get_prompt_boost()."""
+        return self.get("learning", engine.get_prompt_boost)
+
+    def first_attempt(self, maximizer) -> str:
+        """FirstAttemptMaximizer.get_quality_boost_prompt()."""
+        return self.get("first_attempt", maximizer.get_quality_boost_prompt,
+                        (maximizer.HISTORY_FILE,))
+
+    def techniques(self) -> str:
+        """VIRAL_MASTERY_GUIDE.get_viral_techniques_for_prompt()."""
+        return self.get("techniques", _viral_techniques)
+
+    def get_stats(self) -> Dict:
+        return {
+            "snapshots": sorted(self._snapshots),
+            "builds": self.builds,
+            "hits": self.hits,
+        }
+
+
+def _viral_prompt_boost() -> str:
+    try:
+        from viral_channel_analyzer import get_viral_prompt_boost
+    except ImportError:
+        from src.analytics.viral_channel_analyzer import get_viral_prompt_boost
+    return get_viral_prompt_boost(refresh=False)
+
+
+def _viral_techniques() -> str:
+    try:
+        from VIRAL_MASTERY_GUIDE import get_viral_techniques_for_prompt
+    except ImportError:
+        from src.analytics.VIRAL_MASTERY_GUIDE import get_viral_techniques_for_prompt
+    return get_viral_techniques_for_prompt()
+
+
+# Singleton
+_snapshots = None
+
+
+def get_boost_snapshots() -> BoostSnapshots:
+    """Get the global BoostSnapshots instance."""
+    global _snapshots
+    if _snapshots is None:
+        _snapshots = BoostSnapshots()
+    return _snapshots
+
+
+if __name__ == "__main__":
+    import time
+
+    safe_print("Testing Boost Snapshots...")
+    snapshots = get_boost_snapshots()
+
+    start = time.time()
+    first = snapshots.viral()
+    built_ms = (time.time() - start) * 1000
+
+    start = time.time()
+    for _ in range(100):
+        assert snapshots.viral() is first
+    cached_ms = (time.time() - start) * 1000 / 100
+
+    safe_print(f"Viral boost: {len(first)} chars, built in {built_ms:.1f}ms, "
+               f"cached get {cached_ms:.2f}ms")
+    safe_print(f"Stats: {snapshots.get_stats()}")
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Candidate Tournament v18.7
+=================================================
+
+One generation, many candidates, local selection.
+
+stage1_decide_video_concept produced one concept per AI call and the
+generator called it again whenever the duplicate check failed.
+TitleABTester made one AI call per title variant, and AITitleOptimizer
+one call for a single title. Every extra candidate cost another round trip.
+
+A tournament instead:
+1. Asks the AI ONCE for K candidates in a JSON array
+   (candidates_instruction / parse_candidates)
+2. Drops near-duplicates of recent topics and of each other - a Jaccard
+   similarity matrix over content words, all candidates at once
+3. Scores the survivors together: the trained performance model
+   (score_batch) and the local hook scorer
+4. Returns the winner plus the ranked runners-up, so a later rejection
+   falls back to the next candidate instead of another AI call
+
+Usage:
+    prompt += candidates_instruction(5, '{"title": "..."}')
+    candidates = parse_candidates(ai_response)
+    result = get_candidate_tournament().select("title", candidates,
+                                               text=lambda c: c["title"])
+    best = result["winner"]
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# Local scorers (both optional - without them the AI's order is kept)
+try:
+    from performance_model import get_performance_model, NUMPY_AVAILABLE as MODEL_NUMPY
+    PERFORMANCE_MODEL_AVAILABLE = MODEL_NUMPY
+except ImportError:
+    try:
+        from src.analytics.performance_model import get_performance_model, NUMPY_AVAILABLE as MODEL_NUMPY
+        PERFORMANCE_MODEL_AVAILABLE = MODEL_NUMPY
+    except ImportError:
+        PERFORMANCE_MODEL_AVAILABLE = False
+
+try:
+    from critical_fixes import score_hook_quality
+    HOOK_SCORER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.enhancements.critical_fixes import score_hook_quality
+        HOOK_SCORER_AVAILABLE = True
+    except ImportError:
+        HOOK_SCORER_AVAILABLE = False
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+TOURNAMENT_FILE = STATE_DIR / "candidate_tournament.json"
+
+# Candidates requested per generation call
+TOURNAMENT_SIZE = int(os.environ.get("TOURNAMENT_SIZE", "5"))
+
+# Content-word Jaccard at or above this = same idea
+DUPLICATE_SIMILARITY = 0.5
+
+# Share of the model in the combined score when it is trained
+MODEL_WEIGHT = 0.7
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "is",
+    "are", "was", "be", "this", "that", "it", "its", "your", "you", "how", "why",
+    "what", "about", "most", "people", "can", "will", "do", "does", "from", "at",
+}
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def content_words(text: str) -> set:
+    """Lower-cased words minus stopwords (a crude plural strip keeps 'habit'/'habits' equal)."""
+    words = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        if word not in _STOPWORDS:
+            words.add(word[:-1] if len(word) > 3 and word.endswith("s") else word)
+    return words
+
+
+def similarity_matrix(texts_a: List[str], texts_b: List[str]) -> List[List[float]]:
+    """
+    Jaccard similarity of every text in a against every text in b.
+
+    NumPy: one incidence matrix over the shared vocabulary and one matrix
+    product for all intersections.
+    """
+    sets_a = [content_words(t) for t in texts_a]
+    sets_b = [content_words(t) for t in texts_b]
+    if not sets_a or not sets_b:
+        return [[0.0] * len(sets_b) for _ in sets_a]
+    if not NUMPY_AVAILABLE:
+        return [[len(a & b) / len(a | b) if a | b else 0.0 for b in sets_b] for a in sets_a]
+
+    vocab = {w: i for i, w in enumerate(set().union(*sets_a, *sets_b))}
+    A = np.zeros((len(sets_a), len(vocab)))
+    B = np.zeros((len(sets_b), len(vocab)))
+    for row, words in enumerate(sets_a):
+        A[row, [vocab[w] for w in words]] = 1
+    for row, words in enumerate(sets_b):
+        B[row, [vocab[w] for w in words]] = 1
+    inter = A @ B.T
+    union = A.sum(axis=1)[:, None] + B.sum(axis=1)[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0).tolist()
+
+
+def candidates_instruction(k: int, item_schema: str) -> str:
+    """Prompt tail asking for k distinct candidates as one JSON array."""
+    return f"""=== OUTPUT: {k} CANDIDATES ===
+Give {k} DIFFERENT candidates - different angles, not rewordings of one idea.
+They are scored and the best one is used, so make every one a real contender.
+
+Return JSON only:
+{{"candidates": [
+    {item_schema},
+    ... ({k} items)
+]}}"""
+
+
+def parse_candidates(response: Any, key: str = "candidates") -> List:
+    """
+    Candidate list from an AI response: a list, {"candidates": [...]},
+    a single object (one candidate), or the raw text of any of those.
+    """
+    if isinstance(response, str):
+        text = response
+        if "```json" in text:
+            text = text.split("```json")[1].split("```")[0]
+        elif "```" in text:
+            text = text.split("```")[1].split("```")[0]
+        try:
+            response = json.loads(text.strip())
+        except (ValueError, TypeError):
+            match = re.search(r"\[.*\]", text, re.DOTALL)
+            try:
+                response = json.loads(match.group(0)) if match else None
+            except ValueError:
+                response = None
+    if isinstance(response, dict):
+        if isinstance(response.get(key), list):
+            return [c for c in response[key] if c]
+        return [response] if response else []
+    if isinstance(response, list):
+        return [c for c in response if c]
+    return []
+
+
+class CandidateTournament:
+    """Vectorised duplicate check + batch scoring over K generated candidates."""
+
+    def __init__(self):
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            if state_exists(TOURNAMENT_FILE):
+                return load_state(TOURNAMENT_FILE)
+        except Exception:
+            pass
+        return {"kinds": {}, "last_updated": None}
+
+    def _save(self):
+        self.data["last_updated"] = datetime.now().isoformat()
+        try:
+            save_state(TOURNAMENT_FILE, self.data)
+        except Exception as e:
+            safe_print(f"[TOURNAMENT] Save error: {e}")
+
+    # =========================================================================
+    # SCORING
+    # =========================================================================
+
+    @staticmethod
+    def score_all(candidates: List, texts: List[str],
+                  fields: Callable[[Any], Dict] = None) -> List[Dict]:
+        """Combined 0-100 score and its components for every candidate."""
+        components = [{} for _ in candidates]
+
+        if PERFORMANCE_MODEL_AVAILABLE:
+            try:
+                model = get_performance_model()
+                predictions = model.score_batch([fields(c) if fields else t
+                                                 for c, t in zip(candidates, texts)])
+                if predictions is not None:
+                    for parts, pct in zip(components, model.to_percent(predictions)):
+                        parts["model"] = pct
+            except Exception as e:
+                safe_print(f"   [TOURNAMENT] Model scoring skipped: {e}")
+
+        if HOOK_SCORER_AVAILABLE:
+            for parts, text in zip(components, texts):
+                parts["hook"] = score_hook_quality(text).get("score", 0) * 10
+
+        scores = []
+        for parts in components:
+            if "model" in parts and "hook" in parts:
+                score = MODEL_WEIGHT * parts["model"] + (1 - MODEL_WEIGHT) * parts["hook"]
+            else:
+                score = parts.get("model", parts.get("hook", 50.0))
+            scores.append({"score": round(score, 1), "components": parts})
+        return scores
+
+    # =========================================================================
+    # SELECTION
+    # =========================================================================
+
+    def select(self, kind: str, candidates: List, text: Callable[[Any], str] = str,
+               fields: Callable[[Any], Dict] = None, recent: List[str] = None,
+               allowed: Callable[[Any], bool] = None) -> Dict:
+        """
+        Pick the best candidate.
+
+        Args:
+            kind: "concept", "title", ... (stats are kept per kind)
+            candidates: As parsed from the AI response
+            text: Candidate -> the text compared for duplicates and hook-scored
+            fields: Candidate -> performance model fields (title/hook/topic/category)
+            recent: Recently used topics/titles; near-copies are dropped
+            allowed: Optional filter (e.g. excluded categories) - candidates
+                     failing it rank after every allowed one
+
+        Returns:
+            {"winner": candidate or None, "ranked": [{candidate, score, components}],
+             "duplicates": [{candidate, similar_to, similarity}]}
+        """
+        candidates = [c for c in candidates if text(c)]
+        texts = [text(c) for c in candidates]
+        recent = [r for r in (recent or []) if r]
+        duplicates = []
+
+        # Near-copies of recent content
+        keep = list(range(len(candidates)))
+        if recent and candidates:
+            to_recent = similarity_matrix(texts, recent)
+            keep = []
+            for i, row in enumerate(to_recent):
+                j = max(range(len(row)), key=row.__getitem__)
+                if row[j] >= DUPLICATE_SIMILARITY:
+                    duplicates.append({"candidate": candidates[i], "similar_to": recent[j],
+                                       "similarity": round(row[j], 2)})
+                else:
+                    keep.append(i)
+
+        scored = self.score_all([candidates[i] for i in keep], [texts[i] for i in keep], fields)
+        order = sorted(range(len(keep)), key=lambda n: (
+            0 if allowed is None or allowed(candidates[keep[n]]) else 1, -scored[n]["score"]))
+
+        # Near-copies of a better candidate
+        pairwise = similarity_matrix([texts[i] for i in keep], [texts[i] for i in keep])
+        ranked, kept = [], []
+        for n in order:
+            twin = next((m for m in kept if pairwise[n][m] >= DUPLICATE_SIMILARITY), None)
+            if twin is not None:
+                duplicates.append({"candidate": candidates[keep[n]], "similar_to": texts[keep[twin]],
+                                   "similarity": round(pairwise[n][twin], 2)})
+                continue
+            kept.append(n)
+            ranked.append({"candidate": candidates[keep[n]], **scored[n]})
+
+        self._record(kind, len(candidates), len(duplicates), ranked)
+        return {"winner": ranked[0]["candidate"] if ranked else None,
+                "ranked": ranked, "duplicates": duplicates}
+
+    def _record(self, kind: str, generated: int, duplicates: int, ranked: List[Dict]):
+        stats = self.data["kinds"].setdefault(kind, {
+            "runs": 0, "candidates": 0, "duplicates_dropped": 0,
+            "empty_runs": 0, "avg_winner_score": 0.0,
+        })
+        stats["runs"] += 1
+        stats["candidates"] += generated
+        stats["duplicates_dropped"] += duplicates
+        if ranked:
+            winners = stats["runs"] - stats["empty_runs"]
+            stats["avg_winner_score"] += (ranked[0]["score"] - stats["avg_winner_score"]) / winners
+        else:
+            stats["empty_runs"] += 1
+        self._save()
+
+    def get_stats(self) -> Dict:
+        return self.data.get("kinds", {})
+
+
+# Singleton
+_tournament = None
+
+
+def get_candidate_tournament() -> CandidateTournament:
+    """Get the shared CandidateTournament instance."""
+    global _tournament
+    if _tournament is None:
+        _tournament = CandidateTournament()
+    return _tournament
+
+
+if __name__ == "__main__":
+    safe_print("Testing Candidate Tournament...")
+    response = """```json
+{"candidates": [
+    {"category": "psychology", "specific_topic": "Why your brain remembers embarrassing moments"},
+    {"category": "psychology", "specific_topic": "Why the brain remembers embarrassing moments"},
+    {"category": "money", "specific_topic": "The 3 savings habits banks hope you skip"},
+    {"category": "health", "specific_topic": "Sleep debt you cannot repay on weekends"}
+]}
+```"""
+    tournament = CandidateTournament()
+    result = tournament.select(
+        "concept_demo", parse_candidates(response),
+        text=lambda c: c["specific_topic"],
+        fields=lambda c: {"topic": c["specific_topic"], "category": c["category"]},
+        recent=["Weekend sleep cannot repay sleep debt"])
+    for entry in result["ranked"]:
+        safe_print(f"  {entry['score']:5.1f}  {entry['candidate']['specific_topic']}")
+    for dup in result["duplicates"]:
+        safe_print(f"  [dup {dup['similarity']}] {dup['candidate']['specific_topic']} ~ {dup['similar_to']}")
@@ -21,6 +21,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     import requests
 except ImportError:
@@ -61,9 +67,8 @@ class EnhancedBRollSelector:
     
     def _load_learning(self) -> Dict:
         try:
-            if BROLL_LEARNING_FILE.exists():
-                with open(BROLL_LEARNING_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(BROLL_LEARNING_FILE):
+                return load_state(BROLL_LEARNING_FILE)
         except:
             pass
         return {
@@ -74,8 +79,7 @@ class EnhancedBRollSelector:
     
     def _save_learning(self):
         self.learning["last_updated"] = datetime.now().isoformat()
-        with open(BROLL_LEARNING_FILE, 'w') as f:
-            json.dump(self.learning, f, indent=2)
+        save_state(BROLL_LEARNING_FILE, self.learning)
     
     def get_ai_keywords(self, content: str, category: str, mood: str) -> List[str]:
         """Ask AI to generate optimal B-roll search keywords."""
@@ -21,6 +21,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     import requests
 except ImportError:
@@ -71,19 +77,17 @@ class EnhancedMusicSelector:
     
     def _load_learning(self) -> Dict:
         try:
-            if MUSIC_LEARNING_FILE.exists():
-                with open(MUSIC_LEARNING_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(MUSIC_LEARNING_FILE):
+                return load_state(MUSIC_LEARNING_FILE)
         except:
             pass
         return {"track_performance": {}, "category_preferences": {}}
     
     def _load_history(self) -> List[str]:
         try:
-            if TRACK_HISTORY_FILE.exists():
-                with open(TRACK_HISTORY_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get("recent_tracks", [])[-30:]
+            if state_exists(TRACK_HISTORY_FILE):
+                data = load_state(TRACK_HISTORY_FILE)
+                return data.get("recent_tracks", [])[-30:]
         except:
             pass
         return []
@@ -92,8 +96,7 @@ class EnhancedMusicSelector:
         self.track_history.append(track_id)
         self.track_history = self.track_history[-30:]
         try:
-            with open(TRACK_HISTORY_FILE, 'w') as f:
-                json.dump({"recent_tracks": self.track_history}, f)
+            save_state(TRACK_HISTORY_FILE, {"recent_tracks": self.track_history})
         except:
             pass
     
@@ -20,6 +20,12 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     import requests
 except ImportError:
@@ -53,9 +59,8 @@ class EnhancedTopicSelector:
     
     def _load_learning(self) -> Dict:
         try:
-            if TOPIC_LEARNING_FILE.exists():
-                with open(TOPIC_LEARNING_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(TOPIC_LEARNING_FILE):
+                return load_state(TOPIC_LEARNING_FILE)
         except:
             pass
         return {
@@ -68,14 +73,12 @@ class EnhancedTopicSelector:
     
     def _save_learning(self):
         self.learning["last_updated"] = datetime.now().isoformat()
-        with open(TOPIC_LEARNING_FILE, 'w') as f:
-            json.dump(self.learning, f, indent=2)
+        save_state(TOPIC_LEARNING_FILE, self.learning)
     
     def _load_variety(self) -> Dict:
         try:
-            if VARIETY_STATE_FILE.exists():
-                with open(VARIETY_STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(VARIETY_STATE_FILE):
+                return load_state(VARIETY_STATE_FILE)
         except:
             pass
         return {"recent_topics": [], "recent_categories": []}
@@ -20,12 +20,17 @@ Research shows:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     from src.ai.smart_ai_caller import smart_call_ai
 except ImportError:
@@ -129,9 +134,8 @@ class FirstSecondsOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if HOOKS_FILE.exists():
-                with open(HOOKS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(HOOKS_FILE):
+                return load_state(HOOKS_FILE)
         except:
             pass
         return {
@@ -143,8 +147,7 @@ class FirstSecondsOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(HOOKS_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(HOOKS_FILE, self.data)
     
     def generate_opening(self, topic: str, category: str, 
                          target_emotion: str = "curiosity") -> Dict:
@@ -14,7 +14,6 @@ Features:
 """
 
 import os
-import json
 import re
 import requests
 from datetime import datetime
@@ -22,6 +21,12 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from xml.etree import ElementTree
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -74,9 +79,8 @@ class GoogleTrendsFetcher:
     def _load_cache(self) -> Dict:
         """Load cached trends."""
         try:
-            if TRENDS_CACHE_FILE.exists():
-                with open(TRENDS_CACHE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(TRENDS_CACHE_FILE):
+                return load_state(TRENDS_CACHE_FILE)
         except Exception as e:
             safe_print(f"[TRENDS] Cache load error: {e}")
         return {"trends": [], "last_fetched": None}
@@ -85,8 +89,7 @@ class GoogleTrendsFetcher:
         """Save trends to cache."""
         self.cache["last_fetched"] = datetime.now().isoformat()
         try:
-            with open(TRENDS_CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            save_state(TRENDS_CACHE_FILE, self.cache)
         except Exception as e:
             safe_print(f"[TRENDS] Cache save error: {e}")
     
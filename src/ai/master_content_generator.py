@@ -31,6 +31,16 @@ except ImportError:
         SMART_CALLER_AVAILABLE = False
         smart_call_ai = None
 
+# v18.7: Template fingerprinting (cache key ignores volatile variables)
+try:
+    from src.ai.prompts_registry import render_prompt
+except ImportError:
+    try:
+        from prompts_registry import render_prompt
+    except ImportError:
+        def render_prompt(template_id, template, **variables):
+            return template.format(**variables)
+
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -224,7 +234,8 @@ class MasterContentGenerator:
                          duration: int, phrase_count: int, 
                          feedback: str) -> Optional[Dict]:
         """Call AI to generate content."""
-        prompt = MASTER_GENERATION_PROMPT.format(
+        prompt = render_prompt(
+            "MASTER_GENERATION_PROMPT", MASTER_GENERATION_PROMPT,
             topic=topic,
             category=category,
             duration=duration,
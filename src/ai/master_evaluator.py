@@ -19,6 +19,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # v17.9.36: Import centralized rate-limited AI caller
 try:
     from src.ai.smart_ai_caller import smart_call_ai
@@ -31,6 +37,27 @@ except ImportError:
         SMART_CALLER_AVAILABLE = False
         smart_call_ai = None
 
+# v18.7: Template fingerprinting (cache key ignores volatile variables)
+try:
+    from src.ai.prompts_registry import render_prompt
+except ImportError:
+    try:
+        from prompts_registry import render_prompt
+    except ImportError:
+        def render_prompt(template_id, template, **variables):
+            return template.format(**variables)
+
+# v18.7: Tiered evaluation cascade (local scorers before the AI call)
+try:
+    from src.core.evaluation_cascade import get_evaluation_cascade
+    CASCADE_AVAILABLE = True
+except ImportError:
+    try:
+        from evaluation_cascade import get_evaluation_cascade
+        CASCADE_AVAILABLE = True
+    except ImportError:
+        CASCADE_AVAILABLE = False
+
 # State directory
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -215,9 +242,8 @@ class MasterEvaluator:
         """Load evaluation history."""
         history_file = STATE_DIR / "master_history.json"
         try:
-            if history_file.exists():
-                with open(history_file, 'r') as f:
-                    return json.load(f)
+            if state_exists(history_file):
+                return load_state(history_file)
         except:
             pass
         return {"evaluations": [], "avg_score": 0, "best_score": 0}
@@ -237,8 +263,7 @@ class MasterEvaluator:
         self.history["best_score"] = max(scores) if scores else 0
         
         history_file = STATE_DIR / "master_history.json"
-        with open(history_file, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        save_state(history_file, self.history)
     
     def _check_ai(self) -> bool:
         """Check if AI is available."""
@@ -248,12 +273,14 @@ class MasterEvaluator:
             os.environ.get("OPENROUTER_API_KEY")
         ])
     
-    def evaluate(self, content: Dict) -> Dict:
+    def evaluate(self, content: Dict, use_cascade: bool = True) -> Dict:
         """
         Perform master evaluation of content.
         
         Args:
             content: Dict with hook, phrases, cta, topic, category
+            use_cascade: v18.7 - let confident local scores skip the AI call.
+                         Pass False when the caller already ran the cascade.
         
         Returns:
             Comprehensive evaluation with scores and improvements
@@ -267,6 +294,17 @@ class MasterEvaluator:
         # Phase 1: Hardcoded checks (instant, no AI needed)
         hardcoded_result = self._hardcoded_checks(hook, phrases, cta)
         
+        # v18.7: Phase 1.5: Local scorer cascade - skip AI when confident
+        if use_cascade and self.ai_available and CASCADE_AVAILABLE:
+            try:
+                outcome = get_evaluation_cascade().evaluate("master", content)
+                if outcome["decision"] != "ai":
+                    result = self._local_result(hardcoded_result, outcome)
+                    self._save_history(result)
+                    return result
+            except Exception as e:
+                safe_print(f"[!] Evaluation cascade failed: {e}")
+        
         # Phase 2: AI evaluation (if available)
         if self.ai_available:
             ai_result = self._ai_evaluation(hook, phrases, cta, topic, category)
@@ -348,7 +386,8 @@ class MasterEvaluator:
         """Get AI evaluation using the master prompt."""
         try:
             # Build the prompt
-            prompt = MASTER_EVALUATION_PROMPT.format(
+            prompt = render_prompt(
+                "MASTER_EVALUATION_PROMPT", MASTER_EVALUATION_PROMPT,
                 hook=hook,
                 phrases="\n".join([f"- {p}" for p in phrases]),
                 cta=cta,
@@ -505,6 +544,29 @@ class MasterEvaluator:
             "checks_total": hardcoded.get("checks_total", 7)
         }
     
+    def _local_result(self, hardcoded: Dict, outcome: Dict) -> Dict:
+        """v18.7: Build an evaluation from a confident local cascade decision."""
+        local_ten = get_evaluation_cascade().to_ten(outcome["local_score"])
+        final_score = min(local_ten, hardcoded.get("score_cap", 10))
+        recommendations = outcome["local"]["details"].get("virality", {}).get("recommendations", [])
+        
+        return {
+            "final_score": round(final_score, 1),
+            "local_score": outcome["local_score"],
+            "hardcoded_cap": hardcoded.get("score_cap", 10),
+            "scores": {},
+            "missing_requirements": hardcoded.get("missing_requirements", []),
+            "would_go_viral": outcome["decision"] == "accept",
+            "strongest_element": "Unknown",
+            "weakest_element": "Unknown",
+            "specific_improvements": recommendations[:3],
+            "rewritten_hook": "",
+            "verdict": self._get_verdict(final_score),
+            "checks_passed": hardcoded.get("checks_passed", 0),
+            "checks_total": hardcoded.get("checks_total", 7),
+            "evaluation_tier": outcome["tier"]
+        }
+    
     def _get_verdict(self, score: float) -> str:
         """Get verdict based on score."""
         if score >= 9:
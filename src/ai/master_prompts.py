@@ -38,6 +38,16 @@ except ImportError:
     def get_best_groq_model(api_key=None):
         return "llama-3.3-70b-versatile"
 
+# v18.7: Template fingerprinting (cache key ignores volatile variables)
+try:
+    from src.ai.prompts_registry import render_prompt
+except ImportError:
+    try:
+        from prompts_registry import render_prompt
+    except ImportError:
+        def render_prompt(template_id, template, **variables):
+            return template.format(**variables)
+
 # Gemini as fallback for when Groq fails
 try:
     import google.generativeai as genai
@@ -1662,7 +1672,8 @@ class MasterContentGenerator:
         # Let AI figure out what's trending - NO HARDCODED LIST
         trending = "USE YOUR KNOWLEDGE to determine what topics are currently trending and relevant"
         
-        prompt = VIRAL_TOPIC_PROMPT.format(
+        prompt = render_prompt(
+            "VIRAL_TOPIC_PROMPT", VIRAL_TOPIC_PROMPT,
             date=now.strftime("%B %d, %Y"),
             day_of_week=now.strftime("%A"),
             season=season,
@@ -1728,13 +1739,15 @@ Only return valid JSON."""
     
     def generate_broll_keywords(self, content: str, mood: str) -> Dict:
         """Generate specific B-roll keywords."""
-        prompt = BROLL_KEYWORDS_PROMPT.format(content=content, mood=mood)
+        prompt = render_prompt("BROLL_KEYWORDS_PROMPT", BROLL_KEYWORDS_PROMPT,
+                               content=content, mood=mood)
         result = self._call_ai(prompt, max_tokens=500)
         return self._parse_json(result) or {}
     
     def evaluate_content(self, hook: str, content: str, video_type: str) -> Dict:
         """Evaluate content quality."""
-        prompt = CONTENT_EVALUATION_PROMPT.format(
+        prompt = render_prompt(
+            "CONTENT_EVALUATION_PROMPT", CONTENT_EVALUATION_PROMPT,
             hook=hook, content=content, video_type=video_type
         )
         result = self._call_ai(prompt, max_tokens=800)
@@ -1742,7 +1755,7 @@ Only return valid JSON."""
     
     def generate_voiceover(self, content: str) -> Dict:
         """Generate optimized voiceover script."""
-        prompt = VOICEOVER_PROMPT.format(content=content)
+        prompt = render_prompt("VOICEOVER_PROMPT", VOICEOVER_PROMPT, content=content)
         result = self._call_ai(prompt, max_tokens=500)
         data = self._parse_json(result) or {}
         
@@ -17,11 +17,27 @@ All filtering based on real-time API data.
 """
 
 import os
-import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared stale-while-revalidate snapshot for model discovery
+try:
+    from discovery_cache import get_discovery_cache
+    DISCOVERY_CACHE_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.discovery_cache import get_discovery_cache
+        DISCOVERY_CACHE_AVAILABLE = True
+    except ImportError:
+        DISCOVERY_CACHE_AVAILABLE = False
+
 # Cache directory
 CACHE_DIR = Path("cache/models")
 EMERGENCY_CACHE_DIR = Path("data/persistent/model_cache")  # Persists across runs
@@ -288,17 +304,16 @@ def get_cached_model_categories(provider: str, force_refresh: bool = False) -> O
     """
     cache_file = EMERGENCY_CACHE_DIR / f"{provider}_categories.json"
     
-    if not force_refresh and cache_file.exists():
+    if not force_refresh and state_exists(cache_file):
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                cached_time = datetime.fromisoformat(data.get("cached_at", "2000-01-01"))
-                age_hours = (datetime.now() - cached_time).total_seconds() / 3600
-                
-                # Categories valid for 24 hours (quotas don't change often)
-                if age_hours < 24:
-                    _safe_print(f"[MODEL] Using cached categories for {provider} (age: {age_hours:.1f}h)")
-                    return data.get("categories")
+            data = load_state(cache_file)
+            cached_time = datetime.fromisoformat(data.get("cached_at", "2000-01-01"))
+            age_hours = (datetime.now() - cached_time).total_seconds() / 3600
+            
+            # Categories valid for 24 hours (quotas don't change often)
+            if age_hours < 24:
+                _safe_print(f"[MODEL] Using cached categories for {provider} (age: {age_hours:.1f}h)")
+                return data.get("categories")
         except:
             pass
     
@@ -310,11 +325,10 @@ def save_model_categories(provider: str, categories: Dict):
     cache_file = EMERGENCY_CACHE_DIR / f"{provider}_categories.json"
     try:
         EMERGENCY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(cache_file, 'w') as f:
-            json.dump({
-                "cached_at": datetime.now().isoformat(),
-                "categories": categories
-            }, f)
+        save_state(cache_file, {
+            "cached_at": datetime.now().isoformat(),
+            "categories": categories
+        })
         _safe_print(f"[MODEL] Saved {provider} categories to cache")
     except Exception as e:
         _safe_print(f"[MODEL] Failed to cache categories: {e}")
@@ -324,9 +338,8 @@ def _load_quota_cache() -> Dict[str, int]:
     """Load cached quota values discovered from 429 errors."""
     quota_cache_file = EMERGENCY_CACHE_DIR / "actual_quotas.json"
     try:
-        if quota_cache_file.exists():
-            with open(quota_cache_file, 'r') as f:
-                return json.load(f)
+        if state_exists(quota_cache_file):
+            return load_state(quota_cache_file)
     except:
         pass
     return {}
@@ -337,8 +350,7 @@ def _save_quota_cache(cache: Dict[str, int]):
     quota_cache_file = EMERGENCY_CACHE_DIR / "actual_quotas.json"
     try:
         EMERGENCY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(quota_cache_file, 'w') as f:
-            json.dump(cache, f, indent=2)
+        save_state(quota_cache_file, cache)
     except:
         pass
 
@@ -483,6 +495,10 @@ def _is_model_usable(model_name: str, provider: str) -> Tuple[bool, int]:
         return (True, quota)
 
 
+# Model list TTL before background revalidation
+MODEL_CACHE_TTL_HOURS = 24
+
+
 def _load_cache(provider: str, allow_expired: bool = False) -> Optional[Dict]:
     """
     Load cached models for a provider.
@@ -494,18 +510,17 @@ def _load_cache(provider: str, allow_expired: bool = False) -> Optional[Dict]:
     # Try main cache first
     for cache_dir in [CACHE_DIR, EMERGENCY_CACHE_DIR]:
         cache_file = cache_dir / f"{provider}_models.json"
-        if cache_file.exists():
+        if state_exists(cache_file):
             try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    cached_time = datetime.fromisoformat(data.get("cached_at", "2000-01-01"))
-                    age_hours = (datetime.now() - cached_time).total_seconds() / 3600
-                    
-                    if age_hours < 24:
-                        return data
-                    elif allow_expired:
-                        _safe_print(f"[MODEL] Using expired cache for {provider} ({age_hours:.1f}h old)")
-                        return data
+                data = load_state(cache_file)
+                cached_time = datetime.fromisoformat(data.get("cached_at", "2000-01-01"))
+                age_hours = (datetime.now() - cached_time).total_seconds() / 3600
+                
+                if age_hours < MODEL_CACHE_TTL_HOURS:
+                    return data
+                elif allow_expired:
+                    _safe_print(f"[MODEL] Using expired cache for {provider} ({age_hours:.1f}h old)")
+                    return data
             except:
                 pass
     return None
@@ -518,8 +533,7 @@ def _save_cache(provider: str, data: Dict):
     for cache_dir in [CACHE_DIR, EMERGENCY_CACHE_DIR]:
         try:
             cache_dir.mkdir(parents=True, exist_ok=True)
-            with open(cache_dir / f"{provider}_models.json", 'w') as f:
-                json.dump(data, f, indent=2)
+            save_state(cache_dir / f"{provider}_models.json", data)
         except:
             pass
 
@@ -673,8 +687,8 @@ def get_dynamic_groq_model() -> str:
         except ImportError:
             pass
     
-    # 2. Use _discover_groq_models() which has proper filtering
-    models = _discover_groq_models()
+    # 2. Use the filtered text-gen list (v18.7: from the discovery snapshot)
+    models = get_all_models("groq")
     if models:
         _safe_print(f"[MODEL] Selected Groq: {models[0]} (from {len(models)} text-gen models)")
         return models[0]
@@ -830,9 +844,32 @@ def get_all_models(provider: str) -> List[str]:
     """
     Get ALL available models for a provider (for fallback chains).
     
+    v18.7: Served from the shared discovery snapshot - a stale list is
+    returned instantly and revalidated in the background.
+    
     Returns: List of model IDs, ordered by priority (best first)
     """
     provider = provider.lower()
+    discover = {
+        "groq": _discover_groq_models,
+        "gemini": _discover_gemini_models,
+        "openrouter": _discover_openrouter_models,
+        "huggingface": _discover_huggingface_models,
+    }.get(provider)
+    
+    if discover and DISCOVERY_CACHE_AVAILABLE:
+        legacy = _load_cache(provider, allow_expired=True) or {}
+        try:
+            seed_time = datetime.fromisoformat(legacy.get("cached_at", "2000-01-01")).timestamp()
+        except ValueError:
+            seed_time = 0
+        return get_discovery_cache().get(
+            f"model_helper:{provider}",
+            fetch=discover,
+            ttl=MODEL_CACHE_TTL_HOURS * 3600,
+            seed=legacy.get("models"),
+            seed_time=seed_time
+        ) or []
     
     # Try fresh cache
     cached = _load_cache(provider)
@@ -840,14 +877,8 @@ def get_all_models(provider: str) -> List[str]:
         return cached["models"]
     
     # Discover dynamically
-    if provider == "groq":
-        return _discover_groq_models()
-    elif provider == "gemini":
-        return _discover_gemini_models()
-    elif provider == "openrouter":
-        return _discover_openrouter_models()
-    elif provider == "huggingface":
-        return _discover_huggingface_models()
+    if discover:
+        return discover()
     
     # Emergency cache
     cached = _load_cache(provider, allow_expired=True)
@@ -16,12 +16,17 @@ and routes requests accordingly.
 """
 
 import os
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 import re
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -103,9 +108,8 @@ class ModelIntelligence:
     
     def _load(self) -> Dict:
         try:
-            if MODEL_INTELLIGENCE_FILE.exists():
-                with open(MODEL_INTELLIGENCE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(MODEL_INTELLIGENCE_FILE):
+                return load_state(MODEL_INTELLIGENCE_FILE)
         except:
             pass
         return {
@@ -116,8 +120,7 @@ class ModelIntelligence:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(MODEL_INTELLIGENCE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(MODEL_INTELLIGENCE_FILE, self.data)
     
     def get_best_provider_for_task(self, task_type: str) -> str:
         """
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Prompt Assembler v18.7
+=============================================
+
+Token-budgeted assembly of stage prompts.
+
+Stage prompts were concatenated from many boosters - get_viral_prompt_boost(),
+learning_engine.get_prompt_boost(), FirstAttemptMaximizer.get_quality_boost_prompt(),
+pre_generation_checks enhancement instructions and the v12 master prompt -
+with no size control. The same instructions appeared several times and the
+prompts grew as learned data grew.
+
+The assembler:
+1. COUNTS tokens per section (token_usage.estimate_tokens)
+2. SPLITS large guideline blocks at their "### " headings, so each
+   subsection is ranked on its own
+3. DEDUPLICATES guidance lines already present in the core prompt or in a
+   higher-ranked section (exact and near-duplicate lines)
+4. RANKS sections by measured usefulness: the quality score of videos whose
+   prompt included a section vs. those where it was dropped
+5. FITS the sections into a per-task token budget (required sections
+   always stay; the next one is trimmed line by line if it only part-fits)
+
+Prompt sizes (before/after fitting) are recorded per template and day in
+data/persistent/prompt_assembly.json - see print_size_report().
+
+Usage:
+    assembler = get_prompt_assembler()
+    parts = assembler.assemble("content", render, {
+        "regen_feedback": (regen_feedback, {"required": True}),
+        "viral_boost": viral_boost,
+        "v12_guidelines": (v12_guidelines, {"split": True}),
+    })
+    prompt = render(parts)
+"""
+
+import os
+import random
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+try:
+    from token_usage import estimate_tokens
+except ImportError:
+    from src.quota.token_usage import estimate_tokens
+
+
+def safe_print(msg: str):
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+ASSEMBLY_FILE = STATE_DIR / "prompt_assembly.json"
+
+# Whole-prompt token budget per task (core text + fitted sections)
+TASK_PROMPT_BUDGETS = {
+    "concept": 2200,
+    "content": 2600,
+    "evaluate": 2000,
+    "metadata": 1200,
+}
+DEFAULT_PROMPT_BUDGET = 2000
+
+# A section that only part-fits is trimmed if at least this much room is left
+MIN_PARTIAL_TOKENS = 60
+
+# Lines sharing this much of their vocabulary count as the same instruction
+# (only for lines long enough that the overlap is not just shared filler words)
+NEAR_DUPLICATE = 0.8
+NEAR_DUPLICATE_MIN_WORDS = 6
+
+# Usefulness needs this many videos with AND without a section
+MIN_SAMPLES = 3
+LIFT_WEIGHT = 2.0  # Rank points per quality point of measured lift
+# Random rank noise so near-equal sections take turns being dropped -
+# otherwise a section that is never left out can never show its lift
+EXPLORE_JITTER = 1.0
+
+SIZE_HISTORY_DAYS = 60
+
+_WORD = re.compile(r"[a-z0-9$%]+")
+_DECORATION = re.compile(r"^[\s#=*_~\-]*$")
+
+
+def prompt_budget(task: str) -> int:
+    """Token budget for a task (PROMPT_BUDGET_<TASK> env var overrides)."""
+    env = os.environ.get(f"PROMPT_BUDGET_{task.upper()}")
+    if env and env.isdigit():
+        return int(env)
+    return TASK_PROMPT_BUDGETS.get(task, DEFAULT_PROMPT_BUDGET)
+
+
+def _words(line: str) -> List[str]:
+    return _WORD.findall(line.lower())
+
+
+def _is_guidance(line: str) -> bool:
+    """Lines that carry an instruction (not headings, rules or blank lines)."""
+    stripped = line.strip()
+    if not stripped or _DECORATION.match(stripped):
+        return False
+    if stripped.startswith(("#", "===")) or stripped.endswith(("===", ":")):
+        return False
+    return len(_words(stripped)) >= 3
+
+
+def split_headings(name: str, text: str) -> List[Tuple[str, str]]:
+    """Split a guideline block at its '### ' headings into named subsections."""
+    parts: List[Tuple[str, str]] = []
+    current, lines = "intro", []
+    for line in text.splitlines():
+        match = re.match(r"^#{2,3}\s+(.+)$", line.strip())
+        if match and line.strip().startswith("###"):
+            if any(l.strip() for l in lines):
+                parts.append((f"{name}/{current}", "\n".join(lines)))
+            current, lines = match.group(1).strip().lower(), [line]
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        parts.append((f"{name}/{current}", "\n".join(lines)))
+    return parts
+
+
+class _Section:
+    def __init__(self, name: str, text: str, required: bool = False,
+                 priority: float = 5.0, slot: str = None):
+        self.name = name
+        self.slot = slot or name  # Placeholder the text goes back into
+        self.text = text.strip("\n")
+        self.required = required
+        self.priority = priority
+        self.lines = self.text.splitlines()
+        self.rank = priority
+        self.tokens = estimate_tokens(self.text)
+
+
+class PromptAssembler:
+    """Fits booster sections into a per-task token budget."""
+
+    def __init__(self):
+        self.state = self._load()
+        self._included: Dict[str, Dict[str, bool]] = {}  # task -> section -> included
+
+    def _load(self) -> Dict:
+        try:
+            if state_exists(ASSEMBLY_FILE):
+                data = load_state(ASSEMBLY_FILE)
+                data.setdefault("usefulness", {})
+                data.setdefault("sizes", {})
+                return data
+        except Exception:
+            pass
+        return {"usefulness": {}, "sizes": {}}
+
+    def _save(self):
+        try:
+            save_state(ASSEMBLY_FILE, self.state)
+        except Exception as e:
+            safe_print(f"[ASSEMBLER] Save failed: {e}")
+
+    # =========================================================================
+    # RANKING
+    # =========================================================================
+
+    def lift(self, task: str, section: str) -> float:
+        """Mean quality with the section minus mean quality without it."""
+        stats = self.state["usefulness"].get(task, {}).get(section)
+        if not stats or stats["in_n"] < MIN_SAMPLES or stats["out_n"] < MIN_SAMPLES:
+            return 0.0
+        return stats["in_sum"] / stats["in_n"] - stats["out_sum"] / stats["out_n"]
+
+    def _rank(self, task: str, sections: List[_Section]) -> List[_Section]:
+        for section in sections:
+            section.rank = (section.priority + LIFT_WEIGHT * self.lift(task, section.name)
+                            + random.uniform(0, EXPLORE_JITTER))
+        # Best first; among equals the cheaper section wins
+        return sorted(sections, key=lambda s: (not s.required, -s.rank, s.tokens))
+
+    # =========================================================================
+    # DEDUPLICATION
+    # =========================================================================
+
+    @staticmethod
+    def _seen_before(words: List[str], seen: List[set], seen_exact: set) -> bool:
+        key = " ".join(words)
+        if key in seen_exact:
+            return True
+        vocab = set(words)
+        if len(vocab) < NEAR_DUPLICATE_MIN_WORDS:
+            return False
+        for other in seen:
+            union = len(vocab | other)
+            if union and len(vocab & other) / union >= NEAR_DUPLICATE:
+                return True
+        return False
+
+    def _dedupe(self, core: str, sections: List[_Section]) -> int:
+        """Drop guidance lines the core or a better-ranked section already has."""
+        seen_exact, seen = set(), []
+        for line in core.splitlines():
+            if _is_guidance(line):
+                words = _words(line)
+                seen_exact.add(" ".join(words))
+                seen.append(set(words))
+
+        removed = 0
+        for section in sections:
+            kept, has_guidance = [], False
+            for line in section.lines:
+                if _is_guidance(line):
+                    words = _words(line)
+                    if self._seen_before(words, seen, seen_exact):
+                        removed += 1
+                        continue
+                    seen_exact.add(" ".join(words))
+                    seen.append(set(words))
+                    has_guidance = True
+                kept.append(line)
+            # A section reduced to its headings says nothing
+            if not has_guidance and any(_is_guidance(l) for l in section.lines):
+                kept = []
+            section.lines = kept
+            section.text = "\n".join(kept)
+            section.tokens = estimate_tokens(section.text)
+        return removed
+
+    # =========================================================================
+    # ASSEMBLY
+    # =========================================================================
+
+    def assemble(self, task: str, render: Callable[[Dict[str, str]], str],
+                 sections: Dict[str, object], budget: int = None) -> Dict[str, str]:
+        """
+        Fit booster sections into the task's prompt budget.
+
+        Args:
+            task: Stage/template name ("concept", "content", ...)
+            render: Builds the full prompt from {placeholder: text}
+            sections: {placeholder: text} or {placeholder: (text, options)};
+                options: required (bool), priority (0-10), split (bool)
+            budget: Token budget for the whole prompt (default: prompt_budget(task))
+
+        Returns:
+            {placeholder: fitted text} for every placeholder in `sections`
+        """
+        budget = budget or prompt_budget(task)
+        slots = {name: "" for name in sections}
+        core = render(slots)
+        core_tokens = estimate_tokens(core)
+
+        parsed: List[_Section] = []
+        for name, spec in sections.items():
+            text, options = (spec if isinstance(spec, tuple) else (spec, {}))
+            if not text or not str(text).strip():
+                continue
+            text = str(text)
+            if options.get("split"):
+                for sub_name, sub_text in split_headings(name, text):
+                    parsed.append(_Section(sub_name, sub_text, options.get("required", False),
+                                           options.get("priority", 5.0), slot=name))
+            else:
+                parsed.append(_Section(name, text, options.get("required", False),
+                                       options.get("priority", 5.0)))
+
+        raw_tokens = core_tokens + sum(s.tokens for s in parsed)
+        ranked = self._rank(task, parsed)
+        duplicates = self._dedupe(core, ranked)
+
+        room = budget - core_tokens
+        included: Dict[str, bool] = {}
+        chosen: List[_Section] = []
+        for section in ranked:
+            if not section.lines:
+                included[section.name] = False
+                continue
+            if section.required or section.tokens <= room:
+                chosen.append(section)
+                room -= section.tokens
+                included[section.name] = True
+            elif room >= MIN_PARTIAL_TOKENS:
+                trimmed = self._trim(section, room)
+                if trimmed:
+                    chosen.append(section)
+                    room -= section.tokens
+                included[section.name] = trimmed
+            else:
+                included[section.name] = False
+
+        # Put the chosen sections back in their original order and slots
+        order = {id(s): i for i, s in enumerate(parsed)}
+        for section in sorted(chosen, key=lambda s: order[id(s)]):
+            slots[section.slot] = (slots[section.slot] + "\n" + section.text).strip("\n")
+
+        final_tokens = estimate_tokens(render(slots))
+        dropped = [n for n, kept in included.items() if not kept]
+        self._included[task] = included
+        self._record_size(task, raw_tokens, final_tokens, budget)
+        if raw_tokens != final_tokens:
+            safe_print(f"   [ASSEMBLER] {task}: {raw_tokens} -> {final_tokens} tokens "
+                       f"(budget {budget}, {duplicates} duplicate lines, {len(dropped)} sections dropped)")
+        return slots
+
+    @staticmethod
+    def _trim(section: _Section, room: int) -> bool:
+        """Keep the section's leading lines that fit in `room` tokens."""
+        kept, used = [], 0
+        for line in section.lines:
+            cost = estimate_tokens(line) + 1
+            if used + cost > room:
+                break
+            kept.append(line)
+            used += cost
+        if not any(_is_guidance(l) for l in kept):
+            return False
+        section.lines = kept
+        section.text = "\n".join(kept)
+        section.tokens = estimate_tokens(section.text)
+        return True
+
+    # =========================================================================
+    # FEEDBACK & REPORTING
+    # =========================================================================
+
+    def record_outcome(self, score: float):
+        """
+        Credit the video's quality score to the sections its prompts included
+        (and, as the baseline, to the ones that were dropped).
+        """
+        if not self._included or score is None:
+            return
+        usefulness = self.state["usefulness"]
+        for task, included in self._included.items():
+            task_stats = usefulness.setdefault(task, {})
+            for section, was_included in included.items():
+                stats = task_stats.setdefault(section, {"in_n": 0, "in_sum": 0.0,
+                                                        "out_n": 0, "out_sum": 0.0})
+                side = "in" if was_included else "out"
+                stats[f"{side}_n"] += 1
+                stats[f"{side}_sum"] = round(stats[f"{side}_sum"] + float(score), 2)
+        self._included = {}
+        self._save()
+
+    def _record_size(self, template: str, raw: int, final: int, budget: int):
+        today = datetime.now().strftime("%Y-%m-%d")
+        days = self.state["sizes"].setdefault(template, {})
+        day = days.setdefault(today, {"n": 0, "raw": 0, "final": 0, "budget": budget})
+        day["n"] += 1
+        day["raw"] += raw
+        day["final"] += final
+        day["budget"] = budget
+        cutoff = (datetime.now() - timedelta(days=SIZE_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        for old in [d for d in days if d < cutoff]:
+            del days[old]
+        self._save()
+
+    def get_size_report(self, days: int = 14) -> Dict[str, List[Dict]]:
+        """Average prompt size per template and day (raw vs assembled)."""
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        report = {}
+        for template, per_day in self.state["sizes"].items():
+            report[template] = [
+                {"date": date, "prompts": d["n"], "raw": d["raw"] // max(1, d["n"]),
+                 "final": d["final"] // max(1, d["n"]), "budget": d["budget"]}
+                for date, d in sorted(per_day.items()) if date >= cutoff
+            ]
+        return report
+
+    def print_size_report(self, days: int = 14):
+        safe_print("\n=== PROMPT SIZE TRENDS (tokens, avg per prompt) ===")
+        for template, rows in sorted(self.get_size_report(days).items()):
+            safe_print(f"  {template}:")
+            for row in rows:
+                safe_print(f"    {row['date']}  raw {row['raw']:>5}  ->  {row['final']:>5}  "
+                           f"(budget {row['budget']}, {row['prompts']} prompts)")
+
+
+# Singleton
+_assembler = None
+
+
+def get_prompt_assembler() -> PromptAssembler:
+    """Get the global PromptAssembler instance."""
+    global _assembler
+    if _assembler is None:
+        _assembler = PromptAssembler()
+    return _assembler
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" PROMPT ASSEMBLER")
+    safe_print("=" * 60)
+
+    def render(parts: Dict[str, str]) -> str:
+        return f"""Create a viral short.
+- Use specific numbers, not vague claims
+{parts['feedback']}
+{parts['viral']}
+{parts['guidelines']}
+OUTPUT JSON ONLY."""
+
+    guidelines = """### Hooks
+- Open with a pattern interrupt in the first second
+- Use specific numbers, not vague claims
+- Ask a question the viewer needs answered
+### Pacing
+- Change the visual every 2-3 seconds to hold attention
+- Keep each phrase under 15 words so it reads in one glance
+### Typography
+- Use bold sans-serif fonts with high contrast outlines
+- Keep captions inside the center safe zone of the frame
+### Endings
+- Close with a question that forces a one-word comment
+- Loop the last line back into the hook for rewatches"""
+    parts = get_prompt_assembler().assemble("demo", render, {
+        "feedback": ("Previous attempt scored 5/10 - make the hook sharper", {"required": True}),
+        "viral": "- Use specific numbers, not vague claims\n- Open with a pattern interrupt",
+        "guidelines": (guidelines, {"split": True}),
+    }, budget=160)
+    safe_print(render(parts))
+    get_prompt_assembler().print_size_report()
@@ -14,11 +14,16 @@ NO HARDCODED CONTEXT - Everything dynamic!
 """
 
 import os
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -43,9 +48,8 @@ class PromptOptimizer:
     
     def _load_performance(self) -> Dict:
         try:
-            if PROMPT_PERF_FILE.exists():
-                with open(PROMPT_PERF_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(PROMPT_PERF_FILE):
+                return load_state(PROMPT_PERF_FILE)
         except:
             pass
         return {
@@ -56,8 +60,7 @@ class PromptOptimizer:
     
     def _save_performance(self):
         self.performance["last_updated"] = datetime.now().isoformat()
-        with open(PROMPT_PERF_FILE, 'w') as f:
-            json.dump(self.performance, f, indent=2)
+        save_state(PROMPT_PERF_FILE, self.performance)
     
     def get_dynamic_context(self) -> Dict:
         """Get current dynamic context for prompt injection."""
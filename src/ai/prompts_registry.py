@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-ViralShorts Factory - Prompts Registry v17.9.9
-===============================================
+ViralShorts Factory - Prompts Registry v18.7
+=============================================
 
 CENTRAL REGISTRY of all prompts used in the system.
 
@@ -18,6 +18,11 @@ Usage:
     all_prompts = registry.get_all_prompts()
     creative_prompts = registry.get_prompts_by_type("creative")
 
+Template fingerprinting (v18.7):
+    prompt = render_prompt("BROLL_KEYWORDS_PROMPT", BROLL_KEYWORDS_PROMPT,
+                           content=content, mood=mood)
+    # prompt is a str; prompt.cache_key only covers the template's cache_vars
+
 Auto-update:
     The registry can scan source files to discover new prompts.
     Run: registry.scan_and_update()
@@ -26,11 +31,18 @@ Auto-update:
 import os
 import json
 import re
+import hashlib
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # State directory
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -52,6 +64,47 @@ class PromptInfo:
     avg_quality: float  # Average quality score when used
     last_used: Optional[str]  # ISO timestamp
     times_used: int  # Usage count
+    # v18.7: Template fingerprinting - variables that change the answer.
+    # None = every variable is cache-relevant. Dates, learned-pattern boosts
+    # and exclusion lists are deliberately left out.
+    cache_vars: Optional[List[str]] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+class TemplatedPrompt(str):
+    """
+    v18.7: Prompt text that remembers which registered template built it.
+    
+    Behaves exactly like a str, so it flows through call_ai/smart_call_ai
+    unchanged; the cache and router read template_id/cache_key from it.
+    """
+    template_id: Optional[str] = None
+    cache_key: Optional[str] = None
+
+
+def canonicalize(value):
+    """Normalise a template variable so equivalent values fingerprint the same."""
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value).strip().lower()
+    if isinstance(value, dict):
+        return {str(k): canonicalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(canonicalize(v) for v in value)
+    if isinstance(value, float):
+        return round(value, 4)
+    if value is None or isinstance(value, (int, bool)):
+        return value
+    return canonicalize(str(value))
+
+
+def template_cache_key(template_id: str, variables: Dict) -> str:
+    """Cache key = (template id, canonical cache-relevant variable set)."""
+    payload = json.dumps({"t": template_id, "v": canonicalize(variables)},
+                         sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
 
 
 # =============================================================================
@@ -71,7 +124,8 @@ DEFAULT_PROMPTS = [
         success_rate=0.95,
         avg_quality=8.5,
         last_used=None,
-        times_used=0
+        times_used=0,
+        cache_vars=["season", "count"]
     ),
     PromptInfo(
         name="MASTER_GENERATION_PROMPT",
@@ -84,7 +138,8 @@ DEFAULT_PROMPTS = [
         success_rate=0.92,
         avg_quality=9.0,
         last_used=None,
-        times_used=0
+        times_used=0,
+        cache_vars=["topic", "category", "duration", "phrase_count", "feedback"]
     ),
     PromptInfo(
         name="VOICEOVER_PROMPT",
@@ -97,7 +152,8 @@ DEFAULT_PROMPTS = [
         success_rate=0.95,
         avg_quality=8.0,
         last_used=None,
-        times_used=0
+        times_used=0,
+        cache_vars=["content"]
     ),
     PromptInfo(
         name="ENGAGEMENT_REPLY_PROMPT",
@@ -151,7 +207,8 @@ DEFAULT_PROMPTS = [
         success_rate=0.95,
         avg_quality=9.0,
         last_used=None,
-        times_used=0
+        times_used=0,
+        cache_vars=["hook", "phrases", "cta", "topic", "category"]
     ),
     PromptInfo(
         name="CONTENT_EVALUATION_PROMPT",
@@ -164,7 +221,8 @@ DEFAULT_PROMPTS = [
         success_rate=0.93,
         avg_quality=8.5,
         last_used=None,
-        times_used=0
+        times_used=0,
+        cache_vars=["hook", "content", "video_type"]
     ),
     PromptInfo(
         name="VIRAL_VELOCITY_PROMPT",
@@ -205,7 +263,8 @@ DEFAULT_PROMPTS = [
         success_rate=0.98,
         avg_quality=7.5,
         last_used=None,
-        times_used=0
+        times_used=0,
+        cache_vars=["content", "mood"]
     ),
     PromptInfo(
         name="DESCRIPTION_SEO_PROMPT",
@@ -471,6 +530,50 @@ DEFAULT_PROMPTS = [
         last_used=None,
         times_used=0
     ),
+    
+    # === PIPELINE STAGE PROMPTS (v18.7 - inline prompts in pro_video_generator) ===
+    PromptInfo(
+        name="STAGE3_EVALUATION_PROMPT",
+        type="evaluation",
+        source_file="src/core/pro_video_generator.py",
+        description="Stage 3 content review, scoring and phrase improvement",
+        complexity="complex",
+        avg_tokens=1200,
+        best_model="gemini:gemini-2.0-flash",
+        success_rate=0.93,
+        avg_quality=8.5,
+        last_used=None,
+        times_used=0,
+        cache_vars=["hook", "phrases", "value"]
+    ),
+    PromptInfo(
+        name="STAGE4_BROLL_PROMPT",
+        type="simple",
+        source_file="src/core/pro_video_generator.py",
+        description="Stage 4 B-roll keyword per phrase",
+        complexity="simple",
+        avg_tokens=400,
+        best_model="gemini:gemini-2.5-flash",
+        success_rate=0.97,
+        avg_quality=7.5,
+        last_used=None,
+        times_used=0,
+        cache_vars=["phrases"]
+    ),
+    PromptInfo(
+        name="STAGE5_METADATA_PROMPT",
+        type="simple",
+        source_file="src/core/pro_video_generator.py",
+        description="Stage 5 title variants, description and hashtags",
+        complexity="simple",
+        avg_tokens=400,
+        best_model="gemini:gemini-2.5-flash",
+        success_rate=0.96,
+        avg_quality=8.0,
+        last_used=None,
+        times_used=0,
+        cache_vars=["category", "topic", "hook", "first_phrase", "value"]
+    ),
 ]
 
 
@@ -492,12 +595,12 @@ class PromptsRegistry:
     def _load(self):
         """Load registry from file or use defaults."""
         try:
-            if REGISTRY_FILE.exists():
-                with open(REGISTRY_FILE, 'r') as f:
-                    data = json.load(f)
-                    for prompt_data in data.get("prompts", []):
-                        prompt = PromptInfo(**prompt_data)
-                        self.prompts[prompt.name] = prompt
+            if state_exists(REGISTRY_FILE):
+                data = load_state(REGISTRY_FILE)
+                for prompt_data in data.get("prompts", []):
+                    prompt = PromptInfo(**prompt_data)
+                    self.prompts[prompt.name] = prompt
+                self._merge_defaults()
                 print(f"[REGISTRY] Loaded {len(self.prompts)} prompts from cache")
             else:
                 self._use_defaults()
@@ -512,16 +615,24 @@ class PromptsRegistry:
         self._save()
         print(f"[REGISTRY] Initialized with {len(self.prompts)} default prompts")
     
+    def _merge_defaults(self):
+        """v18.7: Add new default prompts; cache_vars always come from code."""
+        for default in DEFAULT_PROMPTS:
+            existing = self.prompts.get(default.name)
+            if existing is None:
+                self.prompts[default.name] = PromptInfo(**asdict(default))
+            elif default.cache_vars is not None:
+                existing.cache_vars = list(default.cache_vars)
+    
     def _save(self):
         """Save registry to file."""
         try:
             data = {
-                "version": "17.9.9",
+                "version": "18.7",
                 "updated_at": datetime.now().isoformat(),
                 "prompts": [asdict(p) for p in self.prompts.values()]
             }
-            with open(REGISTRY_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            save_state(REGISTRY_FILE, data)
         except Exception as e:
             print(f"[REGISTRY] Save failed: {e}")
     
@@ -538,7 +649,8 @@ class PromptsRegistry:
         return [p for p in self.prompts.values() if p.type == prompt_type]
     
     def record_usage(self, prompt_name: str, model_used: str, 
-                     success: bool, quality_score: float = None):
+                     success: bool, quality_score: float = None,
+                     tokens: int = None):
         """
         Record prompt usage for learning.
         
@@ -547,6 +659,7 @@ class PromptsRegistry:
             model_used: Model that was used (e.g., "groq:llama-3.3-70b")
             success: Whether the call succeeded
             quality_score: Quality of the result (1-10)
+            tokens: v18.7 - Prompt + completion tokens the call actually used
         """
         prompt = self.prompts.get(prompt_name)
         if not prompt:
@@ -556,6 +669,10 @@ class PromptsRegistry:
         prompt.times_used += 1
         prompt.last_used = datetime.now().isoformat()
         
+        # v18.7: avg_tokens learns from real usage instead of the static guess
+        if tokens:
+            prompt.avg_tokens = int(0.9 * prompt.avg_tokens + 0.1 * tokens) if prompt.avg_tokens else tokens
+        
         if success:
             # Update success rate (moving average)
             old_rate = prompt.success_rate
@@ -576,6 +693,66 @@ class PromptsRegistry:
         if prompt.times_used % 10 == 0:
             self._save()
     
+    # =========================================================================
+    # v18.7: TEMPLATE FINGERPRINTING
+    # =========================================================================
+    
+    def _fingerprint(self, template_id: str, text: str, variables: Dict) -> TemplatedPrompt:
+        prompt = self.prompts.get(template_id)
+        cache_vars = prompt.cache_vars if prompt else None
+        if cache_vars is not None:
+            variables = {k: variables.get(k) for k in cache_vars}
+        
+        result = TemplatedPrompt(text)
+        result.template_id = template_id
+        result.cache_key = template_cache_key(template_id, variables)
+        return result
+    
+    def render(self, template_id: str, template: str, **variables) -> TemplatedPrompt:
+        """
+        Build a prompt from a registered template with named variables.
+        
+        The cache key only covers the template's cache_vars, so volatile
+        fragments (dates, boosts, exclusion lists) don't break cache hits.
+        """
+        return self._fingerprint(template_id, template.format(**variables), variables)
+    
+    def tag(self, template_id: str, text: str, **cache_vars) -> TemplatedPrompt:
+        """Fingerprint an already-built (inline f-string) prompt by its cache-relevant inputs."""
+        return self._fingerprint(template_id, text, cache_vars)
+    
+    def get_prompt_type(self, template_id: str) -> Optional[str]:
+        """Prompt type of a registered template (used by SmartModelRouter)."""
+        prompt = self.prompts.get(template_id)
+        return prompt.type if prompt else None
+    
+    def record_cache_result(self, template_id: str, hit: bool):
+        """Record a prompt-cache hit/miss for a template."""
+        prompt = self.prompts.get(template_id)
+        if not prompt:
+            return
+        if hit:
+            prompt.cache_hits += 1
+        else:
+            prompt.cache_misses += 1
+        
+        # Save periodically
+        if (prompt.cache_hits + prompt.cache_misses) % 10 == 0:
+            self._save()
+    
+    def get_cache_report(self) -> Dict[str, Dict]:
+        """Per-template prompt-cache hit rates."""
+        report = {}
+        for p in self.prompts.values():
+            lookups = p.cache_hits + p.cache_misses
+            if lookups:
+                report[p.name] = {
+                    "hits": p.cache_hits,
+                    "misses": p.cache_misses,
+                    "hit_rate": round(p.cache_hits / lookups, 3)
+                }
+        return report
+    
     def get_best_model_for_prompt(self, prompt_name: str) -> Optional[str]:
         """Get the best model for a specific prompt."""
         prompt = self.prompts.get(prompt_name)
@@ -657,7 +834,8 @@ class PromptsRegistry:
             "by_type": by_type,
             "avg_success_rate": sum(p.success_rate for p in self.prompts.values()) / max(1, len(self.prompts)),
             "avg_quality": sum(p.avg_quality for p in self.prompts.values()) / max(1, len(self.prompts)),
-            "most_used": max(self.prompts.values(), key=lambda p: p.times_used).name if self.prompts else None
+            "most_used": max(self.prompts.values(), key=lambda p: p.times_used).name if self.prompts else None,
+            "cache_hit_rates": self.get_cache_report()
         }
 
 
@@ -682,9 +860,19 @@ def get_best_model_for_prompt(prompt_name: str) -> Optional[str]:
 
 
 def record_prompt_usage(prompt_name: str, model_used: str, 
-                        success: bool, quality: float = None):
+                        success: bool, quality: float = None, tokens: int = None):
     """Convenience function."""
-    get_prompts_registry().record_usage(prompt_name, model_used, success, quality)
+    get_prompts_registry().record_usage(prompt_name, model_used, success, quality, tokens)
+
+
+def render_prompt(template_id: str, template: str, **variables) -> TemplatedPrompt:
+    """v18.7: Convenience function - build a fingerprinted prompt from a template."""
+    return get_prompts_registry().render(template_id, template, **variables)
+
+
+def tag_prompt(template_id: str, text: str, **cache_vars) -> TemplatedPrompt:
+    """v18.7: Convenience function - fingerprint an inline prompt."""
+    return get_prompts_registry().tag(template_id, text, **cache_vars)
 
 
 # =============================================================================
@@ -727,5 +915,12 @@ if __name__ == "__main__":
     for prompt, model in list(recommendations.items())[:10]:
         print(f"  {prompt} -> {model}")
     
+    # Test template fingerprinting
+    a = registry.render("BROLL_KEYWORDS_PROMPT", "{content} / {mood} / {date}",
+                        content="Money  Tips", mood="calm", date="Jan 1")
+    b = registry.render("BROLL_KEYWORDS_PROMPT", "{content} / {mood} / {date}",
+                        content="money tips", mood="calm", date="Feb 2")
+    print(f"\nFingerprint stable across volatile vars: {a.cache_key == b.cache_key}")
+    
     print("\n" + "=" * 60)
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-ViralShorts Factory - Smart AI Caller v17.9.9
-==============================================
+ViralShorts Factory - Smart AI Caller v18.7
+============================================
 
 Makes AI calls using the SmartModelRouter.
 
@@ -11,6 +11,8 @@ Features:
 - GUARANTEES eventual success (tries ALL models)
 - Respects rate limits per model
 - Tracks success/failure for learning
+- v18.7: Prompt cache, latency-aware policies, hedged requests and
+  streaming with early stop once the JSON answer is complete
 
 USAGE:
     from src.ai.smart_ai_caller import smart_call_ai
@@ -26,21 +28,32 @@ import os
 import json
 import time
 import re
+import threading
 import warnings
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import asdict
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Suppress google.generativeai deprecation warning (will migrate to google.genai later)
 warnings.filterwarnings("ignore", category=FutureWarning, module="google.generativeai")
 
 # Import the router
 try:
     from src.ai.smart_model_router import (
-        get_smart_router, SmartModelRouter, ModelInfo
+        get_smart_router, SmartModelRouter, ModelInfo, POLICY_BEST_QUALITY
     )
     from src.ai.model_helper import get_smart_delay
 except ImportError:
-    from smart_model_router import get_smart_router, SmartModelRouter, ModelInfo
+    from smart_model_router import get_smart_router, SmartModelRouter, ModelInfo, POLICY_BEST_QUALITY
     try:
         from model_helper import get_smart_delay
     except ImportError:
@@ -48,6 +61,42 @@ except ImportError:
         def get_smart_delay(model_name: str, provider: str = None) -> float:
             return 12.0  # Conservative default
 
+# v18.7: Shared prompt cache (explicit per-task cacheable policy)
+try:
+    from src.quota.prompt_cache import get_prompt_cache, is_cacheable, namespace_for_task
+    PROMPT_CACHE_AVAILABLE = True
+except ImportError:
+    try:
+        from prompt_cache import get_prompt_cache, is_cacheable, namespace_for_task
+        PROMPT_CACHE_AVAILABLE = True
+    except ImportError:
+        PROMPT_CACHE_AVAILABLE = False
+
+# v18.7: Circuit breakers - open models/providers are skipped instantly
+try:
+    from src.quota.circuit_breaker import get_breaker_registry, classify_error, ERROR_NOT_FOUND
+    CIRCUIT_BREAKERS_AVAILABLE = True
+except ImportError:
+    try:
+        from circuit_breaker import get_breaker_registry, classify_error, ERROR_NOT_FOUND
+        CIRCUIT_BREAKERS_AVAILABLE = True
+    except ImportError:
+        CIRCUIT_BREAKERS_AVAILABLE = False
+
+# v18.7: Stage deadlines cap waits, retries and request timeouts
+try:
+    from src.utils.deadline import (
+        deadline_expired, sleep_within, request_timeout, give_up, time_left
+    )
+except ImportError:
+    from deadline import deadline_expired, sleep_within, request_timeout, give_up, time_left
+
+# v18.7: Callers return AIResponse (a str) carrying real token usage
+try:
+    from src.quota.token_usage import make_response
+except ImportError:
+    from token_usage import make_response
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -60,6 +109,15 @@ def safe_print(msg: str):
 # =============================================================================
 # PROVIDER-SPECIFIC CALLERS
 # =============================================================================
+# v18.7: Callers raise on failure (SDK errors, non-200 responses) so
+# _call_model can classify the real error for retries and circuit breakers.
+# None means "no answer" (no API key, empty body).
+
+def _raise_for_status(response):
+    """Raise with the status code and body of a failed HTTP response."""
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
 
 def _call_groq(model_id: str, prompt: str, max_tokens: int, 
                temperature: float) -> Optional[str]:
@@ -68,20 +126,17 @@ def _call_groq(model_id: str, prompt: str, max_tokens: int,
     if not api_key:
         return None
     
-    try:
-        from groq import Groq
-        client = Groq(api_key=api_key)
-        
-        response = client.chat.completions.create(
-            model=model_id,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        safe_print(f"   [!] Groq ({model_id}): {e}")
-        return None
+    from groq import Groq
+    client = Groq(api_key=api_key, timeout=request_timeout(60))
+    
+    response = client.chat.completions.create(
+        model=model_id,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        temperature=temperature
+    )
+    return make_response(response.choices[0].message.content, prompt,
+                         f"groq:{model_id}", response)
 
 
 def _call_gemini(model_id: str, prompt: str, max_tokens: int,
@@ -91,22 +146,18 @@ def _call_gemini(model_id: str, prompt: str, max_tokens: int,
     if not api_key:
         return None
     
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        
-        model = genai.GenerativeModel(model_id)
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "max_output_tokens": max_tokens,
-                "temperature": temperature
-            }
-        )
-        return response.text
-    except Exception as e:
-        safe_print(f"   [!] Gemini ({model_id}): {e}")
-        return None
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    
+    model = genai.GenerativeModel(model_id)
+    response = model.generate_content(
+        prompt,
+        generation_config={
+            "max_output_tokens": max_tokens,
+            "temperature": temperature
+        }
+    )
+    return make_response(response.text, prompt, f"gemini:{model_id}", response)
 
 
 def _call_openrouter(model_id: str, prompt: str, max_tokens: int,
@@ -116,30 +167,27 @@ def _call_openrouter(model_id: str, prompt: str, max_tokens: int,
     if not api_key:
         return None
     
-    try:
-        import requests
-        
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": model_id,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": max_tokens,
-                "temperature": temperature
-            },
-            timeout=60
-        )
-        
-        if response.status_code == 200:
-            return response.json()["choices"][0]["message"]["content"]
-        return None
-    except Exception as e:
-        safe_print(f"   [!] OpenRouter ({model_id}): {e}")
-        return None
+    import requests
+    
+    response = requests.post(
+        "https://openrouter.ai/api/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        },
+        json={
+            "model": model_id,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        },
+        timeout=request_timeout(60)
+    )
+    _raise_for_status(response)
+    
+    body = response.json()
+    return make_response(body["choices"][0]["message"]["content"], prompt,
+                         f"openrouter:{model_id}", body)
 
 
 def _call_huggingface(model_id: str, prompt: str, max_tokens: int,
@@ -149,31 +197,28 @@ def _call_huggingface(model_id: str, prompt: str, max_tokens: int,
     if not api_key:
         return None
     
-    try:
-        import requests
-        
-        response = requests.post(
-            f"https://api-inference.huggingface.co/models/{model_id}",
-            headers={"Authorization": f"Bearer {api_key}"},
-            json={
-                "inputs": prompt,
-                "parameters": {
-                    "max_new_tokens": max_tokens,
-                    "temperature": temperature,
-                    "return_full_text": False
-                }
-            },
-            timeout=120
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list) and len(result) > 0:
-                return result[0].get("generated_text", "")
-        return None
-    except Exception as e:
-        safe_print(f"   [!] HuggingFace ({model_id}): {e}")
-        return None
+    import requests
+    
+    response = requests.post(
+        f"https://api-inference.huggingface.co/models/{model_id}",
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={
+            "inputs": prompt,
+            "parameters": {
+                "max_new_tokens": max_tokens,
+                "temperature": temperature,
+                "return_full_text": False
+            }
+        },
+        timeout=request_timeout(120)
+    )
+    _raise_for_status(response)
+    
+    result = response.json()
+    if isinstance(result, list) and len(result) > 0:
+        return make_response(result[0].get("generated_text", ""), prompt,
+                             f"huggingface:{model_id}")
+    return None
 
 
 # Provider function mapping
@@ -185,6 +230,389 @@ PROVIDER_CALLERS = {
 }
 
 
+# =============================================================================
+# STREAMING WITH EARLY JSON COMPLETION (v18.7)
+# =============================================================================
+# Models often keep talking after the JSON closes ("Here's why this works...")
+# until max_tokens. Streaming lets us stop as soon as the top-level value is
+# balanced and valid - less latency and fewer output tokens billed.
+
+class IncrementalJSONParser:
+    """
+    Finds the first complete top-level JSON object/array in streamed text.
+    
+    Tracks string/escape state and bracket depth across chunks, so each
+    character is scanned once. Text before the JSON (markdown fences,
+    preamble) is skipped.
+    """
+    
+    def __init__(self):
+        self.buffer = ""
+        self.start = -1       # Index of the opening { or [
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.pos = 0          # Next character to scan
+        self.result = None    # Complete JSON text once found
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """Add streamed text. Returns the JSON text once it is complete."""
+        if self.result is not None:
+            return self.result
+        self.buffer += chunk
+        
+        while self.pos < len(self.buffer):
+            ch = self.buffer[self.pos]
+            self.pos += 1
+            
+            if self.start < 0:
+                if ch in "{[":
+                    self.start, self.depth = self.pos - 1, 1
+                continue
+            
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    candidate = self.buffer[self.start:self.pos]
+                    try:
+                        value = json.loads(candidate)
+                    except ValueError:
+                        value = None
+                    if self._is_answer(value):
+                        self.result = candidate
+                        return self.result
+                    # Not the answer (e.g. "[1]" citation in prose) - keep looking
+                    self.start = -1
+        return None
+    
+    @staticmethod
+    def _is_answer(value) -> bool:
+        """Objects always count; arrays only if they hold strings or containers."""
+        if isinstance(value, dict):
+            return True
+        if isinstance(value, list):
+            return any(isinstance(v, (str, dict, list)) for v in value)
+        return False
+
+
+# Streaming usage (early stops = responses cut short after the JSON closed)
+STREAM_STATS = {"streams": 0, "early_stops": 0, "chars_streamed": 0}
+
+
+def _stream_groq(model_id: str, prompt: str, max_tokens: int, temperature: float):
+    """Stream Groq chat completion text chunks."""
+    api_key = os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        return
+    
+    from groq import Groq
+    client = Groq(api_key=api_key, timeout=request_timeout(60))
+    stream = client.chat.completions.create(
+        model=model_id,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        stream=True
+    )
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()  # Drops the HTTP connection - generation stops server-side
+
+
+def _stream_gemini(model_id: str, prompt: str, max_tokens: int, temperature: float):
+    """Stream Gemini text chunks."""
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        return
+    
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    
+    model = genai.GenerativeModel(model_id)
+    response = model.generate_content(
+        prompt,
+        generation_config={
+            "max_output_tokens": max_tokens,
+            "temperature": temperature
+        },
+        stream=True
+    )
+    for chunk in response:
+        text = getattr(chunk, "text", "")
+        if text:
+            yield text
+
+
+def _iter_sse_data(response):
+    """Yield parsed `data:` payloads from a server-sent events response."""
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            return
+        try:
+            yield json.loads(payload)
+        except ValueError:
+            continue
+
+
+def _stream_openrouter(model_id: str, prompt: str, max_tokens: int, temperature: float):
+    """Stream OpenRouter (OpenAI-compatible SSE) text chunks."""
+    api_key = os.environ.get("OPENROUTER_API_KEY")
+    if not api_key:
+        return
+    
+    import requests
+    response = requests.post(
+        "https://openrouter.ai/api/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        },
+        json={
+            "model": model_id,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        },
+        timeout=request_timeout(60),
+        stream=True
+    )
+    try:
+        _raise_for_status(response)
+        for event in _iter_sse_data(response):
+            choices = event.get("choices") or [{}]
+            text = choices[0].get("delta", {}).get("content")
+            if text:
+                yield text
+    finally:
+        response.close()
+
+
+def _stream_huggingface(model_id: str, prompt: str, max_tokens: int, temperature: float):
+    """Stream HuggingFace Inference API (text-generation SSE) tokens."""
+    api_key = os.environ.get("HUGGINGFACE_API_KEY") or os.environ.get("HF_TOKEN")
+    if not api_key:
+        return
+    
+    import requests
+    response = requests.post(
+        f"https://api-inference.huggingface.co/models/{model_id}",
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={
+            "inputs": prompt,
+            "parameters": {
+                "max_new_tokens": max_tokens,
+                "temperature": temperature,
+                "return_full_text": False
+            },
+            "stream": True
+        },
+        timeout=request_timeout(120),
+        stream=True
+    )
+    try:
+        _raise_for_status(response)
+        for event in _iter_sse_data(response):
+            token = event.get("token", {})
+            if token.get("text") and not token.get("special"):
+                yield token["text"]
+    finally:
+        response.close()
+
+
+PROVIDER_STREAMERS = {
+    "groq": _stream_groq,
+    "gemini": _stream_gemini,
+    "openrouter": _stream_openrouter,
+    "huggingface": _stream_huggingface
+}
+
+
+def _call_streaming(provider: str, model_id: str, prompt: str, max_tokens: int,
+                    temperature: float) -> Optional[str]:
+    """
+    Stream a completion and stop once a complete JSON value has arrived.
+    
+    Returns the JSON text on early completion, otherwise the full text
+    (same as the non-streaming callers). Provider errors propagate like
+    theirs. Streams carry no usage fields, so their token counts are
+    estimates.
+    """
+    streamer = PROVIDER_STREAMERS[provider]
+    parser = IncrementalJSONParser()
+    chunks = []
+    stream = streamer(model_id, prompt, max_tokens, temperature)
+    STREAM_STATS["streams"] += 1
+    try:
+        for chunk in stream:
+            chunks.append(chunk)
+            STREAM_STATS["chars_streamed"] += len(chunk)
+            if parser.feed(chunk) is not None:
+                STREAM_STATS["early_stops"] += 1
+                return make_response(parser.result, prompt, f"{provider}:{model_id}")
+            if deadline_expired():
+                give_up(f"stream from {model_id} cut off")
+                return None
+    finally:
+        stream.close()  # Runs the streamer's cleanup (closes the connection)
+    
+    return make_response("".join(chunks), prompt, f"{provider}:{model_id}")
+
+
+# =============================================================================
+# HEDGED REQUESTS (v18.7)
+# =============================================================================
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+HEDGE_FILE = STATE_DIR / "hedge_stats.json"
+
+# Extra (duplicate) AI calls hedging may spend per day
+MAX_HEDGES_PER_DAY = int(os.environ.get("MAX_HEDGES_PER_DAY", "20"))
+
+
+class HedgeTracker:
+    """
+    Caps hedged requests per day and measures the tail latency they remove.
+    
+    A hedge "saves" time when the backup wins: the saving is how much longer
+    the abandoned primary took to finish than the hedged call as a whole.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.data = self._load()
+    
+    def _load(self) -> Dict:
+        try:
+            if state_exists(HEDGE_FILE):
+                return load_state(HEDGE_FILE)
+        except:
+            pass
+        return {
+            "date": None,
+            "hedges_today": 0,
+            "total_hedges": 0,
+            "backup_wins": 0,
+            "primary_wins": 0,
+            "both_failed": 0,
+            "seconds_saved": 0.0,
+            "recent": []
+        }
+    
+    def _save(self):
+        self.data["last_updated"] = datetime.now().isoformat()
+        try:
+            save_state(HEDGE_FILE, self.data)
+        except:
+            pass
+    
+    def _roll_day(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        if self.data.get("date") != today:
+            self.data["date"] = today
+            self.data["hedges_today"] = 0
+    
+    def can_hedge(self) -> bool:
+        """True while today's hedge budget isn't spent."""
+        with self._lock:
+            self._roll_day()
+            return self.data["hedges_today"] < MAX_HEDGES_PER_DAY
+    
+    def record_launch(self):
+        with self._lock:
+            self._roll_day()
+            self.data["hedges_today"] += 1
+            self.data["total_hedges"] += 1
+            self._save()
+    
+    def record_outcome(self, primary: str, backup: str, winner: Optional[str], elapsed: float):
+        with self._lock:
+            if winner is None:
+                self.data["both_failed"] += 1
+            elif winner == primary:
+                self.data["primary_wins"] += 1
+            else:
+                self.data["backup_wins"] += 1
+            self.data["recent"].append({
+                "primary": primary,
+                "backup": backup,
+                "winner": winner,
+                "elapsed": round(elapsed, 2),
+                "timestamp": datetime.now().isoformat()
+            })
+            self.data["recent"] = self.data["recent"][-50:]
+            self._save()
+    
+    def record_primary_latency(self, primary_latency: float, hedged_elapsed: float):
+        """Called when an abandoned primary finally finishes."""
+        with self._lock:
+            saved = max(0.0, primary_latency - hedged_elapsed)
+            self.data["seconds_saved"] = round(self.data["seconds_saved"] + saved, 2)
+            if self.data["recent"]:
+                self.data["recent"][-1]["primary_latency"] = round(primary_latency, 2)
+            self._save()
+    
+    def get_report(self) -> Dict:
+        """Hedging summary: launches, wins, quota spent and tail latency removed."""
+        with self._lock:
+            self._roll_day()
+            total = self.data["total_hedges"]
+            return {
+                "hedges_today": self.data["hedges_today"],
+                "daily_cap": MAX_HEDGES_PER_DAY,
+                "total_hedges": total,
+                "backup_win_rate": round(self.data["backup_wins"] / total, 3) if total else 0,
+                "seconds_saved": self.data["seconds_saved"],
+                "avg_seconds_saved_per_hedge": round(self.data["seconds_saved"] / total, 2) if total else 0
+            }
+
+
+_hedge_tracker = None
+
+
+def get_hedge_tracker() -> HedgeTracker:
+    """Get the global HedgeTracker instance."""
+    global _hedge_tracker
+    if _hedge_tracker is None:
+        _hedge_tracker = HedgeTracker()
+    return _hedge_tracker
+
+
+def _record_template_cache(template_id: Optional[str], hit: bool):
+    """v18.7: Per-template cache hit rates live in the prompts registry."""
+    if not template_id:
+        return
+    try:
+        from prompts_registry import get_prompts_registry
+    except ImportError:
+        try:
+            from src.ai.prompts_registry import get_prompts_registry
+        except ImportError:
+            return
+    get_prompts_registry().record_cache_result(template_id, hit)
+
+
 # =============================================================================
 # SMART AI CALLER
 # =============================================================================
@@ -203,10 +631,13 @@ class SmartAICaller:
     def __init__(self):
         self.router = get_smart_router()
         self.last_call_time = {}  # Track last call per provider
+        self.last_model_key = None  # Model that produced the last response
     
     def call(self, prompt: str, hint: str = None, 
              max_tokens: int = 2000, temperature: float = 0.8,
-             prompt_name: str = None) -> Optional[str]:
+             prompt_name: str = None, cacheable: bool = None,
+             policy: str = POLICY_BEST_QUALITY, hedge: bool = False,
+             stream_json: bool = False) -> Optional[str]:
         """
         Make an AI call with smart routing.
         
@@ -216,97 +647,346 @@ class SmartAICaller:
             max_tokens: Maximum tokens in response
             temperature: Creativity level (0-1)
             prompt_name: Optional name for prompt tracking (e.g., "VIRAL_TOPIC_PROMPT")
+            cacheable: v18.7 - Serve/store via prompt cache. None = task policy for hint
+            policy: v18.7 - "best_quality" or "fastest_acceptable" (latency-aware)
+            hedge: v18.7 - Race a second model if the first is slower than its p90
+            stream_json: v18.7 - Stream and stop once the JSON response is complete
         
         Returns:
             The AI response text, or None if all models fail
         """
         # Get fallback chain for this prompt type
         prompt_type = self.router.classify_prompt(prompt, hint)
-        chain = self.router.get_model_chain(prompt_type)
         
-        safe_print(f"   [ROUTER] Type: {prompt_type}, Chain: {len(chain)} models")
+        # v18.7: Registered templates name themselves for prompt tracking
+        template_id = getattr(prompt, "template_id", None)
+        prompt_name = prompt_name or template_id
+        
+        # v18.7: Check prompt cache before touching any provider
+        # Templated prompts use (template id, cache-relevant vars) as the key
+        cache = None
+        cache_key = getattr(prompt, "cache_key", None)
+        cache_ns = namespace_for_task(hint or prompt_type) if PROMPT_CACHE_AVAILABLE else None
+        if cacheable is None:
+            # Templated prompts have a trusted type, free-form ones need a hint
+            policy_task = hint or (prompt_type if template_id else None)
+            cacheable = PROMPT_CACHE_AVAILABLE and is_cacheable(policy_task)
+        if cacheable and PROMPT_CACHE_AVAILABLE:
+            cache = get_prompt_cache()
+            cached = cache.get(prompt, cache_ns, key=cache_key)
+            _record_template_cache(template_id, hit=cached is not None)
+            if cached:
+                safe_print(f"   [CACHE] Hit ({template_id or cache_ns})")
+                return cached
+        
+        chain = self.router.get_model_chain(prompt_type, policy, max_tokens)
+        
+        safe_print(f"   [ROUTER] Type: {prompt_type}, Policy: {policy}, Chain: {len(chain)} models")
+        
+        # v18.7: Hedged race between the top two models (opt-in, critical path)
+        tried = set()
+        result = None
+        if hedge:
+            result, tried = self._call_hedged(chain, prompt, max_tokens, temperature, stream_json)
         
         # Try each model in the chain
         for i, (model_key, model_info) in enumerate(chain):
-            # Extract provider and model_id
-            provider, model_id = model_key.split(":", 1)
-            
-            # Check if provider caller exists
-            caller = PROVIDER_CALLERS.get(provider)
-            if not caller:
+            if result:
+                break
+            if model_key in tried:
                 continue
-            
-            # Respect rate limits - v17.9.32: Use smart per-model delay with 10% margin
-            smart_delay = get_smart_delay(model_id, provider)
-            self._wait_for_rate_limit(provider, model_id, smart_delay)
-            
-            # Log attempt
-            if i > 0:
-                safe_print(f"   [FALLBACK] Trying {model_key}...")
-            else:
-                safe_print(f"   [AI] Using {model_key}")
-            
-            # Make the call with retry for transient errors
-            # v17.9.12: Exponential backoff for network/rate limit errors
-            max_retries = 3
-            retry_delay = 5  # Start with 5 seconds
-            
-            for attempt in range(max_retries):
-                try:
+            if deadline_expired():
+                give_up(f"out of time after {i} of {len(chain)} models")
+                break
+            result = self._try_model(model_key, prompt, max_tokens, temperature,
+                                     was_fallback=(i > 0 or bool(tried)),
+                                     stream_json=stream_json)
+        
+        if not result:
+            # All models failed
+            safe_print(f"   [FAIL] All {len(chain)} models failed!")
+            return None
+        
+        # v17.9.43: Record prompt performance for learning
+        if prompt_name:
+            try:
+                from prompts_registry import record_prompt_usage
+                record_prompt_usage(prompt_name, self.last_model_key, 
+                                    success=True, quality=7.5,
+                                    tokens=getattr(result, "total_tokens", None))
+            except ImportError:
+                pass  # Registry not available
+        
+        if cache is not None:
+            cache.set(prompt, result, cache_ns, key=cache_key)
+        
+        return result
+    
+    def _try_model(self, model_key: str, prompt: str, max_tokens: int,
+                   temperature: float, was_fallback: bool = False,
+                   stream_json: bool = False) -> Optional[str]:
+        """
+        Call one model (with retries for transient errors) and record the outcome.
+        
+        v18.7: stream_json streams the response and stops at the end of the
+        first complete JSON value.
+        
+        Returns:
+            The response text, or None if this model failed
+        """
+        result, error = self._call_model(model_key, prompt, max_tokens, temperature,
+                                         was_fallback, stream_json)
+        self._record_outcome(model_key, result, error, was_fallback)
+        return result
+    
+    def _record_outcome(self, model_key: str, result: Optional[str], error: Optional[str],
+                        was_fallback: bool = False):
+        """
+        v18.7: Feed one call's outcome to the router (stats, quota ledger,
+        latency, breakers). Skipped calls (error None) record nothing.
+        """
+        if result:
+            # Success! Feed latency + real token usage to the router
+            self.router.record_result(model_key, success=True,
+                                      was_fallback=was_fallback,
+                                      latency=result.latency,
+                                      output_tokens=result.completion_tokens,
+                                      tokens=result.total_tokens)
+            if was_fallback:
+                safe_print(f"   [OK] Fallback succeeded with {model_key}")
+            self.last_model_key = model_key
+        elif error is not None:
+            self.router.record_result(model_key, success=False, error=error)
+    
+    def _call_model(self, model_key: str, prompt: str, max_tokens: int,
+                    temperature: float, was_fallback: bool = False,
+                    stream_json: bool = False,
+                    decided: Optional[threading.Event] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        v18.7: Call one model without recording anything.
+        
+        Hedge workers run this directly so an abandoned request never
+        touches the router, ledger or breakers; _try_model records.
+        decided is set once a hedged race has a result: a backup that
+        hasn't sent its request yet is dropped, and nothing retries.
+        
+        Returns:
+            (response, None) on success, (None, error text) on failure,
+            (None, None) if the model was skipped without a call
+        """
+        caller = self._prepare_call(model_key, was_fallback)
+        if caller is None or (decided is not None and decided.is_set()):
+            return None, None
+        return self._send_call(model_key, caller, prompt, max_tokens, temperature,
+                               stream_json, decided)
+    
+    def _prepare_call(self, model_key: str, was_fallback: bool = False):
+        """
+        v18.7: Wait out the model's rate limit and check its breaker.
+        
+        Returns:
+            The provider caller, or None if the model must be skipped
+        """
+        # Extract provider and model_id
+        provider, model_id = model_key.split(":", 1)
+        
+        # Check if provider caller exists
+        caller = PROVIDER_CALLERS.get(provider)
+        if not caller:
+            return None
+        
+        # Respect rate limits - v17.9.32: Use smart per-model delay with 10% margin
+        smart_delay = get_smart_delay(model_id, provider)
+        if not self._wait_for_rate_limit(provider, model_id, smart_delay):
+            return None  # v18.7: Waiting would overrun the deadline - next model
+        
+        # v18.7: An open breaker skips the model without retrying
+        # (in HALF_OPEN this call becomes the single probe)
+        if CIRCUIT_BREAKERS_AVAILABLE and not get_breaker_registry().allow(model_key):
+            safe_print(f"   [BREAKER] Skipping {model_key} (circuit open)")
+            return None
+        
+        # Log attempt
+        if was_fallback:
+            safe_print(f"   [FALLBACK] Trying {model_key}...")
+        else:
+            safe_print(f"   [AI] Using {model_key}")
+        return caller
+    
+    def _send_call(self, model_key: str, caller, prompt: str, max_tokens: int,
+                   temperature: float, stream_json: bool = False,
+                   decided: Optional[threading.Event] = None) -> Tuple[Optional[str], Optional[str]]:
+        """v18.7: Send the request (with retries) once _prepare_call has cleared it."""
+        provider, model_id = model_key.split(":", 1)
+        
+        # Make the call with retry for transient errors
+        # v17.9.12: Exponential backoff for network/rate limit errors
+        max_retries = 3
+        retry_delay = 5  # Start with 5 seconds
+        
+        for attempt in range(max_retries):
+            if attempt and decided is not None and decided.is_set():
+                return None, error_str  # The hedge race was decided during the backoff
+            try:
+                started = time.time()
+                if stream_json and provider in PROVIDER_STREAMERS:
+                    result = _call_streaming(provider, model_id, prompt, max_tokens, temperature)
+                else:
                     result = caller(model_id, prompt, max_tokens, temperature)
+                
+                if result:
+                    return make_response(result, prompt, model_key,
+                                         latency=time.time() - started), None
+                # Empty response, try next model (don't retry empty responses)
+                return None, "empty response"
                     
-                    if result:
-                        # Success!
-                        self.router.record_result(model_key, success=True, 
-                                                  was_fallback=(i > 0))
-                        if i > 0:
-                            safe_print(f"   [OK] Fallback succeeded with {model_key}")
-                        
-                        # v17.9.43: Record prompt performance for learning
-                        if prompt_name:
-                            try:
-                                from prompts_registry import record_prompt_usage
-                                record_prompt_usage(prompt_name, model_key, 
-                                                    success=True, response_quality=7.5)
-                            except ImportError:
-                                pass  # Registry not available
-                        
-                        return result
-                    else:
-                        # Empty response, try next model
-                        self.router.record_result(model_key, success=False)
-                        break  # Don't retry empty responses
-                        
-                except Exception as e:
-                    error_str = str(e)
-                    # Retry for rate limits (429) and network errors
-                    is_retryable = '429' in error_str or 'timeout' in error_str.lower() or \
-                                   'connection' in error_str.lower() or 'network' in error_str.lower()
-                    
-                    # v17.9.13: Record quota from 429 errors for smarter model selection
-                    if '429' in error_str:
-                        import re
-                        match = re.search(r'quota_value[:\s]+(\d+)', error_str)
-                        if match:
-                            try:
-                                from src.ai.model_helper import record_quota_from_429
-                                model_name = model_id.split(':')[-1] if ':' in model_id else model_id
-                                record_quota_from_429(model_name, int(match.group(1)))
-                            except ImportError:
-                                pass  # Function not available
-                    
-                    if is_retryable and attempt < max_retries - 1:
-                        safe_print(f"   [!] {model_key}: {error_str[:50]}... retrying in {retry_delay}s")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
-                    else:
-                        safe_print(f"   [!] {model_key} exception: {e}")
-                        self.router.record_result(model_key, success=False)
-                        break  # Move to next model
-        
-        # All models failed
-        safe_print(f"   [FAIL] All {len(chain)} models failed!")
-        return None
+            except Exception as e:
+                error_str = str(e)
+                # Retry for rate limits (429) and network errors
+                is_retryable = '429' in error_str or 'timeout' in error_str.lower() or \
+                               'connection' in error_str.lower() or 'network' in error_str.lower()
+                
+                # v17.9.13: Record quota from 429 errors for smarter model selection
+                if '429' in error_str:
+                    match = re.search(r'quota_value[:\s]+(\d+)', error_str)
+                    if match:
+                        try:
+                            from src.ai.model_helper import record_quota_from_429
+                            model_name = model_id.split(':')[-1] if ':' in model_id else model_id
+                            record_quota_from_429(model_name, int(match.group(1)))
+                        except ImportError:
+                            pass  # Function not available
+                
+                # v18.7: Never retry a removed model, and stop once the
+                # provider's breaker has opened (other calls saw the outage)
+                if CIRCUIT_BREAKERS_AVAILABLE:
+                    if classify_error(error_str) == ERROR_NOT_FOUND:
+                        is_retryable = False
+                    elif not get_breaker_registry().is_available(model_key):
+                        is_retryable = False
+                
+                # v18.7: A decided hedge race doesn't need this answer any more
+                if decided is not None and decided.is_set():
+                    is_retryable = False
+                
+                # v18.7: Backoff only while the stage deadline leaves room
+                if is_retryable and attempt < max_retries - 1 and sleep_within(retry_delay):
+                    safe_print(f"   [!] {model_key}: {error_str[:50]}... retried after {retry_delay}s")
+                    retry_delay *= 2  # Exponential backoff
+                else:
+                    safe_print(f"   [!] {model_key} exception: {e}")
+                    return None, error_str  # Move to next model
+        
+        return None, None
+    
+    def _call_hedged(self, chain: List[Tuple[str, ModelInfo]], prompt: str,
+                     max_tokens: int, temperature: float,
+                     stream_json: bool = False) -> Tuple[Optional[str], set]:
+        """
+        v18.7: Hedged request for latency-critical stages.
+        
+        Starts the primary model; if it hasn't answered by its recorded p90
+        latency, sends the same prompt to the next model with spare quota and
+        takes whichever valid response arrives first. The primary's rate-limit
+        wait and breaker check happen here, before the hedge timer starts, so
+        only time spent on the request itself can trigger a hedge.
+        
+        The provider SDKs used here can't abort an in-flight HTTP request, so
+        the loser is abandoned (not waited on) but stops retrying. The winner,
+        and requests that failed before a winner was found, are recorded as
+        usual; a loser that still reached the provider is charged to the
+        router and ledger via record_abandoned when it finishes.
+        
+        Returns:
+            (result or None, set of model keys already tried)
+        """
+        candidates = [(k, m) for k, m in chain if PROVIDER_CALLERS.get(k.split(":", 1)[0])]
+        if not candidates:
+            return None, set()
+        
+        primary_key = candidates[0][0]
+        backup_key = None
+        for key, _ in candidates[1:]:
+            if key.split(":", 1)[0] != primary_key.split(":", 1)[0] and \
+                    self.router.is_model_available(key):
+                backup_key = key
+                break
+        
+        caller = self._prepare_call(primary_key)
+        if caller is None:
+            return None, {primary_key}  # Skipped - the normal chain takes over
+        
+        tracker = get_hedge_tracker()
+        hedge_after = self.router.expected_latency(primary_key)
+        stats = self.router.get_latency_stats(primary_key)
+        if stats:
+            hedge_after = stats["p90"]
+        
+        decided = threading.Event()
+        started = time.time()
+        pool = ThreadPoolExecutor(max_workers=2)
+        # Each worker runs in a copy of this context so it sees the deadline
+        futures = {pool.submit(contextvars.copy_context().run, self._send_call, primary_key, caller, prompt,
+                               max_tokens, temperature, stream_json, decided): primary_key}
+        tried = {primary_key}
+        
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done and backup_key and tracker.can_hedge():
+            safe_print(f"   [HEDGE] {primary_key} slower than p90 ({hedge_after:.1f}s), "
+                       f"racing {backup_key}")
+            tracker.record_launch()
+            futures[pool.submit(contextvars.copy_context().run, self._call_model, backup_key, prompt, max_tokens,
+                                temperature, True, stream_json, decided)] = backup_key
+            tried.add(backup_key)
+        
+        result, winner = None, None
+        pending = set(futures)
+        while pending and not result:
+            # v18.7: Abandon both requests when the stage deadline runs out
+            done, pending = wait(pending, timeout=time_left(), return_when=FIRST_COMPLETED)
+            if not done:
+                give_up("hedged requests abandoned")
+                break
+            for future in done:
+                model_key = futures[future]
+                response, error = future.result()
+                if response and not result:
+                    result, winner = response, model_key
+                    self._record_outcome(model_key, response, None, model_key != primary_key)
+                elif response:
+                    # Both finished together - the second answer still used quota
+                    self.router.record_abandoned(model_key, True, response.total_tokens,
+                                                 response.latency)
+                else:
+                    self._record_outcome(model_key, None, error, model_key != primary_key)
+        decided.set()
+        
+        elapsed = time.time() - started
+        if len(futures) > 1:
+            tracker.record_outcome(primary_key, backup_key, winner, elapsed)
+        
+        for future in pending:
+            model_key = futures[future]
+            # Backup won - also measure how long the primary would have taken
+            measure = winner == backup_key and model_key == primary_key
+            future.add_done_callback(
+                lambda f, key=model_key, measure=measure: self._settle_abandoned(
+                    key, f, tracker if measure else None, started, elapsed))
+        
+        # Don't block on the abandoned request
+        pool.shutdown(wait=False)
+        return result, tried
+    
+    def _settle_abandoned(self, model_key: str, future, tracker, started: float,
+                          elapsed: float):
+        """v18.7: Charge a finished hedge loser's call (done-callback, worker thread)."""
+        response, error = future.result()
+        if response:
+            self.router.record_abandoned(model_key, True, response.total_tokens, response.latency)
+        elif error is not None:
+            self.router.record_abandoned(model_key, False, error=error)
+        if tracker is not None:
+            tracker.record_primary_latency(time.time() - started, elapsed)
     
     def _wait_for_rate_limit(self, provider: str, model_id: str, delay: float):
         """
@@ -316,6 +996,9 @@ class SmartAICaller:
         of the same provider have different rate limits.
         
         E.g., gemini-2.5-flash (15/min) vs gemini-2.5-pro (2/min)
+        
+        v18.7: Returns False (without waiting) if the wait would overrun the
+        current stage deadline.
         """
         model_key = f"{provider}:{model_id}"
         now = time.time()
@@ -324,10 +1007,13 @@ class SmartAICaller:
         
         if elapsed < delay:
             wait_time = delay - elapsed
-            safe_print(f"   [RATE] Waiting {wait_time:.1f}s for {model_id} rate limit")
-            time.sleep(wait_time)
+            if not sleep_within(wait_time):
+                safe_print(f"   [DEADLINE] Skipping {model_id} - {wait_time:.1f}s rate-limit wait exceeds budget")
+                return False
+            safe_print(f"   [RATE] Waited {wait_time:.1f}s for {model_id} rate limit")
         
         self.last_call_time[model_key] = time.time()
+        return True
     
     def parse_json(self, text: str) -> Optional[Dict]:
         """Parse JSON from AI response."""
@@ -362,7 +1048,10 @@ class SmartAICaller:
     
     def get_stats(self) -> Dict:
         """Get router/caller statistics."""
-        return self.router.get_stats()
+        stats = self.router.get_stats()
+        stats["hedging"] = get_hedge_tracker().get_report()  # v18.7
+        stats["streaming"] = dict(STREAM_STATS)  # v18.7
+        return stats
 
 
 # =============================================================================
@@ -382,7 +1071,9 @@ def get_smart_caller() -> SmartAICaller:
 
 def smart_call_ai(prompt: str, hint: str = None,
                   max_tokens: int = 2000, temperature: float = 0.8,
-                  prompt_name: str = None) -> Optional[str]:
+                  prompt_name: str = None, cacheable: bool = None,
+                  policy: str = POLICY_BEST_QUALITY, hedge: bool = False,
+                  stream_json: bool = False) -> Optional[str]:
     """
     Convenience function for smart AI calls.
     
@@ -392,6 +1083,10 @@ def smart_call_ai(prompt: str, hint: str = None,
         hint: Optional hint about prompt type
         max_tokens: Maximum tokens
         temperature: Creativity level
+        cacheable: Use the prompt cache (None = policy for the hint's task)
+        policy: "best_quality" or "fastest_acceptable"
+        hedge: Race a second model past the first model's p90 latency
+        stream_json: Stream and stop at the end of the first JSON value
     
     Returns:
         AI response text or None
@@ -403,19 +1098,23 @@ def smart_call_ai(prompt: str, hint: str = None,
         )
     """
     caller = get_smart_caller()
-    return caller.call(prompt, hint, max_tokens, temperature, prompt_name)
+    return caller.call(prompt, hint, max_tokens, temperature, prompt_name, cacheable,
+                       policy, hedge, stream_json)
 
 
 def smart_call_json(prompt: str, hint: str = None,
                     max_tokens: int = 2000, temperature: float = 0.7,
-                    prompt_name: str = None) -> Optional[Dict]:
+                    prompt_name: str = None, cacheable: bool = None,
+                    policy: str = POLICY_BEST_QUALITY, stream_json: bool = True) -> Optional[Dict]:
     """
     Make AI call and parse JSON response.
     
     Lower default temperature for more consistent JSON output.
+    v18.7: Streams by default and stops as soon as the JSON is complete.
     """
     caller = get_smart_caller()
-    text = caller.call(prompt, hint, max_tokens, temperature, prompt_name)
+    text = caller.call(prompt, hint, max_tokens, temperature, prompt_name, cacheable,
+                       policy, stream_json=stream_json)
     return caller.parse_json(text)
 
 
@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """
-ViralShorts Factory - Smart Model Router v17.9.9
-=================================================
+ViralShorts Factory - Smart Model Router v18.7
+===============================================
 
 INTELLIGENT model selection that:
 1. Routes each PROMPT TYPE to the BEST model for that type
-2. Updates model rankings PERIODICALLY (weekly by default)
+2. Updates model rankings PERIODICALLY (in the background, v18.7)
 3. Has FALLBACK CHAINS for every prompt type
 4. GUARANTEES eventual success (never runs out of quota)
 5. Uses PROMPTS REGISTRY to learn optimal models per prompt
@@ -21,10 +21,14 @@ PROMPT TYPES:
 - EVALUATION: Scoring, quality checks (need structured output)
 - SIMPLE: Hashtags, keywords, SEO (speed matters most)
 - ANALYSIS: Analytics, trends, strategy (need deep reasoning)
+
+ROUTING POLICIES (v18.7):
+- best_quality: Ranked chain (quality, quota, failures) - default
+- fastest_acceptable: Lowest expected completion time among models
+  above the prompt type's quality floor, measured from real calls
 """
 
 import os
-import json
 import time
 import re
 from datetime import datetime, timedelta
@@ -33,12 +37,58 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import hashlib
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # State directory for caching
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 ROUTER_CACHE_FILE = STATE_DIR / "smart_router_cache.json"
 ROUTER_STATS_FILE = STATE_DIR / "smart_router_stats.json"
+ROUTER_LATENCY_FILE = STATE_DIR / "smart_router_latency.json"
+
+# v18.7: Model pool shared through the discovery snapshot
+DISCOVERY_KEY = "smart_model_router:models"
+
+try:
+    from discovery_cache import get_discovery_cache
+    DISCOVERY_CACHE_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.discovery_cache import get_discovery_cache
+        DISCOVERY_CACHE_AVAILABLE = True
+    except ImportError:
+        DISCOVERY_CACHE_AVAILABLE = False
+
+# v18.7: Per-model daily calls are kept in the shared quota ledger
+try:
+    from quota_ledger import get_quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.quota_ledger import get_quota_ledger
+        QUOTA_LEDGER_AVAILABLE = True
+    except ImportError:
+        QUOTA_LEDGER_AVAILABLE = False
+
+# v18.7: Per-provider / per-model circuit breakers
+try:
+    from circuit_breaker import get_breaker_registry
+    CIRCUIT_BREAKERS_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.circuit_breaker import get_breaker_registry
+        CIRCUIT_BREAKERS_AVAILABLE = True
+    except ImportError:
+        CIRCUIT_BREAKERS_AVAILABLE = False
+
+# v18.7: Routing policies a call site can choose
+POLICY_BEST_QUALITY = "best_quality"
+POLICY_FASTEST = "fastest_acceptable"
 
 
 def safe_print(msg: str):
@@ -245,6 +295,17 @@ class SmartModelRouter:
         "mixtral-8x7b-32768": 100,
     }
     
+    # v18.7: Latency tracking - rolling window of recent successful calls
+    LATENCY_WINDOW = 100
+    
+    # v18.7: Minimum quality for "fastest_acceptable" per prompt type
+    QUALITY_FLOORS = {
+        "creative": 7.0,
+        "evaluation": 7.5,
+        "simple": 6.5,
+        "analysis": 7.5,
+    }
+    
     def __init__(self):
         self.models = {}
         self.rankings = {}  # {prompt_type: [ordered list of model keys]}
@@ -255,25 +316,30 @@ class SmartModelRouter:
         self.model_usage_today = {}  # {model_name: count}
         self.usage_date = None  # Track which day the usage is for
         
+        # v18.7: {template_id: prompt type} from the prompts registry
+        self._template_types = {}
+        
+        # v18.7: {model_key: [[latency_seconds, output_tokens], ...]}
+        self.latency = {}
+        
         # Load cached data or initialize
         self._load_cache()
         
-        # Refresh if needed
+        # Refresh if needed - v18.7: in the background, never blocking startup
         if self._needs_refresh():
-            self.refresh_rankings()
+            self._refresh_in_background()
     
     def _load_cache(self):
         """Load cached router data."""
         try:
-            if ROUTER_CACHE_FILE.exists():
-                with open(ROUTER_CACHE_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.rankings = data.get("rankings", {})
-                    self.last_refresh = data.get("last_refresh")
-                    # Reconstruct models from cache
-                    for key, model_data in data.get("models", {}).items():
-                        self.models[key] = ModelInfo(**model_data)
-                    safe_print(f"[ROUTER] Loaded cached rankings from {self.last_refresh}")
+            if state_exists(ROUTER_CACHE_FILE):
+                data = load_state(ROUTER_CACHE_FILE)
+                self.rankings = data.get("rankings", {})
+                self.last_refresh = data.get("last_refresh")
+                # Reconstruct models from cache
+                for key, model_data in data.get("models", {}).items():
+                    self.models[key] = ModelInfo(**model_data)
+                safe_print(f"[ROUTER] Loaded cached rankings from {self.last_refresh}")
             else:
                 self._use_defaults()
         except Exception as e:
@@ -282,9 +348,15 @@ class SmartModelRouter:
         
         # Load stats
         try:
-            if ROUTER_STATS_FILE.exists():
-                with open(ROUTER_STATS_FILE, 'r') as f:
-                    self.stats = json.load(f)
+            if state_exists(ROUTER_STATS_FILE):
+                self.stats = load_state(ROUTER_STATS_FILE)
+        except:
+            pass
+        
+        # v18.7: Load latency samples
+        try:
+            if state_exists(ROUTER_LATENCY_FILE):
+                self.latency = load_state(ROUTER_LATENCY_FILE).get("samples", {})
         except:
             pass
     
@@ -301,16 +373,26 @@ class SmartModelRouter:
                 "last_refresh": self.last_refresh,
                 "models": {k: asdict(v) for k, v in self.models.items()}
             }
-            with open(ROUTER_CACHE_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            save_state(ROUTER_CACHE_FILE, data)
         except Exception as e:
             safe_print(f"[ROUTER] Cache save failed: {e}")
     
     def _save_stats(self):
         """Save usage stats."""
         try:
-            with open(ROUTER_STATS_FILE, 'w') as f:
-                json.dump(self.stats, f, indent=2)
+            save_state(ROUTER_STATS_FILE, self.stats)
+        except:
+            pass
+    
+    def _save_latency(self):
+        """v18.7: Save latency samples and their summary."""
+        try:
+            data = {
+                "updated_at": datetime.now().isoformat(),
+                "summary": {key: self.get_latency_stats(key) for key in self.latency},
+                "samples": self.latency
+            }
+            save_state(ROUTER_LATENCY_FILE, data)
         except:
             pass
     
@@ -334,25 +416,76 @@ class SmartModelRouter:
         2. Testing availability
         3. Computing rankings for each prompt type
         
-        Called periodically (weekly by default) or on-demand.
+        Synchronous - used for forced refreshes. Startup goes through
+        _refresh_in_background() instead.
         """
         safe_print("[ROUTER] Refreshing model rankings...")
+        pool = self._discover_model_pool()
+        if DISCOVERY_CACHE_AVAILABLE:
+            get_discovery_cache().put(DISCOVERY_KEY, pool)
+        self._apply_model_pool(pool)
+    
+    def _refresh_in_background(self):
+        """
+        v18.7: Stale-while-revalidate refresh.
+        
+        Serves cached (or default) rankings immediately. If another run already
+        refreshed the shared discovery snapshot, adopt it; otherwise probe the
+        providers in a background thread and swap the pool in when done.
+        """
+        if not DISCOVERY_CACHE_AVAILABLE:
+            self.refresh_rankings()
+            return
+        
+        discovery = get_discovery_cache()
+        pool = discovery.peek(DISCOVERY_KEY)
+        if pool and not discovery.is_stale(DISCOVERY_KEY, self.REFRESH_INTERVAL):
+            safe_print("[ROUTER] Using model pool from discovery snapshot")
+            self._apply_model_pool(pool)
+            return
+        
+        if pool and not self.models:
+            self._apply_model_pool(pool, save=False)
+        elif not self.rankings:
+            self._use_defaults()
+        
+        def revalidate():
+            pool = self._discover_model_pool()
+            self._apply_model_pool(pool)
+            return pool
+        
+        discovery.refresh_async(DISCOVERY_KEY, revalidate)
+    
+    def _discover_model_pool(self) -> Dict[str, Dict]:
+        """Probe every provider into a fresh model pool (network, no side effects)."""
+        probe = SmartModelRouter.__new__(SmartModelRouter)
         
         # Start with defaults
-        self.models = DEFAULT_MODELS.copy()
+        probe.models = DEFAULT_MODELS.copy()
         
         # Discover additional models from each provider
-        self._discover_groq_models()
-        self._discover_gemini_models()
-        self._discover_openrouter_models()
-        self._discover_huggingface_models()
+        probe._discover_groq_models()
+        probe._discover_gemini_models()
+        probe._discover_openrouter_models()
+        probe._discover_huggingface_models()
+        
+        return {k: asdict(v) for k, v in probe.models.items()}
+    
+    def _apply_model_pool(self, pool: Dict[str, Dict], save: bool = True):
+        """Rank a discovered pool off to the side, then swap it in."""
+        staged = SmartModelRouter.__new__(SmartModelRouter)
+        staged.models = {k: ModelInfo(**v) for k, v in pool.items()}
+        staged.rankings = {}
         
         # Compute rankings for each prompt type
-        self._compute_rankings()
+        staged._compute_rankings()
         
-        # Save to cache
+        self.models, self.rankings = staged.models, staged.rankings
         self.last_refresh = datetime.now().isoformat()
-        self._save_cache()
+        
+        # Save to cache
+        if save:
+            self._save_cache()
         
         safe_print(f"[ROUTER] Rankings updated: {len(self.models)} models, "
                    f"{len(self.rankings)} prompt types")
@@ -548,8 +681,6 @@ class SmartModelRouter:
         - Remaining daily quota (avoid exhausted models)
         - Consecutive failures (deprioritize failing models)
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        
         for prompt_type_name, prompt_type in PROMPT_TYPES.items():
             scored_models = []
             
@@ -586,7 +717,7 @@ class SmartModelRouter:
                 
                 # v17.9.10: QUOTA-AWARE SCORING
                 # Penalize models that are close to exhaustion
-                calls_today = model.calls_today if model.last_call_date == today else 0
+                calls_today = self._calls_today(key, model)
                 remaining_quota = max(0, model.daily_limit - calls_today)
                 quota_ratio = remaining_quota / max(1, model.daily_limit)
                 
@@ -623,6 +754,13 @@ class SmartModelRouter:
         Returns:
             Prompt type name ("creative", "evaluation", "simple", "analysis")
         """
+        # v18.7: Registered templates carry their type - no keyword scan needed
+        template_id = getattr(prompt, "template_id", None)
+        if template_id:
+            template_type = self._template_type(template_id)
+            if template_type in PROMPT_TYPES:
+                return template_type
+        
         prompt_lower = prompt.lower()
         
         # If hint provided, try to match it first
@@ -645,10 +783,29 @@ class SmartModelRouter:
         
         return "simple"  # Default
     
-    def get_model_chain(self, prompt_type: str) -> List[Tuple[str, ModelInfo]]:
+    def _template_type(self, template_id: str) -> Optional[str]:
+        """v18.7: Prompt type of a registered template (memoised per router)."""
+        if template_id not in self._template_types:
+            try:
+                try:
+                    from src.ai.prompts_registry import get_prompts_registry
+                except ImportError:
+                    from prompts_registry import get_prompts_registry
+                self._template_types[template_id] = get_prompts_registry().get_prompt_type(template_id)
+            except Exception:
+                self._template_types[template_id] = None
+        return self._template_types[template_id]
+    
+    def get_model_chain(self, prompt_type: str, policy: str = POLICY_BEST_QUALITY,
+                        max_tokens: int = None) -> List[Tuple[str, ModelInfo]]:
         """
         Get the full fallback chain for a prompt type.
         
+        Args:
+            prompt_type: Prompt type name
+            policy: v18.7 - "best_quality" (ranked) or "fastest_acceptable"
+            max_tokens: Expected response size, used by "fastest_acceptable"
+        
         Returns:
             List of (model_key, ModelInfo) tuples in priority order
         """
@@ -665,20 +822,132 @@ class SmartModelRouter:
             for key, model in self.models.items():
                 chain.append((key, model))
         
+        # v18.7: Skip models whose breaker (or provider breaker) is open.
+        # If every breaker is open, keep the chain - the caller's allow()
+        # check still skips them instantly once their cooldown is running.
+        if CIRCUIT_BREAKERS_AVAILABLE:
+            breakers = get_breaker_registry()
+            closed = [(k, m) for k, m in chain if breakers.is_available(k)]
+            if closed:
+                chain = closed
+        
+        if policy == POLICY_FASTEST:
+            chain = self._fastest_acceptable(chain, prompt_type, max_tokens)
+        
         return chain
     
-    def _is_model_exhausted(self, model_key: str, model: ModelInfo) -> bool:
+    # =========================================================================
+    # v18.7: LATENCY-AWARE ROUTING
+    # =========================================================================
+    
+    def _type_quality(self, model: ModelInfo, prompt_type: str) -> float:
+        """Quality score that matters for a prompt type."""
+        if prompt_type == "creative":
+            return model.quality_creative
+        if prompt_type in ("evaluation", "simple"):
+            return model.quality_structured
+        return model.quality_general
+    
+    def _fastest_acceptable(self, chain: List[Tuple[str, ModelInfo]], prompt_type: str,
+                            max_tokens: int = None) -> List[Tuple[str, ModelInfo]]:
         """
-        v17.9.43: Check if a model has hit its daily quota.
+        Reorder a ranked chain by expected completion time.
         
-        Returns True if we should skip this model and try next in chain.
+        Models at or above the quality floor come first (fastest first);
+        the rest keep their ranked order as fallbacks. Broken models
+        (3+ consecutive failures) are never promoted.
         """
-        today = datetime.now().strftime("%Y-%m-%d")
+        floor = self.QUALITY_FLOORS.get(prompt_type, 7.0)
+        acceptable, rest = [], []
+        for key, model in chain:
+            if self._type_quality(model, prompt_type) >= floor and model.consecutive_failures < 3:
+                acceptable.append((key, model))
+            else:
+                rest.append((key, model))
+        
+        acceptable.sort(key=lambda item: self.expected_latency(item[0], max_tokens))
+        return acceptable + rest
+    
+    def _prior_latency(self, model_key: str) -> float:
+        """Latency guess (seconds) for models without measurements."""
+        model = self.models.get(model_key)
+        speed = model.quality_speed if model else 5.0
+        return 1.0 + (10.0 - speed) * 1.5
+    
+    def expected_latency(self, model_key: str, max_tokens: int = None) -> float:
+        """
+        Expected completion time in seconds.
         
-        # Reset counter if new day
-        if model.last_call_date != today:
+        Uses measured tokens/sec when a response size is given, otherwise
+        the median latency. Unmeasured models fall back to quality_speed.
+        """
+        stats = self.get_latency_stats(model_key)
+        if not stats:
+            return self._prior_latency(model_key)
+        if max_tokens and stats["tokens_per_sec"] > 0:
+            # Responses rarely use the full budget - assume half of it,
+            # capped by what we've actually seen this model take
+            estimate = (max_tokens * 0.5) / stats["tokens_per_sec"]
+            return min(estimate, stats["p90"])
+        return stats["p50"]
+    
+    def record_latency(self, model_key: str, seconds: float, output_tokens: int = 0):
+        """v18.7: Record a successful call's latency and output size."""
+        samples = self.latency.setdefault(model_key, [])
+        samples.append([round(seconds, 3), int(output_tokens or 0)])
+        if len(samples) > self.LATENCY_WINDOW:
+            del samples[:len(samples) - self.LATENCY_WINDOW]
+    
+    def get_latency_stats(self, model_key: str) -> Optional[Dict]:
+        """
+        v18.7: Latency percentiles and throughput for a model.
+        
+        Returns:
+            {"samples", "p50", "p90", "p99", "tokens_per_sec"} or None
+        """
+        samples = self.latency.get(model_key)
+        if not samples:
+            return None
+        
+        latencies = sorted(s[0] for s in samples)
+        
+        def percentile(p: float) -> float:
+            index = min(len(latencies) - 1, int(round(p * (len(latencies) - 1))))
+            return round(latencies[index], 3)
+        
+        total_time = sum(s[0] for s in samples if s[1] > 0)
+        total_tokens = sum(s[1] for s in samples if s[1] > 0)
+        return {
+            "samples": len(latencies),
+            "p50": percentile(0.50),
+            "p90": percentile(0.90),
+            "p99": percentile(0.99),
+            "tokens_per_sec": round(total_tokens / total_time, 1) if total_time > 0 else 0.0
+        }
+    
+    def _calls_today(self, model_key: str, model: ModelInfo) -> int:
+        """
+        v18.7: Today's calls for a model.
+        
+        Read from the quota ledger when available, so the count survives
+        restarts between the day's workflow runs.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        if QUOTA_LEDGER_AVAILABLE:
+            model.calls_today = get_quota_ledger().model_usage(model_key)["calls"]
+            model.last_call_date = today
+        elif model.last_call_date != today:
             model.calls_today = 0
             model.last_call_date = today
+        return model.calls_today
+    
+    def _is_model_exhausted(self, model_key: str, model: ModelInfo) -> bool:
+        """
+        v17.9.43: Check if a model has hit its daily quota.
+        
+        Returns True if we should skip this model and try next in chain.
+        """
+        if self._calls_today(model_key, model) == 0:
             return False
         
         # Get quota for this model
@@ -694,6 +963,22 @@ class SmartModelRouter:
         
         return False
     
+    def is_model_available(self, model_key: str) -> bool:
+        """
+        v18.7: Whether a model can take a call right now.
+        
+        False if it is unknown, disabled, out of daily quota or behind an
+        open circuit breaker.
+        """
+        model = self.models.get(model_key)
+        if model is None or not model.available:
+            return False
+        if self._is_model_exhausted(model_key, model):
+            return False
+        if CIRCUIT_BREAKERS_AVAILABLE and not get_breaker_registry().is_available(model_key):
+            return False
+        return True
+    
     def get_best_model(self, prompt: str, hint: str = None, 
                        prompt_name: str = None) -> Tuple[str, ModelInfo]:
         """
@@ -752,8 +1037,19 @@ class SmartModelRouter:
             return (key, model)
         raise ValueError("No models available - check API keys and network connection")
     
-    def record_result(self, model_key: str, success: bool, was_fallback: bool = False):
-        """Record the result of a model call for stats."""
+    def record_result(self, model_key: str, success: bool, was_fallback: bool = False,
+                      latency: float = None, output_tokens: int = None,
+                      error: str = None, tokens: int = None):
+        """
+        Record the result of a model call for stats.
+        
+        v18.7: latency (seconds) and output_tokens of successful calls feed
+        the per-model latency percentiles used by "fastest_acceptable".
+        The outcome (and error text of a failure) also feeds the circuit
+        breakers. tokens = prompt + completion tokens the provider reported;
+        successful calls are charged to both the model and its provider in
+        the quota ledger.
+        """
         self.stats["calls"] = self.stats.get("calls", 0) + 1
         if success:
             self.stats["successes"] = self.stats.get("successes", 0) + 1
@@ -772,12 +1068,7 @@ class SmartModelRouter:
         # v17.9.10: Track daily usage per model to prevent quota exhaustion
         if model_key in self.models:
             model = self.models[model_key]
-            today = datetime.now().strftime("%Y-%m-%d")
-            # Reset daily counter if new day
-            if model.last_call_date != today:
-                model.calls_today = 0
-                model.last_call_date = today
-            model.calls_today += 1
+            self._charge_call(model_key, model, success, tokens or output_tokens or 0)
             # Track consecutive failures for deprioritization
             if success:
                 model.consecutive_failures = 0
@@ -788,9 +1079,58 @@ class SmartModelRouter:
                     model.available = False
                     safe_print(f"[ROUTER] Auto-disabled {model_key} after 5 consecutive failures")
         
+        if success and latency is not None:
+            self.record_latency(model_key, latency, output_tokens)
+        
+        if CIRCUIT_BREAKERS_AVAILABLE:
+            if success:
+                get_breaker_registry().record_success(model_key, latency)
+            else:
+                get_breaker_registry().record_failure(model_key, error or "")
+        
         # Save periodically (every 10 calls)
         if self.stats["calls"] % 10 == 0:
             self._save_stats()
+            self._save_latency()
+    
+    def _charge_call(self, model_key: str, model: ModelInfo, success: bool, tokens: int = 0):
+        """
+        v18.7: Count one call against the model's daily quota.
+        
+        Successful calls charge their tokens to the model and its provider
+        in the quota ledger; failed calls count against the model only.
+        """
+        if QUOTA_LEDGER_AVAILABLE:
+            if success:
+                get_quota_ledger().record_usage(model.provider, tokens, model=model_key)
+            else:
+                get_quota_ledger().record_model_call(model_key, 0)
+            self._calls_today(model_key, model)
+        else:
+            today = datetime.now().strftime("%Y-%m-%d")
+            # Reset daily counter if new day
+            if model.last_call_date != today:
+                model.calls_today = 0
+                model.last_call_date = today
+            model.calls_today += 1
+    
+    def record_abandoned(self, model_key: str, success: bool, tokens: int = 0,
+                         latency: float = None, error: str = None):
+        """
+        v18.7: Record a request whose answer was not used (a hedge loser).
+        
+        It still reached the provider, so its quota is charged and its
+        breaker sees the outcome, but it never counts as a success,
+        fallback or latency sample in the router's stats.
+        """
+        model = self.models.get(model_key)
+        if model is not None:
+            self._charge_call(model_key, model, success, tokens)
+        if CIRCUIT_BREAKERS_AVAILABLE:
+            if success:
+                get_breaker_registry().record_success(model_key, latency)
+            else:
+                get_breaker_registry().record_failure(model_key, error or "")
     
     def get_stats(self) -> Dict:
         """Get router statistics."""
@@ -801,7 +1141,9 @@ class SmartModelRouter:
             "success_rate": (self.stats.get("successes", 0) / max(1, self.stats.get("calls", 1))) * 100,
             "fallback_rate": (self.stats.get("fallbacks", 0) / max(1, self.stats.get("calls", 1))) * 100,
             "models_used": len(self.stats.get("models", {})),
-            "last_refresh": self.last_refresh
+            "last_refresh": self.last_refresh,
+            "latency": {key: self.get_latency_stats(key) for key in self.latency},
+            "breakers": get_breaker_registry().get_report()["open"] if CIRCUIT_BREAKERS_AVAILABLE else []
         }
     
     def print_rankings(self):
@@ -815,8 +1157,10 @@ class SmartModelRouter:
             for i, key in enumerate(model_keys[:5], 1):
                 model = self.models.get(key)
                 if model:
+                    latency = self.get_latency_stats(key)
+                    timing = f", p50={latency['p50']}s p90={latency['p90']}s" if latency else ""
                     safe_print(f"  {i}. {key} (quality={model.quality_general}, "
-                              f"robust={model.robustness:.0%})")
+                              f"robust={model.robustness:.0%}{timing})")
         
         safe_print("\n" + "=" * 60)
 
@@ -848,7 +1192,7 @@ def get_best_model_for_prompt(prompt: str, hint: str = None) -> Tuple[str, Dict]
     return key, asdict(info)
 
 
-def get_fallback_chain(prompt_type: str) -> List[Tuple[str, Dict]]:
+def get_fallback_chain(prompt_type: str, policy: str = POLICY_BEST_QUALITY) -> List[Tuple[str, Dict]]:
     """
     Get the fallback chain for a prompt type.
     
@@ -856,7 +1200,7 @@ def get_fallback_chain(prompt_type: str) -> List[Tuple[str, Dict]]:
         List of (model_key, model_info_dict)
     """
     router = get_smart_router()
-    chain = router.get_model_chain(prompt_type)
+    chain = router.get_model_chain(prompt_type, policy)
     return [(key, asdict(info)) for key, info in chain]
 
 
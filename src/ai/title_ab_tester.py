@@ -20,12 +20,31 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Smart AI caller
 try:
     from src.ai.smart_ai_caller import smart_call_ai
 except ImportError:
     smart_call_ai = None
 
+# v18.7: All variants from one AI call, ranked locally
+try:
+    from candidate_tournament import get_candidate_tournament, candidates_instruction, parse_candidates
+    CANDIDATE_TOURNAMENT_AVAILABLE = True
+except ImportError:
+    try:
+        from src.ai.candidate_tournament import (
+            get_candidate_tournament, candidates_instruction, parse_candidates
+        )
+        CANDIDATE_TOURNAMENT_AVAILABLE = True
+    except ImportError:
+        CANDIDATE_TOURNAMENT_AVAILABLE = False
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -95,9 +114,8 @@ class TitleABTester:
     def _load(self) -> Dict:
         """Load A/B test data."""
         try:
-            if AB_TEST_FILE.exists():
-                with open(AB_TEST_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(AB_TEST_FILE):
+                return load_state(AB_TEST_FILE)
         except Exception as e:
             safe_print(f"[AB] Load error: {e}")
         
@@ -113,8 +131,7 @@ class TitleABTester:
         """Save A/B test data."""
         self.data["last_updated"] = datetime.now().isoformat()
         try:
-            with open(AB_TEST_FILE, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            save_state(AB_TEST_FILE, self.data)
         except Exception as e:
             safe_print(f"[AB] Save error: {e}")
     
@@ -136,8 +153,12 @@ class TitleABTester:
         # Get top 3 performing styles + 1 experimental
         top_styles = self._get_top_styles(3)
         
+        # v18.7: One call for every style; the tournament ranks the candidates
+        if smart_call_ai and CANDIDATE_TOURNAMENT_AVAILABLE:
+            variants = self._generate_ai_variants(topic, category, top_styles)
+        
         # Use AI to generate variants
-        if smart_call_ai:
+        elif smart_call_ai:
             for style_name in top_styles:
                 style = self.TITLE_STYLES.get(style_name, self.TITLE_STYLES["curiosity_gap"])
                 variant = self._generate_ai_variant(topic, category, style_name, style)
@@ -169,6 +190,68 @@ class TitleABTester:
         safe_print(f"[AB] Generated {len(variants)} title variants")
         return variants
     
+    def _generate_ai_variants(self, topic: str, category: str,
+                              styles: List[str], per_style: int = 2) -> List[Dict]:
+        """
+        v18.7: Generate candidates for every style in ONE AI call.
+        
+        The candidate tournament drops near-identical titles and scores the
+        rest together; the best title of each style becomes its variant.
+        """
+        style_lines = []
+        for style_name in styles:
+            style = self.TITLE_STYLES.get(style_name, self.TITLE_STYLES["curiosity_gap"])
+            style_lines.append(f"- {style_name}: pattern \"{style['pattern']}\", "
+                               f"triggers {', '.join(style['triggers'])}, "
+                               f"e.g. \"{style['example']}\"")
+        styles_text = "\n".join(style_lines)
+        
+        prompt = f"""Generate viral YouTube Shorts titles, {per_style} for EACH style below.
+
+Topic: {topic}
+Category: {category}
+
+Styles:
+{styles_text}
+
+Requirements:
+1. Maximum 60 characters
+2. Use the style pattern as inspiration (don't copy exactly)
+3. Create curiosity/urgency
+4. Be specific and compelling
+5. No emojis
+
+{candidates_instruction(per_style * len(styles), '{"title": "the title", "style": "style name from the list"}')}"""
+        
+        try:
+            result = smart_call_ai(prompt, hint="creative", max_tokens=40 * per_style * len(styles) + 60)
+        except Exception as e:
+            safe_print(f"[AB] AI variants error: {e}")
+            return []
+        
+        candidates = []
+        for item in parse_candidates(result or ""):
+            if isinstance(item, dict) and item.get("style") in styles:
+                title = str(item.get("title", "")).strip().strip('"\'')
+                if title and len(title) <= 80:
+                    candidates.append({"title": title, "style": item["style"]})
+        
+        outcome = get_candidate_tournament().select(
+            "title_variants", candidates, text=lambda c: c["title"],
+            fields=lambda c: {"title": c["title"], "topic": topic, "category": category})
+        
+        variants = []
+        for entry in outcome["ranked"]:
+            style_name = entry["candidate"]["style"]
+            if style_name not in {v["style"] for v in variants}:
+                variants.append({
+                    "title": entry["candidate"]["title"],
+                    "style": style_name,
+                    "triggers": self.TITLE_STYLES[style_name]["triggers"],
+                    "score": entry["score"],
+                })
+        return variants
+    
     def _generate_ai_variant(self, topic: str, category: str,
                              style_name: str, style: Dict) -> Optional[str]:
         """Generate a title variant using AI."""
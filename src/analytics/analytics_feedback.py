@@ -21,9 +21,89 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from collections.abc import Mapping
+from dataclasses import dataclass, asdict, fields
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
+# v18.7: Indexed SQLite table of per-video facts
+try:
+    from video_metadata_db import VideoMetadataDB, get_video_db
+except ImportError:
+    from src.analytics.video_metadata_db import VideoMetadataDB, get_video_db
+
+# v18.7: Running group-by stats, updated as videos change
+try:
+    from performance_aggregates import PerformanceAggregates, get_performance_aggregates
+    PERFORMANCE_AGGREGATES_AVAILABLE = True
+except ImportError:
+    try:
+        from src.analytics.performance_aggregates import (
+            PerformanceAggregates, get_performance_aggregates
+        )
+        PERFORMANCE_AGGREGATES_AVAILABLE = True
+    except ImportError:
+        PERFORMANCE_AGGREGATES_AVAILABLE = False
+
+# v18.7: Local effect sizes / regression for the insights the AI used to guess
+try:
+    from feature_correlation import FeatureCorrelationEngine, NUMPY_AVAILABLE
+    FEATURE_CORRELATION_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    try:
+        from src.analytics.feature_correlation import FeatureCorrelationEngine, NUMPY_AVAILABLE
+        FEATURE_CORRELATION_AVAILABLE = NUMPY_AVAILABLE
+    except ImportError:
+        FEATURE_CORRELATION_AVAILABLE = False
+
+# v18.7: Trained model of our uploads' views (batch scoring of candidates)
+try:
+    from performance_model import get_performance_model, NUMPY_AVAILABLE as MODEL_NUMPY
+    PERFORMANCE_MODEL_AVAILABLE = MODEL_NUMPY
+except ImportError:
+    try:
+        from src.analytics.performance_model import get_performance_model, NUMPY_AVAILABLE as MODEL_NUMPY
+        PERFORMANCE_MODEL_AVAILABLE = MODEL_NUMPY
+    except ImportError:
+        PERFORMANCE_MODEL_AVAILABLE = False
+
+# v18.7: YouTube Data API units are counted in the shared quota ledger
+try:
+    from quota_ledger import get_quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.quota_ledger import get_quota_ledger
+        QUOTA_LEDGER_AVAILABLE = True
+    except ImportError:
+        QUOTA_LEDGER_AVAILABLE = False
+
+
+# =============================================================================
+# v18.7: BATCHED STATS REFRESH SETTINGS
+# =============================================================================
+
+# videos.list takes up to 50 IDs and costs 1 quota unit per request
+YOUTUBE_IDS_PER_REQUEST = 50
+YOUTUBE_UNITS_PER_LIST = 1
+
+# Daily Data API quota, and units always left for uploads (videos.insert = 1600)
+YOUTUBE_DAILY_QUOTA = int(os.environ.get("YOUTUBE_DAILY_QUOTA", "10000"))
+YOUTUBE_UPLOAD_RESERVE = int(os.environ.get("YOUTUBE_UPLOAD_RESERVE", "3200"))
+YOUTUBE_LEDGER_NAME = "youtube_data_api"
+
+# Parallel videos.list requests
+STATS_REFRESH_WORKERS = 4
+
+# Stats older than this are refreshed: (max video age, max stats age)
+# Young videos move fast; a month-old Short barely changes in a day.
+STATS_FRESHNESS = [
+    (timedelta(days=2), timedelta(hours=1)),
+    (timedelta(days=7), timedelta(hours=6)),
+    (timedelta(days=30), timedelta(days=1)),
+]
+STATS_FRESHNESS_OLD = timedelta(days=7)
+
 
 # =============================================================================
 # VIDEO METADATA TRACKING
@@ -124,78 +204,168 @@ class VideoMetadata:
     was_youtube_selected: bool = False  # Was this the "best" video for YouTube?
 
 
+VIDEO_METADATA_FIELDS = {f.name for f in fields(VideoMetadata)}
+
+
 class VideoMetadataStore:
     """
     Store and retrieve video metadata.
     
-    Saves to JSON file for persistence across runs.
+    v18.7: Backed by the indexed SQLite video table (video_metadata_db)
+    instead of one JSON file loaded whole on every construction. The
+    legacy JSON file at store_path is imported once. `metadata` is a
+    live {video_id: VideoMetadata} view of the table.
+    
+    Every save also updates the performance aggregates in the same
+    transaction (built once from all videos on first use).
     """
     
-    def __init__(self, store_path: str = "data/video_metadata.json"):
+    def __init__(self, store_path: str = "data/video_metadata.json", db_path: str = None):
         self.store_path = Path(store_path)
-        self.store_path.parent.mkdir(parents=True, exist_ok=True)
-        self.metadata: Dict[str, VideoMetadata] = {}
-        self._load()
+        self.db = VideoMetadataDB(db_path) if db_path else get_video_db()
+        self.db.migrate_json(self.store_path)
+        self.metadata = _MetadataView(self)
+        
+        self.aggregates = None
+        if PERFORMANCE_AGGREGATES_AVAILABLE:
+            self.aggregates = PerformanceAggregates(self.db) if db_path else get_performance_aggregates()
+            if self.aggregates.is_empty() and self.db.count():
+                self.aggregates.rebuild(self.db.all_records())
+    
+    @staticmethod
+    def _to_metadata(record: Dict) -> VideoMetadata:
+        """Record dict -> VideoMetadata (ignoring fields this version doesn't know)."""
+        return VideoMetadata(**{k: v for k, v in record.items() if k in VIDEO_METADATA_FIELDS})
     
-    def _load(self):
-        """Load metadata from file."""
-        if self.store_path.exists():
+    def _to_list(self, records: List[Dict]) -> List[VideoMetadata]:
+        videos = []
+        for record in records:
             try:
-                with open(self.store_path, 'r') as f:
-                    data = json.load(f)
-                    for vid_id, meta in data.items():
-                        self.metadata[vid_id] = VideoMetadata(**meta)
-            except Exception as e:
-                print(f"⚠️ Error loading metadata: {e}")
-    
-    def _save(self):
-        """Save metadata to file."""
-        try:
-            data = {vid_id: asdict(meta) for vid_id, meta in self.metadata.items()}
-            with open(self.store_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-        except Exception as e:
-            print(f"⚠️ Error saving metadata: {e}")
+                videos.append(self._to_metadata(record))
+            except TypeError as e:
+                print(f"⚠️ Skipping malformed metadata {record.get('video_id')}: {e}")
+        return videos
+    
+    def save(self, metadata: VideoMetadata):
+        """Persist changes to one video's metadata."""
+        record = asdict(metadata)
+        with self.db.transaction():
+            self.db.put(record)
+            if self.aggregates:
+                self.aggregates.observe(record)
     
     def add(self, metadata: VideoMetadata):
         """Add new video metadata."""
-        self.metadata[metadata.video_id] = metadata
-        self._save()
+        self.save(metadata)
         print(f"📝 Saved metadata for: {metadata.video_id}")
     
+    def get(self, video_id: str) -> Optional[VideoMetadata]:
+        record = self.db.get_record(video_id)
+        return self._to_metadata(record) if record else None
+    
     def update_performance(self, video_id: str, performance: Dict):
         """Update performance metrics for a video."""
-        if video_id in self.metadata:
-            self.metadata[video_id].performance = performance
-            self._save()
+        meta = self.get(video_id)
+        if meta:
+            meta.performance = performance
+            self.save(meta)
             print(f"📊 Updated performance for: {video_id}")
     
+    def update_performance_batch(self, updates: Dict[str, Dict]) -> int:
+        """
+        v18.7: Update performance for many videos in a single transaction.
+        
+        Returns number of videos updated.
+        """
+        changed = []
+        for video_id, performance in updates.items():
+            meta = self.get(video_id)
+            if meta:
+                meta.performance = performance
+                changed.append(asdict(meta))
+        if not changed:
+            return 0
+        with self.db.transaction():
+            self.db.put_many(changed)
+            if self.aggregates:
+                self.aggregates.observe_many(changed)
+        return len(changed)
+    
     def get_all(self) -> List[VideoMetadata]:
         """Get all video metadata."""
-        return list(self.metadata.values())
+        return self._to_list(self.db.all_records())
+    
+    def get_many(self, video_ids: List[str]) -> List[VideoMetadata]:
+        """v18.7: Metadata of specific videos (e.g. those changed since a cursor)."""
+        return self._to_list(self.db.records_by_ids(video_ids))
+    
+    def changed_since(self, consumer: str) -> Tuple[List[VideoMetadata], Optional[int]]:
+        """
+        v18.7: Videos whose tracked stats changed since `consumer` last ran.
+        
+        Returns (videos, cursor); call aggregates.mark_consumed(consumer, cursor)
+        once they are processed. Without aggregates: (all videos, None).
+        """
+        if not self.aggregates:
+            return self.get_all(), None
+        video_ids, cursor = self.aggregates.changed_since(consumer)
+        return self.get_many(video_ids), cursor
+    
+    def mark_consumed(self, consumer: str, cursor: Optional[int]):
+        if self.aggregates and cursor is not None:
+            self.aggregates.mark_consumed(consumer, cursor)
+    
+    def get_uploaded(self, platform: str = "youtube") -> List[VideoMetadata]:
+        """v18.7: Videos with an ID on the platform, oldest upload first."""
+        return self._to_list(self.db.uploaded_records(platform))
     
     def get_recent(self, days: int = 7) -> List[VideoMetadata]:
         """Get videos from the last N days."""
-        cutoff = datetime.now() - timedelta(days=days)
-        recent = []
-        for meta in self.metadata.values():
-            try:
-                gen_time = datetime.fromisoformat(meta.generated_at)
-                if gen_time > cutoff:
-                    recent.append(meta)
-            except:
-                pass
-        return recent
-    
-    def get_top_performers(self, limit: int = 10) -> List[VideoMetadata]:
-        """Get top performing videos by views."""
-        with_performance = [m for m in self.metadata.values() if m.performance]
-        sorted_videos = sorted(
-            with_performance,
-            key=lambda x: x.performance.get("views", 0),
-            reverse=True
-        )
-        return sorted_videos[:limit]
+        return self._to_list(self.db.recent_records(days))
+    
+    def get_top_performers(self, limit: int = 10, category: str = None) -> List[VideoMetadata]:
+        """Get top performing videos by views (optionally within one category)."""
+        return self._to_list(self.db.top_records(limit, category))
+    
+    def get_by_category(self, category: str, limit: int = None) -> List[VideoMetadata]:
+        """v18.7: Newest videos of one category."""
+        return self._to_list(self.db.category_records(category, limit))
+    
+    def find_by_platform_id(self, platform: str, platform_id: str) -> Optional[VideoMetadata]:
+        """v18.7: Look a video up by its YouTube/Dailymotion ID."""
+        record = self.db.find_by_platform_id(platform, platform_id)
+        return self._to_metadata(record) if record else None
+
+
+class _MetadataView(Mapping):
+    """Read-through {video_id: VideoMetadata} view over the video table."""
+    
+    def __init__(self, store: VideoMetadataStore):
+        self._store = store
+    
+    def __getitem__(self, video_id: str) -> VideoMetadata:
+        meta = self._store.get(video_id)
+        if meta is None:
+            raise KeyError(video_id)
+        return meta
+    
+    def __setitem__(self, video_id: str, meta: VideoMetadata):
+        self._store.save(meta)
+    
+    def __contains__(self, video_id) -> bool:
+        return self._store.db.get_record(video_id) is not None
+    
+    def __iter__(self):
+        return iter(self._store.db.record_ids())
+    
+    def __len__(self) -> int:
+        return self._store.db.count()
+    
+    def values(self) -> List[VideoMetadata]:
+        return self._store.get_all()
+    
+    def items(self) -> List[Tuple[str, VideoMetadata]]:
+        return [(meta.video_id, meta) for meta in self._store.get_all()]
 
 
 # =============================================================================
@@ -241,45 +411,79 @@ class YouTubeAnalyticsFetcher:
             print(f"⚠️ Error getting access token: {e}")
         return None
     
+    @staticmethod
+    def _parse_stats(item: Dict) -> Dict:
+        """videos.list item -> {views, likes, comments, title, published_at, fetched_at}"""
+        stats = item.get("statistics", {})
+        snippet = item.get("snippet", {})
+        return {
+            "views": int(stats.get("viewCount", 0)),
+            "likes": int(stats.get("likeCount", 0)),
+            "comments": int(stats.get("commentCount", 0)),
+            "title": snippet.get("title", ""),
+            "published_at": snippet.get("publishedAt", ""),
+            "fetched_at": datetime.now().isoformat(),
+        }
+    
     def get_video_stats(self, video_id: str) -> Optional[Dict]:
         """
         Get statistics for a specific video.
         
         Returns: {views, likes, comments, published_at}
         """
+        result = self.get_videos_stats([video_id])
+        return result["stats"].get(video_id)
+    
+    def get_videos_stats(self, video_ids: List[str], etag: str = None) -> Dict:
+        """
+        v18.7: Statistics for up to 50 videos in ONE videos.list request.
+        
+        Args:
+            video_ids: YouTube video IDs (at most YOUTUBE_IDS_PER_REQUEST)
+            etag: ETag of the previous response for these IDs - sent as
+                  If-None-Match, so unchanged results come back as 304
+        
+        Returns: {"status": "ok"|"not_modified"|"error",
+                  "stats": {youtube_id: stats}, "etag": str, "units": int}
+        """
+        result = {"status": "error", "stats": {}, "etag": etag, "units": 0}
+        if not video_ids:
+            return result
         if not self.access_token:
             if not self._get_access_token():
-                return None
+                return result
+        
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        if etag:
+            headers["If-None-Match"] = etag
         
         try:
             response = requests.get(
                 "https://www.googleapis.com/youtube/v3/videos",
                 params={
                     "part": "statistics,snippet",
-                    "id": video_id,
+                    "id": ",".join(video_ids[:YOUTUBE_IDS_PER_REQUEST]),
+                    "maxResults": YOUTUBE_IDS_PER_REQUEST,
                 },
-                headers={"Authorization": f"Bearer {self.access_token}"}
+                headers=headers,
+                timeout=30
             )
+            result["units"] = YOUTUBE_UNITS_PER_LIST
             
-            if response.status_code == 200:
+            if response.status_code == 304:
+                result["status"] = "not_modified"
+            elif response.status_code == 200:
                 data = response.json()
-                if data.get("items"):
-                    item = data["items"][0]
-                    stats = item.get("statistics", {})
-                    snippet = item.get("snippet", {})
-                    
-                    return {
-                        "views": int(stats.get("viewCount", 0)),
-                        "likes": int(stats.get("likeCount", 0)),
-                        "comments": int(stats.get("commentCount", 0)),
-                        "title": snippet.get("title", ""),
-                        "published_at": snippet.get("publishedAt", ""),
-                        "fetched_at": datetime.now().isoformat(),
-                    }
+                result["status"] = "ok"
+                result["etag"] = data.get("etag") or response.headers.get("ETag")
+                for item in data.get("items", []):
+                    result["stats"][item["id"]] = self._parse_stats(item)
+            else:
+                print(f"⚠️ videos.list returned HTTP {response.status_code}")
         except Exception as e:
             print(f"⚠️ Error fetching video stats: {e}")
         
-        return None
+        return result
     
     def get_channel_videos(self, max_results: int = 50) -> List[Dict]:
         """Get recent videos from our channel."""
@@ -354,11 +558,53 @@ class AnalyticsAnalyzer:
                 self.client = Groq(api_key=self.groq_key)
             except ImportError:
                 pass
+        
+        # v18.7: Statistics are computed locally; the AI only phrases them
+        self.correlation = FeatureCorrelationEngine() if FEATURE_CORRELATION_AVAILABLE else None
     
-    def analyze_performance(self, videos: List[VideoMetadata]) -> Dict:
+    def _complete_json(self, prompt: str, max_tokens: int) -> Dict:
+        """Ask Groq for a JSON answer (raises on API or parse failure)."""
+        # v16.10: DYNAMIC MODEL - No hardcoding
+        try:
+            from quota_optimizer import get_quota_optimizer
+            optimizer = get_quota_optimizer()
+            groq_models = optimizer.get_groq_models()
+            model_to_use = groq_models[0] if groq_models else "llama-3.3-70b-versatile"
+        except:
+            model_to_use = "llama-3.3-70b-versatile"
+        
+        response = self.client.chat.completions.create(
+            model=model_to_use,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.7
+        )
+        
+        result = response.choices[0].message.content
+        
+        # Parse JSON
+        if "```json" in result:
+            result = result.split("```json")[1].split("```")[0]
+        elif "```" in result:
+            result = result.split("```")[1].split("```")[0]
+        
+        return json.loads(result.strip())
+    
+    def analyze_performance(self, videos: List[VideoMetadata], summary: Dict = None,
+                            records: List[Dict] = None) -> Dict:
         """
         Analyze video performance and extract actionable insights.
         
+        v18.7: With `summary` (PerformanceAggregates.get_summary()) the AI gets
+        the aggregated history plus only the videos passed in - the new
+        datapoints - instead of every video ever made.
+        
+        v18.7: When numpy is available the insights are computed locally by
+        FeatureCorrelationEngine over `records` (all measured videos, asdict
+        form - defaults to `videos` when no summary is given): effect sizes
+        with 95% CIs and ridge coefficients. The AI then only phrases a
+        fixed-size digest, so the prompt no longer grows with history.
+        
         Returns insights about:
         - Which topics perform best
         - Which video types get most engagement
@@ -366,8 +612,16 @@ class AnalyticsAnalyzer:
         - What music moods are effective
         - What to do MORE of and LESS of
         """
+        if self.correlation:
+            if records is None and summary is None:
+                records = [asdict(v) for v in videos]
+            if records is not None:
+                computed = self.correlation.analyze(records)
+                if "error" not in computed:
+                    return self._phrase_insights(computed)
+        
         if not self.client:
-            return self._basic_analysis(videos)
+            return self._basic_analysis(videos, summary)
         
         # Prepare data for AI analysis (v3.0 enhanced)
         video_data = []
@@ -395,12 +649,21 @@ class AnalyticsAnalyzer:
                     "ai_title_used": v.ai_title_generated,
                 })
         
-        if not video_data:
+        if not video_data and not (summary and summary.get("videos_with_performance")):
             return {"error": "No performance data available"}
         
-        prompt = f"""You are a YouTube Shorts analytics expert. Analyze this video performance data and provide actionable insights.
+        history = ""
+        if summary:
+            history = f"""
+AGGREGATED HISTORY (all {summary.get('videos_with_performance', 0)} measured videos):
+{json.dumps(summary, indent=2)}
 
-VIDEO DATA:
+NEW VIDEO DATA (changed since the last analysis):"""
+        else:
+            history = "\nVIDEO DATA:"
+        
+        prompt = f"""You are a YouTube Shorts analytics expert. Analyze this video performance data and provide actionable insights.
+{history}
 {json.dumps(video_data, indent=2)}
 
 Analyze the data and provide:
@@ -459,38 +722,63 @@ Return as JSON:
 }}"""
 
         try:
-            # v16.10: DYNAMIC MODEL - No hardcoding
-            try:
-                from quota_optimizer import get_quota_optimizer
-                optimizer = get_quota_optimizer()
-                groq_models = optimizer.get_groq_models()
-                model_to_use = groq_models[0] if groq_models else "llama-3.3-70b-versatile"
-            except:
-                model_to_use = "llama-3.3-70b-versatile"
-            
-            response = self.client.chat.completions.create(
-                model=model_to_use,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                temperature=0.7
-            )
-            
-            result = response.choices[0].message.content
-            
-            # Parse JSON
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0]
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0]
-            
-            return json.loads(result.strip())
-            
+            return self._complete_json(prompt, 1000)
         except Exception as e:
             print(f"⚠️ AI analysis failed: {e}")
-            return self._basic_analysis(videos)
+            return self._basic_analysis(videos, summary)
+    
+    def _phrase_insights(self, computed: Dict) -> Dict:
+        """
+        v18.7: Let the AI word the computed results - never decide them.
+        
+        Only key_insight, do_more, do_less and next_video_suggestions are
+        taken from the answer; the statistical lists stay under "evidence".
+        """
+        if not self.client:
+            return computed
+        
+        digest = FeatureCorrelationEngine.compact_summary(computed)
+        prompt = f"""You are a YouTube Shorts analytics expert. These results were computed from our video performance data (effects are % change in views, with 95% confidence intervals; "confirmed" means the interval excludes zero and a regression controlling for the other features agrees).
+
+{json.dumps(digest, indent=2)}
+
+Explain them for the content team. Only restate findings listed above - do not add new claims, and call effects whose interval includes zero inconclusive.
+
+Return as JSON:
+{{
+    "key_insight": "One sentence summary of the most important finding",
+    "do_more": ["recommendation backed by a confirmed positive effect"],
+    "do_less": ["thing to avoid backed by a confirmed negative effect"],
+    "next_video_suggestions": ["suggestion1", "suggestion2", "suggestion3"]
+}}"""
+        
+        try:
+            phrased = self._complete_json(prompt, 500)
+        except Exception as e:
+            print(f"⚠️ AI phrasing failed: {e}")
+            return computed
+        
+        insights = dict(computed)
+        insights["evidence"] = {"do_more": computed["do_more"], "do_less": computed["do_less"]}
+        for key in ("key_insight", "do_more", "do_less", "next_video_suggestions"):
+            if phrased.get(key):
+                insights[key] = phrased[key]
+        return insights
     
-    def _basic_analysis(self, videos: List[VideoMetadata]) -> Dict:
+    def _basic_analysis(self, videos: List[VideoMetadata], summary: Dict = None) -> Dict:
         """Basic analysis without AI."""
+        # v18.7: Answer from the running aggregates when available
+        if summary and summary.get("videos_with_performance") and summary.get("best_category"):
+            best_type = summary["best_category"][0]["value"]
+            avg_views = summary["average_views"]
+            return {
+                "total_videos": summary["videos_with_performance"],
+                "total_views": summary["total_views"],
+                "average_views": avg_views,
+                "best_video_type": best_type,
+                "key_insight": f"Average of {avg_views:.0f} views. {best_type} performs best.",
+            }
+        
         with_performance = [v for v in videos if v.performance]
         
         if not with_performance:
@@ -557,6 +845,10 @@ class FeedbackLoopController:
         # Content preferences (updated by analytics)
         self.preferences_path = Path("data/content_preferences.json")
         self.preferences = self._load_preferences()
+        
+        # v18.7: ETag per block of YouTube IDs (conditional stats refresh)
+        self.etags_path = Path("data/youtube_stats_etags.json")
+        self.last_refresh_report: Dict = {}
     
     def _load_preferences(self) -> Dict:
         """Load content preferences."""
@@ -660,8 +952,8 @@ class FeedbackLoopController:
     
     def record_upload(self, video_id: str, platform: str, platform_video_id: str):
         """Record when a video is uploaded to a platform."""
-        if video_id in self.metadata_store.metadata:
-            meta = self.metadata_store.metadata[video_id]
+        meta = self.metadata_store.get(video_id)
+        if meta:
             meta.platforms_uploaded.append(platform)
             meta.uploaded_at = datetime.now().isoformat()
             
@@ -670,36 +962,151 @@ class FeedbackLoopController:
             elif platform == "dailymotion":
                 meta.dailymotion_video_id = platform_video_id
             
-            self.metadata_store._save()
+            self.metadata_store.save(meta)
     
-    def update_all_performance(self) -> int:
+    @staticmethod
+    def _stats_due(meta: VideoMetadata, now: datetime) -> bool:
+        """v18.7: Are this video's stats stale for its age?"""
+        performance = meta.performance or {}
+        try:
+            fetched = datetime.fromisoformat(performance["fetched_at"])
+        except (KeyError, TypeError, ValueError):
+            return True
+        try:
+            born = datetime.fromisoformat(meta.uploaded_at or meta.generated_at)
+        except (TypeError, ValueError):
+            return True
+        video_age = now - born
+        max_age = STATS_FRESHNESS_OLD
+        for age_limit, stats_limit in STATS_FRESHNESS:
+            if video_age <= age_limit:
+                max_age = stats_limit
+                break
+        return now - fetched >= max_age
+    
+    def _youtube_units_available(self) -> int:
+        """v18.7: Data API units today's refresh may spend (uploads keep their reserve)."""
+        used = 0
+        if QUOTA_LEDGER_AVAILABLE:
+            used = get_quota_ledger().usage(YOUTUBE_LEDGER_NAME)["tokens"]
+        return max(0, YOUTUBE_DAILY_QUOTA - YOUTUBE_UPLOAD_RESERVE - used)
+    
+    def _load_etags(self) -> Dict[str, str]:
+        if self.etags_path.exists():
+            try:
+                with open(self.etags_path, 'r') as f:
+                    return json.load(f)
+            except:
+                pass
+        return {}
+    
+    def _save_etags(self, etags: Dict[str, str]):
+        self.etags_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.etags_path, 'w') as f:
+            json.dump(etags, f, indent=2)
+    
+    def update_all_performance(self, force: bool = False) -> int:
         """
         Fetch and update performance for all videos with YouTube IDs.
         
+        v18.7: Batched refresh - one videos.list request per block of 50
+        IDs instead of one per video:
+        - Blocks are cut in upload order, so they stay the same between
+          runs and their ETags can be sent as If-None-Match
+        - A block is only requested if one of its videos is due
+          (see STATS_FRESHNESS); fetching its fresh videos too is free
+        - Blocks run concurrently, capped by today's remaining quota
+        - All updates are committed with one metadata write
+        
+        Args:
+            force: Refresh every block regardless of freshness
+        
         Returns number of videos updated.
         """
-        updated = 0
-        
-        for video_id, meta in self.metadata_store.metadata.items():
-            if meta.youtube_video_id:
-                stats = self.youtube_fetcher.get_video_stats(meta.youtube_video_id)
-                if stats:
-                    self.metadata_store.update_performance(video_id, stats)
-                    updated += 1
+        now = datetime.now()
+        tracked = self.metadata_store.get_uploaded("youtube")
+        by_youtube_id = {meta.youtube_video_id: meta for meta in tracked}
+        youtube_ids = list(by_youtube_id)
+        blocks = [youtube_ids[i:i + YOUTUBE_IDS_PER_REQUEST]
+                  for i in range(0, len(youtube_ids), YOUTUBE_IDS_PER_REQUEST)]
+        
+        # Most stale videos first, in case the quota can't cover every block
+        due = [(sum(self._stats_due(by_youtube_id[y], now) for y in block), block)
+               for block in blocks]
+        due = [(count, block) for count, block in due if count or force]
+        due.sort(key=lambda d: -d[0])
+        budget = self._youtube_units_available() // YOUTUBE_UNITS_PER_LIST
+        requests_planned = [block for _, block in due[:budget]]
+        
+        report = {
+            "videos": len(youtube_ids),
+            "fresh_skipped": len(youtube_ids) - sum(len(block) for _, block in due),
+            "requests": len(requests_planned),
+            "deferred_by_quota": max(0, len(due) - budget),
+            "not_modified": 0,
+            "quota_units": 0,
+            "updated": 0,
+        }
         
-        print(f"📊 Updated performance for {updated} videos")
-        return updated
+        etags = self._load_etags()
+        results = []
+        if requests_planned:
+            with ThreadPoolExecutor(max_workers=STATS_REFRESH_WORKERS) as pool:
+                results = list(pool.map(
+                    lambda block: (block, self.youtube_fetcher.get_videos_stats(
+                        block, None if force else etags.get(",".join(block)))),
+                    requests_planned))
+        
+        updates = {}
+        for block, result in results:
+            report["quota_units"] += result["units"]
+            key = ",".join(block)
+            if result["status"] == "ok":
+                if result["etag"]:
+                    etags[key] = result["etag"]
+                for youtube_id, stats in result["stats"].items():
+                    if youtube_id in by_youtube_id:
+                        updates[by_youtube_id[youtube_id].video_id] = stats
+            elif result["status"] == "not_modified":
+                # Unchanged counts - only the freshness timestamp moves
+                report["not_modified"] += len(block)
+                for youtube_id in block:
+                    meta = by_youtube_id[youtube_id]
+                    if meta.performance:
+                        updates[meta.video_id] = dict(meta.performance,
+                                                      fetched_at=now.isoformat())
+        
+        report["updated"] = self.metadata_store.update_performance_batch(updates)
+        if results:
+            # Drop ETags of blocks that no longer exist
+            self._save_etags({key: etags[key] for key in map(",".join, blocks) if key in etags})
+        if QUOTA_LEDGER_AVAILABLE and report["quota_units"]:
+            get_quota_ledger().record_usage(YOUTUBE_LEDGER_NAME, tokens=report["quota_units"],
+                                            calls=len(results))
+        
+        self.last_refresh_report = report
+        print(f"📊 Updated performance for {report['updated']} videos "
+              f"({report['requests']} requests, {report['quota_units']} quota units, "
+              f"{report['not_modified']} unchanged, {report['fresh_skipped']} fresh skipped"
+              + (f", {report['deferred_by_quota']} blocks deferred by quota" if report['deferred_by_quota'] else "")
+              + ")")
+        return report["updated"]
     
     def run_analysis(self) -> Dict:
         """
         Run full analytics analysis and update preferences.
         v17.8: Now refreshes AI patterns based on insights!
         """
-        # Get videos with performance data
-        all_videos = self.metadata_store.get_all()
-        
-        # Analyze
-        insights = self.analyzer.analyze_performance(all_videos)
+        # v18.7: Aggregated history + only the videos that changed since last time
+        if self.metadata_store.aggregates:
+            new_videos, cursor = self.metadata_store.changed_since("analysis")
+            insights = self.analyzer.analyze_performance(
+                new_videos, self.metadata_store.aggregates.get_summary(),
+                records=self.metadata_store.db.measured_records() if self.analyzer.correlation else None)
+            if "error" not in insights:
+                self.metadata_store.mark_consumed("analysis", cursor)
+        else:
+            insights = self.analyzer.analyze_performance(self.metadata_store.get_all())
         
         # Update preferences
         recommendations = self.analyzer.get_content_recommendations(insights)
@@ -710,6 +1117,9 @@ class FeedbackLoopController:
         # v17.8: Refresh AI patterns with new insights
         self._update_ai_patterns_from_insights(insights)
         
+        # v18.7: Retrain the local performance model on the new stats
+        self.update_performance_model()
+        
         print("\n[ANALYTICS] Analytics Analysis Complete!")
         print(f"   Key Insight: {insights.get('key_insight', 'N/A')}")
         
@@ -744,8 +1154,10 @@ class FeedbackLoopController:
         v17.9.15: Update ALL content generators with performance data.
         This ensures the feedback loop is COMPLETE - learned patterns 
         are used in future content generation!
+        
+        v18.7: Only videos whose stats changed since the last update are fed.
         """
-        all_videos = self.metadata_store.get_all()
+        all_videos, cursor = self.metadata_store.changed_since("generators")
         
         # Update Hook Generator with hook performance
         try:
@@ -851,7 +1263,34 @@ class FeedbackLoopController:
         except Exception as e:
             print(f"   [!] Music feedback failed: {e}")
         
-        print("   [FEEDBACK] All generators updated from analytics!")
+        self.metadata_store.mark_consumed("generators", cursor)
+        print(f"   [FEEDBACK] All generators updated from analytics! ({len(all_videos)} changed videos)")
+    
+    def update_performance_model(self) -> Optional[Dict]:
+        """
+        v18.7: Feed videos whose stats changed to the performance model.
+        
+        Only the changed contributions are replaced; a new weights version
+        is stored when anything changed. After a feature change dropped the
+        model's samples, it is rebuilt from every video instead. Returns the
+        fit summary, if any.
+        """
+        if not PERFORMANCE_MODEL_AVAILABLE:
+            return None
+        try:
+            model = get_performance_model()
+            videos, cursor = self.metadata_store.changed_since("performance_model")
+            if model.needs_rebuild:
+                videos = self.metadata_store.get_all()
+            fit = model.train([asdict(v) for v in videos])
+            self.metadata_store.mark_consumed("performance_model", cursor)
+            if fit:
+                print(f"   [MODEL] Performance model v{fit['version']} trained on "
+                      f"{fit['samples']} uploads (R2 {fit['r2']}, alpha {fit['alpha']})")
+            return fit
+        except Exception as e:
+            print(f"   [!] Performance model update failed: {e}")
+            return None
     
     def get_content_guidance(self) -> Dict:
         """
@@ -878,6 +1317,13 @@ class FeedbackLoopController:
         """
         from pro_video_generator import VIDEO_TYPES
         
+        # v18.7: Per-type mean score straight from the running aggregates
+        aggregates = self.metadata_store.aggregates
+        if aggregates:
+            avg_scores = {video_type: stats["mean"] for video_type, stats
+                          in aggregates.group("category", "type_score").items()}
+            return self._save_type_weights(avg_scores, VIDEO_TYPES)
+        
         all_videos = self.metadata_store.get_all()
         
         if not all_videos:
@@ -917,6 +1363,15 @@ class FeedbackLoopController:
             else:
                 avg_scores[video_type] = 1
         
+        return self._save_type_weights(avg_scores, VIDEO_TYPES)
+    
+    def _save_type_weights(self, avg_scores: Dict[str, float], VIDEO_TYPES: Dict) -> Dict[str, float]:
+        """Normalize per-type average scores into weights and save them."""
+        if not avg_scores:
+            # No data yet - equal weights
+            types = list(VIDEO_TYPES.keys())
+            return {t: 1.0 / len(types) for t in types}
+        
         # Include types with no videos yet (give them minimum weight)
         for video_type in VIDEO_TYPES:
             if video_type not in avg_scores:
@@ -955,7 +1410,8 @@ class FeedbackLoopController:
             from enhancements_v9 import get_hook_tracker
             hook_tracker = get_hook_tracker()
             
-            all_videos = self.metadata_store.get_all()
+            # v18.7: Only videos whose stats changed since the last run
+            all_videos, cursor = self.metadata_store.changed_since("hook_words")
             
             for video in all_videos:
                 if video.performance and video.hook:
@@ -968,6 +1424,7 @@ class FeedbackLoopController:
                         avg_views=avg_views
                     )
             
+            self.metadata_store.mark_consumed("hook_words", cursor)
             power_words = hook_tracker.get_power_words()
             avoid_words = hook_tracker.get_words_to_avoid()
             
@@ -1011,6 +1468,17 @@ class FeedbackLoopController:
         
         Returns: Dict with best hours and days for posting
         """
+        # v18.7: Engagement per posting hour/day from the running aggregates
+        aggregates = self.metadata_store.aggregates
+        if aggregates:
+            result = {
+                "best_hours": [int(h) for h, _ in aggregates.best("posting_hour", "engagement_rate", 3, 2)],
+                "best_days": [d for d, _ in aggregates.best("posting_day", "engagement_rate", 3, 2)],
+                "sample_size": aggregates.overall("type_score")["n"]
+            }
+            print(f"📊 Best posting times: Hours {result['best_hours']}, Days {result['best_days']}")
+            return result
+        
         all_videos = self.metadata_store.get_all()
         
         hour_performance = {}
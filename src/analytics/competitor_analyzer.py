@@ -19,6 +19,12 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # State file
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -46,9 +52,8 @@ class CompetitorAnalyzer:
     def _load(self) -> Dict:
         """Load competitor data."""
         try:
-            if COMPETITOR_FILE.exists():
-                with open(COMPETITOR_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(COMPETITOR_FILE):
+                return load_state(COMPETITOR_FILE)
         except:
             pass
         return {
@@ -63,8 +68,7 @@ class CompetitorAnalyzer:
     def _save(self):
         """Save competitor data."""
         self.data["last_analysis"] = datetime.now().isoformat()
-        with open(COMPETITOR_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(COMPETITOR_FILE, self.data)
     
     def identify_content_gaps(self, our_topics: List[str], popular_topics: List[str]) -> List[Dict]:
         """
@@ -14,6 +14,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     try:
@@ -45,9 +51,8 @@ class CompetitorGapAnalyzer:
     
     def _load(self) -> Dict:
         try:
-            if GAP_FILE.exists():
-                with open(GAP_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(GAP_FILE):
+                return load_state(GAP_FILE)
         except:
             pass
         return {
@@ -59,8 +64,7 @@ class CompetitorGapAnalyzer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(GAP_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(GAP_FILE, self.data)
     
     def analyze_gap(self, our_content: Dict, competitor_topic: str,
                    competitor_performance: Dict = None) -> Dict:
@@ -17,12 +17,22 @@ Note: Requires YouTube API access for full functionality
 """
 
 import os
-import json
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
-import requests
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: YouTube research goes through the quota-budgeted crawler
+try:
+    from research_crawler import get_research_crawler
+except ImportError:
+    from src.analytics.research_crawler import get_research_crawler
 
 
 def safe_print(msg: str):
@@ -94,9 +104,8 @@ class CompetitorLearner:
     
     def _load(self) -> Dict:
         try:
-            if COMPETITOR_FILE.exists():
-                with open(COMPETITOR_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(COMPETITOR_FILE):
+                return load_state(COMPETITOR_FILE)
         except:
             pass
         return {
@@ -109,8 +118,7 @@ class CompetitorLearner:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(COMPETITOR_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(COMPETITOR_FILE, self.data)
     
     def analyze_successful_titles(self, titles: List[str]) -> Dict:
         """
@@ -220,32 +228,23 @@ class CompetitorLearner:
             return self.data.get("learned_patterns", {})
         
         try:
-            # Search YouTube
-            search_url = "https://www.googleapis.com/youtube/v3/search"
-            params = {
-                "part": "snippet",
-                "q": query + " #shorts",
-                "type": "video",
-                "videoDuration": "short",
-                "order": "viewCount",
-                "maxResults": min(max_results, 50),
-                "key": self.youtube_key
-            }
-            
-            response = requests.get(search_url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                results = response.json()
-                
+            # v18.7: Only videos published since this query last ran are
+            # fetched; earlier results come from the crawler's cache
+            items = get_research_crawler().search(query + " #shorts", max_results=max_results,
+                                                  include_seen=True)
+            if items:
+                known = {t["title"] for t in self.data["top_titles"]}
                 titles = []
-                for item in results.get("items", []):
+                for item in items:
                     title = item["snippet"]["title"]
                     titles.append(title)
-                    self.data["top_titles"].append({
-                        "title": title,
-                        "query": query,
-                        "timestamp": datetime.now().isoformat()
-                    })
+                    if title not in known:
+                        known.add(title)
+                        self.data["top_titles"].append({
+                            "title": title,
+                            "query": query,
+                            "timestamp": datetime.now().isoformat()
+                        })
                 
                 # Keep only recent titles
                 self.data["top_titles"] = self.data["top_titles"][-200:]
@@ -257,7 +256,7 @@ class CompetitorLearner:
                 
                 return analysis
             else:
-                safe_print(f"[COMPETITOR] API error: {response.status_code}")
+                safe_print(f"[COMPETITOR] No results for: {query}")
         
         except Exception as e:
             safe_print(f"[COMPETITOR] Error: {e}")
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Content Feature Service v18.7
+====================================================
+
+Text features shared by every local content scorer.
+
+ScriptAnalyzer, ViralityCalculator, RetentionPredictor, both
+EngagementPredictors, AIQualityGate, score_hook_quality /
+count_items_in_content and the SelfLearningEngine pattern extractors each
+re-split and re-scanned the same hook/phrases/CTA, running dozens of
+`any(w in text for w in [...])` scans per check.
+
+Here a text is analysed once:
+- word/token/syllable counts, numbers, question and exclamation marks
+  are computed lazily and cached on the TextFeatures object
+- every registered word list is matched in ONE pass by a compiled trie
+  regex; the matcher is rebuilt only when a list changes (learned triggers)
+- TextFeatures are memoised per text (LRU), so the cascade, quality gate,
+  content optimizer and tournament share one analysis of the script
+- script() scans the full script once; the hook, CTA and phrases read
+  their list matches from that scan by offset
+
+Matching keeps the scorers' substring semantics ("how" matches "however"),
+so scores are unchanged.
+"""
+
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+CACHE_SIZE = 512
+
+VOWEL_RUN = re.compile(r'[aeiouy]+')
+NO_VOWEL_WORD = re.compile(r'(?<!\S)[^\saeiouy]+(?!\S)')
+SENTENCE_MARKS = re.compile(r'[.!?]+')
+NUMBERS = re.compile(r'\d+')
+TOKENS = re.compile(r'\w+')
+
+# count_items_in_content list-item markers
+_NUMBERED_ITEM = re.compile(r'^\s*\d+[\.\):\-]')
+_ORDINAL_ITEM = re.compile(r'\b(first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|next|another|last|final)\b', re.IGNORECASE)
+_LIST_INDICATOR = re.compile(r'\b(one\s+(?:is|thing)|number\s+\d|#\d|step\s+\d)\b', re.IGNORECASE)
+
+
+def count_syllables(text: str) -> int:
+    """Rough syllable count: vowel runs per word, at least one per word."""
+    text = text.lower()
+    return len(VOWEL_RUN.findall(text)) + len(NO_VOWEL_WORD.findall(text))
+
+
+def script_text(hook: str, phrases: List[str], cta: str = "") -> str:
+    """The hook + phrases + CTA string the scorers analyse."""
+    return f"{hook} {' '.join(phrases)} {cta}"
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Regex for a character trie; alternatives are tried longest-first."""
+    ends = "" in node
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if ends:
+        return "(?:" + body + ")?" if len(branches) > 1 or len(branches[0]) > 1 else body + "?"
+    return body
+
+
+class PhraseMatcher:
+    """
+    All phrases of all lists, found in one scan of the text.
+
+    A lookahead at every position captures the LONGEST phrase starting
+    there; every other phrase starting at that position is one of its
+    prefixes, so each phrase's prefix list completes the set.
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        self.lexicons = {name: tuple(dict.fromkeys(p.lower() for p in phrases if p))
+                         for name, phrases in lexicons.items()}
+        phrases = sorted({p for words in self.lexicons.values() for p in words})
+        self.prefixes = {p: {q for q in phrases if p.startswith(q)} for p in phrases}
+
+        trie: Dict = {}
+        for phrase in phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self.regex = re.compile("(?=(" + _trie_pattern(trie) + "))", re.DOTALL) if phrases else None
+
+    def find(self, text_lower: str) -> Set[str]:
+        """Every registered phrase occurring in the (lowercased) text."""
+        found: Set[str] = set()
+        if self.regex is None:
+            return found
+        for longest in set(self.regex.findall(text_lower)):
+            found |= self.prefixes[longest]
+        return found
+
+    def positions(self, text_lower: str) -> List[Tuple[int, str]]:
+        """(start, longest phrase) for every position a phrase starts at."""
+        if self.regex is None:
+            return []
+        return [(match.start(), match.group(1)) for match in self.regex.finditer(text_lower)]
+
+    def find_between(self, positions: List[Tuple[int, str]], start: int, end: int) -> Set[str]:
+        """Phrases lying wholly inside text[start:end], from a scan of the text."""
+        found: Set[str] = set()
+        for pos, longest in positions[bisect_left(positions, (start,)):]:
+            if pos >= end:
+                break
+            if pos + len(longest) <= end:
+                found |= self.prefixes[longest]
+            else:
+                found.update(p for p in self.prefixes[longest] if pos + len(p) <= end)
+        return found
+
+
+class lazy_feature:
+    """cached_property without the per-instance lock - features are pure."""
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
+class TextFeatures:
+    """Features of one text; each is computed on first use and kept."""
+
+    def __init__(self, text: str, service: "ContentFeatureService",
+                 parent: Optional["TextFeatures"] = None, offset: int = 0):
+        self.text = text
+        self._service = service
+        self._parent = parent    # Section of a scanned script text
+        self._offset = offset
+        self._sections = False   # Script text whose sections are cached
+
+    @lazy_feature
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @lazy_feature
+    def words(self) -> List[str]:
+        """Whitespace-split words, as `text.split()`."""
+        return self.text.split()
+
+    @lazy_feature
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @lazy_feature
+    def tokens(self) -> Set[str]:
+        """Lowercase \\w+ tokens - the same words `\\bword\\b` matches."""
+        return set(TOKENS.findall(self.lower))
+
+    @lazy_feature
+    def syllables(self) -> int:
+        return count_syllables(self.text)
+
+    @lazy_feature
+    def sentence_marks(self) -> int:
+        """Runs of . ! ? in the text."""
+        return len(SENTENCE_MARKS.findall(self.text))
+
+    @lazy_feature
+    def numbers(self) -> List[str]:
+        return NUMBERS.findall(self.text)
+
+    @property
+    def has_digit(self) -> bool:
+        return bool(self.numbers)
+
+    @lazy_feature
+    def question_count(self) -> int:
+        return self.text.count("?")
+
+    @lazy_feature
+    def exclamation_count(self) -> int:
+        return self.text.count("!")
+
+    @lazy_feature
+    def chars_no_spaces(self) -> int:
+        return len(self.text) - self.text.count(" ")
+
+    @lazy_feature
+    def is_list_item(self) -> bool:
+        """Numbered, ordinal or step-style phrase (count_items_in_content)."""
+        return bool(_NUMBERED_ITEM.match(self.text) or _ORDINAL_ITEM.search(self.text)
+                    or _LIST_INDICATOR.search(self.text))
+
+    @lazy_feature
+    def scan(self) -> Tuple[PhraseMatcher, List[Tuple[int, str]]]:
+        """Matcher pass keeping positions, so sections can reuse it."""
+        matcher = self._service.matcher
+        return matcher, matcher.positions(self.lower)
+
+    @lazy_feature
+    def phrases(self) -> Set[str]:
+        """Registered phrases found in the text (one matcher pass)."""
+        if self._parent is not None:
+            matcher, positions = self._parent.scan
+            return matcher.find_between(positions, self._offset, self._offset + len(self.text))
+        return self._service.matcher.find(self.lower)
+
+    def matched(self, lexicon: str) -> List[str]:
+        """Phrases of one list present in the text, in list order."""
+        return [p for p in self._service.lexicon(lexicon) if p in self.phrases]
+
+    def count(self, lexicon: str) -> int:
+        return len(self.matched(lexicon))
+
+    def has(self, lexicon: str) -> bool:
+        return not self.phrases.isdisjoint(self._service.lexicon(lexicon))
+
+
+class ContentFeatureService:
+    """
+    Registry of named word lists plus the per-text feature cache.
+
+    Scorers register their lists once (learned lists again when they
+    change); registering an identical list is free.
+    """
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.cache_size = cache_size
+        self._lexicons: Dict[str, tuple] = {}
+        self._matcher: Optional[PhraseMatcher] = None
+        self._cache: "OrderedDict[str, TextFeatures]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "rebuilds": 0}
+
+    def register(self, name: str, phrases: Iterable[str]):
+        """Set the phrases of a named list; the matcher rebuilds if it changed."""
+        phrases = tuple(dict.fromkeys(p.lower() for p in phrases if p))
+        if self._lexicons.get(name) != phrases:
+            self._lexicons[name] = phrases
+            self._matcher = None
+            self._cache.clear()
+
+    def register_many(self, lexicons: Dict[str, Iterable[str]]):
+        for name, phrases in lexicons.items():
+            self.register(name, phrases)
+
+    def lexicon(self, name: str) -> tuple:
+        return self._lexicons[name]
+
+    @property
+    def matcher(self) -> PhraseMatcher:
+        if self._matcher is None:
+            self._matcher = PhraseMatcher(self._lexicons)
+            self.stats["rebuilds"] += 1
+        return self._matcher
+
+    def extract(self, text: str) -> TextFeatures:
+        """Features of a text, memoised per content."""
+        text = text or ""
+        features = self._cache.get(text)
+        if features is not None:
+            self.stats["hits"] += 1
+            self._cache.move_to_end(text)
+            return features
+        self.stats["misses"] += 1
+        return self._add(TextFeatures(text, self))
+
+    def _add(self, features: TextFeatures) -> TextFeatures:
+        self._cache[features.text] = features
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return features
+
+    def script(self, hook: str, phrases: List[str], cta: str = "") -> TextFeatures:
+        """
+        Features of the full hook + phrases + CTA text.
+
+        The hook, CTA, each phrase, the joined phrases and hook + phrases
+        are cached as sections of it: their word lists are read from the
+        one scan of the full text instead of scanning each again.
+        """
+        text = script_text(hook, phrases, cta)
+        full = self.extract(text)
+        if full._sections or not text.isascii():
+            return full  # Done already / lower() may change lengths
+        full._sections = True
+
+        body = " ".join(phrases)
+        body_start = len(f"{hook} ")
+        sections = [(str(hook), 0), (body, body_start), (f"{hook} {body}", 0),
+                    (str(cta), body_start + len(body) + 1)]
+        offset = body_start
+        for phrase in phrases:
+            sections.append((phrase, offset))
+            offset += len(phrase) + 1
+        for section, start in sections:
+            if section and section not in self._cache:
+                self._add(TextFeatures(section, self, parent=full, offset=start))
+        return full
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, cached=len(self._cache), lexicons=len(self._lexicons))
+
+
+# Singleton
+_content_features = None
+
+
+def get_content_features() -> ContentFeatureService:
+    """Get the shared feature service."""
+    global _content_features
+    if _content_features is None:
+        _content_features = ContentFeatureService()
+    return _content_features
+
+
+if __name__ == "__main__":
+    safe_print("Testing Content Feature Service...")
+
+    service = get_content_features()
+    service.register_many({
+        "demo.curiosity": ["secret", "truth", "why", "how", "how to"],
+        "demo.interrupt": ["stop", "wait", "hold on"],
+    })
+
+    features = service.script(
+        "STOP - Why do 90% of people fail at this?",
+        ["Here's how to fix it in 5 minutes.", "However, nobody tells you the truth."],
+        "Comment below!")
+    safe_print(f"  Words: {features.word_count}, syllables: {features.syllables}")
+    safe_print(f"  Numbers: {features.numbers}, questions: {features.question_count}")
+    safe_print(f"  Curiosity: {features.matched('demo.curiosity')}")
+    safe_print(f"  Interrupt: {features.has('demo.interrupt')}")
+    service.script("STOP - Why do 90% of people fail at this?",
+                   ["Here's how to fix it in 5 minutes.", "However, nobody tells you the truth."],
+                   "Comment below!")
+    safe_print(f"  Stats: {service.get_stats()}")
+
+    safe_print("\nTest complete!")
@@ -7,12 +7,17 @@ Generates HTML dashboards for performance analytics.
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, state_exists
+
 
 def safe_print(msg: str):
     try:
@@ -46,9 +51,8 @@ class DashboardGenerator:
         for name, filename in files_to_read:
             try:
                 file_path = STATE_DIR / filename
-                if file_path.exists():
-                    with open(file_path, 'r') as f:
-                        data[name] = json.load(f)
+                if state_exists(file_path):
+                    data[name] = load_state(file_path)
             except:
                 data[name] = {}
         
@@ -13,12 +13,23 @@ Engagement factors:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared per-text features; word lists are matched in one pass
+try:
+    from content_features import get_content_features, TextFeatures
+except ImportError:
+    from src.analytics.content_features import get_content_features, TextFeatures
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -33,6 +44,14 @@ STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 ENGAGEMENT_FILE = STATE_DIR / "engagement_patterns.json"
 
+LEXICONS = {
+    "engagement.controversy": ["wrong", "truth", "lie", "unpopular"],
+    "engagement.value": ["tip", "hack", "secret", "trick", "easy"],
+    "engagement.viral": ["everyone", "mind-blowing", "shocking", "unbelievable"],
+    "engagement.social_proof": ["millions", "viral", "trending", "famous"],
+    "engagement.actionable": ["step", "how to", "guide", "tips", "ways"],
+}
+
 
 class EngagementPredictor:
     """
@@ -53,6 +72,8 @@ class EngagementPredictor:
     
     def __init__(self):
         self.data = self._load()
+        self.features = get_content_features()
+        self.features.register_many(LEXICONS)
         
         # v17.9.16: Initialize triggers with baseline + learned
         self._init_dynamic_triggers()
@@ -89,12 +110,19 @@ class EngagementPredictor:
                             self.SAVE_TRIGGERS.append(t_lower)
         except:
             pass  # Use baseline only
+        
+        # v18.7: Matcher rebuilds only if the learned lists changed
+        self.features.register_many({
+            "engagement.comment": self.COMMENT_TRIGGERS,
+            "engagement.share": self.SHARE_TRIGGERS,
+            "engagement.like": self.LIKE_TRIGGERS,
+            "engagement.save": self.SAVE_TRIGGERS,
+        })
     
     def _load(self) -> Dict:
         try:
-            if ENGAGEMENT_FILE.exists():
-                with open(ENGAGEMENT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(ENGAGEMENT_FILE):
+                return load_state(ENGAGEMENT_FILE)
         except:
             pass
         return {
@@ -106,8 +134,7 @@ class EngagementPredictor:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(ENGAGEMENT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(ENGAGEMENT_FILE, self.data)
     
     def predict_engagement(self, content: Dict) -> Dict:
         """
@@ -125,7 +152,7 @@ class EngagementPredictor:
         category = content.get("category", "general")
         
         # Combine all text
-        all_text = f"{hook} {' '.join(phrases)} {cta}".lower()
+        all_text = self.features.script(hook, phrases, cta)
         
         # Score each engagement type
         comment_score = self._score_comment_potential(all_text, cta)
@@ -150,73 +177,65 @@ class EngagementPredictor:
             )
         }
     
-    def _score_comment_potential(self, text: str, cta: str) -> float:
+    def _score_comment_potential(self, text: TextFeatures, cta: str) -> float:
         """Score comment potential (0-100)."""
         score = 30  # Base
         
         # Question marks
-        score += text.count("?") * 15
+        score += text.question_count * 15
         
         # Comment triggers
-        for trigger in self.COMMENT_TRIGGERS:
-            if trigger in text:
-                score += 10
+        score += text.count("engagement.comment") * 10
         
         # Controversy indicators
-        if any(w in text for w in ["wrong", "truth", "lie", "unpopular"]):
+        if text.has("engagement.controversy"):
             score += 15
         
         return min(100, score)
     
-    def _score_like_potential(self, text: str, cta: str) -> float:
+    def _score_like_potential(self, text: TextFeatures, cta: str) -> float:
         """Score like potential (0-100)."""
         score = 40  # Base (easier to get likes)
         
         # Like triggers
-        for trigger in self.LIKE_TRIGGERS:
-            if trigger in text:
-                score += 15
+        score += text.count("engagement.like") * 15
         
         # Value indicators
-        if any(w in text for w in ["tip", "hack", "secret", "trick", "easy"]):
+        if text.has("engagement.value"):
             score += 10
         
         return min(100, score)
     
-    def _score_share_potential(self, text: str, cta: str) -> float:
+    def _score_share_potential(self, text: TextFeatures, cta: str) -> float:
         """Score share potential (0-100)."""
         score = 20  # Base (hardest to get)
         
         # Share triggers
-        for trigger in self.SHARE_TRIGGERS:
-            if trigger in text:
-                score += 15
+        score += text.count("engagement.share") * 15
         
         # Viral indicators
-        if any(w in text for w in ["everyone", "mind-blowing", "shocking", "unbelievable"]):
+        if text.has("engagement.viral"):
             score += 15
         
         # Social proof
-        if any(w in text for w in ["millions", "viral", "trending", "famous"]):
+        if text.has("engagement.social_proof"):
             score += 10
         
         return min(100, score)
     
-    def _score_save_potential(self, text: str, phrases: List[str]) -> float:
+    def _score_save_potential(self, text: TextFeatures, phrases: List[str]) -> float:
         """Score save potential (0-100)."""
         score = 25  # Base
         
         # Save triggers
-        for trigger in self.SAVE_TRIGGERS:
-            if trigger in text:
-                score += 15
+        score += text.count("engagement.save") * 15
         
         # List/step format
         if len(phrases) >= 3:
             score += 15
         
         # Actionable content
-        if any(w in text for w in ["step", "how to", "guide", "tips", "ways"]):
+        if text.has("engagement.actionable"):
             score += 15
         
         return min(100, score)
@@ -17,12 +17,23 @@ This allows:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared per-text features; word lists are matched in one pass
+try:
+    from content_features import get_content_features
+except ImportError:
+    from src.analytics.content_features import get_content_features
+
 try:
     from src.ai.smart_ai_caller import smart_call_ai
 except ImportError:
@@ -59,6 +70,11 @@ class EngagementPredictor:
                    "mind-blowing", "heartbreaking", "inspiring"]
     }
     
+    PATTERN_INTERRUPTS = [
+        "you won't believe", "wait", "stop", "this is",
+        "what if", "the truth", "i found", "secret"
+    ]
+    
     # Category baseline engagement (views per 1000 impressions)
     CATEGORY_BASELINES = {
         "psychology": 45,
@@ -76,12 +92,14 @@ class EngagementPredictor:
     def __init__(self):
         self.data = self._load()
         self.variety_state = self._load_variety_state()
+        self.features = get_content_features()
+        self.features.register_many({f"power.{name}": words for name, words in self.POWER_WORDS.items()})
+        self.features.register("power.interrupt", self.PATTERN_INTERRUPTS)
     
     def _load(self) -> Dict:
         try:
-            if PREDICTIONS_FILE.exists():
-                with open(PREDICTIONS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(PREDICTIONS_FILE):
+                return load_state(PREDICTIONS_FILE)
         except:
             pass
         return {
@@ -92,17 +110,15 @@ class EngagementPredictor:
     
     def _load_variety_state(self) -> Dict:
         try:
-            if VARIETY_FILE.exists():
-                with open(VARIETY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(VARIETY_FILE):
+                return load_state(VARIETY_FILE)
         except:
             pass
         return {}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(PREDICTIONS_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(PREDICTIONS_FILE, self.data)
     
     def predict_engagement(self, title: str, hook: str, category: str,
                            description: str = "", thumbnail_score: float = None) -> Dict:
@@ -168,11 +184,11 @@ class EngagementPredictor:
         score = 5.0  # Base score
         factors = []
         
-        title_lower = title.lower()
+        features = self.features.extract(title)
         
         # Check power words
-        for category, words in self.POWER_WORDS.items():
-            matches = [w for w in words if w in title_lower]
+        for category in self.POWER_WORDS:
+            matches = features.matched(f"power.{category}")
             if matches:
                 score += len(matches) * 0.5
                 factors.append(f"+{len(matches)} {category} words")
@@ -195,7 +211,7 @@ class EngagementPredictor:
             factors.append("Contains numbers")
         
         # Check for question (increases engagement)
-        if "?" in title:
+        if features.question_count:
             score += 0.5
             factors.append("Question format")
         
@@ -213,21 +229,15 @@ class EngagementPredictor:
         score = 5.0
         factors = []
         
-        hook_lower = hook.lower()
+        features = self.features.extract(hook)
         
         # Check for pattern interrupts
-        pattern_interrupts = [
-            "you won't believe", "wait", "stop", "this is",
-            "what if", "the truth", "i found", "secret"
-        ]
-        for phrase in pattern_interrupts:
-            if phrase in hook_lower:
-                score += 1.5
-                factors.append("Pattern interrupt detected")
-                break
+        if features.has("power.interrupt"):
+            score += 1.5
+            factors.append("Pattern interrupt detected")
         
         # Check for direct address ("you")
-        if "you" in hook_lower or "your" in hook_lower:
+        if "you" in features.lower:
             score += 0.8
             factors.append("Direct address (you)")
         
@@ -237,7 +247,7 @@ class EngagementPredictor:
             factors.append("Specific numbers")
         
         # Check length (optimal: 10-25 words for hooks)
-        word_count = len(hook.split())
+        word_count = features.word_count
         if 10 <= word_count <= 25:
             score += 0.5
             factors.append("Good hook length")
@@ -246,10 +256,7 @@ class EngagementPredictor:
             factors.append("Hook too short")
         
         # Power words in hook
-        power_count = sum(
-            1 for words in self.POWER_WORDS.values()
-            for w in words if w in hook_lower
-        )
+        power_count = sum(features.count(f"power.{category}") for category in self.POWER_WORDS)
         if power_count >= 2:
             score += 1.0
             factors.append(f"{power_count} power words")
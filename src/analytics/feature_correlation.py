@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Feature Correlation Engine v18.7
+=======================================================
+
+Local statistics for the analytics feedback loop.
+
+AnalyticsAnalyzer.analyze_performance used to serialise every video's
+features (phrase_count, word_count, has_ken_burns_zoom, caption_style,
+trend_source, music_mood, ...) into a JSON prompt and ask the LLM for the
+"enhancement correlation". The prompt grew with history and the answer
+came with no error bars.
+
+This engine builds a NumPy feature matrix from the measured videos and
+computes, against log views and engagement rate:
+- Effect sizes per feature flag and per category level (one vs rest):
+  difference of means, Hedges' g, and a Welch 95% confidence interval
+- Ridge regression coefficients on standardised features (alpha picked by
+  generalised cross-validation) with bootstrap 95% intervals, so a
+  feature's effect is measured with the others held fixed
+- Best levels per category and the best phrase/word-count bucket
+
+analyze() returns the same insights structure the LLM was asked for. A
+feature is only recommended when its marginal CI excludes zero AND the
+regression coefficient agrees in sign - otherwise it is "neutral".
+compact_summary() is the fixed-size digest the LLM phrases instead.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from performance_aggregates import FEATURE_FLAGS, engagement_rate
+except ImportError:
+    from src.analytics.performance_aggregates import FEATURE_FLAGS, engagement_rate
+
+try:
+    from self_learning_engine import extract_hook_pattern
+except ImportError:
+    from src.analytics.self_learning_engine import extract_hook_pattern
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+# Continuous VideoMetadata fields (0 = not tracked for old videos)
+NUMERIC_FEATURES = [
+    "phrase_count", "total_word_count", "zoom_intensity", "virality_score",
+    "value_check_score", "timeliness_score", "ai_evaluation_score",
+    "regeneration_count",
+]
+
+# Categorical fields, one-hot encoded (hook_pattern is derived from the hook)
+CATEGORICAL_FEATURES = [
+    "video_type", "caption_style", "trend_source", "music_mood",
+    "thumbnail_style", "hook_pattern",
+]
+
+# Insight keys of the flags the analysis prompt always asked about
+IMPACT_KEYS = {
+    "has_captions": "captions_impact",
+    "has_progress_bar": "progress_bar_impact",
+    "has_ken_burns_zoom": "zoom_impact",
+    "has_vignette": "vignette_impact",
+    "ai_title_generated": "ai_title_impact",
+}
+
+# Names used in enhancements_to_enable / enhancements_to_disable
+ENHANCEMENT_NAMES = {
+    "has_captions": "captions",
+    "has_progress_bar": "progress_bar",
+    "has_ken_burns_zoom": "ken_burns_zoom",
+    "has_vignette": "vignette",
+    "has_particles": "particles",
+    "thumbnail_generated": "thumbnail",
+    "ai_title_generated": "ai_title",
+    "v12_enhancements_active": "v12_enhancements",
+    "viral_optimizer_used": "viral_optimizer",
+}
+
+TARGETS = ("log_views", "engagement_rate")
+
+# Fewer measured videos than this and there is nothing to estimate
+MIN_VIDEOS = 8
+# Smallest group on either side of a comparison (and smallest one-hot level)
+MIN_GROUP_SIZE = 3
+
+# Ridge penalties tried (standardised features, so the scale is comparable)
+RIDGE_ALPHAS = (0.1, 0.3, 1.0, 3.0, 10.0, 30.0, 100.0)
+BOOTSTRAP_SAMPLES = 200
+
+# Bucket widths for the optimal content length
+LENGTH_BUCKETS = {"phrase_count": 1, "total_word_count": 10}
+
+Z_975 = 1.959964
+
+
+def t_critical(df: float) -> float:
+    """Two-sided 95% Student t critical value (Cornish-Fisher, exact to ~1e-3 for df >= 3)."""
+    if df <= 0 or math.isinf(df):
+        return Z_975
+    z = Z_975
+    return (z + (z ** 3 + z) / (4 * df)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+
+def effect_size(y: "np.ndarray", mask: "np.ndarray") -> Optional[Dict]:
+    """
+    Difference of means y[mask] - y[~mask] with Hedges' g and a Welch 95% CI.
+
+    None when either side has fewer than MIN_GROUP_SIZE videos.
+    """
+    a, b = y[mask], y[~mask]
+    n1, n2 = len(a), len(b)
+    if n1 < MIN_GROUP_SIZE or n2 < MIN_GROUP_SIZE:
+        return None
+    v1, v2 = float(a.var(ddof=1)), float(b.var(ddof=1))
+    diff = float(a.mean() - b.mean())
+    s1, s2 = v1 / n1, v2 / n2
+    se = math.sqrt(s1 + s2)
+    if s1 + s2 > 0:
+        df = (s1 + s2) ** 2 / (s1 ** 2 / (n1 - 1) + s2 ** 2 / (n2 - 1))
+    else:
+        df = n1 + n2 - 2
+    margin = t_critical(df) * se
+    pooled = math.sqrt(((n1 - 1) * v1 + (n2 - 1) * v2) / (n1 + n2 - 2))
+    hedges_g = diff / pooled * (1 - 3 / (4 * (n1 + n2) - 9)) if pooled > 0 else 0.0
+    return {
+        "n_with": n1, "n_without": n2,
+        "mean_with": float(a.mean()), "mean_without": float(b.mean()),
+        "difference": diff, "ci_low": diff - margin, "ci_high": diff + margin,
+        "hedges_g": hedges_g,
+    }
+
+
+def verdict(effect: Optional[Dict]) -> str:
+    """positive / negative when the 95% CI excludes zero, else neutral."""
+    if not effect:
+        return "neutral"
+    if effect["ci_low"] > 0:
+        return "positive"
+    if effect["ci_high"] < 0:
+        return "negative"
+    return "neutral"
+
+
+def _pct(log_diff: float) -> float:
+    """Difference of mean log views -> % change in (geometric mean) views."""
+    return (math.exp(log_diff) - 1) * 100
+
+
+def ridge_fit(X: "np.ndarray", y: "np.ndarray",
+              alphas=RIDGE_ALPHAS) -> Tuple["np.ndarray", float, float]:
+    """
+    Ridge on centred X/y, alpha chosen by generalised cross-validation.
+
+    One SVD serves every alpha. Returns (coefficients, alpha, r2).
+    """
+    n = X.shape[0]
+    U, s, Vt = np.linalg.svd(X, full_matrices=False)
+    Uty = U.T @ y
+    tss = float(y @ y) or 1e-12
+    best = None
+    for alpha in alphas:
+        shrink = s ** 2 / (s ** 2 + alpha)
+        beta = Vt.T @ (s / (s ** 2 + alpha) * Uty)
+        resid = y - X @ beta
+        rss = float(resid @ resid)
+        gcv = n * rss / max(n - float(shrink.sum()), 1e-9) ** 2
+        if best is None or gcv < best[0]:
+            best = (gcv, beta, alpha, 1 - rss / tss)
+    return best[1], best[2], best[3]
+
+
+@dataclass
+class FeatureMatrix:
+    """Standardised design matrix plus what each column means."""
+    X: "np.ndarray"                      # n x p, centred and scaled
+    columns: List[Dict]                  # {name, feature, kind, level}
+    raw: "np.ndarray"                    # n x p, unscaled (0/1 for flags and levels)
+    targets: Dict[str, "np.ndarray"]     # log_views, engagement_rate
+    views: "np.ndarray"
+    records: List[Dict] = field(default_factory=list)
+
+
+def build_feature_matrix(records: List[Dict]) -> Optional[FeatureMatrix]:
+    """
+    Measured VideoMetadata records (asdict form) -> FeatureMatrix.
+
+    Category levels seen fewer than MIN_GROUP_SIZE times are left out
+    (they act as the baseline); constant columns are dropped.
+    """
+    records = [r for r in records if r.get("performance")]
+    if len(records) < MIN_VIDEOS:
+        return None
+
+    categories = {}
+    for feature in CATEGORICAL_FEATURES:
+        values = [_category(r, feature) for r in records]
+        counts = {}
+        for value in values:
+            if value is not None:
+                counts[value] = counts.get(value, 0) + 1
+        categories[feature] = (values, sorted(v for v, c in counts.items() if c >= MIN_GROUP_SIZE))
+
+    columns, data = [], []
+    for feature in NUMERIC_FEATURES:
+        columns.append({"name": feature, "feature": feature, "kind": "numeric", "level": None})
+        data.append([float(r.get(feature) or 0) for r in records])
+    for flag in FEATURE_FLAGS:
+        columns.append({"name": flag, "feature": flag, "kind": "flag", "level": None})
+        data.append([1.0 if r.get(flag) else 0.0 for r in records])
+    for feature, (values, levels) in categories.items():
+        for level in levels:
+            columns.append({"name": f"{feature}={level}", "feature": feature,
+                            "kind": "level", "level": level})
+            data.append([1.0 if value == level else 0.0 for value in values])
+
+    raw = np.array(data, dtype=float).T
+    std = raw.std(axis=0)
+    keep = std > 0
+    raw, std = raw[:, keep], std[keep]
+    columns = [c for c, k in zip(columns, keep) if k]
+    X = (raw - raw.mean(axis=0)) / std
+
+    views = np.array([float(r["performance"].get("views", 0)) for r in records])
+    targets = {
+        "log_views": np.log1p(np.maximum(views, 0)),
+        "engagement_rate": np.array([engagement_rate(r["performance"]) for r in records]),
+    }
+    return FeatureMatrix(X=X, columns=columns, raw=raw, targets=targets,
+                         views=views, records=records)
+
+
+def _category(record: Dict, feature: str) -> Optional[str]:
+    if feature == "hook_pattern":
+        return extract_hook_pattern(record["hook"]) if record.get("hook") else None
+    value = record.get(feature)
+    return str(value) if value else None
+
+
+class FeatureCorrelationEngine:
+    """Effect sizes, CIs and ridge coefficients over the measured videos."""
+
+    def __init__(self, seed: int = 18):
+        self.seed = seed
+
+    # =========================================================================
+    # STATISTICS
+    # =========================================================================
+
+    def _coefficients(self, fm: FeatureMatrix, target: str) -> Dict:
+        """Ridge coefficients (per 1 SD of the feature) with bootstrap 95% intervals."""
+        y = fm.targets[target] - fm.targets[target].mean()
+        beta, alpha, r2 = ridge_fit(fm.X, y)
+
+        rng = np.random.default_rng(self.seed)
+        n, p = fm.X.shape
+        samples = np.empty((BOOTSTRAP_SAMPLES, p))
+        for b in range(BOOTSTRAP_SAMPLES):
+            idx = rng.integers(0, n, n)
+            Xb = fm.X[idx] - fm.X[idx].mean(axis=0)
+            yb = y[idx] - y[idx].mean()
+            samples[b] = np.linalg.solve(Xb.T @ Xb + alpha * np.eye(p), Xb.T @ yb)
+        low, high = np.percentile(samples, [2.5, 97.5], axis=0)
+
+        return {
+            "alpha": alpha,
+            "r2": round(r2, 3),
+            "coefficients": {
+                column["name"]: {"coef": float(beta[i]), "ci_low": float(low[i]), "ci_high": float(high[i])}
+                for i, column in enumerate(fm.columns)
+            },
+        }
+
+    def _effects(self, fm: FeatureMatrix, target: str) -> Dict[str, Dict]:
+        """One-vs-rest effect for every flag and category level."""
+        y = fm.targets[target]
+        effects = {}
+        for i, column in enumerate(fm.columns):
+            if column["kind"] == "numeric":
+                continue
+            effect = effect_size(y, fm.raw[:, i] > 0.5)
+            if effect:
+                effects[column["name"]] = effect
+        return effects
+
+    @staticmethod
+    def _best_levels(fm: FeatureMatrix, feature: str, top: int = 3) -> List[Tuple[str, float, int]]:
+        """Levels of a categorical feature by mean log views: [(level, mean, n)]."""
+        y = fm.targets["log_views"]
+        ranked = []
+        for i, column in enumerate(fm.columns):
+            if column["feature"] == feature and column["kind"] == "level":
+                mask = fm.raw[:, i] > 0.5
+                ranked.append((column["level"], float(y[mask].mean()), int(mask.sum())))
+        ranked.sort(key=lambda item: -item[1])
+        return ranked[:top]
+
+    @staticmethod
+    def _best_length(fm: FeatureMatrix, feature: str) -> Optional[int]:
+        """Bucket of a length feature with the highest mean log views."""
+        names = [c["name"] for c in fm.columns]
+        if feature not in names:
+            return None
+        values = fm.raw[:, names.index(feature)]
+        y = fm.targets["log_views"]
+        width = LENGTH_BUCKETS[feature]
+        buckets = np.round(values / width) * width
+        best = None
+        for bucket in np.unique(buckets[values > 0]):
+            mask = buckets == bucket
+            if mask.sum() >= MIN_GROUP_SIZE:
+                mean = float(y[mask].mean())
+                if best is None or mean > best[1]:
+                    best = (int(bucket), mean)
+        return best[0] if best else None
+
+    # =========================================================================
+    # INSIGHTS
+    # =========================================================================
+
+    def analyze(self, records: List[Dict]) -> Dict:
+        """
+        Statistical insights over measured video records.
+
+        Same keys as the LLM analysis (top_performers, best_video_types,
+        enhancement_analysis, do_more, ...) plus a "statistics" block.
+        """
+        if not NUMPY_AVAILABLE:
+            return {"error": "numpy not installed"}
+        fm = build_feature_matrix(records)
+        if fm is None:
+            return {"error": f"Need at least {MIN_VIDEOS} measured videos"}
+
+        effects = {target: self._effects(fm, target) for target in TARGETS}
+        models = {target: self._coefficients(fm, target) for target in TARGETS}
+        view_effects = effects["log_views"]
+        view_coefs = models["log_views"]["coefficients"]
+
+        # Recommend only what the marginal CI and the adjusted coefficient agree on
+        confirmed = {}
+        for name, effect in view_effects.items():
+            direction = verdict(effect)
+            coef = view_coefs.get(name, {}).get("coef", 0.0)
+            if direction == "positive" and coef > 0 or direction == "negative" and coef < 0:
+                confirmed[name] = direction
+
+        def describe(name: str) -> str:
+            effect = view_effects[name]
+            return (f"{name}: {_pct(effect['difference']):+.0f}% views "
+                    f"(95% CI {_pct(effect['ci_low']):+.0f}%..{_pct(effect['ci_high']):+.0f}%, "
+                    f"n={effect['n_with']}/{effect['n_without']})")
+
+        ranked = sorted(confirmed, key=lambda name: -abs(view_effects[name]["difference"]))
+        flags = [name for name in ranked if name in ENHANCEMENT_NAMES]
+        top_videos = np.argsort(-fm.views)[:5]
+        best = {feature: self._best_levels(fm, feature) for feature in CATEGORICAL_FEATURES}
+
+        average_views = float(fm.views.mean())
+        if ranked:
+            key_insight = describe(ranked[0])
+        else:
+            key_insight = (f"No feature moved views beyond noise across {len(fm.records)} videos "
+                           f"(average {average_views:.0f} views).")
+
+        return {
+            "analysis_engine": "local",
+            "total_videos": len(fm.records),
+            "total_views": int(fm.views.sum()),
+            "average_views": average_views,
+            "top_performers": [fm.records[i].get("topic") for i in top_videos if fm.records[i].get("topic")],
+            "best_video_types": [level for level, _, _ in best["video_type"]],
+            "best_hooks_patterns": [level for level, _, _ in best["hook_pattern"]],
+            "best_music_moods": [level for level, _, _ in best["music_mood"]],
+            "best_trend_source": best["trend_source"][0][0] if best["trend_source"] else None,
+            "enhancement_analysis": {
+                key: confirmed.get(flag, "neutral") for flag, key in IMPACT_KEYS.items()
+            },
+            "optimal_content_length": {
+                "ideal_phrase_count": self._best_length(fm, "phrase_count"),
+                "ideal_word_count": self._best_length(fm, "total_word_count"),
+            },
+            "do_more": [describe(name) for name in ranked if confirmed[name] == "positive"],
+            "do_less": [describe(name) for name in ranked if confirmed[name] == "negative"],
+            "enhancements_to_enable": [ENHANCEMENT_NAMES[f] for f in flags if confirmed[f] == "positive"],
+            "enhancements_to_disable": [ENHANCEMENT_NAMES[f] for f in flags if confirmed[f] == "negative"],
+            "next_video_suggestions": [],
+            "key_insight": key_insight,
+            "statistics": {
+                "videos": len(fm.records),
+                "features": len(fm.columns),
+                "effects": effects,
+                "models": models,
+                "best_levels": best,
+            },
+        }
+
+    @staticmethod
+    def compact_summary(insights: Dict, top: int = 6) -> Dict:
+        """
+        Fixed-size digest of analyze() for the LLM to phrase.
+
+        Size depends on `top`, not on how many videos were analysed.
+        """
+        stats = insights.get("statistics", {})
+        effects = stats.get("effects", {}).get("log_views", {})
+        coefs = stats.get("models", {}).get("log_views", {}).get("coefficients", {})
+        strongest = sorted(effects, key=lambda name: -abs(effects[name]["hedges_g"]))[:top]
+        return {
+            "videos": stats.get("videos", 0),
+            "average_views": round(insights.get("average_views", 0)),
+            "model_r2": stats.get("models", {}).get("log_views", {}).get("r2"),
+            "confirmed_positive": insights.get("do_more", []),
+            "confirmed_negative": insights.get("do_less", []),
+            "strongest_effects": [{
+                "feature": name,
+                "views_change_pct": round(_pct(effects[name]["difference"])),
+                "ci_pct": [round(_pct(effects[name]["ci_low"])), round(_pct(effects[name]["ci_high"]))],
+                "adjusted_coef": round(coefs.get(name, {}).get("coef", 0.0), 3),
+                "n": [effects[name]["n_with"], effects[name]["n_without"]],
+            } for name in strongest],
+            "best_video_types": insights.get("best_video_types", []),
+            "best_hooks_patterns": insights.get("best_hooks_patterns", []),
+            "best_music_moods": insights.get("best_music_moods", []),
+            "top_topics": insights.get("top_performers", [])[:3],
+            "optimal_content_length": insights.get("optimal_content_length", {}),
+        }
+
+
+# Singleton
+_engine = None
+
+
+def get_feature_correlation_engine() -> FeatureCorrelationEngine:
+    """Get the shared FeatureCorrelationEngine instance."""
+    global _engine
+    if _engine is None:
+        _engine = FeatureCorrelationEngine()
+    return _engine
+
+
+if __name__ == "__main__":
+    import json
+    import random
+    import time
+
+    safe_print("Testing Feature Correlation Engine...")
+    random.seed(3)
+    records = []
+    for i in range(600):
+        zoom = random.random() < 0.5
+        views = int(random.lognormvariate(6.5 + (0.4 if zoom else 0.0), 0.8))
+        records.append({
+            "video_id": f"v{i}", "topic": f"Topic {i}",
+            "video_type": random.choice(["money", "psychology", "health"]),
+            "hook": random.choice(["Did you know this?", "STOP scrolling", "The secret banks hide"]),
+            "music_mood": random.choice(["dramatic", "upbeat"]),
+            "has_ken_burns_zoom": zoom, "has_vignette": random.random() < 0.5,
+            "phrase_count": random.randint(3, 7), "total_word_count": random.randint(40, 90),
+            "performance": {"views": views, "likes": views // 25},
+        })
+    start = time.time()
+    insights = get_feature_correlation_engine().analyze(records)
+    safe_print(f"600 videos analysed in {(time.time() - start) * 1000:.0f}ms")
+    safe_print(insights["key_insight"])
+    safe_print(json.dumps(FeatureCorrelationEngine.compact_summary(insights), indent=2))
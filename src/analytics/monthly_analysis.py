@@ -23,6 +23,18 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: YouTube research goes through the quota-budgeted crawler
+try:
+    from research_crawler import get_research_crawler
+except ImportError:
+    from src.analytics.research_crawler import get_research_crawler
+
 # API Keys - Use OAuth credentials (same as upload)
 YOUTUBE_CLIENT_ID = os.environ.get("YOUTUBE_CLIENT_ID")
 YOUTUBE_CLIENT_SECRET = os.environ.get("YOUTUBE_CLIENT_SECRET")
@@ -35,9 +47,6 @@ VIRAL_PATTERNS_FILE = Path("data/persistent/viral_patterns.json")
 COMPETITOR_TRACKING_FILE = Path("data/persistent/competitor_tracking.json")
 RECYCLE_CANDIDATES_FILE = Path("data/persistent/recycle_candidates.json")
 
-# YouTube access token (refreshed at runtime)
-_youtube_access_token = None
-
 
 def safe_print(msg):
     """Print message safely, handling Unicode."""
@@ -48,93 +57,27 @@ def safe_print(msg):
 
 
 def get_youtube_access_token():
-    """Get YouTube access token using OAuth refresh token."""
-    global _youtube_access_token
-    if _youtube_access_token:
-        return _youtube_access_token
-    
+    """Get YouTube access token using OAuth refresh token (cached until expiry)."""
     if not all([YOUTUBE_CLIENT_ID, YOUTUBE_CLIENT_SECRET, YOUTUBE_REFRESH_TOKEN]):
         safe_print("[!] Missing YouTube OAuth credentials")
         return None
-    
-    try:
-        response = requests.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "client_id": YOUTUBE_CLIENT_ID,
-                "client_secret": YOUTUBE_CLIENT_SECRET,
-                "refresh_token": YOUTUBE_REFRESH_TOKEN,
-                "grant_type": "refresh_token"
-            },
-            timeout=10
-        )
-        if response.status_code == 200:
-            _youtube_access_token = response.json().get("access_token")
-            safe_print("[OK] YouTube OAuth token refreshed")
-            return _youtube_access_token
-        else:
-            safe_print(f"[!] Token refresh failed: {response.status_code}")
-    except Exception as e:
-        safe_print(f"[!] Token refresh error: {e}")
-    return None
+    return get_research_crawler().access_token()
 
 
 def youtube_search(query, max_results=10):
-    """Search YouTube for videos using OAuth."""
-    token = get_youtube_access_token()
-    if not token:
+    """Search YouTube for Shorts published since this query last ran (past 6 months at most)."""
+    if not get_youtube_access_token():
         safe_print("[!] No YouTube access token")
         return []
-    
-    url = "https://www.googleapis.com/youtube/v3/search"
-    # v17.9.17: Use dynamic date (past 6 months) instead of hardcoded year
-    from datetime import datetime, timedelta
-    six_months_ago = (datetime.now() - timedelta(days=180)).strftime("%Y-%m-%dT00:00:00Z")
-    
-    params = {
-        "q": query,
-        "part": "snippet",
-        "type": "video",
-        "videoDuration": "short",  # Shorts only
-        "order": "viewCount",
-        "maxResults": max_results,
-        "publishedAfter": six_months_ago  # Dynamic, not hardcoded
-    }
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    try:
-        response = requests.get(url, params=params, headers=headers, timeout=15)
-        if response.status_code == 200:
-            return response.json().get("items", [])
-        else:
-            safe_print(f"[!] Search failed: {response.status_code}")
-    except Exception as e:
-        safe_print(f"[!] Search error: {e}")
-    return []
+    # v18.7: Budgeted, cursor-aware search via the research crawler
+    return get_research_crawler().search(query, max_results=max_results, window_days=180)
 
 
 def get_video_details(video_ids):
-    """Get detailed stats for videos using OAuth."""
-    token = get_youtube_access_token()
-    if not token or not video_ids:
+    """Get detailed stats for videos (cached ones cost no quota)."""
+    if not video_ids or not get_youtube_access_token():
         return []
-    
-    url = "https://www.googleapis.com/youtube/v3/videos"
-    params = {
-        "id": ",".join(video_ids),
-        "part": "statistics,snippet,contentDetails"
-    }
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    try:
-        response = requests.get(url, params=params, headers=headers, timeout=15)
-        if response.status_code == 200:
-            return response.json().get("items", [])
-        else:
-            safe_print(f"[!] Details failed: {response.status_code}")
-    except Exception as e:
-        safe_print(f"[!] Details error: {e}")
-    return []
+    return get_research_crawler().video_details(video_ids)
 
 
 def analyze_with_ai(videos_data):
@@ -264,12 +207,11 @@ def identify_recycle_candidates(analytics_file=Path("data/persistent/analytics_s
     """v9.0: Find our underperforming videos that could be recycled with a new angle.
     Enhancement #23: Failed content recycling.
     """
-    if not analytics_file.exists():
+    if not state_exists(analytics_file):
         return []
     
     try:
-        with open(analytics_file, 'r') as f:
-            analytics = json.load(f)
+        analytics = load_state(analytics_file)
         
         videos = analytics.get("videos", [])
         avg_views = analytics.get("avg_views", 100)
@@ -354,10 +296,9 @@ def track_competitors():
     """
     competitor_data = {}
     
-    if COMPETITOR_TRACKING_FILE.exists():
+    if state_exists(COMPETITOR_TRACKING_FILE):
         try:
-            with open(COMPETITOR_TRACKING_FILE, 'r') as f:
-                competitor_data = json.load(f)
+            competitor_data = load_state(COMPETITOR_TRACKING_FILE)
         except:
             pass
     
@@ -389,9 +330,17 @@ def main():
     all_videos = []
     seen_ids = set()
 
-    for query in search_queries:
-        safe_print(f"\n[SEARCH] {query}")
-        results = youtube_search(query, max_results=5)
+    # v18.7: Queries run concurrently; each only asks for videos published
+    # since it last ran, within the crawler's quota budget
+    crawler = get_research_crawler()
+    if get_youtube_access_token():
+        query_results = crawler.search_many(search_queries, max_results=5, window_days=180)
+    else:
+        safe_print("[!] No YouTube access token")
+        query_results = [[] for _ in search_queries]
+
+    for query, results in zip(search_queries, query_results):
+        safe_print(f"\n[SEARCH] {query}: {len(results)} results")
         
         for item in results:
             vid_id = item.get("id", {}).get("videoId")
@@ -420,6 +369,8 @@ def main():
                 video["likes"] = int(stats.get("statistics", {}).get("likeCount", 0))
                 video["comments"] = int(stats.get("statistics", {}).get("commentCount", 0))
 
+    safe_print(f"[QUOTA] {crawler.get_stats()}")
+
     # Sort by views
     all_videos.sort(key=lambda x: x.get("views", 0), reverse=True)
     top_videos = all_videos[:10]
@@ -446,15 +397,13 @@ def main():
             "raw_videos": top_videos
         }
         
-        with open(ANALYSIS_FILE, 'w') as f:
-            json.dump(analysis_result, f, indent=2)
+        save_state(ANALYSIS_FILE, analysis_result)
         
         # Update viral patterns file for use by video generator
         existing_patterns = {}
-        if VIRAL_PATTERNS_FILE.exists():
+        if state_exists(VIRAL_PATTERNS_FILE):
             try:
-                with open(VIRAL_PATTERNS_FILE, 'r') as f:
-                    existing_patterns = json.load(f)
+                existing_patterns = load_state(VIRAL_PATTERNS_FILE)
             except:
                 pass
         
@@ -492,8 +441,7 @@ def main():
         existing_patterns["ai_generated"] = True
         existing_patterns["source"] = "youtube_analysis"
         
-        with open(VIRAL_PATTERNS_FILE, 'w') as f:
-            json.dump(existing_patterns, f, indent=2)
+        save_state(VIRAL_PATTERNS_FILE, existing_patterns)
         
         safe_print("\n[SAVED] Patterns updated for video generation")
     else:
@@ -528,18 +476,16 @@ def main():
         competitor_data[channel]["total_views"] += video.get("views", 0)
         competitor_data[channel]["last_seen"] = datetime.now().isoformat()
     
-    with open(COMPETITOR_TRACKING_FILE, 'w') as f:
-        json.dump(competitor_data, f, indent=2)
+    save_state(COMPETITOR_TRACKING_FILE, competitor_data)
     safe_print(f"\n[COMPETITORS] Tracking {len(competitor_data)} channels")
 
     # v9.5: Extract hook words from top-performing titles
     safe_print("\n[v9.5] Hook Word Analysis")
     hook_word_file = Path("data/persistent/hook_word_performance.json")
     hook_data = {"words": {}, "last_updated": datetime.now().isoformat()}
-    if hook_word_file.exists():
+    if state_exists(hook_word_file):
         try:
-            with open(hook_word_file, 'r') as f:
-                hook_data = json.load(f)
+            hook_data = load_state(hook_word_file)
         except:
             pass
     
@@ -558,8 +504,7 @@ def main():
                 hook_data["words"][word]["count"] += 1
     
     hook_data["last_updated"] = datetime.now().isoformat()
-    with open(hook_word_file, 'w') as f:
-        json.dump(hook_data, f, indent=2)
+    save_state(hook_word_file, hook_data)
     safe_print(f"  Updated hook words from {len(top_videos)} competitor videos")
     
     # v9.5: Seasonal content suggestions for next month
@@ -594,8 +539,7 @@ def main():
                     seasonal_data = json.loads(match.group())
                     seasonal_file = Path("data/persistent/seasonal_calendar.json")
                     seasonal_data["generated_at"] = datetime.now().isoformat()
-                    with open(seasonal_file, 'w') as f:
-                        json.dump(seasonal_data, f, indent=2)
+                    save_state(seasonal_file, seasonal_data)
                     safe_print(f"  Generated seasonal content for {len(seasonal_data.get('content_opportunities', []))} opportunities")
     except Exception as e:
         safe_print(f"  [!] Seasonal calendar error: {e}")
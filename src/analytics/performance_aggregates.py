@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Performance Aggregates v18.7
+===================================================
+
+Running group-by statistics over video performance.
+
+run_analysis, AnalyticsAnalyzer._basic_analysis, update_type_weights,
+update_hook_word_performance, get_best_posting_times and the generator
+feedback each rescanned every stored video to recompute the same
+group-by statistics, so the weekly analytics job grew with total history.
+
+This layer keeps, per (dimension, value, metric):
+    n, total, mean, M2  (Welford - variance = M2 / (n - 1))
+
+Dimensions: category, hook pattern, music mood, voice, posting hour and
+weekday, and on/off for each tracked feature flag. Metrics: views,
+engagement rate and the type score used for category weights.
+
+When a video is saved its previous contribution is subtracted and the new
+one added - O(1) per update, whatever the history size. Each video also
+gets a sequence number, so consumers (hook-word tracker, AI analysis,
+generator feedback) can process only what changed since their last run.
+
+Tables live in data/persistent/video_metadata.db next to the video rows,
+so a video and its aggregate update are committed together.
+"""
+
+import json
+import math
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from video_metadata_db import VideoMetadataDB, get_video_db
+except ImportError:
+    from src.analytics.video_metadata_db import VideoMetadataDB, get_video_db
+
+try:
+    from self_learning_engine import extract_hook_pattern
+except ImportError:
+    from src.analytics.self_learning_engine import extract_hook_pattern
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+# Feature flags tracked as on/off groups (VideoMetadata field names)
+FEATURE_FLAGS = [
+    "has_captions", "has_progress_bar", "has_ken_burns_zoom", "has_vignette",
+    "has_particles", "thumbnail_generated", "ai_title_generated",
+    "v12_enhancements_active", "viral_optimizer_used",
+]
+
+METRICS = ("views", "engagement_rate", "type_score")
+
+
+def engagement_rate(performance: Dict) -> float:
+    """(Likes + Comments*3 + Shares*5) / Views * 100 - as calculate_engagement_rate."""
+    views = performance.get("views", 1)
+    if views < 1:
+        return 0.0
+    engagement = (performance.get("likes", 0) + performance.get("comments", 0) * 3
+                  + performance.get("shares", 0) * 5)
+    return engagement / views * 100
+
+
+def type_score(performance: Optional[Dict]) -> float:
+    """Views plus weighted engagement - the score behind category weights."""
+    if not performance:
+        return 0.0
+    engagement = performance.get("likes", 0) + performance.get("comments", 0) * 5
+    return performance.get("views", 0) + engagement * 10
+
+
+def contribution(record: Dict) -> Tuple[List[Tuple[str, str]], Dict[str, float]]:
+    """(group keys, metric values) a VideoMetadata record (asdict form) adds."""
+    keys = [("all", "all")]
+    if record.get("video_type"):
+        keys.append(("category", record["video_type"]))
+    if record.get("hook"):
+        keys.append(("hook_pattern", extract_hook_pattern(record["hook"])))
+    if record.get("music_mood"):
+        keys.append(("music_mood", record["music_mood"]))
+    if record.get("voice_name"):
+        keys.append(("voice", record["voice_name"]))
+    if record.get("uploaded_at"):
+        try:
+            uploaded = datetime.fromisoformat(record["uploaded_at"])
+            keys.append(("posting_hour", str(uploaded.hour)))
+            keys.append(("posting_day", uploaded.strftime("%A")))
+        except (TypeError, ValueError):
+            pass
+    for flag in FEATURE_FLAGS:
+        if flag in record:
+            keys.append((f"feature:{flag}", "on" if record[flag] else "off"))
+
+    performance = record.get("performance")
+    metrics = {"type_score": type_score(performance)}
+    if performance:
+        metrics["views"] = float(performance.get("views", 0))
+        if record.get("uploaded_at"):
+            metrics["engagement_rate"] = engagement_rate(performance)
+    return keys, metrics
+
+
+class PerformanceAggregates:
+    """Welford running stats per (dimension, value, metric) with O(1) updates."""
+
+    def __init__(self, db: VideoMetadataDB = None):
+        self.db = db or get_video_db()
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS agg_groups (
+                dim TEXT NOT NULL, value TEXT NOT NULL, metric TEXT NOT NULL,
+                n INTEGER NOT NULL, total REAL NOT NULL,
+                mean REAL NOT NULL, m2 REAL NOT NULL,
+                PRIMARY KEY (dim, value, metric)
+            )
+        """)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS agg_contributions (
+                video_id TEXT PRIMARY KEY, seq INTEGER NOT NULL, data TEXT NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_agg_seq ON agg_contributions(seq)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS agg_cursors (consumer TEXT PRIMARY KEY, seq INTEGER)")
+
+    # =========================================================================
+    # UPDATES
+    # =========================================================================
+
+    def _apply(self, dim: str, value: str, metric: str, x: float, sign: int):
+        """Add (sign=1) or remove (sign=-1) one observation from a group."""
+        rows = self.db.query("SELECT n, total, mean, m2 FROM agg_groups "
+                             "WHERE dim = ? AND value = ? AND metric = ?", (dim, value, metric))
+        n, total, mean, m2 = (rows[0]["n"], rows[0]["total"], rows[0]["mean"],
+                              rows[0]["m2"]) if rows else (0, 0.0, 0.0, 0.0)
+        if sign > 0:
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+            total += x
+        else:
+            if n <= 1:
+                self.db.execute("DELETE FROM agg_groups WHERE dim = ? AND value = ? AND metric = ?",
+                                (dim, value, metric))
+                return
+            old_mean = mean
+            n -= 1
+            mean = (old_mean * (n + 1) - x) / n
+            m2 = max(0.0, m2 - (x - old_mean) * (x - mean))
+            total -= x
+        self.db.execute("""
+            INSERT INTO agg_groups (dim, value, metric, n, total, mean, m2)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(dim, value, metric) DO UPDATE SET
+                n = excluded.n, total = excluded.total, mean = excluded.mean, m2 = excluded.m2
+        """, (dim, value, metric, n, total, mean, m2))
+
+    def _next_seq(self) -> int:
+        rows = self.db.query("SELECT COALESCE(MAX(seq), 0) FROM agg_contributions")
+        return rows[0][0] + 1
+
+    def observe(self, record: Dict):
+        """Replace a video's contribution with its current state."""
+        self.observe_many([record])
+
+    def observe_many(self, records: Iterable[Dict]) -> int:
+        """Apply several videos' updates in one transaction."""
+        count = 0
+        with self.db.transaction():
+            seq = self._next_seq()
+            for record in records:
+                video_id = record["video_id"]
+                keys, metrics = contribution(record)
+                new = {"keys": keys, "metrics": metrics}
+                rows = self.db.query("SELECT data FROM agg_contributions WHERE video_id = ?",
+                                     (video_id,))
+                old = json.loads(rows[0]["data"]) if rows else None
+                if old == json.loads(json.dumps(new)):
+                    continue  # Nothing this layer tracks has changed
+                if old:
+                    for dim, value in old["keys"]:
+                        for metric, x in old["metrics"].items():
+                            self._apply(dim, value, metric, x, -1)
+                for dim, value in keys:
+                    for metric, x in metrics.items():
+                        self._apply(dim, value, metric, x, 1)
+                self.db.execute("""
+                    INSERT INTO agg_contributions (video_id, seq, data) VALUES (?, ?, ?)
+                    ON CONFLICT(video_id) DO UPDATE SET seq = excluded.seq, data = excluded.data
+                """, (video_id, seq, json.dumps(new)))
+                seq += 1
+                count += 1
+        return count
+
+    def rebuild(self, records: Iterable[Dict]) -> int:
+        """Recompute everything from scratch (first run / repair)."""
+        with self.db.transaction():
+            self.db.execute("DELETE FROM agg_groups")
+            self.db.execute("DELETE FROM agg_contributions")
+            count = self.observe_many(records)
+        safe_print(f"[AGGREGATES] Built from {count} videos")
+        return count
+
+    def is_empty(self) -> bool:
+        return not self.db.query("SELECT 1 FROM agg_contributions LIMIT 1")
+
+    # =========================================================================
+    # CHANGE FEED
+    # =========================================================================
+
+    def changed_since(self, consumer: str) -> Tuple[List[str], int]:
+        """
+        Videos updated since `consumer` last called mark_consumed().
+
+        Returns (video_ids, seq) - pass seq to mark_consumed() once processed.
+        """
+        rows = self.db.query("SELECT seq FROM agg_cursors WHERE consumer = ?", (consumer,))
+        cursor = rows[0]["seq"] if rows else 0
+        changed = self.db.query("SELECT video_id, seq FROM agg_contributions "
+                                "WHERE seq > ? ORDER BY seq", (cursor,))
+        seq = changed[-1]["seq"] if changed else cursor
+        return [row["video_id"] for row in changed], seq
+
+    def mark_consumed(self, consumer: str, seq: int):
+        self.db.execute("""
+            INSERT INTO agg_cursors (consumer, seq) VALUES (?, ?)
+            ON CONFLICT(consumer) DO UPDATE SET seq = excluded.seq
+        """, (consumer, seq))
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    @staticmethod
+    def _stats(row) -> Dict:
+        n = row["n"]
+        return {
+            "n": n,
+            "total": row["total"],
+            "mean": row["mean"],
+            "std": math.sqrt(row["m2"] / (n - 1)) if n > 1 else 0.0,
+        }
+
+    def group(self, dim: str, metric: str) -> Dict[str, Dict]:
+        """{value: {n, total, mean, std}} for one dimension and metric."""
+        rows = self.db.query("SELECT value, n, total, mean, m2 FROM agg_groups "
+                             "WHERE dim = ? AND metric = ?", (dim, metric))
+        return {row["value"]: self._stats(row) for row in rows}
+
+    def overall(self, metric: str) -> Dict:
+        return self.group("all", metric).get("all", {"n": 0, "total": 0.0, "mean": 0.0, "std": 0.0})
+
+    def best(self, dim: str, metric: str, top: int = 3, min_n: int = 1) -> List[Tuple[str, float]]:
+        """Top values of a dimension by mean metric (groups with at least min_n videos)."""
+        groups = self.group(dim, metric)
+        ranked = sorted(((value, s["mean"]) for value, s in groups.items() if s["n"] >= min_n),
+                        key=lambda item: item[1], reverse=True)
+        return ranked[:top]
+
+    def feature_lift(self, metric: str = "views") -> Dict[str, Dict]:
+        """Mean metric with each feature on vs off."""
+        lift = {}
+        for flag in FEATURE_FLAGS:
+            groups = self.group(f"feature:{flag}", metric)
+            on, off = groups.get("on"), groups.get("off")
+            if on and off:
+                lift[flag] = {"on": round(on["mean"], 2), "off": round(off["mean"], 2),
+                              "n_on": on["n"], "n_off": off["n"]}
+        return lift
+
+    def get_summary(self, top: int = 5) -> Dict:
+        """Compact insight summary for reports and AI analysis prompts."""
+        views = self.overall("views")
+        summary = {
+            "videos_tracked": self.overall("type_score")["n"],
+            "videos_with_performance": views["n"],
+            "total_views": int(views["total"]),
+            "average_views": round(views["mean"], 1),
+            "views_std": round(views["std"], 1),
+        }
+        for dim in ("category", "hook_pattern", "music_mood", "voice"):
+            summary[f"best_{dim}"] = [
+                {"value": value, "avg_views": round(mean, 1),
+                 "videos": self.group(dim, "views")[value]["n"]}
+                for value, mean in self.best(dim, "views", top)
+            ]
+        summary["best_posting_hours"] = [int(h) for h, _ in self.best("posting_hour", "engagement_rate", 3, 2)]
+        summary["best_posting_days"] = [d for d, _ in self.best("posting_day", "engagement_rate", 3, 2)]
+        summary["feature_lift"] = self.feature_lift()
+        return summary
+
+
+# Singleton
+_aggregates = None
+
+
+def get_performance_aggregates() -> PerformanceAggregates:
+    """Get the shared PerformanceAggregates instance."""
+    global _aggregates
+    if _aggregates is None:
+        _aggregates = PerformanceAggregates()
+    return _aggregates
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+    from pathlib import Path
+
+    safe_print("Testing Performance Aggregates...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        aggregates = PerformanceAggregates(db)
+        records = [{
+            "video_id": f"v{i}", "video_type": random.choice(["money", "psychology", "health"]),
+            "hook": random.choice(["Did you know this?", "STOP scrolling", "The secret banks hide"]),
+            "music_mood": "dramatic", "uploaded_at": f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:00:00",
+            "has_captions": i % 2 == 0,
+            "performance": {"views": random.randint(100, 5000), "likes": random.randint(0, 200)},
+        } for i in range(1000)]
+        start = time.time()
+        aggregates.rebuild(records)
+        safe_print(f"Rebuild of 1000 videos: {(time.time() - start) * 1000:.0f}ms")
+
+        records[0]["performance"]["views"] = 99999
+        start = time.time()
+        aggregates.observe(records[0])
+        safe_print(f"One update: {(time.time() - start) * 1000:.2f}ms")
+        safe_print(json.dumps(aggregates.get_summary(3), indent=2))
+        db.close()
@@ -13,12 +13,17 @@ This module provides a unified view of all performance metrics:
 Use this to monitor the health of the video generation system.
 """
 
-import json
 import os
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Data directories
 STATE_DIR = Path("data/persistent")
 DASHBOARD_FILE = STATE_DIR / "dashboard_data.json"
@@ -43,9 +48,8 @@ class PerformanceDashboard:
     def _load(self) -> Dict:
         """Load dashboard data from disk."""
         try:
-            if DASHBOARD_FILE.exists():
-                with open(DASHBOARD_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(DASHBOARD_FILE):
+                return load_state(DASHBOARD_FILE)
         except:
             pass
         
@@ -72,8 +76,7 @@ class PerformanceDashboard:
         try:
             STATE_DIR.mkdir(parents=True, exist_ok=True)
             self.data["last_updated"] = datetime.now(timezone.utc).isoformat()
-            with open(DASHBOARD_FILE, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            save_state(DASHBOARD_FILE, self.data)
         except Exception as e:
             safe_print(f"[Dashboard] Save error: {e}")
     
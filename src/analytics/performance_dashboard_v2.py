@@ -17,12 +17,17 @@ Output: Beautiful HTML dashboard with charts
 """
 
 import os
-import json
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, state_exists
+
 
 def safe_print(msg: str):
     try:
@@ -50,9 +55,8 @@ class DashboardGenerator:
     
     def _load_json(self, path: Path) -> Dict:
         try:
-            if path.exists():
-                with open(path, 'r') as f:
-                    return json.load(f)
+            if state_exists(path):
+                return load_state(path)
         except:
             pass
         return {}
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Performance Model v18.7
+==============================================
+
+A small trained model of what our uploads actually get, with batch scoring.
+
+EngagementPredictor (both versions), RetentionPredictor and
+ViralityCalculator score one item at a time with hand-written heuristics;
+predict_ctr / predict_viral_velocity ask the AI. None of them learn from
+the stats we fetch back. This model does:
+
+- Features: hashed title / hook / topic words and bigrams, the category,
+  and a few dense signals (length, numbers, questions, power words)
+- Target: log views of our measured uploads
+- Ridge regression, alpha picked by generalised cross-validation
+
+Training is incremental and exact: the model keeps the sufficient
+statistics (X'X, X'y, sums) in the video metadata database and each video's
+last contribution. When a video's stats change its old contribution is
+subtracted and the new one added, so a retrain after the analytics refresh
+costs one eigendecomposition - independent of how many videos we have.
+
+Every fit is stored as a new weights version (last MAX_VERSIONS kept);
+use_version() pins an older one.
+
+Usage:
+    model = get_performance_model()
+    ranked = model.rank([{"title": t, "hook": h, "category": c} for ...])
+"""
+
+import io
+import json
+import math
+import re
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from video_metadata_db import VideoMetadataDB, get_video_db
+except ImportError:
+    from src.analytics.video_metadata_db import VideoMetadataDB, get_video_db
+
+try:
+    from engagement_predictor_v2 import EngagementPredictor
+    POWER_WORDS = {w for words in EngagementPredictor.POWER_WORDS.values() for w in words}
+except ImportError:
+    try:
+        from src.analytics.engagement_predictor_v2 import EngagementPredictor
+        POWER_WORDS = {w for words in EngagementPredictor.POWER_WORDS.values() for w in words}
+    except ImportError:
+        POWER_WORDS = set()
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+# Bump when featurize() changes - stored statistics are then rebuilt
+FEATURE_VERSION = 1
+
+# Text fields and their hash namespaces
+TEXT_FIELDS = {"title": "t", "hook": "h", "topic": "p"}
+HASH_DIM = 512
+
+DENSE_FEATURES = [
+    "title_length", "hook_words", "has_number", "has_question",
+    "has_exclamation", "power_words", "caps_ratio",
+]
+N_FEATURES = len(DENSE_FEATURES) + HASH_DIM
+
+RIDGE_ALPHAS = (1.0, 3.0, 10.0, 30.0, 100.0, 300.0, 1000.0, 3000.0)
+
+# Fewer measured uploads than this and there's nothing to fit
+MIN_SAMPLES = 20
+MAX_VERSIONS = 10
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+Candidate = Union[str, Dict]
+
+
+def candidate_fields(item: Candidate) -> Dict[str, str]:
+    """
+    Normalise a candidate to {title, hook, topic, category}.
+
+    Strings are titles. Concepts may use "concept"/"topic", and records
+    "video_type" for the category.
+    """
+    if isinstance(item, str):
+        return {"title": item, "hook": "", "topic": "", "category": ""}
+    return {
+        "title": item.get("title") or "",
+        "hook": item.get("hook") or "",
+        "topic": item.get("topic") or item.get("concept") or "",
+        "category": item.get("category") or item.get("video_type") or "",
+    }
+
+
+def record_fields(record: Dict) -> Dict[str, str]:
+    """Candidate fields of a VideoMetadata record (asdict form)."""
+    performance = record.get("performance") or {}
+    return candidate_fields({
+        "title": performance.get("title") or record.get("thumbnail_headline"),
+        "hook": record.get("hook"),
+        "topic": record.get("topic"),
+        "category": record.get("video_type"),
+    })
+
+
+def _bucket(token: str) -> int:
+    return len(DENSE_FEATURES) + zlib.crc32(token.encode("utf-8")) % HASH_DIM
+
+
+def featurize(fields: Dict[str, str]) -> Dict[int, float]:
+    """Sparse feature vector {column: value} of normalised candidate fields."""
+    title, hook = fields["title"], fields["hook"]
+    words = _WORD_RE.findall(f"{title} {hook}".lower())
+    letters = [c for c in title if c.isalpha()]
+    features = {
+        0: min(len(title), 120) / 60,
+        1: min(len(hook.split()), 40) / 15,
+        2: 1.0 if any(c.isdigit() for c in title + hook) else 0.0,
+        3: 1.0 if "?" in title + hook else 0.0,
+        4: 1.0 if "!" in title + hook else 0.0,
+        5: float(sum(1 for w in words if w in POWER_WORDS)),
+        6: sum(1 for c in letters if c.isupper()) / len(letters) if letters else 0.0,
+    }
+    for name, prefix in TEXT_FIELDS.items():
+        tokens = _WORD_RE.findall(fields[name].lower())
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for gram in set(grams):
+            column = _bucket(f"{prefix}:{gram}")
+            features[column] = features.get(column, 0.0) + 1.0
+    if fields["category"]:
+        column = _bucket(f"c:{fields['category'].lower()}")
+        features[column] = features.get(column, 0.0) + 1.0
+    return features
+
+
+def _pack(**arrays) -> bytes:
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _unpack(blob: bytes) -> Dict[str, "np.ndarray"]:
+    with np.load(io.BytesIO(blob)) as data:
+        return {name: data[name] for name in data.files}
+
+
+class PerformanceModel:
+    """Incrementally trained ridge model of log views, with batch scoring."""
+
+    def __init__(self, db: VideoMetadataDB = None):
+        self.db = db or get_video_db()
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS model_samples (
+                video_id TEXT PRIMARY KEY, y REAL NOT NULL, x TEXT NOT NULL
+            )
+        """)
+        self.db.execute("CREATE TABLE IF NOT EXISTS model_state (key TEXT PRIMARY KEY, value BLOB)")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS model_versions (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                trained_at TEXT NOT NULL, feature_version INTEGER NOT NULL,
+                samples INTEGER NOT NULL, alpha REAL NOT NULL, rmse REAL NOT NULL,
+                weights BLOB NOT NULL
+            )
+        """)
+        # Set when a feature change dropped the samples: the next train()
+        # must see every measured record, not just the changed ones
+        self.needs_rebuild = False
+        self.stats = self._load_stats()
+        self.weights = None
+        self.load_version()
+
+    # =========================================================================
+    # SUFFICIENT STATISTICS
+    # =========================================================================
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, "np.ndarray"]:
+        return {
+            "n": np.zeros(1), "sy": np.zeros(1), "syy": np.zeros(1),
+            "sx": np.zeros(N_FEATURES), "xty": np.zeros(N_FEATURES),
+            "xtx": np.zeros((N_FEATURES, N_FEATURES)),
+            "feature_version": np.array([FEATURE_VERSION]),
+        }
+
+    def _load_stats(self) -> Dict[str, "np.ndarray"]:
+        rows = self.db.query("SELECT value FROM model_state WHERE key = 'stats'")
+        if rows:
+            stats = _unpack(rows[0]["value"])
+            if int(stats["feature_version"][0]) == FEATURE_VERSION:
+                return stats
+            # Features changed - old contributions no longer match
+            self.db.execute("DELETE FROM model_samples")
+            self.needs_rebuild = True
+        return self._empty_stats()
+
+    def _add(self, x: Dict[int, float], y: float, sign: int):
+        idx = np.fromiter(x.keys(), dtype=int)
+        val = np.fromiter(x.values(), dtype=float)
+        s = self.stats
+        s["n"] += sign
+        s["sy"] += sign * y
+        s["syy"] += sign * y * y
+        s["sx"][idx] += sign * val
+        s["xty"][idx] += sign * val * y
+        s["xtx"][np.ix_(idx, idx)] += sign * np.outer(val, val)
+
+    def observe_many(self, records: List[Dict]) -> int:
+        """
+        Replace the training contribution of each measured record.
+
+        Returns how many contributions changed.
+        """
+        try:
+            return self._observe(records)
+        except Exception:
+            self.stats = self._load_stats()  # Rolled back - drop the in-memory changes
+            raise
+
+    def _observe(self, records: List[Dict]) -> int:
+        changed = 0
+        with self.db.transaction():
+            for record in records:
+                performance = record.get("performance")
+                if not performance or "views" not in performance:
+                    continue
+                y = math.log1p(max(float(performance.get("views") or 0), 0.0))
+                x = featurize(record_fields(record))
+                encoded = json.dumps(sorted(x.items()))
+                rows = self.db.query("SELECT y, x FROM model_samples WHERE video_id = ?",
+                                     (record["video_id"],))
+                if rows:
+                    if rows[0]["y"] == y and rows[0]["x"] == encoded:
+                        continue
+                    self._add({int(k): v for k, v in json.loads(rows[0]["x"])}, rows[0]["y"], -1)
+                self._add(x, y, 1)
+                self.db.execute("INSERT OR REPLACE INTO model_samples (video_id, y, x) VALUES (?, ?, ?)",
+                                (record["video_id"], y, encoded))
+                changed += 1
+            if changed or self.needs_rebuild:
+                self.db.execute("INSERT OR REPLACE INTO model_state (key, value) VALUES ('stats', ?)",
+                                (_pack(**self.stats),))
+        self.needs_rebuild = False
+        return changed
+
+    @property
+    def samples(self) -> int:
+        return int(round(self.stats["n"][0]))
+
+    # =========================================================================
+    # FITTING
+    # =========================================================================
+
+    def fit(self) -> Optional[Dict]:
+        """
+        Solve ridge from the statistics and store it as a new version.
+
+        Features are centred and scaled to unit variance; one
+        eigendecomposition of the scaled X'X gives GCV for every alpha.
+        """
+        n = self.samples
+        if n < MIN_SAMPLES:
+            return None
+        s = self.stats
+        mx, my = s["sx"] / n, s["sy"][0] / n
+        cov = s["xtx"] - n * np.outer(mx, mx)
+        xy = s["xty"] - n * mx * my
+        tss = max(s["syy"][0] - n * my * my, 1e-12)
+
+        scale = np.sqrt(np.maximum(np.diag(cov), 0) / n)
+        scale[scale < 1e-9] = 1.0
+        cov_z = cov / np.outer(scale, scale)
+        xy_z = xy / scale
+        evals, evecs = np.linalg.eigh(cov_z)
+        evals = np.maximum(evals, 0)
+        proj = evecs.T @ xy_z
+
+        best = None
+        for alpha in RIDGE_ALPHAS:
+            coef = proj / (evals + alpha)
+            explained = float(evals @ coef ** 2)
+            rss = max(tss - 2 * float(coef @ proj) + explained, 0.0)
+            dof = float((evals / (evals + alpha)).sum())
+            gcv = n * rss / max(n - dof, 1.0) ** 2
+            if best is None or gcv < best[0]:
+                best = (gcv, alpha, coef, rss, explained)
+        _, alpha, coef, rss, explained = best
+
+        w = (evecs @ coef) / scale
+        weights = {
+            "w": w, "b": np.array([my - float(mx @ w)]),
+            # Spread of predictions over the training set, for 0-100 scores
+            "pred_mean": np.array([my]),
+            "pred_std": np.array([max(math.sqrt(explained / n), 1e-6)]),
+        }
+        rmse = math.sqrt(rss / n)
+        with self.db.transaction():
+            self.db.execute(
+                "INSERT INTO model_versions (trained_at, feature_version, samples, alpha, rmse, weights) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(), FEATURE_VERSION, n, alpha, rmse, _pack(**weights)))
+            self.db.execute(
+                "DELETE FROM model_versions WHERE version NOT IN "
+                "(SELECT version FROM model_versions ORDER BY version DESC LIMIT ?)", (MAX_VERSIONS,))
+        self.load_version()
+        return {"version": self.version, "samples": n, "alpha": alpha,
+                "rmse": round(rmse, 3), "r2": round(float(1 - rss / tss), 3)}
+
+    def train(self, records: List[Dict]) -> Optional[Dict]:
+        """observe_many + fit when anything changed (or nothing is fitted yet)."""
+        changed = self.observe_many(records)
+        if changed or self.weights is None:
+            return self.fit()
+        return None
+
+    # =========================================================================
+    # VERSIONS
+    # =========================================================================
+
+    def load_version(self, version: int = None) -> bool:
+        """Load the given (default: latest) weights version for this feature set."""
+        if version is None:
+            rows = self.db.query(
+                "SELECT * FROM model_versions WHERE feature_version = ? "
+                "ORDER BY version DESC LIMIT 1", (FEATURE_VERSION,))
+        else:
+            rows = self.db.query(
+                "SELECT * FROM model_versions WHERE version = ? AND feature_version = ?",
+                (version, FEATURE_VERSION))
+        if not rows:
+            self.weights, self.version = None, None
+            return False
+        self.weights = _unpack(rows[0]["weights"])
+        self.version = rows[0]["version"]
+        return True
+
+    def use_version(self, version: int) -> bool:
+        """Pin an older weights version (e.g. after a bad retrain)."""
+        return self.load_version(version)
+
+    def versions(self) -> List[Dict]:
+        return [{k: row[k] for k in ("version", "trained_at", "samples", "alpha", "rmse")}
+                for row in self.db.query("SELECT * FROM model_versions ORDER BY version DESC")]
+
+    def is_trained(self) -> bool:
+        return self.weights is not None
+
+    # =========================================================================
+    # SCORING
+    # =========================================================================
+
+    def feature_matrix(self, candidates: List[Candidate]) -> "np.ndarray":
+        X = np.zeros((len(candidates), N_FEATURES))
+        for i, item in enumerate(candidates):
+            x = featurize(candidate_fields(item))
+            X[i, list(x.keys())] = list(x.values())
+        return X
+
+    def score_batch(self, candidates: List[Candidate]) -> Optional["np.ndarray"]:
+        """
+        Predicted log views for every candidate at once (None until trained).
+
+        Candidates are titles (str) or dicts with title / hook / topic /
+        category; compare scores between candidates with the same fields.
+        """
+        if not self.is_trained() or not candidates:
+            return None
+        return self.feature_matrix(candidates) @ self.weights["w"] + self.weights["b"][0]
+
+    def to_percent(self, predictions: "np.ndarray") -> List[float]:
+        """Predictions -> 0-100 relative to what the model predicts for our uploads."""
+        z = (predictions - self.weights["pred_mean"][0]) / self.weights["pred_std"][0]
+        return [round(50 * (1 + math.erf(v / math.sqrt(2))), 1) for v in z]
+
+    def rank(self, candidates: List[Candidate], top: int = None) -> List[Dict]:
+        """
+        Candidates best first: [{candidate, predicted_views, score (0-100), index}].
+
+        Untrained: original order with score None.
+        """
+        predictions = self.score_batch(candidates)
+        if predictions is None:
+            ranked = [{"candidate": c, "predicted_views": None, "score": None, "index": i}
+                      for i, c in enumerate(candidates)]
+        else:
+            percents = self.to_percent(predictions)
+            ranked = sorted(({"candidate": c, "predicted_views": int(math.expm1(predictions[i])),
+                              "score": percents[i], "index": i}
+                             for i, c in enumerate(candidates)), key=lambda r: -r["score"])
+        return ranked[:top] if top else ranked
+
+    def score(self, candidate: Candidate) -> Optional[float]:
+        """0-100 score of one candidate (None until trained)."""
+        predictions = self.score_batch([candidate])
+        return self.to_percent(predictions)[0] if predictions is not None else None
+
+
+# Singleton
+_model = None
+
+
+def get_performance_model() -> PerformanceModel:
+    """Get the shared PerformanceModel instance."""
+    global _model
+    if _model is None:
+        _model = PerformanceModel()
+    return _model
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+    from pathlib import Path
+
+    safe_print("Testing Performance Model...")
+    random.seed(5)
+    words = ["money", "secret", "brain", "sleep", "habit", "rich", "trick", "daily", "fast", "truth"]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        model = PerformanceModel(db)
+        records = []
+        for i in range(500):
+            title = " ".join(random.sample(words, 4))
+            views = int(random.lognormvariate(6 + (0.8 if "secret" in title else 0), 0.5))
+            records.append({"video_id": f"v{i}", "topic": title, "hook": f"Why {title}?",
+                            "video_type": random.choice(["money", "psychology"]),
+                            "performance": {"views": views, "title": title.title()}})
+        start = time.time()
+        safe_print(f"Trained: {model.train(records)} in {(time.time() - start) * 1000:.0f}ms")
+
+        records[0]["performance"]["views"] = 50000
+        start = time.time()
+        safe_print(f"Retrained after 1 change: {model.train(records[:1])} "
+                   f"in {(time.time() - start) * 1000:.0f}ms")
+
+        candidates = []
+        for _ in range(500):
+            title = " ".join(random.sample(words, 4))
+            candidates.append({"title": title.title(), "hook": f"Why {title}?", "topic": title})
+        start = time.time()
+        ranked = model.rank(candidates, top=3)
+        safe_print(f"Ranked 500 titles in {(time.time() - start) * 1000:.1f}ms")
+        for r in ranked:
+            safe_print(f"  {r['score']:5.1f}  ~{r['predicted_views']} views  {r['candidate']['title']}")
+        safe_print(f"Versions: {[v['version'] for v in model.versions()]}")
+        db.close()
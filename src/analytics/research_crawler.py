@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Competitor Research Crawler v18.7
+========================================================
+
+One quota-aware YouTube Data API client for all competitor research.
+
+Before this module, monthly_analysis, ViralChannelAnalyzer and
+CompetitorLearner each called the API directly: one query at a time,
+nothing remembered between runs, so every monthly run re-searched and
+re-fetched the same videos and channels.
+
+1. Cached OAuth token - refreshed once and reused until shortly before it
+   expires (kept in memory only, never written to data/persistent)
+2. Quota cost model - every request is charged its YouTube unit cost
+   (search.list = 100, videos.list = 1, ...) against a per-run budget;
+   requests that would overspend are skipped instead of sent
+3. Concurrent queries - search_many() runs searches in a thread pool,
+   still within the unit budget
+4. Since-last-seen cursors - a repeated query only asks for videos
+   published after its last search; a channel's uploads playlist is only
+   read up to the newest upload already seen
+5. Video details cache - videos.list is only called for IDs that are not
+   cached (or whose stats are older than DETAILS_MAX_AGE)
+
+Usage:
+    crawler = get_research_crawler()
+    results = crawler.search_many(["psychology facts shorts", ...], max_results=5)
+    details = crawler.video_details([item["id"]["videoId"] for item in results[0]])
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+
+def safe_print(msg: str):
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+CRAWLER_FILE = STATE_DIR / "research_crawler.json"
+
+API_URL = "https://www.googleapis.com/youtube/v3"
+TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+# YouTube Data API quota units per request (10,000/day by default, shared
+# with uploads at 1,600 each)
+QUOTA_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+}
+
+DEFAULT_BUDGET_UNITS = int(os.environ.get("YOUTUBE_RESEARCH_UNITS", "3000"))
+DETAILS_MAX_AGE = timedelta(days=7)
+CHANNEL_MAX_AGE = timedelta(days=1)
+MAX_CACHED_VIDEOS = 3000
+MAX_IDS_PER_CURSOR = 50
+TOKEN_MARGIN_SECONDS = 60
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse(stamp: Optional[str]) -> Optional[datetime]:
+    if not stamp:
+        return None
+    try:
+        return datetime.strptime(stamp[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _trim_video(item: Dict) -> Dict:
+    """The parts of a videos.list item the analyzers read."""
+    snippet = item.get("snippet", {})
+    return {
+        "id": item.get("id"),
+        "snippet": {k: snippet[k] for k in ("title", "channelTitle", "channelId", "publishedAt")
+                    if k in snippet},
+        "statistics": item.get("statistics", {}),
+        "contentDetails": {"duration": item.get("contentDetails", {}).get("duration", "PT0S")},
+    }
+
+
+class QuotaBudget:
+    """YouTube unit budget for one run; reserve() before each request."""
+
+    def __init__(self, units: int = DEFAULT_BUDGET_UNITS):
+        self.units = units
+        self.spent = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, endpoint: str) -> bool:
+        cost = QUOTA_COSTS.get(endpoint, 1)
+        with self._lock:
+            if self.spent + cost > self.units:
+                self.skipped += 1
+                return False
+            self.spent += cost
+            return True
+
+    def exhaust(self):
+        """The API reported quotaExceeded - send nothing else this run."""
+        with self._lock:
+            self.spent = max(self.spent, self.units)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.units - self.spent)
+
+
+class ResearchCrawler:
+    """
+    Budgeted, incremental YouTube research client.
+
+    Authenticates with OAuth (YOUTUBE_CLIENT_ID/SECRET/REFRESH_TOKEN) when
+    configured, otherwise with YOUTUBE_API_KEY / GOOGLE_API_KEY. `http` is
+    anything with requests-style get()/post().
+    """
+
+    def __init__(self, budget_units: int = DEFAULT_BUDGET_UNITS,
+                 state_file: Path = CRAWLER_FILE, http=requests):
+        self.client_id = os.environ.get("YOUTUBE_CLIENT_ID")
+        self.client_secret = os.environ.get("YOUTUBE_CLIENT_SECRET")
+        self.refresh_token = os.environ.get("YOUTUBE_REFRESH_TOKEN")
+        self.api_key = os.environ.get("YOUTUBE_API_KEY") or os.environ.get("GOOGLE_API_KEY")
+        self.budget = QuotaBudget(budget_units)
+        self.state_file = Path(state_file)
+        self.http = http
+        self.requests_sent = 0
+        self.cache_hits = 0
+        self._token: Optional[str] = None
+        self._token_expires = 0.0
+        self._token_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self) -> Dict:
+        state = {}
+        try:
+            if state_exists(self.state_file):
+                state = load_state(self.state_file)
+        except Exception:
+            pass
+        for key in ("queries", "channels", "videos"):
+            state.setdefault(key, {})
+        return state
+
+    def save(self):
+        with self._lock:
+            videos = self.state["videos"]
+            if len(videos) > MAX_CACHED_VIDEOS:
+                keep = sorted(videos, key=lambda v: videos[v]["fetched_at"])[-MAX_CACHED_VIDEOS:]
+                self.state["videos"] = {v: videos[v] for v in keep}
+            self.state["last_updated"] = _iso(_now())
+            save_state(self.state_file, self.state)
+
+    # =========================================================================
+    # AUTH + REQUESTS
+    # =========================================================================
+
+    @property
+    def has_oauth(self) -> bool:
+        return bool(self.client_id and self.client_secret and self.refresh_token)
+
+    @property
+    def available(self) -> bool:
+        return self.has_oauth or bool(self.api_key)
+
+    def access_token(self) -> Optional[str]:
+        """OAuth access token, refreshed only when missing or about to expire."""
+        if not self.has_oauth:
+            return None
+        with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires:
+                return self._token
+            try:
+                response = self.http.post(TOKEN_URL, data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "refresh_token": self.refresh_token,
+                    "grant_type": "refresh_token"
+                }, timeout=10)
+                if response.status_code == 200:
+                    data = response.json()
+                    self._token = data.get("access_token")
+                    lifetime = int(data.get("expires_in", 3600))
+                    self._token_expires = time.monotonic() + max(0, lifetime - TOKEN_MARGIN_SECONDS)
+                    safe_print("[OK] YouTube OAuth token refreshed")
+                    return self._token
+                safe_print(f"[!] Token refresh failed: {response.status_code}")
+            except Exception as e:
+                safe_print(f"[!] Token refresh error: {e}")
+            return None
+
+    def _auth(self) -> Optional[Tuple[Dict, Dict]]:
+        """(extra params, headers) for an API request, or None."""
+        token = self.access_token()
+        if token:
+            return {}, {"Authorization": f"Bearer {token}"}
+        if self.api_key:
+            return {"key": self.api_key}, {}
+        return None
+
+    def _get(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """One charged API request; None if over budget or failed."""
+        auth = self._auth()
+        if auth is None:
+            return None
+        if not self.budget.reserve(endpoint):
+            safe_print(f"[QUOTA] Skipping {endpoint}.list - research budget "
+                       f"({self.budget.units} units) spent")
+            return None
+        extra, headers = auth
+        try:
+            self.requests_sent += 1
+            response = self.http.get(f"{API_URL}/{endpoint}", params={**params, **extra},
+                                     headers=headers, timeout=15)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 403 and "quotaExceeded" in (response.text or ""):
+                self.budget.exhaust()
+            safe_print(f"[!] {endpoint}.list failed: {response.status_code}")
+        except Exception as e:
+            safe_print(f"[!] {endpoint}.list error: {e}")
+        return None
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def _search_item(self, video_id: str) -> Optional[Dict]:
+        """A cached video in search.list item shape."""
+        cached = self.state["videos"].get(video_id)
+        if not cached:
+            return None
+        return {"id": {"kind": "youtube#video", "videoId": video_id},
+                "snippet": dict(cached["item"].get("snippet", {}))}
+
+    def search(self, query: str, max_results: int = 10, window_days: int = None,
+               include_seen: bool = False) -> List[Dict]:
+        """One search (see _search); the cursor is saved straight away."""
+        items = self._search(query, max_results, window_days, include_seen)
+        self.save()
+        return items
+
+    def _search(self, query: str, max_results: int, window_days: Optional[int],
+                include_seen: bool) -> List[Dict]:
+        """
+        search.list for Shorts, ordered by views, published since the last
+        time this query ran (and within window_days, if given).
+
+        include_seen adds the query's earlier results (from the cache) after
+        the new ones. If the search is skipped or fails, the earlier results
+        are returned instead.
+        """
+        key = query.strip().lower()
+        cursor = self.state["queries"].get(key, {})
+        seen = cursor.get("video_ids", [])
+        started = _now()
+
+        after = [stamp for stamp in (cursor.get("last_run"),) if stamp]
+        if window_days:
+            after.append(_iso(started - timedelta(days=window_days)))
+        params = {
+            "q": query,
+            "part": "snippet",
+            "type": "video",
+            "videoDuration": "short",
+            "order": "viewCount",
+            "maxResults": min(max_results, 50),
+        }
+        if after:
+            params["publishedAfter"] = max(after)
+
+        data = self._get("search", params)
+        if data is None:
+            cached = [self._search_item(v) for v in seen[:max_results]]
+            return [item for item in cached if item]
+
+        items = [item for item in data.get("items", []) if item.get("id", {}).get("videoId")]
+        new_ids = [item["id"]["videoId"] for item in items]
+        with self._lock:
+            for item in items:
+                video_id = item["id"]["videoId"]
+                if video_id not in self.state["videos"]:
+                    # Snippet only until video_details() fetches stats
+                    self.state["videos"][video_id] = {
+                        "fetched_at": "", "item": _trim_video({**item, "id": video_id})}
+            ids = new_ids + [v for v in seen if v not in new_ids]
+            self.state["queries"][key] = {
+                "last_run": _iso(started),
+                "video_ids": ids[:MAX_IDS_PER_CURSOR],
+            }
+        if include_seen:
+            items += [item for item in (self._search_item(v) for v in seen if v not in new_ids)
+                      if item]
+        return items[:max_results] if include_seen else items
+
+    def search_many(self, queries: List[str], max_results: int = 10, window_days: int = None,
+                    include_seen: bool = False, workers: int = 4) -> List[List[Dict]]:
+        """search() for each query concurrently; results in query order."""
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(
+                lambda q: self._search(q, max_results, window_days, include_seen), queries))
+        self.save()
+        return results
+
+    # =========================================================================
+    # VIDEOS + CHANNELS
+    # =========================================================================
+
+    def video_details(self, video_ids: List[str], max_age: timedelta = DETAILS_MAX_AGE) -> List[Dict]:
+        """
+        videos.list items (statistics, snippet, contentDetails) in input
+        order. Only IDs missing from the cache or older than max_age are
+        fetched, 50 per request.
+        """
+        video_ids = list(dict.fromkeys(v for v in video_ids if v))
+        now = _now()
+        stale = []
+        for video_id in video_ids:
+            fetched = _parse(self.state["videos"].get(video_id, {}).get("fetched_at"))
+            if fetched is None or now - fetched > max_age:
+                stale.append(video_id)
+        self.cache_hits += len(video_ids) - len(stale)
+
+        batches = [stale[i:i + 50] for i in range(0, len(stale), 50)]
+        with ThreadPoolExecutor(max_workers=max(1, min(4, len(batches)))) as pool:
+            responses = list(pool.map(lambda batch: self._get("videos", {
+                "id": ",".join(batch), "part": "statistics,snippet,contentDetails"}), batches))
+        with self._lock:
+            for data in responses:
+                for item in (data or {}).get("items", []):
+                    self.state["videos"][item["id"]] = {"fetched_at": _iso(now),
+                                                        "item": _trim_video(item)}
+        if batches:
+            self.save()
+
+        details = []
+        for video_id in video_ids:
+            cached = self.state["videos"].get(video_id)
+            if cached and cached["fetched_at"]:
+                details.append(cached["item"])
+        return details
+
+    def channel_info(self, channel_id: str) -> Optional[Dict]:
+        """channels.list item (statistics, snippet, contentDetails), cached for a day."""
+        cursor = self.state["channels"].get(channel_id, {})
+        fetched = _parse(cursor.get("fetched_at"))
+        if fetched and _now() - fetched <= CHANNEL_MAX_AGE and cursor.get("info"):
+            self.cache_hits += 1
+            return cursor["info"]
+        data = self._get("channels", {"id": channel_id,
+                                      "part": "statistics,snippet,contentDetails"})
+        if not data or not data.get("items"):
+            return cursor.get("info")
+        info = data["items"][0]
+        with self._lock:
+            self.state["channels"].setdefault(channel_id, {}).update(
+                {"fetched_at": _iso(_now()), "info": info})
+        self.save()
+        return info
+
+    def channel_uploads(self, playlist_id: str, max_results: int = 20) -> List[str]:
+        """
+        Newest video IDs from an uploads playlist. Items already seen end
+        the read; earlier uploads come from the stored cursor.
+        """
+        cursor = self.state["channels"].get(playlist_id, {})
+        seen = cursor.get("video_ids", [])
+        last_seen = cursor.get("last_seen", "")
+
+        data = self._get("playlistItems", {"playlistId": playlist_id, "part": "snippet",
+                                           "maxResults": min(max_results, 50)})
+        if data is None:
+            return seen[:max_results]
+
+        new_ids = []
+        newest = last_seen
+        for item in data.get("items", []):
+            snippet = item.get("snippet", {})
+            video_id = snippet.get("resourceId", {}).get("videoId")
+            published = snippet.get("publishedAt", "")
+            if not video_id or video_id in seen or (last_seen and published and published <= last_seen):
+                continue
+            new_ids.append(video_id)
+            newest = max(newest, published)
+
+        ids = new_ids + [v for v in seen if v not in new_ids]
+        with self._lock:
+            self.state["channels"].setdefault(playlist_id, {}).update(
+                {"last_seen": newest, "video_ids": ids[:MAX_IDS_PER_CURSOR]})
+        self.save()
+        return ids[:max_results]
+
+    def get_stats(self) -> Dict:
+        return {
+            "units_spent": self.budget.spent,
+            "units_budget": self.budget.units,
+            "requests_skipped": self.budget.skipped,
+            "requests_sent": self.requests_sent,
+            "cache_hits": self.cache_hits,
+            "cached_videos": len(self.state["videos"]),
+            "query_cursors": len(self.state["queries"]),
+            "channel_cursors": len(self.state["channels"]),
+        }
+
+
+# Singleton
+_crawler = None
+
+
+def get_research_crawler() -> ResearchCrawler:
+    """Get the global ResearchCrawler instance (one quota budget per run)."""
+    global _crawler
+    if _crawler is None:
+        _crawler = ResearchCrawler()
+    return _crawler
+
+
+if __name__ == "__main__":
+    safe_print("Testing Research Crawler...")
+    crawler = get_research_crawler()
+    if not crawler.available:
+        safe_print("No YouTube credentials - set YOUTUBE_API_KEY or the OAuth variables")
+    else:
+        results = crawler.search_many(["psychology facts shorts", "money facts shorts"],
+                                      max_results=5, window_days=180)
+        ids = [item["id"]["videoId"] for items in results for item in items]
+        details = crawler.video_details(ids)
+        safe_print(f"Found {len(ids)} new videos, {len(details)} with stats")
+        crawler.video_details(ids)  # Served from the cache
+    safe_print(f"Stats: {crawler.get_stats()}")
@@ -14,12 +14,23 @@ Key retention factors:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared per-text features; word lists are matched in one pass
+try:
+    from content_features import get_content_features
+except ImportError:
+    from src.analytics.content_features import get_content_features
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -34,6 +45,14 @@ STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 RETENTION_FILE = STATE_DIR / "retention_patterns.json"
 
+LEXICONS = {
+    "retention.interrupt": ["stop", "wait", "hold on"],
+    "retention.curiosity": ["secret", "truth", "why", "how"],
+    "retention.shock": ["shocking", "unbelievable", "wrong"],
+    "retention.open_loop": ["later", "coming up", "wait for it"],
+    "retention.payoff": ["result", "answer", "secret", "here's"],
+}
+
 
 class RetentionPredictor:
     """
@@ -42,12 +61,13 @@ class RetentionPredictor:
     
     def __init__(self):
         self.data = self._load()
+        self.features = get_content_features()
+        self.features.register_many(LEXICONS)
     
     def _load(self) -> Dict:
         try:
-            if RETENTION_FILE.exists():
-                with open(RETENTION_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(RETENTION_FILE):
+                return load_state(RETENTION_FILE)
         except:
             pass
         return {
@@ -59,8 +79,7 @@ class RetentionPredictor:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(RETENTION_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(RETENTION_FILE, self.data)
     
     def predict_retention(self, content: Dict) -> Dict:
         """
@@ -77,6 +96,9 @@ class RetentionPredictor:
         cta = content.get("cta", "")
         category = content.get("category", "general")
         
+        # v18.7: One scan of the script; hook/phrases/CTA reuse it
+        self.features.script(hook, phrases, cta)
+        
         # Analyze content factors
         hook_score = self._score_hook(hook)
         pacing_score = self._score_pacing(phrases)
@@ -107,30 +129,30 @@ class RetentionPredictor:
         """Score hook strength (0-100)."""
         score = 50  # Base
         
-        hook_lower = hook.lower()
+        features = self.features.extract(hook)
         
         # Pattern interrupt words (+15)
-        if any(w in hook_lower for w in ["stop", "wait", "hold on"]):
+        if features.has("retention.interrupt"):
             score += 15
         
         # Questions (+10)
-        if "?" in hook:
+        if features.question_count:
             score += 10
         
         # Numbers (+10)
-        if re.search(r'\d', hook):
+        if features.has_digit:
             score += 10
         
         # Short and punchy (+10)
-        if len(hook.split()) <= 8:
+        if features.word_count <= 8:
             score += 10
         
         # Curiosity triggers (+10)
-        if any(w in hook_lower for w in ["secret", "truth", "why", "how"]):
+        if features.has("retention.curiosity"):
             score += 10
         
         # Shock/controversy (+5)
-        if any(w in hook_lower for w in ["shocking", "unbelievable", "wrong"]):
+        if features.has("retention.shock"):
             score += 5
         
         return min(100, score)
@@ -149,14 +171,14 @@ class RetentionPredictor:
             score -= 15
         
         # Average word count per phrase (ideal: 8-15 words)
-        avg_words = sum(len(p.split()) for p in phrases) / len(phrases)
+        lengths = [self.features.extract(p).word_count for p in phrases]
+        avg_words = sum(lengths) / len(phrases)
         if 8 <= avg_words <= 15:
             score += 15
         elif avg_words > 20:
             score -= 10
         
         # Variety in phrase length
-        lengths = [len(p.split()) for p in phrases]
         variance = max(lengths) - min(lengths) if lengths else 0
         if variance >= 3:
             score += 10
@@ -181,11 +203,11 @@ class RetentionPredictor:
         
         # Open loop detection
         all_text = hook + " " + " ".join(phrases)
-        if any(w in all_text.lower() for w in ["later", "coming up", "wait for it"]):
+        if self.features.extract(all_text).has("retention.open_loop"):
             score += 10
         
-        # Payoff detection
-        if any(w in " ".join(phrases[-2:]).lower() for w in ["result", "answer", "secret", "here's"]):
+        # Payoff detection (single words - per phrase == joined last two)
+        if any(self.features.extract(p).has("retention.payoff") for p in phrases[-2:]):
             score += 10
         
         return min(100, score)
@@ -212,7 +234,7 @@ class RetentionPredictor:
         
         # Check for low-value phrases
         for i, phrase in enumerate(phrases):
-            if len(phrase.split()) > 25:
+            if self.features.extract(phrase).word_count > 25:
                 risks.append({
                     "position": f"phrase_{i+1}",
                     "risk": "medium",
@@ -13,12 +13,28 @@ Features:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Per-video facts are shared through the indexed video table
+try:
+    from video_metadata_db import record_video_facts
+    VIDEO_DB_AVAILABLE = True
+except ImportError:
+    try:
+        from src.analytics.video_metadata_db import record_video_facts
+        VIDEO_DB_AVAILABLE = True
+    except ImportError:
+        VIDEO_DB_AVAILABLE = False
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -85,9 +101,8 @@ class RevenueTracker:
     def _load(self) -> Dict:
         """Load revenue tracking data."""
         try:
-            if REVENUE_FILE.exists():
-                with open(REVENUE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(REVENUE_FILE):
+                return load_state(REVENUE_FILE)
         except Exception as e:
             safe_print(f"[REVENUE] Load error: {e}")
         
@@ -104,8 +119,7 @@ class RevenueTracker:
         """Save revenue tracking data."""
         self.data["last_updated"] = datetime.now().isoformat()
         try:
-            with open(REVENUE_FILE, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            save_state(REVENUE_FILE, self.data)
         except Exception as e:
             safe_print(f"[REVENUE] Save error: {e}")
     
@@ -133,6 +147,9 @@ class RevenueTracker:
         }
         
         self.data["videos"].append(video_record)
+        if VIDEO_DB_AVAILABLE:
+            record_video_facts(video_id, title=title, category=category, views=views,
+                               engagement_rate=engagement_rate)
         self.data["total_views"] += views
         self.data["estimated_revenue"] += estimated_revenue
         
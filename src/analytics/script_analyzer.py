@@ -14,12 +14,23 @@ Analysis categories:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared per-text features; word lists are matched in one pass
+try:
+    from content_features import get_content_features, count_syllables
+except ImportError:
+    from src.analytics.content_features import get_content_features, count_syllables
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -34,6 +45,15 @@ STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 ANALYSIS_FILE = STATE_DIR / "script_analysis.json"
 
+LEXICONS = {
+    "script.hook_triggers": ["stop", "wait", "?", "secret", "truth", "why", "how"],
+    "script.body_markers": ["first", "second", "third", "next", "then", "finally", "1.", "2.", "3."],
+    "script.cta_actions": ["comment", "like", "share", "follow", "subscribe", "save", "try", "start"],
+    "script.value_words": ["tip", "trick", "hack", "secret", "learn", "discover",
+                           "way", "step", "method", "strategy", "how to", "guide"],
+    "script.action_words": ["do", "try", "start", "stop", "avoid", "use", "make"],
+}
+
 
 class ScriptAnalyzer:
     """
@@ -52,12 +72,13 @@ class ScriptAnalyzer:
     
     def __init__(self):
         self.data = self._load()
+        self.features = get_content_features()
+        self.features.register_many(LEXICONS)
     
     def _load(self) -> Dict:
         try:
-            if ANALYSIS_FILE.exists():
-                with open(ANALYSIS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(ANALYSIS_FILE):
+                return load_state(ANALYSIS_FILE)
         except:
             pass
         return {
@@ -68,8 +89,7 @@ class ScriptAnalyzer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(ANALYSIS_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(ANALYSIS_FILE, self.data)
     
     def analyze_script(self, content: Dict) -> Dict:
         """
@@ -85,6 +105,9 @@ class ScriptAnalyzer:
         phrases = content.get("phrases", [])
         cta = content.get("cta", "")
         
+        # v18.7: One scan of the script; hook/phrases/CTA reuse it
+        self.features.script(hook, phrases, cta)
+        
         # Basic metrics
         metrics = self._calculate_metrics(hook, phrases, cta)
         
@@ -119,11 +142,11 @@ class ScriptAnalyzer:
     
     def _calculate_metrics(self, hook: str, phrases: List[str], cta: str) -> Dict:
         """Calculate basic metrics."""
-        hook_words = len(hook.split()) if hook else 0
+        hook_words = self.features.extract(hook).word_count
         phrase_count = len(phrases)
-        phrase_word_counts = [len(p.split()) for p in phrases]
+        phrase_word_counts = [self.features.extract(p).word_count for p in phrases]
         avg_words_per_phrase = sum(phrase_word_counts) / max(1, phrase_count)
-        cta_words = len(cta.split()) if cta else 0
+        cta_words = self.features.extract(cta).word_count
         total_words = hook_words + sum(phrase_word_counts) + cta_words
         
         # Estimate duration (assuming ~150 words per minute)
@@ -161,10 +184,7 @@ class ScriptAnalyzer:
         if not hook:
             return 0
         
-        hook_lower = hook.lower()
-        triggers = ["stop", "wait", "?", "secret", "truth", "why", "how"]
-        
-        return 1 if any(t in hook_lower for t in triggers) else 0
+        return 1 if self.features.extract(hook).has("script.hook_triggers") else 0
     
     def _is_body_organized(self, phrases: List[str]) -> int:
         """Check if body is organized."""
@@ -172,29 +192,23 @@ class ScriptAnalyzer:
             return 0
         
         # Check for numbering or transitions
-        text = " ".join(phrases).lower()
-        markers = ["first", "second", "third", "next", "then", "finally", "1.", "2.", "3."]
-        
-        return 1 if any(m in text for m in markers) else 0
+        return 1 if self.features.extract(" ".join(phrases)).has("script.body_markers") else 0
     
     def _is_clear_cta(self, cta: str) -> int:
         """Check if CTA is clear."""
         if not cta:
             return 0
         
-        cta_lower = cta.lower()
-        actions = ["comment", "like", "share", "follow", "subscribe", "save", "try", "start"]
-        
-        return 1 if any(a in cta_lower for a in actions) else 0
+        return 1 if self.features.extract(cta).has("script.cta_actions") else 0
     
     def _analyze_readability(self, hook: str, phrases: List[str], cta: str) -> Dict:
         """Analyze text readability."""
-        all_text = f"{hook} {' '.join(phrases)} {cta}"
+        features = self.features.script(hook, phrases, cta)
         
         # Simple readability metrics
-        sentences = len(re.findall(r'[.!?]+', all_text)) + 1
-        words = len(all_text.split())
-        syllables = self._count_syllables(all_text)
+        sentences = features.sentence_marks + 1
+        words = features.word_count
+        syllables = features.syllables
         
         # Flesch Reading Ease (simplified)
         if words > 0 and sentences > 0:
@@ -204,7 +218,7 @@ class ScriptAnalyzer:
             flesch = 50
         
         # Average word length
-        avg_word_length = len(all_text.replace(" ", "")) / max(1, words)
+        avg_word_length = features.chars_no_spaces / max(1, words)
         
         return {
             "score": round(flesch, 1),
@@ -215,21 +229,7 @@ class ScriptAnalyzer:
     
     def _count_syllables(self, text: str) -> int:
         """Rough syllable count."""
-        text = text.lower()
-        count = 0
-        vowels = "aeiouy"
-        
-        for word in text.split():
-            word_count = 0
-            prev_vowel = False
-            for char in word:
-                is_vowel = char in vowels
-                if is_vowel and not prev_vowel:
-                    word_count += 1
-                prev_vowel = is_vowel
-            count += max(1, word_count)
-        
-        return count
+        return count_syllables(text)
     
     def _get_reading_level(self, score: float) -> str:
         """Convert Flesch score to reading level."""
@@ -246,19 +246,16 @@ class ScriptAnalyzer:
     
     def _analyze_value(self, hook: str, phrases: List[str]) -> Dict:
         """Analyze value delivery."""
-        all_text = f"{hook} {' '.join(phrases)}".lower()
+        features = self.features.extract(f"{hook} {' '.join(phrases)}")
         
         # Value indicators
-        value_words = ["tip", "trick", "hack", "secret", "learn", "discover",
-                       "way", "step", "method", "strategy", "how to", "guide"]
-        value_count = sum(1 for w in value_words if w in all_text)
+        value_count = features.count("script.value_words")
         
         # Actionable content
-        action_words = ["do", "try", "start", "stop", "avoid", "use", "make"]
-        action_count = sum(1 for w in action_words if w in all_text)
+        action_count = features.count("script.action_words")
         
         # Numbers (specificity)
-        numbers = len(re.findall(r'\d+', all_text))
+        numbers = len(features.numbers)
         
         score = min(100, 30 + value_count * 10 + action_count * 10 + numbers * 10)
         
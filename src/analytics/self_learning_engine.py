@@ -30,12 +30,60 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import re
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared per-text features; word lists are matched in one pass
+try:
+    from content_features import get_content_features
+except ImportError:
+    from src.analytics.content_features import get_content_features
+
 # State directory
 STATE_DIR = Path("data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 LEARNING_FILE = STATE_DIR / "self_learning.json"
 
+LEXICONS = {
+    "hook.pattern_interrupt": ["stop", "wait", "hold on", "listen"],
+    "hook.social_proof": ["99%", "most people", "nobody", "everyone"],
+    "hook.mystery": ["secret", "truth", "hidden", "won't tell"],
+    "hook.shock": ["shocking", "unbelievable", "crazy", "insane"],
+    "title.comparison": ["vs", "or", "versus"],
+    "title.educational": ["how to", "why", "what"],
+    "title.mystery": ["secret", "hidden", "truth"],
+    "title.shock": ["shocking", "insane", "crazy", "impossible"],
+    "title.direct": ["this", "here's", "watch"],
+}
+FEATURES = get_content_features()
+FEATURES.register_many(LEXICONS)
+
+SPECIFIC_NUMBER = re.compile(r'\$\d+|^\d+%|\d+ (times|days|hours)')
+
+
+def extract_hook_pattern(hook: str) -> str:
+    """Pattern type of a hook (shared with the v18.7 performance aggregates)."""
+    features = FEATURES.extract(hook)
+    
+    if features.question_count:
+        return "question"
+    elif features.has("hook.pattern_interrupt"):
+        return "pattern_interrupt"
+    elif features.has("hook.social_proof"):
+        return "social_proof"
+    elif features.has("hook.mystery"):
+        return "mystery"
+    elif features.has("hook.shock"):
+        return "shock"
+    elif SPECIFIC_NUMBER.search(features.lower):
+        return "specific_number"
+    else:
+        return "statement"
+
 
 @dataclass
 class LearningPattern:
@@ -66,9 +114,8 @@ class SelfLearningEngine:
     def _load(self) -> Dict:
         """Load learning data from disk."""
         try:
-            if LEARNING_FILE.exists():
-                with open(LEARNING_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(LEARNING_FILE):
+                return load_state(LEARNING_FILE)
         except Exception as e:
             print(f"[SelfLearning] Load error: {e}")
         
@@ -121,8 +168,7 @@ class SelfLearningEngine:
         """Save learning data to disk."""
         try:
             self.data["last_updated"] = datetime.now().isoformat()
-            with open(LEARNING_FILE, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            save_state(LEARNING_FILE, self.data)
         except Exception as e:
             print(f"[SelfLearning] Save error: {e}")
     
@@ -191,27 +237,14 @@ class SelfLearningEngine:
     
     def _extract_hook_pattern(self, hook: str) -> str:
         """Extract the pattern type from a hook."""
-        hook_lower = hook.lower()
-        
-        if '?' in hook:
-            return "question"
-        elif any(word in hook_lower for word in ["stop", "wait", "hold on", "listen"]):
-            return "pattern_interrupt"
-        elif any(word in hook_lower for word in ["99%", "most people", "nobody", "everyone"]):
-            return "social_proof"
-        elif any(word in hook_lower for word in ["secret", "truth", "hidden", "won't tell"]):
-            return "mystery"
-        elif any(word in hook_lower for word in ["shocking", "unbelievable", "crazy", "insane"]):
-            return "shock"
-        elif re.search(r'\$\d+|^\d+%|\d+ (times|days|hours)', hook_lower):
-            return "specific_number"
-        else:
-            return "statement"
+        return extract_hook_pattern(hook)
     
     def _extract_number_patterns(self, phrases: List[str]) -> List[Dict]:
         """Extract number patterns from phrases."""
         patterns = []
         full_text = " ".join(phrases)
+        if not FEATURES.extract(full_text).has_digit:
+            return patterns
         
         # Round numbers like $500, 80%, 1000
         if re.search(r'\$\d+00\b|\b\d0%\b|\b\d+000\b', full_text):
@@ -440,21 +473,21 @@ PERFORMANCE STATS:
     
     def _extract_title_pattern(self, title: str) -> str:
         """Extract the pattern type from a title."""
-        title_lower = title.lower()
+        features = FEATURES.extract(title)
         
-        if "?" in title:
+        if features.question_count:
             return "question"
-        elif any(word in title_lower for word in ["vs", "or", "versus"]):
+        elif features.has("title.comparison"):
             return "comparison"
-        elif re.search(r'^\d+\s', title) or re.search(r'top \d+', title_lower):
+        elif re.search(r'^\d+\s', title) or re.search(r'top \d+', features.lower):
             return "listicle"
-        elif any(word in title_lower for word in ["how to", "why", "what"]):
+        elif features.has("title.educational"):
             return "educational"
-        elif any(word in title_lower for word in ["secret", "hidden", "truth"]):
+        elif features.has("title.mystery"):
             return "mystery"
-        elif any(word in title_lower for word in ["shocking", "insane", "crazy", "impossible"]):
+        elif features.has("title.shock"):
             return "shock"
-        elif any(word in title_lower for word in ["this", "here's", "watch"]):
+        elif features.has("title.direct"):
             return "direct"
         else:
             return "statement"
@@ -584,7 +617,6 @@ Return JSON ONLY:
         # Parse result
         if result:
             try:
-                import json
                 start = result.find('{')
                 end = result.rfind('}') + 1
                 if start >= 0 and end > start:
@@ -20,12 +20,28 @@ Why series matter:
 """
 
 import os
-import json
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Per-video facts are shared through the indexed video table
+try:
+    from video_metadata_db import record_video_facts
+    VIDEO_DB_AVAILABLE = True
+except ImportError:
+    try:
+        from src.analytics.video_metadata_db import record_video_facts
+        VIDEO_DB_AVAILABLE = True
+    except ImportError:
+        VIDEO_DB_AVAILABLE = False
+
 
 def safe_print(msg: str):
     try:
@@ -71,9 +87,8 @@ class SeriesDetector:
     
     def _load(self) -> Dict:
         try:
-            if SERIES_FILE.exists():
-                with open(SERIES_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(SERIES_FILE):
+                return load_state(SERIES_FILE)
         except:
             pass
         return {
@@ -85,17 +100,15 @@ class SeriesDetector:
     
     def _load_variety_state(self) -> Dict:
         try:
-            if VARIETY_FILE.exists():
-                with open(VARIETY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(VARIETY_FILE):
+                return load_state(VARIETY_FILE)
         except:
             pass
         return {}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(SERIES_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(SERIES_FILE, self.data)
     
     def analyze_video(self, video_id: str, title: str, category: str,
                       views: int, engagement_rate: float, comments: int = 0,
@@ -118,6 +131,9 @@ class SeriesDetector:
             "timestamp": datetime.now().isoformat()
         }
         self.data["video_performance"].append(video_data)
+        if VIDEO_DB_AVAILABLE:
+            record_video_facts(video_id, title=title, category=category, views=views,
+                               engagement_rate=engagement_rate, comments=comments)
         
         # Calculate performance percentile
         percentile = self._calculate_percentile(views)
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Video Metadata Index v18.7
+=================================================
+
+Indexed SQLite table of everything we know per video.
+
+VideoMetadataStore used to load every record from data/video_metadata.json
+on construction (several times per run), parse generated_at for every
+record on each get_recent() call and sort the whole set on each
+get_top_performers() call. AnalyticsStateManager, RevenueTracker and
+SeriesDetector each kept their own copy of the same per-video facts.
+
+One row per video:
+- Typed, indexed columns for the facts queries filter and sort on
+  (generated_at, category, views, platform IDs, score...)
+- The full VideoMetadata record as JSON in `data` (NULL for videos only
+  other trackers have reported so far)
+
+Time-window, top-k and per-category queries are index range scans, so
+they stay fast with thousands of videos. The legacy JSON file is imported
+once (see migrate_json).
+
+Usage:
+    db = get_video_db()
+    db.put(asdict(metadata))
+    db.merge_facts("run_123", views=1500, category="psychology")
+    db.recent_records(days=7)
+    db.top_records(limit=10, category="money")
+"""
+
+import atexit
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+VIDEO_DB = STATE_DIR / "video_metadata.db"
+
+# Typed columns (besides video_id/data/updated_at) and their SQL types
+FACT_COLUMNS = {
+    "generated_at": "TEXT",
+    "uploaded_at": "TEXT",
+    "category": "TEXT",
+    "topic": "TEXT",
+    "title": "TEXT",
+    "youtube_id": "TEXT",
+    "dailymotion_id": "TEXT",
+    "views": "INTEGER",
+    "likes": "INTEGER",
+    "comments": "INTEGER",
+    "engagement_rate": "REAL",
+    "score": "REAL",
+    "stats_fetched_at": "TEXT",
+}
+
+PLATFORM_COLUMNS = {"youtube": "youtube_id", "dailymotion": "dailymotion_id"}
+
+
+def facts_from_record(record: Dict) -> Dict[str, Any]:
+    """Indexed column values of a VideoMetadata record (asdict form)."""
+    performance = record.get("performance") or {}
+    return {
+        "generated_at": record.get("generated_at"),
+        "uploaded_at": record.get("uploaded_at"),
+        "category": record.get("video_type"),
+        "topic": record.get("topic"),
+        "title": performance.get("title") or record.get("thumbnail_headline"),
+        "youtube_id": record.get("youtube_video_id"),
+        "dailymotion_id": record.get("dailymotion_video_id"),
+        "views": performance.get("views"),
+        "likes": performance.get("likes"),
+        "comments": performance.get("comments"),
+        "score": record.get("quality_score") or record.get("virality_score"),
+        "stats_fetched_at": performance.get("fetched_at"),
+    }
+
+
+class VideoMetadataDB:
+    """Per-video facts in one indexed SQLite table."""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = Path(db_path) if db_path else VIDEO_DB
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                               isolation_level=None, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        columns = ",\n".join(f"{name} {kind}" for name, kind in FACT_COLUMNS.items())
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                {columns},
+                data TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_generated ON videos(generated_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_category ON videos(category, views)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_views ON videos(views)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_youtube ON videos(youtube_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_dailymotion ON videos(dailymotion_id)")
+        return conn
+
+    # =========================================================================
+    # WRITES
+    # =========================================================================
+
+    def _upsert(self, video_id: str, facts: Dict[str, Any], data: Optional[str]):
+        """Insert or update a row; facts given as None keep their stored value."""
+        names = [n for n in FACT_COLUMNS if n in facts]
+        updates = [f"{n} = COALESCE(excluded.{n}, {n})" for n in names]
+        if data is not None:
+            updates.append("data = excluded.data")
+        updates.append("updated_at = excluded.updated_at")
+        self._conn.execute(f"""
+            INSERT INTO videos (video_id, {", ".join(names + ["data", "updated_at"])})
+            VALUES ({", ".join("?" * (len(names) + 3))})
+            ON CONFLICT(video_id) DO UPDATE SET {", ".join(updates)}
+        """, [video_id] + [facts[n] for n in names] + [data, time.time()])
+
+    def put(self, record: Dict):
+        """Save a full VideoMetadata record (asdict form)."""
+        self.put_many([record])
+
+    def put_many(self, records: Iterable[Dict]) -> int:
+        """Save many records in one transaction."""
+        count = 0
+        with self.transaction():
+            for record in records:
+                self._upsert(record["video_id"], facts_from_record(record),
+                             json.dumps(record, default=str))
+                count += 1
+        return count
+
+    def merge_facts(self, video_id: str, **facts):
+        """
+        Record facts another tracker knows about a video (views, category...).
+
+        Unknown keys are ignored; None values never overwrite stored ones.
+        """
+        facts = {k: v for k, v in facts.items() if k in FACT_COLUMNS}
+        if not video_id or not facts:
+            return
+        with self._lock:
+            self._upsert(str(video_id), facts, None)
+
+    @staticmethod
+    def _now_iso() -> str:
+        return datetime.now().isoformat()
+
+    def transaction(self):
+        return _Transaction(self)
+
+    # =========================================================================
+    # READS
+    # =========================================================================
+
+    def query(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def execute(self, sql: str, params: Iterable = ()):
+        """Run a statement on the shared connection (tables layered on this DB)."""
+        with self._lock:
+            self._conn.execute(sql, tuple(params))
+
+    @staticmethod
+    def _records(rows: List[sqlite3.Row]) -> List[Dict]:
+        return [json.loads(row["data"]) for row in rows if row["data"]]
+
+    def get_record(self, video_id: str) -> Optional[Dict]:
+        rows = self.query("SELECT data FROM videos WHERE video_id = ?", (video_id,))
+        records = self._records(rows)
+        return records[0] if records else None
+
+    def get_row(self, video_id: str) -> Optional[sqlite3.Row]:
+        """Typed fact columns of one video (sqlite3.Row, access by name)."""
+        rows = self.query("SELECT * FROM videos WHERE video_id = ?", (video_id,))
+        return rows[0] if rows else None
+
+    def records_by_ids(self, video_ids: List[str]) -> List[Dict]:
+        records = []
+        for i in range(0, len(video_ids), 500):  # SQLite host-parameter limit
+            chunk = video_ids[i:i + 500]
+            records += self._records(self.query(
+                f"SELECT data FROM videos WHERE video_id IN ({', '.join('?' * len(chunk))})",
+                chunk))
+        return records
+
+    def find_by_platform_id(self, platform: str, platform_id: str) -> Optional[Dict]:
+        column = PLATFORM_COLUMNS[platform]
+        rows = self.query(f"SELECT data FROM videos WHERE {column} = ?", (platform_id,))
+        records = self._records(rows)
+        return records[0] if records else None
+
+    def record_ids(self) -> List[str]:
+        return [row["video_id"] for row in self.query(
+            "SELECT video_id FROM videos WHERE data IS NOT NULL ORDER BY generated_at")]
+
+    def count(self) -> int:
+        return self.query("SELECT COUNT(*) FROM videos WHERE data IS NOT NULL")[0][0]
+
+    def all_records(self) -> List[Dict]:
+        return self._records(self.query(
+            "SELECT data FROM videos WHERE data IS NOT NULL ORDER BY generated_at"))
+
+    def measured_records(self) -> List[Dict]:
+        """Records with performance data (views fetched at least once)."""
+        return self._records(self.query(
+            "SELECT data FROM videos WHERE views IS NOT NULL AND data IS NOT NULL "
+            "ORDER BY generated_at"))
+
+    def uploaded_records(self, platform: str) -> List[Dict]:
+        """Records with a platform ID, oldest upload first."""
+        column = PLATFORM_COLUMNS[platform]
+        return self._records(self.query(
+            f"SELECT data FROM videos WHERE {column} IS NOT NULL AND data IS NOT NULL "
+            f"ORDER BY COALESCE(uploaded_at, generated_at)"))
+
+    def recent_records(self, days: float = 7) -> List[Dict]:
+        """Records generated in the last N days (ISO timestamps sort as text)."""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        return self._records(self.query(
+            "SELECT data FROM videos WHERE generated_at > ? AND data IS NOT NULL "
+            "ORDER BY generated_at", (cutoff,)))
+
+    def top_records(self, limit: int = 10, category: str = None) -> List[Dict]:
+        """Most viewed records with performance data (optionally one category)."""
+        if category:
+            rows = self.query(
+                "SELECT data FROM videos WHERE category = ? AND views IS NOT NULL "
+                "AND data IS NOT NULL ORDER BY views DESC LIMIT ?", (category, limit))
+        else:
+            rows = self.query(
+                "SELECT data FROM videos WHERE views IS NOT NULL AND data IS NOT NULL "
+                "ORDER BY views DESC LIMIT ?", (limit,))
+        return self._records(rows)
+
+    def category_records(self, category: str, limit: int = None) -> List[Dict]:
+        rows = self.query(
+            "SELECT data FROM videos WHERE category = ? AND data IS NOT NULL "
+            "ORDER BY generated_at DESC LIMIT ?", (category, limit or -1))
+        return self._records(rows)
+
+    def category_summary(self) -> Dict[str, Dict]:
+        """
+        Per-category video count and view totals, straight from the index.
+
+        Only full records count; fact-only rows from merge_facts may describe
+        the same video under another tracker's ID.
+        """
+        rows = self.query("""
+            SELECT category, COUNT(*) AS videos, COUNT(views) AS measured,
+                   COALESCE(SUM(views), 0) AS views, AVG(views) AS avg_views,
+                   AVG(score) AS avg_score
+            FROM videos WHERE category IS NOT NULL AND data IS NOT NULL GROUP BY category
+        """)
+        return {row["category"]: {
+            "videos": row["videos"],
+            "measured": row["measured"],
+            "views": row["views"],
+            "avg_views": round(row["avg_views"] or 0, 1),
+            "avg_score": round(row["avg_score"], 2) if row["avg_score"] is not None else None,
+        } for row in rows}
+
+    # =========================================================================
+    # MIGRATION
+    # =========================================================================
+
+    def migrate_json(self, json_path: Path) -> int:
+        """
+        Import a legacy video_metadata.json once.
+
+        Returns number of records imported (0 if already migrated or absent).
+        """
+        json_path = Path(json_path)
+        key = f"migrated:{json_path.resolve()}"
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+            if not json_path.exists():
+                return 0
+            try:
+                with open(json_path, 'r') as f:
+                    data = json.load(f)
+            except Exception as e:
+                safe_print(f"[VIDEO DB] Skipping unreadable {json_path}: {e}")
+                return 0
+            with self.transaction():
+                imported = self.put_many(dict(record, video_id=record.get("video_id", vid_id))
+                                         for vid_id, record in data.items())
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                   (key, self._now_iso()))
+            safe_print(f"[VIDEO DB] Migrated {imported} videos from {json_path}")
+            return imported
+
+    def close(self):
+        """Checkpoint the WAL so the .db file is self-contained (runs at exit)."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.close()
+            except Exception as e:
+                safe_print(f"[VIDEO DB] Close failed: {e}")
+            self._conn = None
+
+
+class _Transaction:
+    """Re-entrant BEGIN IMMEDIATE ... COMMIT/ROLLBACK around a block."""
+
+    def __init__(self, db: VideoMetadataDB):
+        self.db = db
+        self.outer = False
+
+    def __enter__(self):
+        self.db._lock.acquire()
+        self.outer = not self.db._conn.in_transaction
+        if self.outer:
+            self.db._conn.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.outer:
+                self.db._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.db._lock.release()
+        return False
+
+
+# Singleton
+_video_db = None
+
+
+def get_video_db() -> VideoMetadataDB:
+    """Get the shared VideoMetadataDB instance."""
+    global _video_db
+    if _video_db is None:
+        _video_db = VideoMetadataDB()
+    return _video_db
+
+
+def record_video_facts(video_id: str, **facts):
+    """Best-effort fact sharing for trackers outside the feedback loop."""
+    try:
+        get_video_db().merge_facts(video_id, **facts)
+    except Exception as e:
+        safe_print(f"[VIDEO DB] Could not record facts for {video_id}: {e}")
+
+
+if __name__ == "__main__":
+    safe_print("Testing Video Metadata Index...")
+
+    db = VideoMetadataDB(STATE_DIR / "video_metadata_demo.db")
+    categories = ["psychology", "money", "health", "science"]
+    start = time.time()
+    db.put_many({
+        "video_id": f"demo_{i}",
+        "video_type": categories[i % 4],
+        "topic": f"Topic {i}",
+        "generated_at": (datetime.now() - timedelta(hours=i)).isoformat(),
+        "youtube_video_id": f"yt{i}",
+        "performance": {"views": (i * 7919) % 5000, "likes": i},
+    } for i in range(5000))
+    safe_print(f"5000 videos written in {(time.time() - start) * 1000:.0f}ms")
+
+    start = time.time()
+    recent = db.recent_records(days=2)
+    top = db.top_records(10, category="money")
+    safe_print(f"recent(2d)={len(recent)}, top money={top[0]['performance']['views']} "
+               f"in {(time.time() - start) * 1000:.1f}ms")
+    safe_print(f"Summary: {db.category_summary()}")
+    db.close()
+    (STATE_DIR / "video_metadata_demo.db").unlink()
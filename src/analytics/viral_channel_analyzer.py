@@ -31,6 +31,12 @@ except ImportError:
         except: print(re.sub(r'[^\x00-\x7F]+', '', msg))
     get_viral_manager = None
 
+# v18.7: YouTube research goes through the quota-budgeted crawler
+try:
+    from research_crawler import get_research_crawler
+except ImportError:
+    from src.analytics.research_crawler import get_research_crawler
+
 
 @dataclass
 class ChannelInsight:
@@ -65,7 +71,12 @@ class ViralChannelAnalyzer:
     # This is just the STRUCTURE, not content
     PROVEN_PATTERNS = None  # Will be AI-generated
     
-    def __init__(self):
+    def __init__(self, refresh: bool = True):
+        """
+        refresh=False never calls the AI: stale or missing patterns are used
+        as-is (v18.7 - generation hot path; refresh workflows regenerate).
+        """
+        self.refresh = refresh
         self.youtube_api_key = os.environ.get("YOUTUBE_API_KEY")
         self.groq_key = os.environ.get("GROQ_API_KEY")
         
@@ -85,6 +96,9 @@ class ViralChannelAnalyzer:
         """
         # Check if we already have patterns from viral manager
         if self.viral_manager and self.viral_manager.patterns.get("title_patterns"):
+            if not self.refresh:
+                self.PROVEN_PATTERNS = self.viral_manager.patterns
+                return
             patterns_age = self.viral_manager.patterns.get("last_updated")
             if patterns_age:
                 # Use existing if less than 7 days old
@@ -97,12 +111,26 @@ class ViralChannelAnalyzer:
                 except:
                     pass
         
+        if not self.refresh:
+            self.PROVEN_PATTERNS = self._minimal_fallback_patterns()
+            return
+        
+        self.refresh_patterns()
+    
+    def refresh_patterns(self) -> Dict:
+        """
+        Regenerate patterns via AI and save them.
+        
+        v18.7: Called by the refresh-ai-patterns workflow, so prompt building
+        during generation only ever reads saved patterns.
+        """
         # Generate fresh patterns via AI
         self.PROVEN_PATTERNS = self._generate_viral_patterns_ai()
         
         # Save to viral manager for persistence
         if self.viral_manager:
             self.viral_manager.update_patterns_from_analysis(self.PROVEN_PATTERNS)
+        return self.PROVEN_PATTERNS
     
     def _generate_viral_patterns_ai(self) -> Dict:
         """
@@ -217,23 +245,11 @@ Be specific, creative, and based on CURRENT viral trends. JSON ONLY."""
             return None
         
         try:
-            # Get channel info
-            channel_url = f"https://www.googleapis.com/youtube/v3/channels"
-            params = {
-                "key": self.youtube_api_key,
-                "id": channel_id,
-                "part": "statistics,snippet,contentDetails"
-            }
-            
-            response = requests.get(channel_url, params=params, timeout=15)
-            if response.status_code != 200:
+            # Get channel info (v18.7: cached for a day by the research crawler)
+            channel = get_research_crawler().channel_info(channel_id)
+            if not channel:
                 return None
             
-            data = response.json()
-            if not data.get("items"):
-                return None
-            
-            channel = data["items"][0]
             stats = channel.get("statistics", {})
             snippet = channel.get("snippet", {})
             
@@ -280,35 +296,15 @@ Be specific, creative, and based on CURRENT viral trends. JSON ONLY."""
             return []
         
         try:
-            url = "https://www.googleapis.com/youtube/v3/playlistItems"
-            params = {
-                "key": self.youtube_api_key,
-                "playlistId": playlist_id,
-                "part": "snippet",
-                "maxResults": max_results
-            }
-            
-            response = requests.get(url, params=params, timeout=15)
-            if response.status_code != 200:
-                return []
-            
-            items = response.json().get("items", [])
-            video_ids = [item["snippet"]["resourceId"]["videoId"] for item in items]
-            
-            # Get video statistics
-            videos_url = "https://www.googleapis.com/youtube/v3/videos"
-            videos_params = {
-                "key": self.youtube_api_key,
-                "id": ",".join(video_ids),
-                "part": "statistics,contentDetails,snippet"
-            }
-            
-            videos_response = requests.get(videos_url, params=videos_params, timeout=15)
-            if videos_response.status_code != 200:
+            # v18.7: Only uploads newer than the channel's cursor are new;
+            # details for the rest come from the crawler's cache
+            crawler = get_research_crawler()
+            video_ids = crawler.channel_uploads(playlist_id, max_results)
+            if not video_ids:
                 return []
             
             videos = []
-            for item in videos_response.json().get("items", []):
+            for item in crawler.video_details(video_ids):
                 duration = item["contentDetails"].get("duration", "PT0S")
                 # Only include Shorts (< 60 seconds)
                 if self._duration_to_seconds(duration) <= 60:
@@ -467,7 +463,7 @@ OPTIMAL METRICS:
         Generate viral guidance inline when no patterns exist.
         This is a one-time AI call to bootstrap the system.
         """
-        if not self.groq_key:
+        if not self.groq_key or not self.refresh:
             return """
 === VIRAL CONTENT GUIDANCE ===
 - Create a strong hook in first 2 seconds
@@ -535,7 +531,7 @@ Format as simple bullet points. Be specific and creative. Under 100 words total.
         return patterns
 
 
-def get_viral_prompt_boost() -> str:
+def get_viral_prompt_boost(refresh: bool = True) -> str:
     """
     Get COMPREHENSIVE viral + analytics-learned additions for prompts.
     
@@ -543,8 +539,11 @@ def get_viral_prompt_boost() -> str:
     - Viral patterns from other successful channels (monthly)
     - Our own performance analytics (weekly)
     - GOLD-VALUE: Tricks, baits, hacks, psychological triggers
+    
+    v18.7: Prompt building passes refresh=False (via boost_snapshots) so
+    stale patterns never trigger an AI call mid-generation.
     """
-    analyzer = ViralChannelAnalyzer()
+    analyzer = ViralChannelAnalyzer(refresh=refresh)
     viral_additions = analyzer.get_optimized_prompt_additions()
     
     # Also load our performance-learned preferences
@@ -15,12 +15,23 @@ Virality factors:
 """
 
 import os
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared per-text features; word lists are matched in one pass
+try:
+    from content_features import get_content_features
+except ImportError:
+    from src.analytics.content_features import get_content_features
+
 
 def safe_print(msg: str):
     """Print with Unicode fallback."""
@@ -35,6 +46,19 @@ STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 VIRALITY_FILE = STATE_DIR / "virality_scores.json"
 
+LEXICONS = {
+    "virality.emotional": ["amazing", "incredible", "unbelievable", "shocking"],
+    "virality.social_proof": ["everyone", "millions", "viral", "most people"],
+    "virality.controversy": ["truth", "lie", "wrong", "actually"],
+    "virality.share_prompt": ["share", "send this", "tag someone"],
+    "virality.relatable": ["you", "your", "we all", "everyone knows"],
+    "virality.cta": ["comment", "like", "follow", "save"],
+    "virality.opinion": ["what do you think", "agree", "disagree", "opinion"],
+    "virality.sequence": ["first", "second", "third", "next", "finally"],
+    "virality.curiosity_gap": ["but", "however", "actually", "here's the thing"],
+    "virality.evergreen": ["success", "habits", "mindset", "health", "relationships"],
+}
+
 
 class ViralityCalculator:
     """
@@ -62,14 +86,16 @@ class ViralityCalculator:
     def __init__(self):
         self.data = self._load()
         
+        self.features = get_content_features()
+        self.features.register_many(LEXICONS)
+        
         # v17.9.16: Initialize with baseline + learned
         self._init_dynamic_patterns()
     
     def _load(self) -> Dict:
         try:
-            if VIRALITY_FILE.exists():
-                with open(VIRALITY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(VIRALITY_FILE):
+                return load_state(VIRALITY_FILE)
         except:
             pass
         return {
@@ -105,11 +131,14 @@ class ViralityCalculator:
                         self.curiosity_words.append(w_lower)
         except:
             pass  # Use baseline only
+        
+        # v18.7: Matcher rebuilds only if the learned lists changed
+        self.features.register("virality.interrupt", self.pattern_interrupt_words)
+        self.features.register("virality.curiosity", self.curiosity_words)
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(VIRALITY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(VIRALITY_FILE, self.data)
     
     def calculate_virality(self, content: Dict) -> Dict:
         """
@@ -127,6 +156,9 @@ class ViralityCalculator:
         category = content.get("category", "general")
         topic = content.get("topic", "")
         
+        # v18.7: One scan of the script; hook/phrases/CTA reuse it
+        self.features.script(hook, phrases, cta)
+        
         # Calculate component scores
         hook_score = self._score_hook(hook)
         share_score = self._score_shareability(hook, phrases, cta)
@@ -183,26 +215,26 @@ class ViralityCalculator:
             return 20
         
         score = 30
-        hook_lower = hook.lower()
+        features = self.features.extract(hook)
         
         # Pattern interrupt - uses dynamic patterns
-        if any(w in hook_lower for w in self.pattern_interrupt_words):
+        if features.has("virality.interrupt"):
             score += 20
         
         # Question
-        if "?" in hook:
+        if features.question_count:
             score += 15
         
         # Numbers
-        if re.search(r'\d', hook):
+        if features.has_digit:
             score += 15
         
         # Curiosity/power words - uses dynamic patterns
-        if any(w in hook_lower for w in self.curiosity_words):
+        if features.has("virality.curiosity"):
             score += 15
         
         # Short and punchy
-        if len(hook.split()) <= 10:
+        if features.word_count <= 10:
             score += 10
         
         return min(100, score)
@@ -210,26 +242,26 @@ class ViralityCalculator:
     def _score_shareability(self, hook: str, phrases: List[str], cta: str) -> float:
         """Score shareability (0-100)."""
         score = 25
-        text = f"{hook} {' '.join(phrases)} {cta}".lower()
+        features = self.features.script(hook, phrases, cta)
         
         # Emotional triggers
-        if any(w in text for w in ["amazing", "incredible", "unbelievable", "shocking"]):
+        if features.has("virality.emotional"):
             score += 20
         
         # Social proof
-        if any(w in text for w in ["everyone", "millions", "viral", "most people"]):
+        if features.has("virality.social_proof"):
             score += 15
         
         # Controversy
-        if any(w in text for w in ["truth", "lie", "wrong", "actually"]):
+        if features.has("virality.controversy"):
             score += 15
         
         # Share prompts
-        if any(w in text for w in ["share", "send this", "tag someone"]):
+        if features.has("virality.share_prompt"):
             score += 15
         
         # Relatability
-        if any(w in text for w in ["you", "your", "we all", "everyone knows"]):
+        if features.has("virality.relatable"):
             score += 15
         
         return min(100, score)
@@ -237,17 +269,17 @@ class ViralityCalculator:
     def _score_engagement(self, hook: str, phrases: List[str], cta: str) -> float:
         """Score engagement potential (0-100)."""
         score = 30
-        text = f"{hook} {' '.join(phrases)} {cta}".lower()
+        features = self.features.script(hook, phrases, cta)
         
         # Questions
-        score += text.count("?") * 10
+        score += features.question_count * 10
         
         # CTA presence
-        if any(w in text for w in ["comment", "like", "follow", "save"]):
+        if features.has("virality.cta"):
             score += 20
         
         # Opinion prompts
-        if any(w in text for w in ["what do you think", "agree", "disagree", "opinion"]):
+        if features.has("virality.opinion"):
             score += 15
         
         # Call to action
@@ -272,12 +304,12 @@ class ViralityCalculator:
             score += 15
         
         # Value delivery
-        text = " ".join(phrases).lower()
-        if any(w in text for w in ["first", "second", "third", "next", "finally"]):
+        features = self.features.extract(" ".join(phrases))
+        if features.has("virality.sequence"):
             score += 15
         
         # Curiosity maintenance
-        if any(w in text for w in ["but", "however", "actually", "here's the thing"]):
+        if features.has("virality.curiosity_gap"):
             score += 10
         
         return min(100, score)
@@ -292,8 +324,7 @@ class ViralityCalculator:
             score += 25
         
         # Evergreen topics
-        evergreen = ["success", "habits", "mindset", "health", "relationships"]
-        if any(e in topic.lower() for e in evergreen):
+        if self.features.extract(topic).has("virality.evergreen"):
             score += 20
         
         # Trending signals - use current year dynamically
@@ -309,8 +340,10 @@ class ViralityCalculator:
         """Score YouTube Shorts optimization (0-100)."""
         score = 50
         
+        hook_words = self.features.extract(hook).word_count
+        
         # Short hook (under 10 words)
-        if len(hook.split()) <= 10:
+        if hook_words <= 10:
             score += 15
         
         # Right phrase count (3-5)
@@ -322,7 +355,7 @@ class ViralityCalculator:
             score += 10
         
         # Total content length (ideal: 100-200 words)
-        total_words = len(hook.split()) + sum(len(p.split()) for p in phrases)
+        total_words = hook_words + sum(self.features.extract(p).word_count for p in phrases)
         if 60 <= total_words <= 150:
             score += 15
         
@@ -27,11 +27,16 @@ When ON, it consumes extra quota for enhanced learning.
 """
 
 import os
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # State file for aggressive mode
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -93,9 +98,8 @@ _aggressive_mode_enabled = None  # Cached state
 def _load_state() -> Dict:
     """Load aggressive mode state from file."""
     try:
-        if AGGRESSIVE_MODE_FILE.exists():
-            with open(AGGRESSIVE_MODE_FILE, 'r') as f:
-                return json.load(f)
+        if state_exists(AGGRESSIVE_MODE_FILE):
+            return load_state(AGGRESSIVE_MODE_FILE)
     except Exception:
         pass
     return {
@@ -114,8 +118,7 @@ def _save_state(state: Dict):
     """Save aggressive mode state to file."""
     try:
         STATE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(AGGRESSIVE_MODE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
+        save_state(AGGRESSIVE_MODE_FILE, state)
     except Exception as e:
         _safe_print(f"[AGGRESSIVE] Failed to save state: {e}")
 
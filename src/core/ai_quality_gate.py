@@ -8,13 +8,18 @@ Uses all AI modules to ensure high-quality content.
 """
 
 import os
-import json
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 sys.path.insert(0, 'src')
 sys.path.insert(0, 'src/ai')
 sys.path.insert(0, 'src/analytics')
@@ -59,6 +64,13 @@ try:
 except ImportError:
     AI_QUALITY = False
 
+# v18.7: Only spend the AI quality check when local checks are inconclusive
+try:
+    from evaluation_cascade import get_evaluation_cascade
+    CASCADE = True
+except ImportError:
+    CASCADE = False
+
 
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -87,9 +99,8 @@ class AIQualityGate:
     
     def _load(self) -> Dict:
         try:
-            if GATE_FILE.exists():
-                with open(GATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(GATE_FILE):
+                return load_state(GATE_FILE)
         except:
             pass
         return {
@@ -101,8 +112,7 @@ class AIQualityGate:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(GATE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(GATE_FILE, self.data)
     
     def check(self, content: Dict) -> Tuple[bool, Dict]:
         """
@@ -182,8 +192,21 @@ class AIQualityGate:
                 issues.extend(analysis.get("suggestions", []))
             safe_print(f"   [4/5] Script: {score:.1f} ({analysis.get('grade', '?')})")
         
+        # v18.7: Cascade - the four local checks above may already be conclusive
+        run_ai_check = AI_QUALITY
+        if AI_QUALITY and CASCADE:
+            try:
+                cascade = get_evaluation_cascade()
+                local = cascade.combine({name: c["score"] for name, c in checks.items()})
+                outcome = cascade.evaluate("quality_gate", local=local)
+                run_ai_check = outcome["decision"] == "ai"
+                if not run_ai_check:
+                    safe_print(f"   [5/5] AI Quality: skipped (local {outcome['decision']})")
+            except Exception as e:
+                safe_print(f"   [!] Cascade skipped: {e}")
+        
         # 5. AI Quality Check
-        if AI_QUALITY:
+        if run_ai_check:
             checker = get_quality_checker()
             quality = checker.check_content(content)
             score = quality.get("score", 5) * 10  # Convert to 0-100
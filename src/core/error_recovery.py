@@ -14,12 +14,17 @@ GOAL: System should recover gracefully from any error.
 """
 
 import os
-import json
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional, Callable, Any
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 STATE_DIR = Path("./data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -64,9 +69,8 @@ class ErrorRecovery:
     
     def _load_patterns(self) -> Dict:
         try:
-            if ERROR_PATTERNS_FILE.exists():
-                with open(ERROR_PATTERNS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(ERROR_PATTERNS_FILE):
+                return load_state(ERROR_PATTERNS_FILE)
         except:
             pass
         return {
@@ -77,8 +81,7 @@ class ErrorRecovery:
     
     def _save_patterns(self):
         self.patterns["last_updated"] = datetime.now().isoformat()
-        with open(ERROR_PATTERNS_FILE, 'w') as f:
-            json.dump(self.patterns, f, indent=2)
+        save_state(ERROR_PATTERNS_FILE, self.patterns)
     
     def classify_error(self, error: str) -> str:
         """Classify error into type."""
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Tiered Evaluation Cascade v18.7
+======================================================
+
+Runs the cheap LOCAL scorers first and only spends an AI call when
+the local verdict is uncertain.
+
+Tiers:
+1. LOCAL: ViralityCalculator, RetentionPredictor, EngagementPredictor,
+   ScriptAnalyzer and critical_fixes.score_hook_quality (instant, free)
+2. AI: the caller's own AI evaluation (MasterEvaluator, stage 3 review,
+   AI quality checker, post-render validation)
+
+Each evaluation site has an uncertainty BAND on the 0-100 local scale:
+- local score >= accept  -> accepted locally (no AI call)
+- local score <  reject  -> rejected locally (no AI call)
+- anything in between    -> AI decides
+
+Tier decisions are recorded per site and per video so the bands can be
+tuned and the AI calls saved per video can be measured.
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+# Local scorers (all optional - the cascade degrades to "always AI")
+try:
+    from virality_calculator import get_virality_calculator
+    VIRAL_CALC = True
+except ImportError:
+    try:
+        from src.analytics.virality_calculator import get_virality_calculator
+        VIRAL_CALC = True
+    except ImportError:
+        VIRAL_CALC = False
+
+try:
+    from retention_predictor import get_retention_predictor
+    RETENTION = True
+except ImportError:
+    try:
+        from src.analytics.retention_predictor import get_retention_predictor
+        RETENTION = True
+    except ImportError:
+        RETENTION = False
+
+try:
+    from engagement_predictor import get_engagement_predictor
+    ENGAGEMENT = True
+except ImportError:
+    try:
+        from src.analytics.engagement_predictor import get_engagement_predictor
+        ENGAGEMENT = True
+    except ImportError:
+        ENGAGEMENT = False
+
+try:
+    from script_analyzer import get_script_analyzer
+    SCRIPT = True
+except ImportError:
+    try:
+        from src.analytics.script_analyzer import get_script_analyzer
+        SCRIPT = True
+    except ImportError:
+        SCRIPT = False
+
+try:
+    from critical_fixes import score_hook_quality
+    HOOK_SCORER = True
+except ImportError:
+    try:
+        from src.enhancements.critical_fixes import score_hook_quality
+        HOOK_SCORER = True
+    except ImportError:
+        HOOK_SCORER = False
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+CASCADE_FILE = STATE_DIR / "evaluation_cascade.json"
+
+# Tier outcomes
+LOCAL_ACCEPT = "local_accept"
+LOCAL_REJECT = "local_reject"
+AI_TIER = "ai"
+
+
+class EvaluationCascade:
+    """
+    Local-first evaluator with a configurable AI uncertainty band.
+
+    Usage:
+        cascade = get_evaluation_cascade()
+        outcome = cascade.evaluate("master", content, lambda: ai_eval(content))
+        if outcome["tier"] == "ai":
+            ai_result = outcome["ai_result"]
+    """
+
+    # Uncertainty bands per evaluation site (0-100 local scale)
+    BANDS = {
+        "stage3": {"reject": 40, "accept": 78},
+        "quality_gate": {"reject": 40, "accept": 75},
+        "master": {"reject": 40, "accept": 80},
+        "post_render": {"reject": 35, "accept": 70},
+    }
+
+    DEFAULT_BAND = {"reject": 40, "accept": 80}
+
+    # Minimum number of local scorers that must agree before we trust them
+    MIN_COMPONENTS = 2
+
+    def __init__(self):
+        self.data = self._load()
+        self.video = self._new_video_record(None)
+
+    def _load(self) -> Dict:
+        try:
+            if state_exists(CASCADE_FILE):
+                return load_state(CASCADE_FILE)
+        except:
+            pass
+        return {
+            "sites": {},
+            "videos": [],
+            "band_overrides": {},
+            "last_updated": None
+        }
+
+    def _save(self):
+        self.data["last_updated"] = datetime.now().isoformat()
+        try:
+            save_state(CASCADE_FILE, self.data)
+        except Exception as e:
+            safe_print(f"   [CASCADE] Save failed: {e}")
+
+    @staticmethod
+    def _new_video_record(video_id: Optional[str]) -> Dict:
+        return {
+            "video_id": video_id,
+            "started": datetime.now().isoformat(),
+            LOCAL_ACCEPT: 0,
+            LOCAL_REJECT: 0,
+            AI_TIER: 0,
+        }
+
+    # =========================================================================
+    # BANDS
+    # =========================================================================
+
+    def get_band(self, site: str) -> Dict:
+        """Get the (possibly tuned) uncertainty band for a site."""
+        band = dict(self.BANDS.get(site, self.DEFAULT_BAND))
+        band.update(self.data.get("band_overrides", {}).get(site, {}))
+        return band
+
+    def adjust_band(self, site: str, reject: float = None, accept: float = None):
+        """Tune a site's band. Overrides persist across runs."""
+        override = self.data.setdefault("band_overrides", {}).setdefault(site, {})
+        if reject is not None:
+            override["reject"] = reject
+        if accept is not None:
+            override["accept"] = accept
+        band = self.get_band(site)
+        if band["reject"] > band["accept"]:
+            raise ValueError(f"Invalid band for {site}: reject {band['reject']} > accept {band['accept']}")
+        self._save()
+        safe_print(f"   [CASCADE] {site} band -> reject<{band['reject']}, accept>={band['accept']}")
+
+    # =========================================================================
+    # TIER 1: LOCAL SCORING
+    # =========================================================================
+
+    def local_score(self, content: Dict) -> Dict:
+        """
+        Run all available local scorers on content.
+
+        Args:
+            content: Dict with hook, phrases, cta, topic, category
+
+        Returns:
+            {"score": 0-100 or None, "components": {name: 0-100}, "details": {name: raw}}
+        """
+        components = {}
+        details = {}
+        hook = content.get("hook", "")
+
+        if VIRAL_CALC:
+            try:
+                virality = get_virality_calculator().calculate_virality(content)
+                components["virality"] = virality.get("overall_score", 0)
+                details["virality"] = virality
+            except Exception as e:
+                safe_print(f"   [CASCADE] Virality scorer skipped: {e}")
+
+        if RETENTION:
+            try:
+                retention = get_retention_predictor().predict_retention(content)
+                components["retention"] = retention.get("overall_retention", 0)
+                details["retention"] = retention
+            except Exception as e:
+                safe_print(f"   [CASCADE] Retention scorer skipped: {e}")
+
+        if ENGAGEMENT:
+            try:
+                engagement = get_engagement_predictor().predict_engagement(content)
+                components["engagement"] = engagement.get("overall_engagement", 0)
+                details["engagement"] = engagement
+            except Exception as e:
+                safe_print(f"   [CASCADE] Engagement scorer skipped: {e}")
+
+        if SCRIPT:
+            try:
+                script = get_script_analyzer().analyze_script(content)
+                components["script"] = script.get("overall_score", 0)
+                details["script"] = script
+            except Exception as e:
+                safe_print(f"   [CASCADE] Script scorer skipped: {e}")
+
+        if HOOK_SCORER and hook:
+            try:
+                hook_quality = score_hook_quality(hook)
+                components["hook"] = hook_quality.get("score", 0) * 10
+                details["hook"] = hook_quality
+            except Exception as e:
+                safe_print(f"   [CASCADE] Hook scorer skipped: {e}")
+
+        return self.combine(components, details)
+
+    def combine(self, components: Dict[str, float], details: Dict = None) -> Dict:
+        """
+        Combine already-computed local component scores (0-100 each).
+
+        Lets callers that have run the scorers themselves (e.g. stage 3)
+        reuse those results instead of scoring twice.
+        """
+        valid = {k: float(v) for k, v in components.items() if v is not None}
+        score = round(sum(valid.values()) / len(valid), 1) if valid else None
+        return {"score": score, "components": valid, "details": details or {}}
+
+    def decide(self, site: str, local: Dict) -> str:
+        """Map a local result onto LOCAL_ACCEPT, LOCAL_REJECT or AI_TIER."""
+        score = local.get("score")
+        if score is None or len(local.get("components", {})) < self.MIN_COMPONENTS:
+            return AI_TIER
+        band = self.get_band(site)
+        if score >= band["accept"]:
+            return LOCAL_ACCEPT
+        if score < band["reject"]:
+            return LOCAL_REJECT
+        return AI_TIER
+
+    # =========================================================================
+    # CASCADE
+    # =========================================================================
+
+    def evaluate(self, site: str, content: Dict = None,
+                 ai_evaluate: Callable[[], object] = None,
+                 local: Dict = None) -> Dict:
+        """
+        Run the cascade for one evaluation site.
+
+        Args:
+            site: Evaluation site name ("stage3", "quality_gate", "master", "post_render")
+            content: Content dict for local scoring (ignored if `local` is given)
+            ai_evaluate: Zero-arg callable doing the AI evaluation; only called
+                         when the local verdict falls inside the band
+            local: Pre-computed result from local_score()/combine()
+
+        Returns:
+            {"site", "tier", "decision", "local_score", "local", "ai_result"}
+            decision is "accept", "reject" or "ai"
+        """
+        if local is None:
+            local = self.local_score(content or {})
+
+        tier = self.decide(site, local)
+        ai_result = None
+
+        if tier == AI_TIER and ai_evaluate is not None:
+            ai_result = ai_evaluate()
+
+        self.record(site, tier)
+
+        decision = {LOCAL_ACCEPT: "accept", LOCAL_REJECT: "reject"}.get(tier, "ai")
+        score_str = f"{local['score']:.1f}" if local.get("score") is not None else "n/a"
+        if tier == AI_TIER:
+            safe_print(f"   [CASCADE] {site}: local {score_str}/100 uncertain -> AI evaluation")
+        else:
+            safe_print(f"   [CASCADE] {site}: local {score_str}/100 -> {decision.upper()} (AI call saved)")
+
+        return {
+            "site": site,
+            "tier": tier,
+            "decision": decision,
+            "local_score": local.get("score"),
+            "local": local,
+            "ai_result": ai_result
+        }
+
+    @staticmethod
+    def to_ten(score: Optional[float]) -> float:
+        """Convert a 0-100 local score to the 1-10 scale used by AI evaluations."""
+        if score is None:
+            return 5.0
+        return round(max(1.0, min(10.0, score / 10)), 1)
+
+    # =========================================================================
+    # STATS
+    # =========================================================================
+
+    def record(self, site: str, tier: str):
+        """Record which tier decided for a site (persisted by finish_video)."""
+        site_stats = self.data.setdefault("sites", {}).setdefault(
+            site, {LOCAL_ACCEPT: 0, LOCAL_REJECT: 0, AI_TIER: 0}
+        )
+        site_stats[tier] = site_stats.get(tier, 0) + 1
+        self.video[tier] = self.video.get(tier, 0) + 1
+
+    def start_video(self, video_id: str = None):
+        """Start counting tier decisions for a new video."""
+        self.video = self._new_video_record(video_id)
+
+    def finish_video(self) -> Dict:
+        """Close the current video record and return its summary."""
+        record = dict(self.video)
+        record["ai_calls_saved"] = record[LOCAL_ACCEPT] + record[LOCAL_REJECT]
+        record["finished"] = datetime.now().isoformat()
+
+        self.data.setdefault("videos", []).append(record)
+        self.data["videos"] = self.data["videos"][-100:]
+        self._save()
+
+        total = record["ai_calls_saved"] + record[AI_TIER]
+        safe_print(f"   [CASCADE] Video summary: {record['ai_calls_saved']}/{total} "
+                   f"evaluations decided locally")
+
+        self.video = self._new_video_record(None)
+        return record
+
+    def get_stats(self) -> Dict:
+        """Get per-site tier rates and average AI calls saved per video."""
+        sites = {}
+        for site, counts in self.data.get("sites", {}).items():
+            total = sum(counts.values())
+            local = counts.get(LOCAL_ACCEPT, 0) + counts.get(LOCAL_REJECT, 0)
+            sites[site] = {
+                **counts,
+                "total": total,
+                "local_rate": round(local / total * 100, 1) if total else 0.0,
+                "band": self.get_band(site)
+            }
+
+        videos = self.data.get("videos", [])
+        saved = [v.get("ai_calls_saved", 0) for v in videos]
+        return {
+            "sites": sites,
+            "videos_tracked": len(videos),
+            "avg_ai_calls_saved_per_video": round(sum(saved) / len(saved), 2) if saved else 0.0
+        }
+
+
+# Singleton
+_cascade = None
+
+
+def get_evaluation_cascade() -> EvaluationCascade:
+    """Get singleton cascade."""
+    global _cascade
+    if _cascade is None:
+        _cascade = EvaluationCascade()
+    return _cascade
+
+
+def cascade_evaluate(site: str, content: Dict,
+                     ai_evaluate: Callable[[], object] = None) -> Dict:
+    """Convenience function."""
+    return get_evaluation_cascade().evaluate(site, content, ai_evaluate)
+
+
+if __name__ == "__main__":
+    safe_print("Testing Evaluation Cascade...")
+    safe_print("=" * 60)
+
+    cascade = get_evaluation_cascade()
+    cascade.start_video("test")
+
+    strong = {
+        "hook": "STOP - Why do 90% of people fail at saving $500?",
+        "phrases": [
+            "Here's the truth nobody tells you about money.",
+            "First, pay yourself before any bill today.",
+            "Second, automate 20% of every paycheck.",
+            "Third, cut the 3 subscriptions you forgot about."
+        ],
+        "cta": "Which one will you try first? Comment below!",
+        "topic": "saving money",
+        "category": "money"
+    }
+    weak = {"hook": "Some things", "phrases": ["Okay."], "cta": "", "topic": "", "category": ""}
+
+    for name, content in [("strong", strong), ("weak", weak)]:
+        outcome = cascade.evaluate("master", content, lambda: {"final_score": 7})
+        safe_print(f"{name}: tier={outcome['tier']} local={outcome['local_score']}")
+
+    cascade.finish_video()
+    safe_print(json.dumps(cascade.get_stats(), indent=2))
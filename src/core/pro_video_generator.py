@@ -26,6 +26,22 @@ Previous versions:
 TOTAL: 419 ENHANCEMENTS - ALL AI-DRIVEN!
 """
 
+from __future__ import annotations
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Per-stage deadlines bound retries/fallbacks across the AI call stack
+try:
+    from deadline import stage_deadline, deadline_expired, sleep_within, request_timeout, give_up
+except ImportError:
+    from src.utils.deadline import (
+        stage_deadline, deadline_expired, sleep_within, request_timeout, give_up
+    )
+
 import os
 import sys
 import re
@@ -38,414 +54,320 @@ import warnings
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-import numpy as np
+from functools import lru_cache
 
 # Suppress google.generativeai deprecation warning (will migrate to google.genai later)
 warnings.filterwarnings("ignore", category=FutureWarning, module="google.generativeai")
-import requests
 
-# Core imports
-from moviepy.editor import (
-    VideoFileClip, AudioFileClip, CompositeVideoClip,
-    concatenate_videoclips, ImageClip, CompositeAudioClip,
-    ColorClip
-)
-from moviepy.video.VideoClip import VideoClip
-import moviepy.video.fx.all as vfx
+# v18.7: LAZY FEATURE REGISTRY
+# Every optional module below is bound to a module-level name here but only
+# imported the first time its *_AVAILABLE flag is tested or one of its names
+# is used - so --help,
+# tests and analytics-only runs never pay for moviepy, enhancements_v12, etc.
+# Profile with: python pro_video_generator.py --import-profile
+try:
+    from lazy_imports import LazyRegistry, profile_imports
+except ImportError:
+    from src.utils.lazy_imports import LazyRegistry, profile_imports
+
+LAZY = LazyRegistry()
+
+# Core imports (heavy - resolved when rendering/voiceover/AI calls start)
+np = LAZY.module("numpy")
+requests = LAZY.module("requests")
+edge_tts = LAZY.module("edge_tts")
+vfx = LAZY.module("moviepy.video.fx.all")
+
+_MOVIEPY = LAZY.register("MOVIEPY_AVAILABLE", ("moviepy.editor", "moviepy.video.VideoClip"))
+MOVIEPY_AVAILABLE = _MOVIEPY.available
+VideoFileClip = _MOVIEPY.symbol("VideoFileClip")
+AudioFileClip = _MOVIEPY.symbol("AudioFileClip")
+CompositeVideoClip = _MOVIEPY.symbol("CompositeVideoClip")
+concatenate_videoclips = _MOVIEPY.symbol("concatenate_videoclips")
+ImageClip = _MOVIEPY.symbol("ImageClip")
+CompositeAudioClip = _MOVIEPY.symbol("CompositeAudioClip")
+VideoClip = _MOVIEPY.symbol("VideoClip", "moviepy.video.VideoClip")
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-if not hasattr(Image, 'ANTIALIAS'):
-    Image.ANTIALIAS = Image.Resampling.LANCZOS
 
-import edge_tts
+def _patch_pil_antialias(values: Dict):
+    Image = values["Image"]
+    if not hasattr(Image, 'ANTIALIAS'):
+        Image.ANTIALIAS = Image.Resampling.LANCZOS
+
+
+_PIL = LAZY.register("PIL_AVAILABLE", "PIL", on_load=_patch_pil_antialias)
+PIL_AVAILABLE = _PIL.available
+Image = _PIL.symbol("Image")
+ImageDraw = _PIL.symbol("ImageDraw")
+ImageFont = _PIL.symbol("ImageFont")
 
 # v8.0: Persistent state availability flag (actual imports in v9.5 block below)
 PERSISTENT_STATE_AVAILABLE = True  # Will be updated by v9.5 import block
 
 # v8.0: Import viral patterns for better hooks
-try:
-    from viral_channel_analyzer import get_viral_prompt_boost
-    VIRAL_PATTERNS_AVAILABLE = True
-except ImportError:
-    VIRAL_PATTERNS_AVAILABLE = False
-    get_viral_prompt_boost = lambda: ""
+_VIRAL_PATTERNS = LAZY.register("VIRAL_PATTERNS_AVAILABLE", "viral_channel_analyzer")
+VIRAL_PATTERNS_AVAILABLE = _VIRAL_PATTERNS.available
+get_viral_prompt_boost = _VIRAL_PATTERNS.symbol("get_viral_prompt_boost",
+                                                fallback=lambda **_: "")
 
-# v11.0: Import comprehensive enhancements module (89 enhancements!)
-try:
-    from enhancements_v9 import (
-        # v17.7: Core AI caller and tracking (previously unused!)
-        get_ai_caller,
-        ABTestTracker,
-        ErrorPatternLearner,
-        # Core orchestrator
-        get_enhancement_orchestrator,
-        # v9.0 functions
-        check_semantic_duplicate,
-        enhance_voice_pacing,
-        predict_retention_curve,
-        score_value_density,
-        validate_post_render,
-        score_trend_freshness,
-        # v9.5 functions
-        get_seasonal_content_suggestions,
-        get_hook_tracker,
-        get_voice_optimizer,
-        get_hashtag_rotator,
-        get_platform_analytics,
-        get_category_decay,
-        detect_faces_in_broll,
-        score_broll_for_thumbnail,
-        score_broll_relevance,
-        generate_fresh_hashtags,
-        detect_series_potential,
-        generate_reply_templates,
-        # v10.0 functions
-        get_thumbnail_optimizer,
-        get_sentiment_tracker,
-        get_publishing_optimizer,
-        get_title_length_optimizer,
-        get_bpm_matcher,
-        get_intro_learner,
-        design_emotional_arc,
-        analyze_competitor_gaps,
-        optimize_description_seo,
-        analyze_comment_sentiment,
-        predict_viral_velocity,
-        # v11.0 Category 1: Click Baiting
-        get_curiosity_gap,
-        get_number_hook,
-        get_controversy,
-        get_fomo,
-        get_power_words_tracker,
-        predict_ctr,
-        # v11.0 Category 2: First Seconds
-        get_pattern_interrupt,
-        get_open_loop,
-        get_first_frame,
-        get_audio_hook,
-        score_scroll_stop_power,
-        generate_instant_value_hook,
-        # v11.0 Category 3: Algorithm
-        get_watch_time,
-        get_completion_rate,
-        get_comment_bait,
-        get_share_trigger,
-        get_rewatch,
-        generate_algorithm_signals,
-        # v11.0 Category 4: Visual
-        get_color_psychology,
-        get_motion_energy,
-        get_text_readability,
-        get_visual_variety,
-        score_thumbnail_quality,
-        # v11.0 Category 5: Content Quality
-        get_fact_credibility,
-        get_actionable,
-        get_story_structure,
-        get_memory_hook,
-        get_relatability,
-        check_content_credibility,
-        enforce_actionable_takeaway,
-        generate_memory_hook,
-        check_relatability,
-        detect_ai_slop,
-        # v11.0 Category 6: Viral/Trendy
-        get_trend_lifecycle,
-        get_evergreen_balance,
-        get_cultural_moment,
-        get_viral_pattern,
-        get_platform_trend,
-        detect_cultural_moments,
-        # v11.0 Category 7: Analytics
-        get_micro_retention,
-        get_correlation,
-        get_channel_health,
-        get_growth_rate,
-        get_content_decay,
-        find_performance_correlations,
-        # v11.0 Category 8: Other
-        get_competitor_response,
-        get_niche_authority,
-        get_quality_consistency,
-        get_upload_cadence,
-        get_audience_loyalty,
-        generate_competitor_response
-    )
-    ENHANCEMENTS_V11_AVAILABLE = True
-except ImportError as e:
-    ENHANCEMENTS_V11_AVAILABLE = False
-    print(f"[!] v11.0 enhancements not fully available: {e}")
+# v18.7: Learned prompt boosts built once per state version (no AI calls)
+_BOOST_SNAPSHOTS = LAZY.register("BOOST_SNAPSHOTS_AVAILABLE", "boost_snapshots",
+                                 packages=("", "src.ai"))
+BOOST_SNAPSHOTS_AVAILABLE = _BOOST_SNAPSHOTS.available
+get_boost_snapshots = _BOOST_SNAPSHOTS.symbol("get_boost_snapshots")
 
+# v11.0: Import comprehensive enhancements module (89 enhancements!)
+_ENHANCEMENTS_V11 = LAZY.register(
+    "ENHANCEMENTS_V11_AVAILABLE", "enhancements_v9",
+    missing_msg="[!] v11.0 enhancements not fully available: {e}")
+ENHANCEMENTS_V11_AVAILABLE = _ENHANCEMENTS_V11.available
 # Backward compatibility aliases
 ENHANCEMENTS_V10_AVAILABLE = ENHANCEMENTS_V11_AVAILABLE
 ENHANCEMENTS_V95_AVAILABLE = ENHANCEMENTS_V11_AVAILABLE
 ENHANCEMENTS_AVAILABLE = ENHANCEMENTS_V11_AVAILABLE
+# v17.7: Core AI caller and tracking
+ABTestTracker = _ENHANCEMENTS_V11.symbol("ABTestTracker")
+ErrorPatternLearner = _ENHANCEMENTS_V11.symbol("ErrorPatternLearner")
+# Core orchestrator
+get_enhancement_orchestrator = _ENHANCEMENTS_V11.symbol("get_enhancement_orchestrator")
+# v9.5 functions
+get_seasonal_content_suggestions = _ENHANCEMENTS_V11.symbol("get_seasonal_content_suggestions")
+get_hook_tracker = _ENHANCEMENTS_V11.symbol("get_hook_tracker")
+get_voice_optimizer = _ENHANCEMENTS_V11.symbol("get_voice_optimizer")
+get_hashtag_rotator = _ENHANCEMENTS_V11.symbol("get_hashtag_rotator")
+get_category_decay = _ENHANCEMENTS_V11.symbol("get_category_decay")
+# v10.0 functions
+get_publishing_optimizer = _ENHANCEMENTS_V11.symbol("get_publishing_optimizer")
+get_title_length_optimizer = _ENHANCEMENTS_V11.symbol("get_title_length_optimizer")
+get_intro_learner = _ENHANCEMENTS_V11.symbol("get_intro_learner")
+optimize_description_seo = _ENHANCEMENTS_V11.symbol("optimize_description_seo")
+predict_viral_velocity = _ENHANCEMENTS_V11.symbol("predict_viral_velocity")
+# v11.0 Category 2: First Seconds
+score_scroll_stop_power = _ENHANCEMENTS_V11.symbol("score_scroll_stop_power")
 
 # v12.0: Import ULTIMATE enhancements module (330 NEW enhancements!)
-try:
-    from enhancements_v12 import (
-        # MASTER INTEGRATION - THE KEY FUNCTION
-        get_v12_complete_master_prompt,
-        # Helper functions for specific enhancements
-        get_v12_hook_boost,
-        get_v12_voice_settings,
-        get_v12_font_settings,
-        get_v12_music_settings,
-        get_v12_color_settings,
-        apply_v12_text_humanization,
-        get_v12_algorithm_checklist,
-        get_v12_compliance_rules,
-        # Individual getters (for specific use cases)
-        get_natural_rhythm, get_filler_injector, get_contractions_enforcer,
-        get_font_psychology, get_text_animation, get_voice_matcher,
-        get_sound_library, get_tempo_matcher, get_genre_matcher,
-        get_shock_opener, get_algorithm_signals,
-        get_color_grading, get_fomo_trigger, get_open_loop_technique,
-        get_source_citation, get_yt_optimization, get_hook_body_payoff,
-        get_performance_correlator, get_token_budget, get_yt_compliance
-    )
-    ENHANCEMENTS_V12_AVAILABLE = True
-    V12_MASTER_PROMPT = get_v12_complete_master_prompt()
-    print("[OK] v12.0 Ultimate Enhancements loaded: 330 enhancements ACTIVE!")
-except ImportError as e:
-    ENHANCEMENTS_V12_AVAILABLE = False
-    V12_MASTER_PROMPT = ""
-    print(f"[!] v12.0 enhancements not available: {e}")
+_ENHANCEMENTS_V12 = LAZY.register(
+    "ENHANCEMENTS_V12_AVAILABLE", "enhancements_v12",
+    loaded_msg="[OK] v12.0 Ultimate Enhancements loaded: 330 enhancements ACTIVE!",
+    missing_msg="[!] v12.0 enhancements not available: {e}")
+ENHANCEMENTS_V12_AVAILABLE = _ENHANCEMENTS_V12.available
+# MASTER INTEGRATION - THE KEY FUNCTION
+get_v12_complete_master_prompt = _ENHANCEMENTS_V12.symbol("get_v12_complete_master_prompt")
+# Helper functions for specific enhancements
+get_v12_hook_boost = _ENHANCEMENTS_V12.symbol("get_v12_hook_boost")
+get_v12_voice_settings = _ENHANCEMENTS_V12.symbol("get_v12_voice_settings")
+get_v12_font_settings = _ENHANCEMENTS_V12.symbol("get_v12_font_settings")
+get_v12_music_settings = _ENHANCEMENTS_V12.symbol("get_v12_music_settings")
+get_v12_color_settings = _ENHANCEMENTS_V12.symbol("get_v12_color_settings")
+apply_v12_text_humanization = _ENHANCEMENTS_V12.symbol("apply_v12_text_humanization")
+get_v12_algorithm_checklist = _ENHANCEMENTS_V12.symbol("get_v12_algorithm_checklist")
+get_v12_compliance_rules = _ENHANCEMENTS_V12.symbol("get_v12_compliance_rules")
+# Individual getters (for specific use cases)
+get_natural_rhythm = _ENHANCEMENTS_V12.symbol("get_natural_rhythm")
+get_filler_injector = _ENHANCEMENTS_V12.symbol("get_filler_injector")
+get_contractions_enforcer = _ENHANCEMENTS_V12.symbol("get_contractions_enforcer")
+get_font_psychology = _ENHANCEMENTS_V12.symbol("get_font_psychology")
+get_text_animation = _ENHANCEMENTS_V12.symbol("get_text_animation")
+get_voice_matcher = _ENHANCEMENTS_V12.symbol("get_voice_matcher")
+get_sound_library = _ENHANCEMENTS_V12.symbol("get_sound_library")
+get_tempo_matcher = _ENHANCEMENTS_V12.symbol("get_tempo_matcher")
+get_genre_matcher = _ENHANCEMENTS_V12.symbol("get_genre_matcher")
+get_shock_opener = _ENHANCEMENTS_V12.symbol("get_shock_opener")
+get_algorithm_signals = _ENHANCEMENTS_V12.symbol("get_algorithm_signals")
+get_color_grading = _ENHANCEMENTS_V12.symbol("get_color_grading")
+get_fomo_trigger = _ENHANCEMENTS_V12.symbol("get_fomo_trigger")
+get_open_loop_technique = _ENHANCEMENTS_V12.symbol("get_open_loop_technique")
+get_source_citation = _ENHANCEMENTS_V12.symbol("get_source_citation")
+get_yt_optimization = _ENHANCEMENTS_V12.symbol("get_yt_optimization")
+get_hook_body_payoff = _ENHANCEMENTS_V12.symbol("get_hook_body_payoff")
+get_performance_correlator = _ENHANCEMENTS_V12.symbol("get_performance_correlator")
+get_token_budget = _ENHANCEMENTS_V12.symbol("get_token_budget")
+get_yt_compliance = _ENHANCEMENTS_V12.symbol("get_yt_compliance")
+
+
+@lru_cache(maxsize=1)
+def v12_master_prompt() -> str:
+    """The v12 master prompt ("" without enhancements_v12), built once."""
+    return get_v12_complete_master_prompt() if ENHANCEMENTS_V12_AVAILABLE else ""
+
 
 # CRITICAL FIXES: Real enforcement of quality, fonts, SFX, promises
-try:
-    from critical_fixes import (
-        select_font_for_content,
-        get_varied_sfx_for_phrase,
-        validate_numbered_promise,
-        fix_broken_promise,
-        apply_all_critical_fixes,
-        MINIMUM_ACCEPTABLE_SCORE,
-        CONTENT_CONSTRAINTS,
-        score_hook_quality  # v17.6: Hook quality scoring
-    )
-    CRITICAL_FIXES_AVAILABLE = True
-    print("[OK] Critical Fixes loaded: Font/SFX/Quality/Promise/Hook-scoring ACTIVE!")
-except ImportError as e:
-    CRITICAL_FIXES_AVAILABLE = False
-    MINIMUM_ACCEPTABLE_SCORE = 7  # Fallback
-    print(f"[!] Critical fixes not available: {e}")
+_CRITICAL_FIXES = LAZY.register(
+    "CRITICAL_FIXES_AVAILABLE", "critical_fixes",
+    loaded_msg="[OK] Critical Fixes loaded: Font/SFX/Quality/Promise/Hook-scoring ACTIVE!",
+    missing_msg="[!] Critical fixes not available: {e}")
+CRITICAL_FIXES_AVAILABLE = _CRITICAL_FIXES.available
+select_font_for_content = _CRITICAL_FIXES.symbol("select_font_for_content")
+get_varied_sfx_for_phrase = _CRITICAL_FIXES.symbol("get_varied_sfx_for_phrase")
+validate_numbered_promise = _CRITICAL_FIXES.symbol("validate_numbered_promise")
+fix_broken_promise = _CRITICAL_FIXES.symbol("fix_broken_promise")
+score_hook_quality = _CRITICAL_FIXES.symbol("score_hook_quality")  # v17.6: Hook quality scoring
+# Constant - read with .get() (7 without critical_fixes)
+MINIMUM_ACCEPTABLE_SCORE = _CRITICAL_FIXES.symbol("MINIMUM_ACCEPTABLE_SCORE", fallback=7)
 
 # v17.6: Import viral video science for better content quality
-try:
-    from viral_video_science import (
-        ValueDeliveryChecker,
-        ViralContentGenerator,
-        CONTENT_TEMPLATES
-    )
-    VIRAL_SCIENCE_AVAILABLE = True
-    print("[OK] Viral Video Science loaded: Value delivery checking ACTIVE!")
-except ImportError as e:
-    VIRAL_SCIENCE_AVAILABLE = False
-    print(f"[!] Viral Video Science not available: {e}")
+_VIRAL_SCIENCE = LAZY.register(
+    "VIRAL_SCIENCE_AVAILABLE", "viral_video_science",
+    loaded_msg="[OK] Viral Video Science loaded: Value delivery checking ACTIVE!",
+    missing_msg="[!] Viral Video Science not available: {e}")
+VIRAL_SCIENCE_AVAILABLE = _VIRAL_SCIENCE.available
+ValueDeliveryChecker = _VIRAL_SCIENCE.symbol("ValueDeliveryChecker")
+ViralContentGenerator = _VIRAL_SCIENCE.symbol("ViralContentGenerator")
 
 # v9.5: Import persistent state with series tracking
-try:
-    from persistent_state import (
-        get_upload_manager, get_variety_manager, 
-        get_analytics_manager, get_viral_manager,
-        get_series_manager, get_performance_aggregator
-    )
-    PERSISTENT_STATE_V15_AVAILABLE = True
-except ImportError:
-    PERSISTENT_STATE_V15_AVAILABLE = False
-    get_series_manager = lambda: None
-    get_performance_aggregator = lambda: None
+_PERSISTENT_STATE_V15 = LAZY.register("PERSISTENT_STATE_V15_AVAILABLE", "persistent_state")
+PERSISTENT_STATE_V15_AVAILABLE = _PERSISTENT_STATE_V15.available
+get_upload_manager = _PERSISTENT_STATE_V15.symbol("get_upload_manager")
+get_variety_manager = _PERSISTENT_STATE_V15.symbol("get_variety_manager")
+get_analytics_manager = _PERSISTENT_STATE_V15.symbol("get_analytics_manager")
 
 # v17.7.3: Import thumbnail generator for video thumbnails
-try:
-    from thumbnail_generator import generate_thumbnail, get_ai_thumbnail_concept
-    THUMBNAIL_GENERATOR_AVAILABLE = True
-    print("[OK] Thumbnail Generator loaded: AI-driven thumbnails ACTIVE!")
-except ImportError as e:
-    THUMBNAIL_GENERATOR_AVAILABLE = False
-    print(f"[!] Thumbnail Generator not available: {e}")
+_THUMBNAIL_GENERATOR = LAZY.register(
+    "THUMBNAIL_GENERATOR_AVAILABLE", "thumbnail_generator",
+    loaded_msg="[OK] Thumbnail Generator loaded: AI-driven thumbnails ACTIVE!",
+    missing_msg="[!] Thumbnail Generator not available: {e}")
+THUMBNAIL_GENERATOR_AVAILABLE = _THUMBNAIL_GENERATOR.available
+generate_thumbnail = _THUMBNAIL_GENERATOR.symbol("generate_thumbnail")
 
 # v17.7.6: Import error logger for centralized logging
-try:
-    from error_logger import get_error_logger, log_error
-    ERROR_LOGGER_AVAILABLE = True
-except ImportError:
-    ERROR_LOGGER_AVAILABLE = False
-    def log_error(e, ctx="", comp=""): pass  # No-op fallback
+_ERROR_LOGGER = LAZY.register("ERROR_LOGGER_AVAILABLE", "error_logger")
+ERROR_LOGGER_AVAILABLE = _ERROR_LOGGER.available
+log_error = _ERROR_LOGGER.symbol("log_error", fallback=lambda e, ctx="", comp="": None)  # No-op fallback
 
 # v17.7.8: Import competitor analyzer for differentiated content
-try:
-    from competitor_analyzer import get_competitor_analyzer
-    COMPETITOR_ANALYZER_AVAILABLE = True
-    print("[OK] Competitor Analyzer loaded: Differentiation ACTIVE!")
-except ImportError:
-    COMPETITOR_ANALYZER_AVAILABLE = False
+_COMPETITOR_ANALYZER = LAZY.register(
+    "COMPETITOR_ANALYZER_AVAILABLE", "competitor_analyzer",
+    loaded_msg="[OK] Competitor Analyzer loaded: Differentiation ACTIVE!")
+COMPETITOR_ANALYZER_AVAILABLE = _COMPETITOR_ANALYZER.available
 
 # v17.8: Import AI Pattern Generator for AI-first architecture
-try:
-    from ai_pattern_generator import get_pattern_generator, refresh_patterns_if_needed
-    AI_PATTERN_GENERATOR_AVAILABLE = True
-    print("[OK] AI Pattern Generator loaded: AI-first patterns ACTIVE!")
-except ImportError:
-    try:
-        from src.ai.ai_pattern_generator import get_pattern_generator, refresh_patterns_if_needed
-        AI_PATTERN_GENERATOR_AVAILABLE = True
-        print("[OK] AI Pattern Generator loaded: AI-first patterns ACTIVE!")
-    except ImportError:
-        AI_PATTERN_GENERATOR_AVAILABLE = False
-        print("[!] AI Pattern Generator not available - using fallback patterns")
+_AI_PATTERN_GENERATOR = LAZY.register(
+    "AI_PATTERN_GENERATOR_AVAILABLE", "ai_pattern_generator", packages=("", "src.ai"),
+    loaded_msg="[OK] AI Pattern Generator loaded: AI-first patterns ACTIVE!",
+    missing_msg="[!] AI Pattern Generator not available - using fallback patterns")
+AI_PATTERN_GENERATOR_AVAILABLE = _AI_PATTERN_GENERATOR.available
+get_pattern_generator = _AI_PATTERN_GENERATOR.symbol("get_pattern_generator")
 
 # v17.8: Import Model Intelligence for smart provider selection
-try:
-    from model_intelligence import get_provider_for_task, record_task_performance
-    MODEL_INTELLIGENCE_AVAILABLE = True
-    print("[OK] Model Intelligence loaded: Smart provider selection ACTIVE!")
-except ImportError:
-    try:
-        from src.ai.model_intelligence import get_provider_for_task, record_task_performance
-        MODEL_INTELLIGENCE_AVAILABLE = True
-        print("[OK] Model Intelligence loaded: Smart provider selection ACTIVE!")
-    except ImportError:
-        MODEL_INTELLIGENCE_AVAILABLE = False
-        # Fallback functions
-        def get_provider_for_task(task_type: str) -> str:
-            return "gemini"
-        def record_task_performance(*args, **kwargs):
-            pass
+_MODEL_INTELLIGENCE = LAZY.register(
+    "MODEL_INTELLIGENCE_AVAILABLE", "model_intelligence", packages=("", "src.ai"),
+    loaded_msg="[OK] Model Intelligence loaded: Smart provider selection ACTIVE!")
+MODEL_INTELLIGENCE_AVAILABLE = _MODEL_INTELLIGENCE.available
 
 # v17.9.9: Import Smart Model Router for optimal model selection per prompt type
-try:
-    from smart_model_router import get_smart_router
-    from smart_ai_caller import smart_call_ai, get_smart_caller
-    SMART_ROUTER_AVAILABLE = True
-    print("[OK] Smart Model Router loaded: Optimal model selection per prompt ACTIVE!")
-except ImportError:
-    try:
-        from src.ai.smart_model_router import get_smart_router
-        from src.ai.smart_ai_caller import smart_call_ai, get_smart_caller
-        SMART_ROUTER_AVAILABLE = True
-        print("[OK] Smart Model Router loaded: Optimal model selection per prompt ACTIVE!")
-    except ImportError:
-        SMART_ROUTER_AVAILABLE = False
-        smart_call_ai = None
-        get_smart_caller = None
-        print("[!] Smart Model Router not available - using legacy call_ai")
-
-# v17.8: Import all AI-first modules
-try:
-    from ai_hook_generator import generate_hook, get_hook_generator
-    AI_HOOK_GENERATOR_AVAILABLE = True
-except ImportError:
-    AI_HOOK_GENERATOR_AVAILABLE = False
-    def generate_hook(topic, cat): return f"Did you know about {topic}?"
-
-try:
-    from ai_cta_generator import generate_cta, get_cta_generator
-    AI_CTA_GENERATOR_AVAILABLE = True
-except ImportError:
-    AI_CTA_GENERATOR_AVAILABLE = False
-    def generate_cta(topic, cat): return "Comment if you agree!"
-
-try:
-    from ai_topic_suggester import get_topic_suggestions, get_topic_suggester
-    AI_TOPIC_SUGGESTER_AVAILABLE = True
-except ImportError:
-    AI_TOPIC_SUGGESTER_AVAILABLE = False
-    def get_topic_suggestions(count=5, cat=None): return []
-
-try:
-    from ai_content_quality_checker import check_content_quality, get_quality_checker
-    AI_QUALITY_CHECKER_AVAILABLE = True
-except ImportError:
-    AI_QUALITY_CHECKER_AVAILABLE = False
-    def check_content_quality(content): return {"score": 7, "verdict": "PASS"}
-
-try:
-    from ai_broll_keywords import generate_broll_keywords, get_broll_keyword_generator
-    AI_BROLL_KEYWORDS_AVAILABLE = True
-except ImportError:
-    AI_BROLL_KEYWORDS_AVAILABLE = False
-    def generate_broll_keywords(phrase, cat=None): return ["abstract motion"]
-
-try:
-    from ai_music_mood import select_music_mood, get_music_mood_selector
-    AI_MUSIC_MOOD_AVAILABLE = True
-except ImportError:
-    AI_MUSIC_MOOD_AVAILABLE = False
-    def select_music_mood(topic, cat): return ("dramatic", "cinematic")
-
-try:
-    from ai_title_optimizer import optimize_title, get_title_optimizer
-    AI_TITLE_OPTIMIZER_AVAILABLE = True
-except ImportError:
-    AI_TITLE_OPTIMIZER_AVAILABLE = False
-    def optimize_title(topic, cat, existing=None): return f"The Truth About {topic}"
+_SMART_ROUTER = LAZY.register(
+    "SMART_ROUTER_AVAILABLE", ("smart_model_router", "smart_ai_caller"), packages=("", "src.ai"),
+    loaded_msg="[OK] Smart Model Router loaded: Optimal model selection per prompt ACTIVE!",
+    missing_msg="[!] Smart Model Router not available - using legacy call_ai")
+SMART_ROUTER_AVAILABLE = _SMART_ROUTER.available
+smart_call_ai = _SMART_ROUTER.symbol("smart_call_ai", "smart_ai_caller", fallback=None)
+
+# v18.7: Prompt cache with explicit per-task cacheable policy
+_PROMPT_CACHE = LAZY.register("PROMPT_CACHE_AVAILABLE", "prompt_cache", packages=("", "src.quota"))
+PROMPT_CACHE_AVAILABLE = _PROMPT_CACHE.available
+get_prompt_cache = _PROMPT_CACHE.symbol("get_prompt_cache")
+is_cacheable = _PROMPT_CACHE.symbol("is_cacheable", fallback=lambda task: False)
+
+# v18.7: Template fingerprints so volatile prompt fragments don't defeat the cache
+_PROMPT_TEMPLATES = LAZY.register("PROMPT_TEMPLATES_AVAILABLE", "prompts_registry",
+                                  packages=("", "src.ai"))
+tag_prompt = _PROMPT_TEMPLATES.symbol(
+    "tag_prompt", fallback=lambda template_id, text, **cache_vars: text)
+
+# v17.8: Import all AI-first modules (availability logged per generation run)
+AI_HOOK_GENERATOR_AVAILABLE = LAZY.register(
+    "AI_HOOK_GENERATOR_AVAILABLE", "ai_hook_generator").available
+AI_CTA_GENERATOR_AVAILABLE = LAZY.register(
+    "AI_CTA_GENERATOR_AVAILABLE", "ai_cta_generator").available
+AI_TOPIC_SUGGESTER_AVAILABLE = LAZY.register(
+    "AI_TOPIC_SUGGESTER_AVAILABLE", "ai_topic_suggester").available
+AI_QUALITY_CHECKER_AVAILABLE = LAZY.register(
+    "AI_QUALITY_CHECKER_AVAILABLE", "ai_content_quality_checker").available
+AI_BROLL_KEYWORDS_AVAILABLE = LAZY.register(
+    "AI_BROLL_KEYWORDS_AVAILABLE", "ai_broll_keywords").available
+AI_MUSIC_MOOD_AVAILABLE = LAZY.register(
+    "AI_MUSIC_MOOD_AVAILABLE", "ai_music_mood").available
+AI_TITLE_OPTIMIZER_AVAILABLE = LAZY.register(
+    "AI_TITLE_OPTIMIZER_AVAILABLE", "ai_title_optimizer").available
 
 # v17.9.6: Import ALL remaining AI modules that were defined but never used!
-try:
-    from ai_quality_gate import AIQualityGate
-    AI_QUALITY_GATE_AVAILABLE = True
-except ImportError:
-    AI_QUALITY_GATE_AVAILABLE = False
+_AI_QUALITY_GATE = LAZY.register("AI_QUALITY_GATE_AVAILABLE", "ai_quality_gate")
+AI_QUALITY_GATE_AVAILABLE = _AI_QUALITY_GATE.available
+AIQualityGate = _AI_QUALITY_GATE.symbol("AIQualityGate")
 
 # v17.9.7: Master Master Evaluator - THE definitive quality scoring system
-try:
-    from master_evaluator import MasterEvaluator, get_master_evaluator
-    MASTER_EVALUATOR_AVAILABLE = True
-except ImportError:
-    MASTER_EVALUATOR_AVAILABLE = False
-
-try:
-    from content_optimizer import ContentOptimizer
-    CONTENT_OPTIMIZER_AVAILABLE = True
-except ImportError:
-    CONTENT_OPTIMIZER_AVAILABLE = False
-
-try:
-    from retention_predictor import RetentionPredictor
-    RETENTION_PREDICTOR_AVAILABLE = True
-except ImportError:
-    RETENTION_PREDICTOR_AVAILABLE = False
-
-try:
-    from engagement_predictor import EngagementPredictor
-    ENGAGEMENT_PREDICTOR_AVAILABLE = True
-except ImportError:
-    ENGAGEMENT_PREDICTOR_AVAILABLE = False
-
-try:
-    from virality_calculator import ViralityCalculator
-    VIRALITY_CALCULATOR_AVAILABLE = True
-except ImportError:
-    VIRALITY_CALCULATOR_AVAILABLE = False
-
-try:
-    from script_analyzer import ScriptAnalyzer
-    SCRIPT_ANALYZER_AVAILABLE = True
-except ImportError:
-    SCRIPT_ANALYZER_AVAILABLE = False
-
-try:
-    from ai_description_generator import AIDescriptionGenerator
-    AI_DESCRIPTION_GENERATOR_AVAILABLE = True
-except ImportError:
-    AI_DESCRIPTION_GENERATOR_AVAILABLE = False
-
-try:
-    from ai_hashtag_generator import AIHashtagGenerator
-    AI_HASHTAG_GENERATOR_AVAILABLE = True
-except ImportError:
-    AI_HASHTAG_GENERATOR_AVAILABLE = False
-
-try:
-    from dashboard_generator import DashboardGenerator
-    DASHBOARD_GENERATOR_AVAILABLE = True
-except ImportError:
-    DASHBOARD_GENERATOR_AVAILABLE = False
-
-# Log AI module availability
-_ai_modules = [
+_MASTER_EVALUATOR = LAZY.register("MASTER_EVALUATOR_AVAILABLE", "master_evaluator")
+MASTER_EVALUATOR_AVAILABLE = _MASTER_EVALUATOR.available
+get_master_evaluator = _MASTER_EVALUATOR.symbol("get_master_evaluator")
+
+# v18.7: Tiered evaluation cascade - local scorers decide before any AI evaluation
+_EVALUATION_CASCADE = LAZY.register("EVALUATION_CASCADE_AVAILABLE", "evaluation_cascade")
+EVALUATION_CASCADE_AVAILABLE = _EVALUATION_CASCADE.available
+get_evaluation_cascade = _EVALUATION_CASCADE.symbol("get_evaluation_cascade")
+
+# v18.7: Real prompt/completion token counts from provider responses
+_TOKEN_USAGE = LAZY.register("TOKEN_USAGE_AVAILABLE", "token_usage", packages=("", "src.quota"))
+make_response = _TOKEN_USAGE.symbol("make_response",
+                                    fallback=lambda text, *args, **kwargs: text)
+
+# v18.7: Quota-aware batch planner - admission control for --count N
+_BATCH_PLANNER = LAZY.register("BATCH_PLANNER_AVAILABLE", "batch_planner",
+                               packages=("", "src.quota"))
+BATCH_PLANNER_AVAILABLE = _BATCH_PLANNER.available
+get_batch_planner = _BATCH_PLANNER.symbol("get_batch_planner")
+SkippedPrompt = _BATCH_PLANNER.symbol("SkippedPrompt")
+was_skipped = _BATCH_PLANNER.symbol("was_skipped", fallback=lambda result: False)
+
+# v18.7: Token-budgeted prompt assembly - dedupe, rank and fit booster sections
+_PROMPT_ASSEMBLER = LAZY.register("PROMPT_ASSEMBLER_AVAILABLE", "prompt_assembler",
+                                  packages=("", "src.ai"))
+PROMPT_ASSEMBLER_AVAILABLE = _PROMPT_ASSEMBLER.available
+get_prompt_assembler = _PROMPT_ASSEMBLER.symbol("get_prompt_assembler")
+
+# v18.7: K concepts per AI call, selected locally (duplicates + batch scoring)
+_CANDIDATE_TOURNAMENT = LAZY.register("CANDIDATE_TOURNAMENT_AVAILABLE", "candidate_tournament",
+                                      packages=("", "src.ai"))
+CANDIDATE_TOURNAMENT_AVAILABLE = _CANDIDATE_TOURNAMENT.available
+get_candidate_tournament = _CANDIDATE_TOURNAMENT.symbol("get_candidate_tournament")
+candidates_instruction = _CANDIDATE_TOURNAMENT.symbol("candidates_instruction")
+parse_candidates = _CANDIDATE_TOURNAMENT.symbol("parse_candidates")
+# Constant - read with .get() (1 = no tournament)
+TOURNAMENT_SIZE = _CANDIDATE_TOURNAMENT.symbol("TOURNAMENT_SIZE", fallback=1)
+
+_CONTENT_OPTIMIZER = LAZY.register("CONTENT_OPTIMIZER_AVAILABLE", "content_optimizer")
+CONTENT_OPTIMIZER_AVAILABLE = _CONTENT_OPTIMIZER.available
+ContentOptimizer = _CONTENT_OPTIMIZER.symbol("ContentOptimizer")
+
+_RETENTION_PREDICTOR = LAZY.register("RETENTION_PREDICTOR_AVAILABLE", "retention_predictor")
+RETENTION_PREDICTOR_AVAILABLE = _RETENTION_PREDICTOR.available
+RetentionPredictor = _RETENTION_PREDICTOR.symbol("RetentionPredictor")
+
+_ENGAGEMENT_PREDICTOR = LAZY.register("ENGAGEMENT_PREDICTOR_AVAILABLE", "engagement_predictor")
+ENGAGEMENT_PREDICTOR_AVAILABLE = _ENGAGEMENT_PREDICTOR.available
+EngagementPredictor = _ENGAGEMENT_PREDICTOR.symbol("EngagementPredictor")
+
+_VIRALITY_CALCULATOR = LAZY.register("VIRALITY_CALCULATOR_AVAILABLE", "virality_calculator")
+VIRALITY_CALCULATOR_AVAILABLE = _VIRALITY_CALCULATOR.available
+ViralityCalculator = _VIRALITY_CALCULATOR.symbol("ViralityCalculator")
+
+_SCRIPT_ANALYZER = LAZY.register("SCRIPT_ANALYZER_AVAILABLE", "script_analyzer")
+SCRIPT_ANALYZER_AVAILABLE = _SCRIPT_ANALYZER.available
+ScriptAnalyzer = _SCRIPT_ANALYZER.symbol("ScriptAnalyzer")
+
+_AI_DESCRIPTION_GENERATOR = LAZY.register("AI_DESCRIPTION_GENERATOR_AVAILABLE",
+                                          "ai_description_generator")
+AI_DESCRIPTION_GENERATOR_AVAILABLE = _AI_DESCRIPTION_GENERATOR.available
+AIDescriptionGenerator = _AI_DESCRIPTION_GENERATOR.symbol("AIDescriptionGenerator")
+
+_AI_HASHTAG_GENERATOR = LAZY.register("AI_HASHTAG_GENERATOR_AVAILABLE", "ai_hashtag_generator")
+AI_HASHTAG_GENERATOR_AVAILABLE = _AI_HASHTAG_GENERATOR.available
+AIHashtagGenerator = _AI_HASHTAG_GENERATOR.symbol("AIHashtagGenerator")
+
+DASHBOARD_GENERATOR_AVAILABLE = LAZY.register(
+    "DASHBOARD_GENERATOR_AVAILABLE", "dashboard_generator").available
+
+# AI module availability (logged when a generation run starts, not at import)
+_AI_MODULE_FLAGS = [
     ("Hook Generator", AI_HOOK_GENERATOR_AVAILABLE),
     ("CTA Generator", AI_CTA_GENERATOR_AVAILABLE),
     ("Topic Suggester", AI_TOPIC_SUGGESTER_AVAILABLE),
@@ -463,8 +385,12 @@ _ai_modules = [
     ("Hashtag Generator", AI_HASHTAG_GENERATOR_AVAILABLE),
     ("Dashboard Generator", DASHBOARD_GENERATOR_AVAILABLE),
 ]
-_available = sum(1 for _, a in _ai_modules if a)
-print(f"[OK] AI Modules loaded: {_available}/{len(_ai_modules)} available")
+
+
+def log_ai_module_availability():
+    """Resolve the AI-first modules and log how many are available."""
+    available = sum(1 for _, flag in _AI_MODULE_FLAGS if flag)
+    print(f"[OK] AI Modules loaded: {available}/{len(_AI_MODULE_FLAGS)} available")
 
 # Constants (only technical, not content!)
 VIDEO_WIDTH = 1080
@@ -539,24 +465,30 @@ def strip_emojis(text: str) -> str:
 # ALL AVAILABLE OPTIONS - AI picks from these, variety enforced
 # ========================================================================
 # v17.8: Categories come from AI pattern generator, not hardcoded
+_base_categories = None
+
+
 def get_base_categories() -> List[str]:
     """
     v17.8: Get categories from AI or learned data, not hardcoded.
+    
+    v18.7: Resolved on first use (was BASE_CATEGORIES at import time, which
+    loaded the AI pattern generator for every import of this module).
     """
+    global _base_categories
+    if _base_categories is not None:
+        return list(_base_categories)
+    
+    _base_categories = ["general", "facts", "tips", "trending"]  # Minimal fallback only if AI unavailable
     if AI_PATTERN_GENERATOR_AVAILABLE:
         try:
             gen = get_pattern_generator()
             patterns = gen.get_patterns()
             if patterns.get("proven_categories"):
-                return patterns["proven_categories"]
+                _base_categories = patterns["proven_categories"]
         except:
             pass
-    
-    # Minimal fallback only if AI unavailable
-    return ["general", "facts", "tips", "trending"]
-
-# For backward compatibility
-BASE_CATEGORIES = get_base_categories()
+    return list(_base_categories)
 
 # v16.6: Cache for trending categories to save quota
 # Extended to 24 hours - trending categories don't change hourly
@@ -581,7 +513,7 @@ def get_ai_trending_categories(groq_key: str = None) -> List[str]:
         groq_key = os.environ.get("GROQ_API_KEY")
     
     if not groq_key:
-        return BASE_CATEGORIES
+        return get_base_categories()
     
     # v17.9.12: DYNAMIC model discovery - no hardcoding!
     try:
@@ -613,7 +545,7 @@ Consider:
 - Social media trending topics
 - What's capturing attention today
 
-Base categories (keep if still relevant): {BASE_CATEGORIES}
+Base categories (keep if still relevant): {get_base_categories()}
 
 Return a JSON array of 8-12 category names (single words or short phrases, lowercase, underscores for spaces).
 Example: ["ai_news", "psychology", "money_hacks", "relationship_tips", "health", "productivity"]
@@ -645,10 +577,7 @@ Return ONLY the JSON array, nothing else."""}],
         safe_print(f"   [CACHE] Using stale cached categories (API failed)")
         return _trending_cache["categories"]
     
-    return BASE_CATEGORIES
-
-# Will be populated dynamically by AI
-ALL_CATEGORIES = BASE_CATEGORIES  # Fallback, gets updated at runtime
+    return get_base_categories()
 
 
 def get_learned_optimal_metrics() -> Dict:
@@ -672,9 +601,8 @@ def get_learned_optimal_metrics() -> Dict:
             # Load learned optimal metrics from persistent storage
             learned_metrics_path = Path("data/persistent/learned_video_metrics.json")
             
-            if learned_metrics_path.exists():
-                with open(learned_metrics_path, 'r') as f:
-                    learned = json.load(f)
+            if state_exists(learned_metrics_path):
+                learned = load_state(learned_metrics_path)
                     
                 # Use learned values if we have enough data confidence
                 if learned.get("confidence", 0) >= 0.5:  # At least 50% confidence
@@ -709,9 +637,8 @@ def update_learned_metrics_from_performance(video_id: str, performance: Dict, vi
         learned_path = Path("data/persistent/learned_video_metrics.json")
         
         # Load existing data
-        if learned_path.exists():
-            with open(learned_path, 'r') as f:
-                data = json.load(f)
+        if state_exists(learned_path):
+            data = load_state(learned_path)
         else:
             data = {
                 "videos_analyzed": 0,
@@ -771,8 +698,7 @@ def update_learned_metrics_from_performance(video_id: str, performance: Dict, vi
         
         # Save
         learned_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(learned_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        save_state(learned_path, data)
             
     except Exception as e:
         pass  # Non-critical
@@ -848,6 +774,9 @@ class MasterAI:
         self.openrouter_available = bool(self.openrouter_key)
         self.huggingface_available = bool(self.huggingface_key)
         
+        # v18.7: Ranked runners-up of the last concept tournament
+        self.concept_runners_up = []
+        
         # v15.0: Initialize token budget manager
         try:
             from token_budget_manager import get_budget_manager, get_first_attempt_maximizer
@@ -926,8 +855,28 @@ class MasterAI:
         if self.openrouter_available:
             safe_print("[OK] OpenRouter AI initialized (fallback)")
     
+    def assemble_prompt(self, task: str, render, sections: Dict) -> str:
+        """
+        v18.7: Build a stage prompt with its booster sections fitted to the
+        task's token budget (duplicates removed, least useful sections dropped).
+        
+        Args:
+            task: Stage name - selects the budget
+            render: Builds the prompt from {placeholder: text}
+            sections: {placeholder: text or (text, options)} - see PromptAssembler.assemble
+        """
+        if PROMPT_ASSEMBLER_AVAILABLE:
+            try:
+                return render(get_prompt_assembler().assemble(task, render, sections))
+            except Exception as e:
+                safe_print(f"[!] Prompt assembly failed, using full prompt: {e}")
+        return render({name: spec[0] if isinstance(spec, tuple) else spec
+                       for name, spec in sections.items()})
+    
     def call_ai(self, prompt: str, max_tokens: int = 2000, temperature: float = 0.9, 
-                 prefer_gemini: bool = False, task: str = "general") -> str:
+                 prefer_gemini: bool = False, task: str = "general",
+                 cacheable: bool = None, policy: str = "best_quality",
+                 hedge: bool = False, stream_json: bool = False) -> str:
         """
         Call AI with smart load balancing: Groq for speed, Gemini for capacity.
         
@@ -943,9 +892,35 @@ class MasterAI:
         
         Args:
             task: Task type for budget tracking ("concept", "content", "evaluate", etc.)
+            cacheable: v18.7 - Use the prompt cache. None = TASK_CACHE_POLICY for task
+            policy: v18.7 - Router policy: "best_quality" or "fastest_acceptable"
+            hedge: v18.7 - Hedge slow primaries (critical-path stages only)
+            stream_json: v18.7 - Stream and stop once the JSON answer is complete
         """
-        import time
-        import re
+        # v18.7: Batch planner - optional prompts are skipped and bulk tasks
+        # moved to cheaper models when the batch is running lean
+        if BATCH_PLANNER_AVAILABLE:
+            planner = get_batch_planner()
+            if not planner.allows_task(task):
+                safe_print(f"   [PLANNER] Skipping optional '{task}' prompt ({planner.mode} mode)")
+                return SkippedPrompt()
+            policy, prefer_gemini = planner.routing_for(task, policy, prefer_gemini)
+        
+        result = self._call_ai_routed(prompt, max_tokens, temperature, prefer_gemini, task,
+                                      cacheable, policy, hedge, stream_json)
+        
+        # v18.7: Per-stage calls and real token usage for this video's report
+        if BATCH_PLANNER_AVAILABLE:
+            get_batch_planner().record_call(task, result)
+        return result
+    
+    def _call_ai_routed(self, prompt: str, max_tokens: int, temperature: float,
+                        prefer_gemini: bool, task: str, cacheable: Optional[bool],
+                        policy: str, hedge: bool, stream_json: bool) -> str:
+        """Smart router first, then the legacy provider chain (see call_ai)."""
+        # v18.7: Explicit per-task cache policy (creative tasks never cached)
+        if cacheable is None:
+            cacheable = bool(PROMPT_CACHE_AVAILABLE) and is_cacheable(task)
         
         # v17.9.9: USE SMART MODEL ROUTER (if available)
         # Routes each prompt to the BEST model based on prompt classification
@@ -969,18 +944,58 @@ class MasterAI:
                 hint = task_hint_map.get(task, task)
                 
                 result = smart_call_ai(prompt, hint=hint, max_tokens=max_tokens, 
-                                        temperature=temperature)
+                                        temperature=temperature, cacheable=cacheable,
+                                        policy=policy, hedge=hedge,
+                                        stream_json=stream_json)
                 if result:
-                    # Record to budget manager if available
-                    if self.budget_manager:
-                        self.budget_manager.record_usage("smart_router", max_tokens)
+                    # v18.7: SmartAICaller charged the real token usage to the
+                    # answering provider in the quota ledger (budgets read it)
                     return result
                 else:
                     safe_print("[!] Smart router failed, falling back to legacy logic...")
             except Exception as e:
                 safe_print(f"[!] Smart router error: {e}, falling back to legacy...")
+            
+            # v18.7: No time left in this stage - let the caller use its fallback
+            if deadline_expired():
+                give_up("skipping legacy provider chain")
+                return ""
         
         # === LEGACY LOGIC (fallback when smart router unavailable) ===
+        cache = get_prompt_cache() if cacheable and PROMPT_CACHE_AVAILABLE else None
+        cache_key = getattr(prompt, "cache_key", None)  # v18.7: templated prompts
+        if cache is not None:
+            cached = cache.get(prompt, task, key=cache_key)
+            if cached:
+                safe_print(f"   [CACHE] Hit ({task})")
+                return cached
+        
+        result = self._call_ai_legacy(prompt, max_tokens, temperature, prefer_gemini, task)
+        if result and cache is not None:
+            cache.set(prompt, result, task, key=cache_key)
+        return result
+    
+    def _legacy_result(self, provider: str, text: str, prompt: str, response=None,
+                       model: str = None) -> str:
+        """
+        v18.7: Wrap a legacy-chain answer with the token usage the provider
+        reported (estimated if absent) and charge it to the budget once.
+        """
+        result = make_response(text, prompt, f"{provider}:{model}" if model else provider, response)
+        if not result:
+            return text or ""
+        tokens = getattr(result, "total_tokens", 0)
+        # Both trackers read the shared quota ledger - record once
+        if self.budget_manager:
+            self.budget_manager.record_usage(provider, tokens)
+        elif self.quota_monitor:
+            self.quota_monitor.record_usage(provider, tokens)
+        return result
+    
+    def _call_ai_legacy(self, prompt: str, max_tokens: int, temperature: float,
+                        prefer_gemini: bool, task: str) -> str:
+        """Legacy provider chain (Groq -> Gemini -> HuggingFace -> OpenRouter)."""
+        import re
         
         # v15.0: Use budget manager for provider selection if available
         chosen_provider = None
@@ -1002,7 +1017,10 @@ class MasterAI:
                 "pexels": 18.0
             }
         base_delay = rate_limits.get(chosen_provider, 3.0)
-        time.sleep(base_delay)  # Rate limit protection between AI calls
+        # Rate limit protection between AI calls (v18.7: within the stage deadline)
+        if not sleep_within(base_delay):
+            give_up("no time left for the legacy provider chain")
+            return ""
         
         def extract_retry_delay(error_msg: str) -> int:
             """Extract retry delay from 429 error message."""
@@ -1015,18 +1033,14 @@ class MasterAI:
         if chosen_provider == "gemini" and self.gemini_model:
             try:
                 response = self.gemini_model.generate_content(prompt)
-                if self.budget_manager:
-                    self.budget_manager.record_usage("gemini", max_tokens)
-                if self.quota_monitor:
-                    self.quota_monitor.record_usage("gemini", max_tokens)
-                return response.text
+                return self._legacy_result("gemini", response.text, prompt, response)
             except Exception as e:
                 error_str = str(e)
                 if '429' in error_str:
                     delay = extract_retry_delay(error_str)
                     if self.budget_manager:
                         self.budget_manager.record_429("gemini", delay)
-                    if self.quota_monitor:
+                    elif self.quota_monitor:
                         self.quota_monitor.record_429("gemini", delay)
                     safe_print(f"[!] Gemini 429 - switching to fallback...")
                     # v17.7.6: Log quota exhaustion for tracking
@@ -1043,7 +1057,7 @@ class MasterAI:
             # Try Gemini first to save Groq quota
             try:
                 response = self.gemini_model.generate_content(prompt)
-                return response.text
+                return self._legacy_result("gemini", response.text, prompt, response)
             except Exception as e:
                 safe_print(f"[!] Gemini primary error: {e}")
                 # Fall through to Groq
@@ -1063,6 +1077,8 @@ class MasterAI:
                     groq_models_to_try = []
             
             for model_name in groq_models_to_try:
+                if deadline_expired():
+                    break
                 try:
                     response = self.client.chat.completions.create(
                         model=model_name,
@@ -1070,12 +1086,9 @@ class MasterAI:
                         max_tokens=max_tokens,
                         temperature=temperature
                     )
-                    # v15.0: Record token usage
-                    if self.budget_manager:
-                        self.budget_manager.record_usage("groq", max_tokens)
-                    if self.quota_monitor:
-                        self.quota_monitor.record_usage("groq", max_tokens)
-                    return response.choices[0].message.content
+                    # v15.0: Record token usage (v18.7: actual, from response.usage)
+                    return self._legacy_result("groq", response.choices[0].message.content,
+                                               prompt, response, model_name)
                 except Exception as e:
                     error_str = str(e)
                     if '429' in error_str:
@@ -1098,7 +1111,7 @@ class MasterAI:
             # All Groq models failed - record and continue to fallback
             if self.budget_manager:
                 self.budget_manager.record_429("groq", 60)
-            if self.quota_monitor:
+            elif self.quota_monitor:
                 self.quota_monitor.record_429("groq", 60)
             safe_print(f"[!] All Groq models exhausted, falling back...")
         
@@ -1120,13 +1133,14 @@ class MasterAI:
                         gemini_models_to_try = []
                 
                 for model_name in gemini_models_to_try:
+                    if deadline_expired():
+                        break
                     try:
                         # Try with and without models/ prefix
                         model = genai.GenerativeModel(f'models/{model_name}')
                         response = model.generate_content(prompt)
-                        if self.budget_manager:
-                            self.budget_manager.record_usage("gemini", max_tokens)
-                        return response.text
+                        return self._legacy_result("gemini", response.text, prompt,
+                                                   response, model_name)
                     except Exception as model_err:
                         error_str = str(model_err)
                         if '429' in error_str:
@@ -1137,9 +1151,8 @@ class MasterAI:
                             try:
                                 model = genai.GenerativeModel(model_name)
                                 response = model.generate_content(prompt)
-                                if self.budget_manager:
-                                    self.budget_manager.record_usage("gemini", max_tokens)
-                                return response.text
+                                return self._legacy_result("gemini", response.text, prompt,
+                                                           response, model_name)
                             except:
                                 safe_print(f"[!] Gemini {model_name} not available, refreshing models...")
                                 # v16.8: LAZY LOAD - refresh models list only when needed
@@ -1184,6 +1197,8 @@ class MasterAI:
                 client = InferenceClient(token=self.huggingface_key)
                 
                 for hf_model in hf_models:
+                    if deadline_expired():
+                        break
                     try:
                         response = client.chat_completion(
                             messages=[{"role": "user", "content": prompt}],
@@ -1193,7 +1208,8 @@ class MasterAI:
                         content = response.choices[0].message.content
                         if content:
                             safe_print(f"[OK] HuggingFace succeeded with {hf_model.split('/')[-1]}!")
-                            return content
+                            return self._legacy_result("huggingface", content, prompt,
+                                                       response, hf_model)
                     except Exception as model_err:
                         safe_print(f"[!] {hf_model.split('/')[-1]}: {str(model_err)[:50]}")
                         continue
@@ -1219,6 +1235,8 @@ class MasterAI:
         if self.openrouter_available:
             import requests
             for model in free_models:
+                if deadline_expired():
+                    break
                 try:
                     safe_print(f"[*] OpenRouter: Trying {model.split('/')[1][:20]}...")
                     response = requests.post(
@@ -1234,19 +1252,15 @@ class MasterAI:
                             "max_tokens": max_tokens,
                             "temperature": temperature
                         },
-                        timeout=60
+                        timeout=request_timeout(60)
                     )
                     if response.status_code == 200:
                         result = response.json()
                         content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
                         if content:
-                            # v15.0: Record OpenRouter usage
-                            if self.budget_manager:
-                                self.budget_manager.record_usage("openrouter", max_tokens)
-                            if self.quota_monitor:
-                                self.quota_monitor.record_usage("openrouter", max_tokens)
+                            # v15.0: Record OpenRouter usage (v18.7: actual, from the usage object)
                             safe_print(f"[OK] OpenRouter succeeded with {model.split('/')[1][:20]}!")
-                            return content
+                            return self._legacy_result("openrouter", content, prompt, result, model)
                         else:
                             safe_print(f"[!] OpenRouter: Empty response")
                     elif response.status_code == 429:
@@ -1276,6 +1290,7 @@ class MasterAI:
     # ========================================================================
     # STAGE 1: AI Decides What Type of Video to Create (with VARIETY ENFORCEMENT)
     # ========================================================================
+    @stage_deadline("concept")
     def stage1_decide_video_concept(self, hint: str = None, batch_tracker: BatchTracker = None) -> Dict:
         """
         AI decides EVERYTHING about the video concept.
@@ -1325,10 +1340,10 @@ class MasterAI:
         music_options = ", ".join(ALL_MUSIC_MOODS)
         
         # v8.0: Get viral patterns to inject into prompt
-        viral_boost = get_viral_prompt_boost() if VIRAL_PATTERNS_AVAILABLE else ""
+        viral_boost = self._prompt_boost("viral")
         
         # v12.0: Get v12 master prompt with ALL 330 enhancements
-        v12_guidelines = V12_MASTER_PROMPT if ENHANCEMENTS_V12_AVAILABLE else ""
+        v12_guidelines = v12_master_prompt()
         
         # v16.9: INTEGRATE ALL V12 ENHANCEMENTS (not just master prompt!)
         # These were imported but NEVER USED - now fixing that
@@ -1363,16 +1378,35 @@ OPEN LOOP: {loop_instruction}
                 safe_print(f"[!] v12 extra boosts failed: {e}")
         
         # v15.0: Get first-attempt quality boost to avoid regenerations
-        first_attempt_boost = ""
-        if self.first_attempt:
-            first_attempt_boost = self.first_attempt.get_quality_boost_prompt()
+        first_attempt_boost = self._prompt_boost("first_attempt")
         
         # v15.0: Get self-learning insights
-        learning_boost = ""
-        if self.learning_engine:
-            learning_boost = self.learning_engine.get_prompt_boost()
+        learning_boost = self._prompt_boost("learning")
+        
+        concept_schema = """{
+        "category": "MUST be from available list",
+        "specific_topic": "the specific topic (5-10 words) - BE CREATIVE AND UNIQUE",
+        "why_this_topic": "why this will be viral and valuable",
+        "phrase_count": 8,
+        "voice_style": "energetic/calm/mysterious/etc",
+        "music_mood": "upbeat/dramatic/mysterious/etc",
+        "target_duration_seconds": 45,
+        "global_relevance": "why this works worldwide"
+    }"""
+        
+        # v18.7: One call returns several concepts; the tournament picks the winner
+        tournament_size = TOURNAMENT_SIZE.get()
+        use_tournament = bool(CANDIDATE_TOURNAMENT_AVAILABLE) and tournament_size > 1
+        if use_tournament:
+            output_spec = candidates_instruction(tournament_size, concept_schema)
+            max_tokens = 250 + 160 * tournament_size
+        else:
+            output_spec = f"=== OUTPUT JSON ===\n{concept_schema}\n\nOUTPUT JSON ONLY."
+            max_tokens = 800
         
-        prompt = f"""You are a VIRAL CONTENT STRATEGIST for short-form video (YouTube Shorts, TikTok).
+        # v18.7: Boosters are fitted into the concept prompt budget
+        def render(parts: Dict) -> str:
+            return f"""You are a VIRAL CONTENT STRATEGIST for short-form video (YouTube Shorts, TikTok).
 Your job is to decide what video to create that will get MAXIMUM views while delivering REAL value.
 
 UNIQUE GENERATION ID: {unique_seed}
@@ -1383,15 +1417,15 @@ DATE: {time.strftime('%B %d, %Y, %A')}
 === AVAILABLE CATEGORIES (pick ONE from this list ONLY) ===
 {available_categories}
 
-{viral_boost}
+{parts['viral_boost']}
 
-{v12_guidelines}
+{parts['v12_guidelines']}
 
-{v12_extra_boosts}
+{parts['v12_extra_boosts']}
 
-{first_attempt_boost}
+{parts['first_attempt_boost']}
 
-{learning_boost}
+{parts['learning_boost']}
 
 === YOUR DECISION TASKS ===
 
@@ -1418,23 +1452,26 @@ DATE: {time.strftime('%B %d, %Y, %A')}
    - 45-50s: Deep dive (10 phrases) - Good for complex topics
    - Under 60 seconds keeps YouTube Shorts format
 
-=== OUTPUT JSON ===
-{{
-    "category": "MUST be from available list",
-    "specific_topic": "the specific topic (5-10 words) - BE CREATIVE AND UNIQUE",
-    "why_this_topic": "why this will be viral and valuable",
-    "phrase_count": 8,
-    "voice_style": "energetic/calm/mysterious/etc",
-    "music_mood": "upbeat/dramatic/mysterious/etc",
-    "target_duration_seconds": 45,
-    "global_relevance": "why this works worldwide"
-}}
+{output_spec}
 
-OUTPUT JSON ONLY. Be creative and strategic - NO REPETITION!"""
+Be creative and strategic - NO REPETITION!"""
+        
+        prompt = self.assemble_prompt("concept", render, {
+            "viral_boost": viral_boost,
+            "v12_guidelines": (v12_guidelines, {"split": True, "priority": 4}),
+            "v12_extra_boosts": (v12_extra_boosts, {"priority": 4}),
+            "first_attempt_boost": (first_attempt_boost, {"priority": 6}),
+            "learning_boost": (learning_boost, {"priority": 6}),
+        })
 
         # v15.0: Use task-specific call for budget tracking
-        response = self.call_ai(prompt, 800, temperature=0.98, task="concept")  # Higher temp for variety
+        # v18.7: Critical path - hedge if the primary model is slower than its p90
+        response = self.call_ai(prompt, max_tokens, temperature=0.98, task="concept", hedge=True,
+                                stream_json=True)  # Higher temp for variety
         result = self.parse_json(response)
+        self.concept_runners_up = []
+        if use_tournament and result:
+            result = self._select_concept(result, exclude_categories, exclude_topics)
         
         if result:
             category = result.get('category', '')
@@ -1450,29 +1487,7 @@ OUTPUT JSON ONLY. Be creative and strategic - NO REPETITION!"""
                     result['category'] = random.choice(available_categories)
                 safe_print(f"   [VARIETY] Forced category change: {category} -> {result['category']}")
             
-            # v8.0: Record to PERSISTENT state (survives across runs!)
-            if PERSISTENT_STATE_AVAILABLE:
-                variety = get_variety_manager()
-                variety.record_usage('categories', result.get('category', ''))
-                variety.record_usage('topics', result.get('specific_topic', ''))
-                safe_print(f"   [PERSIST] Recorded to variety state")
-            
-            # Also track in batch tracker for within-batch variety
-            if batch_tracker:
-                batch_tracker.used_categories.append(result.get('category', ''))
-                batch_tracker.used_topics.append(result.get('specific_topic', ''))
-            
-            safe_print(f"   Category: {result.get('category', 'N/A')}")
-            safe_print(f"   Topic: {result.get('specific_topic', 'N/A')}")
-            safe_print(f"   Phrases: {result.get('phrase_count', 'N/A')}")
-            safe_print(f"   Voice: {result.get('voice_style', 'N/A')}")
-            safe_print(f"   Music: {result.get('music_mood', 'N/A')}")
-            safe_print(f"   Duration: ~{result.get('target_duration_seconds', 'N/A')}s")
-            
-            # Save successful concept as backup for future fallback
-            self._save_concept_backup(result)
-            
-            return result
+            return self._record_concept(result, batch_tracker)
         
         # FALLBACK: If AI failed (quota exhausted), try pre-generated concepts
         safe_print("   [!] AI generation failed, trying pre-generated fallback...")
@@ -1483,7 +1498,7 @@ OUTPUT JSON ONLY. Be creative and strategic - NO REPETITION!"""
                 if concept:
                     safe_print("   [FALLBACK] Using pre-generated concept")
                     # v16.2: Dynamic defaults instead of hardcoded
-                    random_cat = random.choice(BASE_CATEGORIES)
+                    random_cat = random.choice(get_base_categories())
                     result = {
                         'category': concept.get('category', random_cat),
                         'specific_topic': concept.get('topic', f'{random_cat.replace("_", " ").title()} Insight'),
@@ -1508,7 +1523,7 @@ OUTPUT JSON ONLY. Be creative and strategic - NO REPETITION!"""
         # Ultimate fallback - v16.2: Dynamic even in fallback mode!
         safe_print("   [!] Concept generation failed completely - using dynamic fallback")
         # Rotate through categories to maintain variety even in failures
-        fallback_categories = BASE_CATEGORIES.copy()
+        fallback_categories = get_base_categories()
         random.shuffle(fallback_categories)
         fallback_cat = fallback_categories[0]
         
@@ -1530,6 +1545,91 @@ OUTPUT JSON ONLY. Be creative and strategic - NO REPETITION!"""
             'target_duration_seconds': random.randint(40, 50)
         }
     
+    def _prompt_boost(self, kind: str) -> str:
+        """
+        v18.7: Learned prompt additions ("viral", "learning", "first_attempt"),
+        rebuilt only when the state they come from changes.
+        """
+        snapshots = get_boost_snapshots() if BOOST_SNAPSHOTS_AVAILABLE else None
+        if kind == "viral":
+            if not VIRAL_PATTERNS_AVAILABLE:
+                return ""
+            return snapshots.viral() if snapshots else get_viral_prompt_boost(refresh=False)
+        if kind == "learning":
+            if not self.learning_engine:
+                return ""
+            if snapshots:
+                return snapshots.learning(self.learning_engine)
+            return self.learning_engine.get_prompt_boost()
+        if not self.first_attempt:
+            return ""
+        if snapshots:
+            return snapshots.first_attempt(self.first_attempt)
+        return self.first_attempt.get_quality_boost_prompt()
+    
+    def _record_concept(self, result: Dict, batch_tracker: BatchTracker = None) -> Dict:
+        """Record a chosen concept for variety tracking and as a fallback backup."""
+        # v8.0: Record to PERSISTENT state (survives across runs!)
+        if PERSISTENT_STATE_AVAILABLE:
+            variety = get_variety_manager()
+            variety.record_usage('categories', result.get('category', ''))
+            variety.record_usage('topics', result.get('specific_topic', ''))
+            safe_print(f"   [PERSIST] Recorded to variety state")
+        
+        # Also track in batch tracker for within-batch variety
+        if batch_tracker:
+            batch_tracker.used_categories.append(result.get('category', ''))
+            batch_tracker.used_topics.append(result.get('specific_topic', ''))
+        
+        safe_print(f"   Category: {result.get('category', 'N/A')}")
+        safe_print(f"   Topic: {result.get('specific_topic', 'N/A')}")
+        safe_print(f"   Phrases: {result.get('phrase_count', 'N/A')}")
+        safe_print(f"   Voice: {result.get('voice_style', 'N/A')}")
+        safe_print(f"   Music: {result.get('music_mood', 'N/A')}")
+        safe_print(f"   Duration: ~{result.get('target_duration_seconds', 'N/A')}s")
+        
+        # Save successful concept as backup for future fallback
+        self._save_concept_backup(result)
+        
+        return result
+    
+    def _select_concept(self, parsed: Dict, exclude_categories: List[str],
+                        recent_topics: List[str]) -> Dict:
+        """
+        v18.7: Pick the best of the generated concepts.
+        
+        Near-copies of recent topics (and of each other) are dropped, the rest
+        scored together; concepts in excluded categories rank last. Runners-up
+        are kept for next_concept_candidate().
+        """
+        candidates = [c for c in parse_candidates(parsed)
+                      if isinstance(c, dict) and c.get('specific_topic')]
+        if not candidates:
+            return {}
+        outcome = get_candidate_tournament().select(
+            "concept", candidates,
+            text=lambda c: c.get('specific_topic', ''),
+            fields=lambda c: {"topic": c.get('specific_topic', ''), "category": c.get('category', '')},
+            recent=recent_topics,
+            allowed=lambda c: c.get('category') not in exclude_categories)
+        
+        ranked = outcome["ranked"]
+        safe_print(f"   [TOURNAMENT] {len(candidates)} concepts, "
+                   f"{len(outcome['duplicates'])} near-duplicates dropped"
+                   + (f", winner scored {ranked[0]['score']}" if ranked else ""))
+        if not ranked:
+            # Every candidate resembles recent content - let the duplicate check decide
+            return candidates[0]
+        self.concept_runners_up = [entry["candidate"] for entry in ranked[1:]]
+        return outcome["winner"]
+    
+    def next_concept_candidate(self, batch_tracker: BatchTracker = None) -> Optional[Dict]:
+        """v18.7: Next runner-up of the last concept tournament (no AI call)."""
+        if not self.concept_runners_up:
+            return None
+        safe_print("\n[STAGE 1] Using the next tournament concept...")
+        return self._record_concept(self.concept_runners_up.pop(0), batch_tracker)
+    
     def _save_concept_backup(self, concept: Dict):
         """Save successful concept as backup for future use."""
         try:
@@ -1565,6 +1665,7 @@ OUTPUT JSON ONLY. Be creative and strategic - NO REPETITION!"""
     # ========================================================================
     # STAGE 2: AI Creates the Content Based on Its Own Decisions
     # ========================================================================
+    @stage_deadline("content")
     def stage2_create_content(self, concept: Dict) -> Dict:
         """AI creates the actual content based on the concept it decided.
         v8.0: Content optimized for engagement with strong hooks.
@@ -1605,10 +1706,10 @@ OUTPUT JSON ONLY. Be creative and strategic - NO REPETITION!"""
         safe_print(f"   [v17.9.4] Using learned optimal: {phrase_count} phrases, {target_duration}s")
         
         # v8.0: Get viral hook patterns
-        viral_boost = get_viral_prompt_boost() if VIRAL_PATTERNS_AVAILABLE else ""
+        viral_boost = self._prompt_boost("viral")
         
         # v12.0: Get v12 master prompt with ALL 330 enhancements
-        v12_guidelines = V12_MASTER_PROMPT if ENHANCEMENTS_V12_AVAILABLE else ""
+        v12_guidelines = v12_master_prompt()
         
         # v16.9: INTEGRATE REMAINING V12 ENHANCEMENTS
         # These were imported but NEVER USED - now fixing that
@@ -1656,8 +1757,8 @@ STRUCTURE: {hbp_structure}
         
         # v15.0: Get first-attempt quality boost to avoid regenerations
         first_attempt_boost = ""
-        if self.first_attempt and not is_regeneration:
-            first_attempt_boost = self.first_attempt.get_quality_boost_prompt()
+        if not is_regeneration:
+            first_attempt_boost = self._prompt_boost("first_attempt")
         
         # v13.1: Handle regeneration feedback for quality enforcement
         regen_feedback = ""
@@ -1693,7 +1794,10 @@ YOU MUST CREATE BETTER CONTENT THIS TIME:
 
 """
         
-        prompt = f"""You are a VIRAL CONTENT CREATOR aiming for 10/10 PERFECT viral potential.
+        # v18.7: Boosters are fitted into the content prompt budget
+        # (regeneration feedback and pre-generation enhancements always stay)
+        def render(parts: Dict) -> str:
+            return f"""You are a VIRAL CONTENT CREATOR aiming for 10/10 PERFECT viral potential.
 
 === YOUR MISSION: CREATE 10/10 CONTENT ===
 To score 10/10, you MUST include ALL of these elements:
@@ -1707,8 +1811,8 @@ To score 10/10, you MUST include ALL of these elements:
 
 Missing ANY element = less than 10/10. Include ALL for perfection!
 
-{regen_feedback}
-{enhancement_boost}
+{parts['regen_feedback']}
+{parts['enhancement_boost']}
 
 === VIDEO CONCEPT ===
 Category: {concept.get('category', 'educational')}
@@ -1717,13 +1821,13 @@ Why Viral: {concept.get('why_this_topic', 'valuable content')}
 Target Duration: {target_duration} seconds (CRITICAL - keep it SHORT!)
 Phrase Count: {phrase_count} phrases ONLY
 
-{viral_boost}
+{parts['viral_boost']}
 
-{v12_guidelines}
+{parts['v12_guidelines']}
 
-{v12_content_boosts}
+{parts['v12_content_boosts']}
 
-{first_attempt_boost}
+{parts['first_attempt_boost']}
 
 === v17.9 CONTENT RULES (FIXED - REAL VALUE REQUIRED) ===
 
@@ -1787,9 +1891,20 @@ CRITICAL:
 - ONLY {phrase_count} phrases - no more!
 - UNDER 15 words per phrase
 OUTPUT JSON ONLY."""
+        
+        prompt = self.assemble_prompt("content", render, {
+            "regen_feedback": (regen_feedback, {"required": True}),
+            "enhancement_boost": (enhancement_boost, {"required": True}),
+            "viral_boost": viral_boost,
+            "v12_guidelines": (v12_guidelines, {"split": True, "priority": 4}),
+            "v12_content_boosts": (v12_content_boosts, {"priority": 4}),
+            "first_attempt_boost": (first_attempt_boost, {"priority": 6}),
+        })
 
         # v15.0: Task-specific call for budget tracking
-        response = self.call_ai(prompt, 1200, temperature=0.85, task="content")
+        # v18.7: Critical path - hedge if the primary model is slower than its p90
+        response = self.call_ai(prompt, 1200, temperature=0.85, task="content", hedge=True,
+                                stream_json=True)
         result = self.parse_json(response)
         
         if result and result.get('phrases'):
@@ -1797,7 +1912,6 @@ OUTPUT JSON ONLY."""
             cleaned_phrases = []
             for phrase in result.get('phrases', []):
                 # Remove "Phrase 1:", "Phrase1:", "1:", "1." etc. prefixes
-                import re
                 cleaned = re.sub(r'^(Phrase\s*\d+\s*[:.]?\s*|\d+\s*[:.]?\s*)', '', phrase, flags=re.IGNORECASE).strip()
                 cleaned_phrases.append(cleaned)
             result['phrases'] = cleaned_phrases
@@ -1834,6 +1948,7 @@ OUTPUT JSON ONLY."""
     # ========================================================================
     # STAGE 3: AI Evaluates and Enhances the Content
     # ========================================================================
+    @stage_deadline("evaluate")
     def stage3_evaluate_enhance(self, content: Dict) -> Dict:
         """AI evaluates its own content and improves it."""
         safe_print("\n[STAGE 3] AI evaluating and enhancing...")
@@ -1876,7 +1991,9 @@ Rules:
 Return ONLY the improved hook, nothing else."""
 
                 improved_hook = self.call_ai(hook_improve_prompt, 100, temperature=0.9, task="hook_improve")
-                if improved_hook and len(improved_hook.strip()) > 5 and len(improved_hook.strip()) < 100:
+                if was_skipped(improved_hook):
+                    content['hook_improve_skipped'] = True  # v18.7: Planner's choice, not a failure
+                elif improved_hook and len(improved_hook.strip()) > 5 and len(improved_hook.strip()) < 100:
                     phrases[0] = improved_hook.strip().strip('"').strip("'")
                     content['phrases'] = phrases
                     content['hook_was_improved'] = True
@@ -1990,7 +2107,37 @@ Return ONLY the improved hook, nothing else."""
                 safe_print(f"   [VIRALITY] Score: {virality.get('overall_score', 0):.0f}/100 ({virality.get('grade', 'N/A')}) - {virality.get('viral_potential', 'N/A')}")
             except Exception as e:
                 safe_print(f"   [!] Virality calculation skipped: {e}")
-        
+
+        # v18.7: EVALUATION CASCADE - reuse the local scores above and only
+        # spend AI evaluation calls when they are inconclusive
+        cascade_outcome = None
+        if EVALUATION_CASCADE_AVAILABLE and phrases:
+            try:
+                cascade = get_evaluation_cascade()
+                hook_score = content.get('hook_quality_score')
+                local = cascade.combine({
+                    "script": content.get('script_analysis', {}).get('overall_score'),
+                    "retention": content.get('retention_prediction', {}).get('overall_retention'),
+                    "engagement": content.get('engagement_prediction', {}).get('overall_engagement'),
+                    "virality": content.get('virality_score', {}).get('overall_score'),
+                    "hook": hook_score * 10 if hook_score is not None else None
+                })
+                cascade_outcome = cascade.evaluate("stage3", local=local)
+                content['evaluation_tier'] = cascade_outcome['tier']
+            except Exception as e:
+                safe_print(f"   [!] Evaluation cascade skipped: {e}")
+                cascade_outcome = None
+
+        if cascade_outcome and cascade_outcome['decision'] != 'ai':
+            content['evaluation_score'] = cascade.to_ten(cascade_outcome['local_score'])
+            if cascade_outcome['decision'] == 'reject':
+                recommendations = content.get('virality_score', {}).get('recommendations', [])
+                content['quality_issues'] = [{"issue": rec} for rec in recommendations[:3]]
+                content['needs_regeneration'] = True
+                content['regen_reason'] = "Local scorers rejected content"
+            safe_print(f"   Score: {content['evaluation_score']}/10 (local {cascade_outcome['decision']})")
+            return content
+
         # 5. v17.9.7: MASTER EVALUATOR - The ULTIMATE quality scoring system
         if MASTER_EVALUATOR_AVAILABLE and phrases:
             try:
@@ -2002,7 +2149,8 @@ Return ONLY the improved hook, nothing else."""
                     "topic": content.get('concept', {}).get('specific_topic', ''),
                     "category": content.get('concept', {}).get('category', 'educational')
                 }
-                master_result = evaluator.evaluate(master_content)
+                # v18.7: Stage 3 already ran the cascade - go straight to AI
+                master_result = evaluator.evaluate(master_content, use_cascade=False)
                 content['master_evaluation'] = master_result
                 
                 final_score = master_result.get('final_score', 0)
@@ -2113,8 +2261,11 @@ For each phrase, ask:
 CRITICAL: Do NOT include "Phrase 1:", "Improved phrase 1:" etc. - just the actual text!
 OUTPUT JSON ONLY."""
 
+        prompt = tag_prompt("STAGE3_EVALUATION_PROMPT", prompt, hook=hook_or_topic,
+                            phrases=phrases, value=content.get('specific_value', ''))
+        
         # v15.0: Task-specific call for budget tracking
-        response = self.call_ai(prompt, 1200, temperature=0.7, task="evaluate")
+        response = self.call_ai(prompt, 1200, temperature=0.7, task="evaluate", stream_json=True)
         result = self.parse_json(response)
         
         if result:
@@ -2153,6 +2304,7 @@ OUTPUT JSON ONLY."""
     # ========================================================================
     # STAGE 4: AI Generates B-Roll Keywords
     # ========================================================================
+    @stage_deadline("broll")
     def stage4_broll_keywords(self, phrases: List[str]) -> List[str]:
         """AI generates visual keywords for each phrase.
         v8.2: Uses Gemini to save Groq quota (non-critical task).
@@ -2199,9 +2351,14 @@ Return exactly {len(phrases)} keywords as JSON array:
 
 JSON ARRAY ONLY."""
 
+        # v18.7: avoid_hint is learned state - not part of the cache key
+        prompt = tag_prompt("STAGE4_BROLL_PROMPT", prompt, phrases=phrases)
+        
         # v8.2: Use Gemini for this task to save Groq quota
         # v15.0: Task-specific call for budget tracking
-        response = self.call_ai(prompt, 400, temperature=0.8, prefer_gemini=True, task="broll")
+        # v18.7: Non-critical - fastest model above the quality floor
+        response = self.call_ai(prompt, 400, temperature=0.8, prefer_gemini=True, task="broll",
+                                policy="fastest_acceptable", stream_json=True)
         
         try:
             if "[" in response:
@@ -2218,6 +2375,7 @@ JSON ARRAY ONLY."""
     # ========================================================================
     # STAGE 5: AI Generates Metadata with A/B Title Variants
     # ========================================================================
+    @stage_deadline("metadata")
     def stage5_metadata(self, content: Dict) -> Dict:
         """AI generates viral metadata with title variants for A/B testing.
         v8.5: Generates 3 title variants, picks one randomly, tracks style.
@@ -2231,7 +2389,7 @@ JSON ARRAY ONLY."""
         # v8.9.1: Get learned viral patterns for title generation (AI-driven, not hardcoded!)
         viral_title_guidance = ""
         try:
-            viral_boost = get_viral_prompt_boost() if VIRAL_PATTERNS_AVAILABLE else ""
+            viral_boost = self._prompt_boost("viral")
             if viral_boost:
                 viral_title_guidance = f"""
 === LEARNED VIRAL PATTERNS (from analysis of successful videos) ===
@@ -2281,9 +2439,19 @@ Create 3 different styles based on the learned patterns above:
 
 JSON ONLY."""
 
+        # v18.7: Learned viral boost is volatile - key on the video itself
+        prompt = tag_prompt("STAGE5_METADATA_PROMPT", prompt,
+                            category=concept.get('category', ''),
+                            topic=concept.get('specific_topic', ''),
+                            hook=concept.get('hook', ''),
+                            first_phrase=phrases[0] if phrases else '',
+                            value=content.get('value_delivered', ''))
+        
         # v8.2: Use Gemini for this task to save Groq quota
         # v15.0: Task-specific call for budget tracking
-        response = self.call_ai(prompt, 400, temperature=0.8, prefer_gemini=True, task="metadata")
+        # v18.7: Non-critical - fastest model above the quality floor
+        response = self.call_ai(prompt, 400, temperature=0.8, prefer_gemini=True, task="metadata",
+                                policy="fastest_acceptable", stream_json=True)
         result = self.parse_json(response)
         
         if result and result.get('title_variants'):
@@ -3428,7 +3596,11 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
     safe_print(f"   Variety: Persistent across runs")
     safe_print(f"   Quality Gates: {len(['pre-gen', 'post-content', 'post-render'])} active")
     safe_print("=" * 70)
-    
+
+    # v18.7: Count local vs AI evaluation decisions for this video
+    if EVALUATION_CASCADE_AVAILABLE:
+        get_evaluation_cascade().start_video(str(run_id))
+
     # v9.0: Initialize enhancement orchestrator
     enhancement_orch = None
     if ENHANCEMENTS_AVAILABLE:
@@ -3455,7 +3627,10 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
     
     for attempt in range(max_concept_attempts):
         try:
-            concept = ai.stage1_decide_video_concept(hint, batch_tracker)
+            # v18.7: A duplicate falls back to the tournament's runner-up first
+            concept = ai.next_concept_candidate(batch_tracker) if attempt else None
+            if not concept:
+                concept = ai.stage1_decide_video_concept(hint, batch_tracker)
         except Exception as e:
             safe_print(f"[!] Concept generation error: {e}")
             concept = None
@@ -3503,7 +3678,7 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
     if not concept:
         safe_print("[!] Concept generation failed - trying dynamic fallback")
         # v16.2: Dynamic fallback - no hardcoded topics!
-        fallback_categories = BASE_CATEGORIES.copy()
+        fallback_categories = get_base_categories()
         random.shuffle(fallback_categories)
         fallback_cat = fallback_categories[0]
         
@@ -3605,65 +3780,74 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
             # Regeneration wastes quota and rarely improves significantly
             # Instead, we fixed the scoring prompt to be more accurate
             score = content.get('evaluation_score', 5)
+            min_score = MINIMUM_ACCEPTABLE_SCORE.get()
             regeneration_attempts = 0
             max_regen = 2  # v17.9.9: Allow 2 retries with oscillation detection
+            if BATCH_PLANNER_AVAILABLE:
+                max_regen = get_batch_planner().max_regenerations(max_regen)  # v18.7
             
             # v17.9.9: OSCILLATION DETECTION - track score history to prevent 7-8-7-8 loops
             score_history = [score]
             best_content = content  # Track best content seen
             best_score = score
             
-            while score < MINIMUM_ACCEPTABLE_SCORE and regeneration_attempts < max_regen:
-                regeneration_attempts += 1
-                safe_print(f"   [QUALITY] Score {score}/10 BELOW minimum {MINIMUM_ACCEPTABLE_SCORE}/10 - REGENERATING (attempt {regeneration_attempts}/{max_regen})")
-                
-                # v17.9.9: Check for oscillation (same score seen before)
-                if len(score_history) >= 2:
-                    # Oscillation = returning to a previously seen score
-                    if score in score_history[:-1]:
-                        safe_print(f"   [OSCILLATION] Detected score {score} repeated - breaking loop")
-                        break
-                    # Plateau = no improvement for 2 attempts
-                    if len(set(score_history[-2:])) == 1:
-                        safe_print(f"   [PLATEAU] Score stuck at {score} - breaking loop")
+            # v18.7: All regenerations share one budget (stages 2+3 nest inside it)
+            with stage_deadline("regenerate") as regen:
+                while score < min_score and regeneration_attempts < max_regen:
+                    # v18.7: Out of regeneration time - keep the best content so far
+                    if regen.expired():
+                        give_up(f"stopping after {regeneration_attempts} regenerations")
                         break
+                    regeneration_attempts += 1
+                    safe_print(f"   [QUALITY] Score {score}/10 BELOW minimum {min_score}/10 - REGENERATING (attempt {regeneration_attempts}/{max_regen})")
                 
-                # Build feedback for AI to improve
-                quality_issues = content.get('quality_issues', [])
-                feedback = f"Previous attempt scored {score}/10 - UNACCEPTABLE. "
-                if quality_issues:
-                    feedback += f"Issues: {', '.join([i.get('issue', '') for i in quality_issues[:3]])}. "
-                feedback += f"Make it MORE engaging, MORE specific, MORE valuable. MINIMUM score needed: {MINIMUM_ACCEPTABLE_SCORE}/10."
+                    # v17.9.9: Check for oscillation (same score seen before)
+                    if len(score_history) >= 2:
+                        # Oscillation = returning to a previously seen score
+                        if score in score_history[:-1]:
+                            safe_print(f"   [OSCILLATION] Detected score {score} repeated - breaking loop")
+                            break
+                        # Plateau = no improvement for 2 attempts
+                        if len(set(score_history[-2:])) == 1:
+                            safe_print(f"   [PLATEAU] Score stuck at {score} - breaking loop")
+                            break
                 
-                # Regenerate content with feedback
-                try:
-                    # Add feedback to concept for regeneration
-                    concept['regeneration_feedback'] = feedback
-                    concept['attempt_number'] = regeneration_attempts
+                    # Build feedback for AI to improve
+                    quality_issues = content.get('quality_issues', [])
+                    feedback = f"Previous attempt scored {score}/10 - UNACCEPTABLE. "
+                    if quality_issues:
+                        feedback += f"Issues: {', '.join([i.get('issue', '') for i in quality_issues[:3]])}. "
+                    feedback += f"Make it MORE engaging, MORE specific, MORE valuable. MINIMUM score needed: {min_score}/10."
+                
+                    # Regenerate content with feedback
+                    try:
+                        # Add feedback to concept for regeneration
+                        concept['regeneration_feedback'] = feedback
+                        concept['attempt_number'] = regeneration_attempts
                     
-                    new_content = ai.stage2_create_content(concept)
-                    if new_content and new_content.get('phrases'):
-                        # Re-evaluate new content
-                        new_content = ai.stage3_evaluate_enhance(new_content)
-                        new_score = new_content.get('evaluation_score', 0)
+                        new_content = ai.stage2_create_content(concept)
+                        if new_content and new_content.get('phrases'):
+                            # Re-evaluate new content
+                            new_content = ai.stage3_evaluate_enhance(new_content)
+                            new_score = new_content.get('evaluation_score', 0)
                         
-                        # v17.9.9: Track all scores for oscillation detection
-                        score_history.append(new_score)
+                            # v17.9.9: Track all scores for oscillation detection
+                            score_history.append(new_score)
                         
-                        # v17.9.9: Always keep the BEST content seen
-                        if new_score > best_score:
-                            best_score = new_score
-                            best_content = new_content
-                            safe_print(f"   [QUALITY] New best: {score}/10 -> {new_score}/10")
+                            # v17.9.9: Always keep the BEST content seen
+                            if new_score > best_score:
+                                best_score = new_score
+                                best_content = new_content
+                                safe_print(f"   [QUALITY] New best: {score}/10 -> {new_score}/10")
                         
-                        if new_score > score:
-                            safe_print(f"   [QUALITY] Improved: {score}/10 -> {new_score}/10")
-                            content = new_content
-                            score = new_score
-                        else:
-                            safe_print(f"   [QUALITY] No improvement: {new_score}/10 (keeping previous)")
-                except Exception as e:
-                    safe_print(f"   [!] Regeneration attempt {regeneration_attempts} failed: {e}")
+                            if new_score > score:
+                                safe_print(f"   [QUALITY] Improved: {score}/10 -> {new_score}/10")
+                                content = new_content
+                                score = new_score
+                            else:
+                                safe_print(f"   [QUALITY] No improvement: {new_score}/10 (keeping previous)")
+                    except Exception as e:
+                        safe_print(f"   [!] Regeneration attempt {regeneration_attempts} failed: {e}")
             
             # v17.9.9: Use best content from all attempts (not just last)
             if best_score > score:
@@ -3671,12 +3855,12 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
                 content = best_content
                 score = best_score
             
-            if score >= MINIMUM_ACCEPTABLE_SCORE:
+            if score >= min_score:
                 safe_print(f"   [QUALITY] Score {score}/10 - ACCEPTABLE")
                 content['quality_warning'] = False
             else:
                 # v17.7: Try ViralContentGenerator as last resort before accepting low quality
-                if VIRAL_SCIENCE_AVAILABLE and score < MINIMUM_ACCEPTABLE_SCORE - 1:
+                if VIRAL_SCIENCE_AVAILABLE and score < min_score - 1:
                     try:
                         safe_print(f"   [VIRAL SCIENCE] Attempting high-quality content generation...")
                         vcg = ViralContentGenerator()
@@ -3695,8 +3879,8 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
                     except Exception as e:
                         safe_print(f"   [!] Viral science fallback failed: {e}")
                 
-                if score < MINIMUM_ACCEPTABLE_SCORE:
-                    safe_print(f"   [QUALITY] WARNING: Could not reach {MINIMUM_ACCEPTABLE_SCORE}/10 after {regeneration_attempts} attempts. Best: {score}/10")
+                if score < min_score:
+                    safe_print(f"   [QUALITY] WARNING: Could not reach {min_score}/10 after {regeneration_attempts} attempts. Best: {score}/10")
                     content['quality_warning'] = True
             
             # v17.9.7: ContentOptimizer - Final unified optimization pass
@@ -3737,6 +3921,10 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
                 )
                 safe_print(f"   [LEARNING] Recorded quality result for future optimization")
             
+            # v18.7: Credit the score to the prompt sections this video was built with
+            if PROMPT_ASSEMBLER_AVAILABLE:
+                get_prompt_assembler().record_outcome(score)
+            
             # v15.0: Record to self-learning engine for pattern analysis
             if ai.learning_engine and content.get('phrases'):
                 ai.learning_engine.learn_from_video(
@@ -4035,9 +4223,9 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
                     'has_vignette': True,
                     'trend_source': 'ai_generated',
                     # v13.2: Track which enhancements were active
-                    'v9_enhancements_active': ENHANCEMENTS_AVAILABLE,
-                    'v12_enhancements_active': ENHANCEMENTS_V12_AVAILABLE,
-                    'critical_fixes_active': CRITICAL_FIXES_AVAILABLE,
+                    'v9_enhancements_active': bool(ENHANCEMENTS_AVAILABLE),
+                    'v12_enhancements_active': bool(ENHANCEMENTS_V12_AVAILABLE),
+                    'critical_fixes_active': bool(CRITICAL_FIXES_AVAILABLE),
                 }
             )
             safe_print("   [ANALYTICS] Video recorded for learning")
@@ -4180,7 +4368,13 @@ async def generate_pro_video(hint: str = None, batch_tracker: BatchTracker = Non
         safe_print(f"   Promise Fixed: {'Yes' if content.get('promise_fixed') else 'No'}")
         safe_print(f"   Quality Warning: {'Yes' if content.get('quality_warning') else 'No'}")
         safe_print("=" * 70)
-        
+
+        if EVALUATION_CASCADE_AVAILABLE:
+            try:
+                get_evaluation_cascade().finish_video()
+            except Exception as e:
+                safe_print(f"   [!] Cascade summary skipped: {e}")
+
         return output_path
     
     return None
@@ -4300,8 +4494,18 @@ async def main():
                         help="Use seasonal content calendar for topic selection")
     # Legacy support - these are IGNORED, AI decides
     parser.add_argument("--type", default=None, help="IGNORED - AI decides type")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="v18.7: Print the startup import-time tree and lazy feature load times, then exit")
     args = parser.parse_args()
     
+    if args.import_profile:
+        profile_imports("pro_video_generator", paths=[p for p in sys.path if p])
+        LAZY.load_all()
+        LAZY.print_report("LAZY FEATURES (all loaded for profiling)")
+        return
+    
+    log_ai_module_availability()
+    
     should_upload = args.upload and not args.no_upload
     
     safe_print(f"\n{'='*70}")
@@ -4331,12 +4535,24 @@ async def main():
     
     hint = args.hint or args.type
     
-    for i in range(args.count):
+    # v18.7: Only start as many videos as today's remaining quota can finish
+    count = args.count
+    planner = get_batch_planner() if BATCH_PLANNER_AVAILABLE else None
+    if planner:
+        count = planner.plan_batch(args.count)["count"]
+    
+    for i in range(count):
+        if planner and i > 0 and not planner.admit_next(count - i):
+            break
         safe_print(f"\n{'='*70}")
-        safe_print(f"   VIDEO {i+1}/{args.count}")
+        safe_print(f"   VIDEO {i+1}/{count}")
         safe_print(f"{'='*70}")
         
+        if planner:
+            planner.start_video()
         path = await generate_pro_video(hint, BATCH_TRACKER, args.output_dir)
+        if planner:
+            planner.finish_video(completed=bool(path))
     
     # Upload phase
     if should_upload and BATCH_TRACKER.video_scores:
@@ -4438,6 +4654,13 @@ async def main():
         safe_print(f"{i:>2} | {category:<15} | {topic:<25} | {voice:<20} | {music:<20} | {score:>5}/10")
     
     safe_print("-" * 100)
+    
+    # v18.7: Prompt size per template (raw boosters vs assembled)
+    if PROMPT_ASSEMBLER_AVAILABLE:
+        get_prompt_assembler().print_size_report(days=7)
+    
+    # v18.7: Which optional modules this run actually needed
+    LAZY.print_report()
 
 
 if __name__ == "__main__":
@@ -20,6 +20,12 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Callable, Any
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     import requests
 except ImportError:
@@ -51,9 +57,8 @@ class ServiceHealthMonitor:
     
     def _load_health(self) -> Dict:
         try:
-            if HEALTH_STATE_FILE.exists():
-                with open(HEALTH_STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(HEALTH_STATE_FILE):
+                return load_state(HEALTH_STATE_FILE)
         except:
             pass
         return {
@@ -63,8 +68,7 @@ class ServiceHealthMonitor:
     
     def _save_health(self):
         self.health_data["last_updated"] = datetime.now().isoformat()
-        with open(HEALTH_STATE_FILE, 'w') as f:
-            json.dump(self.health_data, f, indent=2)
+        save_state(HEALTH_STATE_FILE, self.health_data)
     
     def record_success(self, service: str):
         """Record successful service call."""
@@ -17,13 +17,18 @@ Research shows:
 """
 
 import os
-import json
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import random
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 
 def safe_print(msg: str):
     try:
@@ -80,9 +85,8 @@ class SmartScheduler:
     
     def _load(self) -> Dict:
         try:
-            if SCHEDULE_FILE.exists():
-                with open(SCHEDULE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(SCHEDULE_FILE):
+                return load_state(SCHEDULE_FILE)
         except:
             pass
         return {
@@ -95,17 +99,15 @@ class SmartScheduler:
     def _load_variety_state(self) -> Dict:
         """Load learned optimal times from analytics."""
         try:
-            if VARIETY_FILE.exists():
-                with open(VARIETY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(VARIETY_FILE):
+                return load_state(VARIETY_FILE)
         except:
             pass
         return {}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(SCHEDULE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(SCHEDULE_FILE, self.data)
     
     def get_optimal_upload_time(self, category: str = None,
                                  target_region: str = "global") -> Dict:
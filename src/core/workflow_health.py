@@ -13,11 +13,16 @@ GOAL: Proactive monitoring to prevent failures.
 """
 
 import os
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     import requests
 except ImportError:
@@ -58,9 +63,8 @@ class WorkflowHealthMonitor:
     
     def _load_health(self) -> Dict:
         try:
-            if HEALTH_STATE_FILE.exists():
-                with open(HEALTH_STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(HEALTH_STATE_FILE):
+                return load_state(HEALTH_STATE_FILE)
         except:
             pass
         return {
@@ -71,8 +75,7 @@ class WorkflowHealthMonitor:
     
     def _save_health(self):
         self.health_data["last_check"] = datetime.now().isoformat()
-        with open(HEALTH_STATE_FILE, 'w') as f:
-            json.dump(self.health_data, f, indent=2)
+        save_state(HEALTH_STATE_FILE, self.health_data)
     
     def check_workflow_runs(self, workflow_name: str, limit: int = 10) -> Dict:
         """Check recent runs for a workflow."""
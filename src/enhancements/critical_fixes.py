@@ -15,6 +15,22 @@ import re
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+# v18.7: Regeneration stops when the caller's stage deadline runs out
+try:
+    from deadline import deadline_expired
+except ImportError:
+    try:
+        from src.utils.deadline import deadline_expired
+    except ImportError:
+        def deadline_expired() -> bool:
+            return False
+
+# v18.7: Shared per-text features (word counts, list-item markers)
+try:
+    from content_features import get_content_features
+except ImportError:
+    from src.analytics.content_features import get_content_features
+
 # ============================================
 # FIX 1: AI-DRIVEN FONT SELECTION
 # ============================================
@@ -178,6 +194,9 @@ def enforce_quality_score(content: Dict, ai_func, regenerate_func) -> Tuple[Dict
     """
     Enforce minimum quality score with regeneration.
     
+    v18.7: Stops early (keeping the content it has) once the caller's
+    stage deadline has expired.
+    
     Returns (content, final_score)
     """
     score = content.get('evaluation_score', 0)
@@ -187,6 +206,9 @@ def enforce_quality_score(content: Dict, ai_func, regenerate_func) -> Tuple[Dict
     
     # Need to regenerate
     for attempt in range(MAX_REGENERATION_ATTEMPTS):
+        if deadline_expired():
+            print(f"   [QUALITY] Stage deadline reached - keeping {score}/10 after {attempt} attempts")
+            break
         print(f"   [QUALITY] Score {score}/10 too low (min: {MINIMUM_ACCEPTABLE_SCORE}), regenerating (attempt {attempt + 1})...")
         
         # Regenerate with feedback
@@ -255,18 +277,10 @@ def count_items_in_content(phrases: List[str]) -> int:
     GENERIC count of items delivered in content.
     Counts ANY form of list item, not just specific words.
     """
-    item_count = 0
-    
-    for phrase in phrases:
-        # Explicit numbering: "1.", "2)", "3:"
-        if re.match(r'^\s*\d+[\.\):\-]', phrase):
-            item_count += 1
-        # Ordinal words (generic pattern for any ordinal)
-        elif re.search(r'\b(first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|next|another|last|final)\b', phrase, re.IGNORECASE):
-            item_count += 1
-        # List indicators
-        elif re.search(r'\b(one\s+(?:is|thing)|number\s+\d|#\d|step\s+\d)\b', phrase, re.IGNORECASE):
-            item_count += 1
+    # Explicit numbering ("1.", "2)", "3:"), ordinal words or list
+    # indicators ("step 2", "#3") - see TextFeatures.is_list_item
+    features = get_content_features()
+    item_count = sum(1 for phrase in phrases if features.extract(phrase).is_list_item)
     
     # If no explicit items found, assume each phrase after hook is an item
     return max(item_count, len(phrases) - 1)
@@ -448,6 +462,7 @@ SCROLL_STOP_PATTERNS = [
     r'\btruth\b',          # Revelation
     r'\bshock\b',          # Emotion
 ]
+_SCROLL_STOP_RES = [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in SCROLL_STOP_PATTERNS]
 
 def score_hook_quality(hook: str) -> Dict:
     """
@@ -461,21 +476,21 @@ def score_hook_quality(hook: str) -> Dict:
     score = 0
     patterns_found = []
     
-    hook_lower = hook.lower()
+    features = get_content_features().extract(hook)
     
     # Check for scroll-stop patterns
-    for pattern in SCROLL_STOP_PATTERNS:
-        if re.search(pattern, hook, re.IGNORECASE):
+    for pattern, compiled in _SCROLL_STOP_RES:
+        if compiled.search(hook):
             score += 1
             patterns_found.append(pattern)
     
     # Check for numbers (specificity)
-    if re.search(r'\d+', hook):
+    if features.has_digit:
         score += 1
         patterns_found.append("has_number")
     
     # Check for short hook (<=15 words is optimal)
-    word_count = len(hook.split())
+    word_count = features.word_count
     if word_count <= 15:
         score += 1
         patterns_found.append("short_hook")
@@ -483,7 +498,7 @@ def score_hook_quality(hook: str) -> Dict:
         score -= 1  # Penalty for too long
     
     # Check for personal pronoun (engagement)
-    if re.search(r'\b(you|your|we|our)\b', hook_lower):
+    if features.tokens & {"you", "your", "we", "our"}:
         score += 1
         patterns_found.append("personal_pronoun")
     
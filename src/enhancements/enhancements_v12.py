@@ -18,7 +18,6 @@ All enhancements are:
 - Persistent learning via GitHub Artifacts
 """
 
-import json
 import os
 import re
 import random
@@ -27,6 +26,12 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # State directory
 STATE_DIR = Path("data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -57,9 +62,8 @@ class NaturalSpeechRhythm:
     
     def _load(self) -> Dict:
         try:
-            if self.RHYTHM_FILE.exists():
-                with open(self.RHYTHM_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.RHYTHM_FILE):
+                return load_state(self.RHYTHM_FILE)
         except:
             pass
         return {
@@ -74,8 +78,7 @@ class NaturalSpeechRhythm:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.RHYTHM_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.RHYTHM_FILE, self.data)
     
     def get_rhythm_instruction(self) -> str:
         """Get instruction for AI to vary sentence rhythm."""
@@ -118,17 +121,15 @@ class FillerWordInjector:
     
     def _load(self) -> Dict:
         try:
-            if self.FILLER_FILE.exists():
-                with open(self.FILLER_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.FILLER_FILE):
+                return load_state(self.FILLER_FILE)
         except:
             pass
         return {"usage": {f: 0 for f in self.FILLER_WORDS}, "performance": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.FILLER_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.FILLER_FILE, self.data)
     
     def get_filler_instruction(self) -> str:
         """Get instruction for natural filler words."""
@@ -684,17 +685,15 @@ class FontPsychologyOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.FONT_FILE.exists():
-                with open(self.FONT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.FONT_FILE):
+                return load_state(self.FONT_FILE)
         except:
             pass
         return {"category_fonts": {}, "performance": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.FONT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.FONT_FILE, self.data)
     
     def get_recommended_font(self, category: str, mood: str) -> Dict:
         """Get recommended font based on category and mood."""
@@ -820,16 +819,14 @@ class TextAnimationVariety:
     
     def _load(self) -> Dict:
         try:
-            if self.ANIMATION_FILE.exists():
-                with open(self.ANIMATION_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.ANIMATION_FILE):
+                return load_state(self.ANIMATION_FILE)
         except:
             pass
         return {"recent": [], "performance": {}}
     
     def _save(self):
-        with open(self.ANIMATION_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.ANIMATION_FILE, self.data)
     
     def get_next_animation(self) -> str:
         """Get animation, avoiding recent repetition."""
@@ -953,9 +950,8 @@ class EmojiIntegration:
     
     def _load(self) -> Dict:
         try:
-            if self.EMOJI_FILE.exists():
-                with open(self.EMOJI_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.EMOJI_FILE):
+                return load_state(self.EMOJI_FILE)
         except:
             pass
         return {"learned_mappings": {}, "performance": {}}
@@ -1983,9 +1979,8 @@ class GenreMatching:
     
     def _load(self) -> Dict:
         try:
-            if self.MUSIC_FILE.exists():
-                with open(self.MUSIC_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.MUSIC_FILE):
+                return load_state(self.MUSIC_FILE)
         except:
             pass
         return {"learned_mappings": {}}
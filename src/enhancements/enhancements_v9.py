@@ -91,6 +91,12 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import requests
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Dynamic model selection
 try:
     from src.quota.quota_optimizer import get_best_gemini_model, get_best_groq_model
@@ -294,9 +300,41 @@ def validate_post_render(phrases: List[str], metadata: Dict, video_duration: flo
     - Overall watchability
     
     Returns: {"approved": bool, "issues": [], "suggestions": []}
+
+    v18.7: Local scorers run first; the AI is only asked when they are inconclusive.
     """
+    try:
+        try:
+            from src.core.evaluation_cascade import get_evaluation_cascade
+        except ImportError:
+            from evaluation_cascade import get_evaluation_cascade
+
+        cascade = get_evaluation_cascade()
+        outcome = cascade.evaluate("post_render", {
+            "hook": phrases[0] if phrases else "",
+            "phrases": phrases[1:],
+            "cta": metadata.get("cta", ""),
+            "topic": metadata.get("title", ""),
+            "category": metadata.get("category", "")
+        })
+        if outcome["decision"] != "ai":
+            approved = outcome["decision"] == "accept"
+            recommendations = outcome["local"]["details"].get("virality", {}).get("recommendations", [])
+            return {
+                "approved": approved,
+                "quality_score": cascade.to_ten(outcome["local_score"]),
+                "issues": [] if approved else recommendations[:3],
+                "suggestions": recommendations[:3],
+                "upload_recommendation": "upload" if approved else "review",
+                "evaluation_tier": outcome["tier"]
+            }
+    except ImportError:
+        pass
+    except Exception as e:
+        safe_print(f"   [!] Post-render cascade skipped: {e}")
+
     ai = get_ai_caller()
-    
+
     prompt = f"""You are a FINAL QUALITY GATE before a video goes live.
 This video is ALREADY RENDERED. Your job is to predict any issues viewers might have.
 
@@ -519,16 +557,14 @@ class ABTestTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.STATE_FILE.exists():
-                with open(self.STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.STATE_FILE):
+                return load_state(self.STATE_FILE)
         except:
             pass
         return {"title_styles": {}, "cta_variants": {}, "thumbnail_styles": {}}
     
     def _save(self):
-        with open(self.STATE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.STATE_FILE, self.data)
     
     def record_variant(self, variant_type: str, variant_name: str, video_id: str, metadata: Dict):
         """Record a variant was used."""
@@ -609,16 +645,14 @@ class ErrorPatternLearner:
     
     def _load(self) -> Dict:
         try:
-            if self.STATE_FILE.exists():
-                with open(self.STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.STATE_FILE):
+                return load_state(self.STATE_FILE)
         except:
             pass
         return {"broll_failures": {}, "tts_failures": {}, "api_failures": {}}
     
     def _save(self):
-        with open(self.STATE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.STATE_FILE, self.data)
     
     def record_broll_failure(self, keyword: str):
         """Record a B-roll keyword that failed to return results."""
@@ -798,16 +832,14 @@ class ShadowBanDetector:
     
     def _load(self) -> Dict:
         try:
-            if self.STATE_FILE.exists():
-                with open(self.STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.STATE_FILE):
+                return load_state(self.STATE_FILE)
         except:
             pass
         return {"baseline_first_hour_views": 50, "recent_videos": [], "alerts": []}
     
     def _save(self):
-        with open(self.STATE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.STATE_FILE, self.data)
     
     def record_video_performance(self, video_id: str, first_hour_views: int, title: str):
         """Record first-hour performance for a video."""
@@ -1766,9 +1798,8 @@ def get_optimal_posting_time(variety_state_file: Path = None) -> Dict:
         variety_state_file = STATE_DIR / "variety_state.json"
     
     try:
-        if variety_state_file.exists():
-            with open(variety_state_file, 'r') as f:
-                variety_state = json.load(f)
+        if state_exists(variety_state_file):
+            variety_state = load_state(variety_state_file)
     except:
         pass
     
@@ -2014,17 +2045,15 @@ class HookWordTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.HOOK_WORDS_FILE.exists():
-                with open(self.HOOK_WORDS_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.HOOK_WORDS_FILE):
+                return load_state(self.HOOK_WORDS_FILE)
         except:
             pass
         return {"words": {}, "last_updated": None}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.HOOK_WORDS_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.HOOK_WORDS_FILE, self.data)
     
     def record_hook_performance(self, hook: str, views: int, avg_views: int):
         """Record performance of a hook's words."""
@@ -2090,9 +2119,8 @@ class VoiceSpeedOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.VOICE_SPEED_FILE.exists():
-                with open(self.VOICE_SPEED_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.VOICE_SPEED_FILE):
+                return load_state(self.VOICE_SPEED_FILE)
         except:
             pass
         return {
@@ -2103,8 +2131,7 @@ class VoiceSpeedOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.VOICE_SPEED_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.VOICE_SPEED_FILE, self.data)
     
     def record_performance(self, rate: str, retention_percent: float):
         """Record retention for a voice rate."""
@@ -2166,9 +2193,8 @@ class HashtagRotator:
     
     def _load(self) -> Dict:
         try:
-            if self.HASHTAG_FILE.exists():
-                with open(self.HASHTAG_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.HASHTAG_FILE):
+                return load_state(self.HASHTAG_FILE)
         except:
             pass
         return {
@@ -2179,8 +2205,7 @@ class HashtagRotator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.HASHTAG_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.HASHTAG_FILE, self.data)
     
     def record_hashtag_performance(self, hashtags: List[str], views: int):
         """Record performance of hashtags."""
@@ -2344,9 +2369,8 @@ class CrossPlatformAnalytics:
     
     def _load(self) -> Dict:
         try:
-            if self.PLATFORM_FILE.exists():
-                with open(self.PLATFORM_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.PLATFORM_FILE):
+                return load_state(self.PLATFORM_FILE)
         except:
             pass
         return {
@@ -2358,8 +2382,7 @@ class CrossPlatformAnalytics:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.PLATFORM_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.PLATFORM_FILE, self.data)
     
     def record_performance(self, platform: str, category: str, views: int):
         """Record a video's performance on a specific platform."""
@@ -2555,9 +2578,8 @@ class CategoryDecayTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.DECAY_FILE.exists():
-                with open(self.DECAY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.DECAY_FILE):
+                return load_state(self.DECAY_FILE)
         except:
             pass
         return {
@@ -2567,8 +2589,7 @@ class CategoryDecayTracker:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.DECAY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.DECAY_FILE, self.data)
     
     def record_performance(self, category: str, views: int, avg_views: int):
         """Record a category's performance."""
@@ -2711,9 +2732,8 @@ class ThumbnailTextOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.THUMB_TEXT_FILE.exists():
-                with open(self.THUMB_TEXT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.THUMB_TEXT_FILE):
+                return load_state(self.THUMB_TEXT_FILE)
         except:
             pass
         return {
@@ -2725,8 +2745,7 @@ class ThumbnailTextOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.THUMB_TEXT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.THUMB_TEXT_FILE, self.data)
     
     def _get_power_word_candidates(self) -> List[str]:
         """
@@ -2990,9 +3009,8 @@ class CommentSentimentTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.SENTIMENT_FILE.exists():
-                with open(self.SENTIMENT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.SENTIMENT_FILE):
+                return load_state(self.SENTIMENT_FILE)
         except:
             pass
         return {
@@ -3003,8 +3021,7 @@ class CommentSentimentTracker:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.SENTIMENT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.SENTIMENT_FILE, self.data)
     
     def record_video_sentiment(self, video_id: str, category: str, positive: int, negative: int):
         """Record sentiment counts for a video."""
@@ -3092,9 +3109,8 @@ class PeakPublishingOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.PUBLISHING_FILE.exists():
-                with open(self.PUBLISHING_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.PUBLISHING_FILE):
+                return load_state(self.PUBLISHING_FILE)
         except:
             pass
         return {
@@ -3107,8 +3123,7 @@ class PeakPublishingOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.PUBLISHING_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.PUBLISHING_FILE, self.data)
     
     def record_publishing_performance(self, publish_hour: int, publish_day: str, views: int):
         """Record performance for a publishing time."""
@@ -3173,9 +3188,8 @@ class TitleLengthOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.TITLE_LENGTH_FILE.exists():
-                with open(self.TITLE_LENGTH_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.TITLE_LENGTH_FILE):
+                return load_state(self.TITLE_LENGTH_FILE)
         except:
             pass
         return {
@@ -3186,8 +3200,7 @@ class TitleLengthOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.TITLE_LENGTH_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.TITLE_LENGTH_FILE, self.data)
     
     def _get_bucket(self, length: int) -> str:
         """Get the length bucket for a title."""
@@ -3275,9 +3288,8 @@ class MusicBPMMatcher:
     
     def _load(self) -> Dict:
         try:
-            if self.BPM_FILE.exists():
-                with open(self.BPM_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.BPM_FILE):
+                return load_state(self.BPM_FILE)
         except:
             pass
         return {
@@ -3288,8 +3300,7 @@ class MusicBPMMatcher:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.BPM_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.BPM_FILE, self.data)
     
     def record_music_performance(self, category: str, bpm_range: str, views: int, avg_views: int):
         """Record how a BPM range performed for a category."""
@@ -3360,9 +3371,8 @@ class IntroPatternLearner:
     
     def _load(self) -> Dict:
         try:
-            if self.INTRO_FILE.exists():
-                with open(self.INTRO_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.INTRO_FILE):
+                return load_state(self.INTRO_FILE)
         except:
             pass
         return {
@@ -3373,8 +3383,7 @@ class IntroPatternLearner:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.INTRO_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.INTRO_FILE, self.data)
     
     def detect_intro_pattern(self, hook: str) -> str:
         """Detect the intro pattern used in a hook."""
@@ -3580,9 +3589,8 @@ class CuriosityGapGenerator:
     
     def _load(self) -> Dict:
         try:
-            if self.GAP_FILE.exists():
-                with open(self.GAP_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.GAP_FILE):
+                return load_state(self.GAP_FILE)
         except:
             pass
         return {
@@ -3593,8 +3601,7 @@ class CuriosityGapGenerator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.GAP_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.GAP_FILE, self.data)
     
     def detect_gap_pattern(self, title: str) -> str:
         """Detect which curiosity gap pattern is used."""
@@ -3669,9 +3676,8 @@ class NumberHookOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.NUMBER_FILE.exists():
-                with open(self.NUMBER_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.NUMBER_FILE):
+                return load_state(self.NUMBER_FILE)
         except:
             pass
         return {
@@ -3682,8 +3688,7 @@ class NumberHookOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.NUMBER_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.NUMBER_FILE, self.data)
     
     def extract_number(self, title: str) -> Optional[int]:
         """Extract the first prominent number from a title."""
@@ -3748,9 +3753,8 @@ class ControversyCalibrator:
     
     def _load(self) -> Dict:
         try:
-            if self.CONTROVERSY_FILE.exists():
-                with open(self.CONTROVERSY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.CONTROVERSY_FILE):
+                return load_state(self.CONTROVERSY_FILE)
         except:
             pass
         return {
@@ -3761,8 +3765,7 @@ class ControversyCalibrator:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.CONTROVERSY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.CONTROVERSY_FILE, self.data)
     
     def record_performance(self, controversy_type: str, comment_count: int):
         if controversy_type not in self.data["type_performance"]:
@@ -3810,17 +3813,15 @@ class FOMOInjector:
     
     def _load(self) -> Dict:
         try:
-            if self.FOMO_FILE.exists():
-                with open(self.FOMO_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.FOMO_FILE):
+                return load_state(self.FOMO_FILE)
         except:
             pass
         return {"phrases": {p: {"uses": 0, "engagement": 0} for p in self.FOMO_PHRASES}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.FOMO_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.FOMO_FILE, self.data)
     
     def get_best_fomo_phrase(self) -> str:
         best = "everyone_knows"
@@ -3867,17 +3868,15 @@ class TitlePowerWordTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.POWER_WORD_FILE.exists():
-                with open(self.POWER_WORD_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.POWER_WORD_FILE):
+                return load_state(self.POWER_WORD_FILE)
         except:
             pass
         return {"words": {w: {"uses": 0, "total_ctr": 0} for w in self.POWER_WORDS}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.POWER_WORD_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.POWER_WORD_FILE, self.data)
     
     def record_title_performance(self, title: str, ctr: float):
         title_lower = title.lower()
@@ -3971,17 +3970,15 @@ class PatternInterruptGenerator:
     
     def _load(self) -> Dict:
         try:
-            if self.INTERRUPT_FILE.exists():
-                with open(self.INTERRUPT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.INTERRUPT_FILE):
+                return load_state(self.INTERRUPT_FILE)
         except:
             pass
         return {"types": {t: {"uses": 0, "retention": 0} for t in self.INTERRUPT_TYPES}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.INTERRUPT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.INTERRUPT_FILE, self.data)
     
     def record_performance(self, interrupt_type: str, first_3s_retention: float):
         if interrupt_type not in self.data["types"]:
@@ -4023,17 +4020,15 @@ class OpenLoopTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.LOOP_FILE.exists():
-                with open(self.LOOP_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.LOOP_FILE):
+                return load_state(self.LOOP_FILE)
         except:
             pass
         return {"loops": {l: {"uses": 0, "completion": 0} for l in self.LOOP_TYPES}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.LOOP_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.LOOP_FILE, self.data)
     
     def get_best_loop_type(self) -> str:
         best = "number_tease"
@@ -4059,9 +4054,8 @@ class FirstFrameOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.FRAME_FILE.exists():
-                with open(self.FRAME_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.FRAME_FILE):
+                return load_state(self.FRAME_FILE)
         except:
             pass
         return {
@@ -4073,8 +4067,7 @@ class FirstFrameOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.FRAME_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.FRAME_FILE, self.data)
     
     def record_frame_performance(self, text_style: str, has_face: bool, first_3s_retention: float):
         if text_style not in self.data["text_styles"]:
@@ -4100,9 +4093,8 @@ class AudioHookTimer:
     
     def _load(self) -> Dict:
         try:
-            if self.AUDIO_FILE.exists():
-                with open(self.AUDIO_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.AUDIO_FILE):
+                return load_state(self.AUDIO_FILE)
         except:
             pass
         return {
@@ -4113,8 +4105,7 @@ class AudioHookTimer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.AUDIO_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.AUDIO_FILE, self.data)
     
     def get_optimal_timing(self) -> float:
         return self.data.get("optimal_timing", 0.5)
@@ -4211,17 +4202,15 @@ class WatchTimeMaximizer:
     
     def _load(self) -> Dict:
         try:
-            if self.WATCH_TIME_FILE.exists():
-                with open(self.WATCH_TIME_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.WATCH_TIME_FILE):
+                return load_state(self.WATCH_TIME_FILE)
         except:
             pass
         return {"strategies": {s: {"uses": 0, "avg_watch_pct": 0} for s in self.STRATEGIES}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.WATCH_TIME_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.WATCH_TIME_FILE, self.data)
     
     def get_best_strategy(self) -> str:
         best = "progressive_reveal"
@@ -4251,9 +4240,8 @@ class CompletionRateTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.COMPLETION_FILE.exists():
-                with open(self.COMPLETION_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.COMPLETION_FILE):
+                return load_state(self.COMPLETION_FILE)
         except:
             pass
         return {
@@ -4264,8 +4252,7 @@ class CompletionRateTracker:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.COMPLETION_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.COMPLETION_FILE, self.data)
     
     def get_optimal_duration(self) -> int:
         return self.data.get("optimal_duration", 18)
@@ -4297,17 +4284,15 @@ class CommentBaitOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.COMMENT_BAIT_FILE.exists():
-                with open(self.COMMENT_BAIT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.COMMENT_BAIT_FILE):
+                return load_state(self.COMMENT_BAIT_FILE)
         except:
             pass
         return {"baits": {b: {"uses": 0, "comments": 0} for b in self.BAIT_TYPES}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.COMMENT_BAIT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.COMMENT_BAIT_FILE, self.data)
     
     def get_best_bait_type(self) -> str:
         best = "opinion_ask"
@@ -4347,17 +4332,15 @@ class ShareTriggerTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.SHARE_FILE.exists():
-                with open(self.SHARE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.SHARE_FILE):
+                return load_state(self.SHARE_FILE)
         except:
             pass
         return {"triggers": {t: {"uses": 0, "estimated_shares": 0} for t in self.SHARE_TRIGGERS}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.SHARE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.SHARE_FILE, self.data)
     
     def get_share_instruction(self) -> str:
         """AI-driven instruction for driving shares."""
@@ -4385,17 +4368,15 @@ class ReWatchHookTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.REWATCH_FILE.exists():
-                with open(self.REWATCH_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.REWATCH_FILE):
+                return load_state(self.REWATCH_FILE)
         except:
             pass
         return {"types": {t: {"uses": 0, "rewatch_indicator": 0} for t in self.REWATCH_TYPES}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.REWATCH_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.REWATCH_FILE, self.data)
     
     def get_rewatch_instruction(self) -> str:
         """AI-driven instruction for driving re-watches."""
@@ -4465,17 +4446,15 @@ class ColorPsychologyOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.COLOR_FILE.exists():
-                with open(self.COLOR_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.COLOR_FILE):
+                return load_state(self.COLOR_FILE)
         except:
             pass
         return {"category_colors": {}, "performance": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.COLOR_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.COLOR_FILE, self.data)
     
     def get_recommended_color(self, category: str, mood: str) -> str:
         recommendations = {
@@ -4509,17 +4488,15 @@ class MotionEnergyOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.MOTION_FILE.exists():
-                with open(self.MOTION_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.MOTION_FILE):
+                return load_state(self.MOTION_FILE)
         except:
             pass
         return {"category_motion": {}, "performance": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.MOTION_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.MOTION_FILE, self.data)
     
     def get_recommended_motion(self, category: str, mood: str) -> str:
         if mood in ["suspense", "dramatic"]:
@@ -4543,17 +4520,15 @@ class TextReadabilityScorer:
     
     def _load(self) -> Dict:
         try:
-            if self.READABILITY_FILE.exists():
-                with open(self.READABILITY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.READABILITY_FILE):
+                return load_state(self.READABILITY_FILE)
         except:
             pass
         return {"settings": {}, "performance": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.READABILITY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.READABILITY_FILE, self.data)
     
     def score_text_settings(self, font_size: int, words_per_line: int, contrast: str) -> float:
         """Score text settings for mobile readability (1-10)."""
@@ -4596,17 +4571,15 @@ class VisualVarietyTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.VARIETY_FILE.exists():
-                with open(self.VARIETY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.VARIETY_FILE):
+                return load_state(self.VARIETY_FILE)
         except:
             pass
         return {"optimal_cuts": 4, "performance": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.VARIETY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.VARIETY_FILE, self.data)
     
     def get_optimal_cuts_per_video(self, duration_seconds: int) -> int:
         """Get optimal number of visual changes."""
@@ -4666,17 +4639,15 @@ class FactCredibilityChecker:
     
     def _load(self) -> Dict:
         try:
-            if self.CREDIBILITY_FILE.exists():
-                with open(self.CREDIBILITY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.CREDIBILITY_FILE):
+                return load_state(self.CREDIBILITY_FILE)
         except:
             pass
         return {"flagged_patterns": [], "safe_patterns": []}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.CREDIBILITY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.CREDIBILITY_FILE, self.data)
 
 
 def check_content_credibility(content: str) -> Dict:
@@ -4722,17 +4693,15 @@ class ActionableTakeawayEnforcer:
     
     def _load(self) -> Dict:
         try:
-            if self.TAKEAWAY_FILE.exists():
-                with open(self.TAKEAWAY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.TAKEAWAY_FILE):
+                return load_state(self.TAKEAWAY_FILE)
         except:
             pass
         return {"performance": {}, "best_formats": []}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.TAKEAWAY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.TAKEAWAY_FILE, self.data)
 
 
 def enforce_actionable_takeaway(content: str) -> Dict:
@@ -4786,17 +4755,15 @@ class StoryStructureOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.STORY_FILE.exists():
-                with open(self.STORY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.STORY_FILE):
+                return load_state(self.STORY_FILE)
         except:
             pass
         return {"structures": {s: {"uses": 0, "engagement": 0} for s in self.STRUCTURES}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.STORY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.STORY_FILE, self.data)
     
     def get_best_structure(self) -> str:
         best = "problem_solution"
@@ -4822,17 +4789,15 @@ class MemoryHookGenerator:
     
     def _load(self) -> Dict:
         try:
-            if self.MEMORY_FILE.exists():
-                with open(self.MEMORY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.MEMORY_FILE):
+                return load_state(self.MEMORY_FILE)
         except:
             pass
         return {"hooks": [], "techniques": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.MEMORY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.MEMORY_FILE, self.data)
 
 
 def generate_memory_hook(topic: str, key_message: str) -> Dict:
@@ -4877,17 +4842,15 @@ class RelatabilityChecker:
     
     def _load(self) -> Dict:
         try:
-            if self.RELATABILITY_FILE.exists():
-                with open(self.RELATABILITY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.RELATABILITY_FILE):
+                return load_state(self.RELATABILITY_FILE)
         except:
             pass
         return {"patterns": {}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.RELATABILITY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.RELATABILITY_FILE, self.data)
 
 
 def check_relatability(content: str, target_audience: str = "general") -> Dict:
@@ -4975,17 +4938,15 @@ class TrendLifecycleTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.LIFECYCLE_FILE.exists():
-                with open(self.LIFECYCLE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.LIFECYCLE_FILE):
+                return load_state(self.LIFECYCLE_FILE)
         except:
             pass
         return {"trends": {}, "last_updated": None}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.LIFECYCLE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.LIFECYCLE_FILE, self.data)
     
     def record_trend(self, trend: str, phase: str):
         self.data["trends"][trend] = {
@@ -5011,9 +4972,8 @@ class EvergreenBalancer:
     
     def _load(self) -> Dict:
         try:
-            if self.BALANCE_FILE.exists():
-                with open(self.BALANCE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.BALANCE_FILE):
+                return load_state(self.BALANCE_FILE)
         except:
             pass
         return {
@@ -5025,8 +4985,7 @@ class EvergreenBalancer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.BALANCE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.BALANCE_FILE, self.data)
     
     def should_do_evergreen(self) -> bool:
         total = self.data["trending_count"] + self.data["evergreen_count"]
@@ -5055,17 +5014,15 @@ class CulturalMomentDetector:
     
     def _load(self) -> Dict:
         try:
-            if self.MOMENT_FILE.exists():
-                with open(self.MOMENT_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.MOMENT_FILE):
+                return load_state(self.MOMENT_FILE)
         except:
             pass
         return {"moments": [], "leveraged": []}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.MOMENT_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.MOMENT_FILE, self.data)
 
 
 def detect_cultural_moments() -> Dict:
@@ -5128,17 +5085,15 @@ class ViralPatternMatcher:
     
     def _load(self) -> Dict:
         try:
-            if self.PATTERN_FILE.exists():
-                with open(self.PATTERN_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.PATTERN_FILE):
+                return load_state(self.PATTERN_FILE)
         except:
             pass
         return {"patterns": {p: {"uses": 0, "views": 0} for p in self.PROVEN_PATTERNS}}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.PATTERN_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.PATTERN_FILE, self.data)
     
     def get_best_pattern(self) -> str:
         best = "listicle"
@@ -5164,9 +5119,8 @@ class PlatformTrendSplitter:
     
     def _load(self) -> Dict:
         try:
-            if self.PLATFORM_TREND_FILE.exists():
-                with open(self.PLATFORM_TREND_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.PLATFORM_TREND_FILE):
+                return load_state(self.PLATFORM_TREND_FILE)
         except:
             pass
         return {
@@ -5176,8 +5130,7 @@ class PlatformTrendSplitter:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.PLATFORM_TREND_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.PLATFORM_TREND_FILE, self.data)
 
 
 # =============================================================================
@@ -5196,9 +5149,8 @@ class MicroRetentionAnalyzer:
     
     def _load(self) -> Dict:
         try:
-            if self.MICRO_FILE.exists():
-                with open(self.MICRO_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.MICRO_FILE):
+                return load_state(self.MICRO_FILE)
         except:
             pass
         return {
@@ -5208,8 +5160,7 @@ class MicroRetentionAnalyzer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.MICRO_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.MICRO_FILE, self.data)
     
     def record_drop_point(self, second: int):
         key = f"second_{second}"
@@ -5236,17 +5187,15 @@ class PerformanceCorrelationFinder:
     
     def _load(self) -> Dict:
         try:
-            if self.CORRELATION_FILE.exists():
-                with open(self.CORRELATION_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.CORRELATION_FILE):
+                return load_state(self.CORRELATION_FILE)
         except:
             pass
         return {"correlations": [], "last_analysis": None}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.CORRELATION_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.CORRELATION_FILE, self.data)
 
 
 def find_performance_correlations(video_data: List[Dict]) -> Dict:
@@ -5294,9 +5243,8 @@ class ChannelHealthMonitor:
     
     def _load(self) -> Dict:
         try:
-            if self.HEALTH_FILE.exists():
-                with open(self.HEALTH_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.HEALTH_FILE):
+                return load_state(self.HEALTH_FILE)
         except:
             pass
         return {
@@ -5308,8 +5256,7 @@ class ChannelHealthMonitor:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.HEALTH_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.HEALTH_FILE, self.data)
     
     def calculate_health(self, recent_views: int, avg_views: int, 
                          recent_engagement: float, shadow_ban_risk: bool) -> int:
@@ -5359,17 +5306,15 @@ class GrowthRatePredictor:
     
     def _load(self) -> Dict:
         try:
-            if self.GROWTH_FILE.exists():
-                with open(self.GROWTH_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.GROWTH_FILE):
+                return load_state(self.GROWTH_FILE)
         except:
             pass
         return {"history": [], "predictions": []}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.GROWTH_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.GROWTH_FILE, self.data)
     
     def predict_growth(self, current_views: int, current_subs: int, 
                        days_of_data: int) -> Dict:
@@ -5398,9 +5343,8 @@ class ContentDecayTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.DECAY_FILE.exists():
-                with open(self.DECAY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.DECAY_FILE):
+                return load_state(self.DECAY_FILE)
         except:
             pass
         return {
@@ -5411,8 +5355,7 @@ class ContentDecayTracker:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.DECAY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.DECAY_FILE, self.data)
 
 
 # =============================================================================
@@ -5431,17 +5374,15 @@ class CompetitorResponseGenerator:
     
     def _load(self) -> Dict:
         try:
-            if self.COMPETITOR_FILE.exists():
-                with open(self.COMPETITOR_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.COMPETITOR_FILE):
+                return load_state(self.COMPETITOR_FILE)
         except:
             pass
         return {"responses": [], "competitors": []}
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.COMPETITOR_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.COMPETITOR_FILE, self.data)
 
 
 def generate_competitor_response(competitor_topic: str, our_angle: str) -> Dict:
@@ -5486,9 +5427,8 @@ class NicheAuthorityBuilder:
     
     def _load(self) -> Dict:
         try:
-            if self.AUTHORITY_FILE.exists():
-                with open(self.AUTHORITY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.AUTHORITY_FILE):
+                return load_state(self.AUTHORITY_FILE)
         except:
             pass
         return {
@@ -5498,8 +5438,7 @@ class NicheAuthorityBuilder:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.AUTHORITY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.AUTHORITY_FILE, self.data)
     
     def record_niche_content(self, niche: str, views: int):
         if niche not in self.data["niches"]:
@@ -5535,9 +5474,8 @@ class QualityConsistencyEnforcer:
     
     def _load(self) -> Dict:
         try:
-            if self.CONSISTENCY_FILE.exists():
-                with open(self.CONSISTENCY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.CONSISTENCY_FILE):
+                return load_state(self.CONSISTENCY_FILE)
         except:
             pass
         return {
@@ -5548,8 +5486,7 @@ class QualityConsistencyEnforcer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.CONSISTENCY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.CONSISTENCY_FILE, self.data)
     
     def record_quality(self, score: float) -> bool:
         """Record quality score. Returns False if below threshold."""
@@ -5585,9 +5522,8 @@ class UploadCadenceOptimizer:
     
     def _load(self) -> Dict:
         try:
-            if self.CADENCE_FILE.exists():
-                with open(self.CADENCE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.CADENCE_FILE):
+                return load_state(self.CADENCE_FILE)
         except:
             pass
         return {
@@ -5598,8 +5534,7 @@ class UploadCadenceOptimizer:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.CADENCE_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.CADENCE_FILE, self.data)
     
     def get_optimal_cadence(self) -> int:
         return self.data.get("optimal_cadence", 6)
@@ -5617,9 +5552,8 @@ class AudienceLoyaltyTracker:
     
     def _load(self) -> Dict:
         try:
-            if self.LOYALTY_FILE.exists():
-                with open(self.LOYALTY_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.LOYALTY_FILE):
+                return load_state(self.LOYALTY_FILE)
         except:
             pass
         return {
@@ -5630,8 +5564,7 @@ class AudienceLoyaltyTracker:
     
     def _save(self):
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.LOYALTY_FILE, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        save_state(self.LOYALTY_FILE, self.data)
 
 
 # =============================================================================
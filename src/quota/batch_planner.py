@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Quota-Aware Batch Planner v18.7
+======================================================
+
+Admission control for `--count N` batches.
+
+TokenBudgetManager.estimate_videos_remaining() divides the token budget by
+a fixed per-video guess, and main() used to start N videos regardless -
+exhaustion was discovered mid-batch, after spending quota on videos that
+never finished. The planner instead:
+
+1. LEARNS what a video really costs: per-provider AI calls and tokens are
+   taken from the quota ledger before/after each video, and per-task calls
+   and tokens (a per-stage token report) from MasterAI.call_ai.
+2. PLANS the batch against what is left today (router models' remaining
+   daily calls per provider, TokenBudgetManager tokens) and picks the
+   cheapest mode that still fits the requested count:
+   - full:    everything runs as designed
+   - lean:    hook rewrites are skipped and regenerations capped
+   - cheap:   lean + bulk tasks (b-roll, metadata) use the fastest
+              acceptable models / Gemini, drawing on whichever provider
+              has headroom
+   - reduced: cheap, with the count cut to what fits
+3. ADMITS each further video only if one more complete video still fits.
+
+History is kept in data/persistent/batch_planner.json.
+"""
+
+import math
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+try:
+    from quota_ledger import get_quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.quota_ledger import get_quota_ledger
+        QUOTA_LEDGER_AVAILABLE = True
+    except ImportError:
+        QUOTA_LEDGER_AVAILABLE = False
+
+# Calls made inside the regeneration loop count as the optional "regenerate" task
+try:
+    from deadline import current_deadline
+except ImportError:
+    try:
+        from src.utils.deadline import current_deadline
+    except ImportError:
+        def current_deadline():
+            return None
+
+
+def safe_print(msg: str):
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+PLANNER_FILE = STATE_DIR / "batch_planner.json"
+
+MODE_FULL = "full"
+MODE_LEAN = "lean"
+MODE_CHEAP = "cheap"
+MODE_REDUCED = "reduced"
+
+# Prompts a video can ship without
+OPTIONAL_TASKS = {"hook_improve", "regenerate"}
+
+# Optional prompts skipped outright below full mode. Regenerations are
+# capped by MAX_REGENERATIONS instead, so one that started always finishes.
+SKIPPABLE_TASKS = OPTIONAL_TASKS - {"regenerate"}
+
+# High-volume, low-stakes prompts that any decent model handles
+BULK_TASKS = {"broll", "metadata", "hashtag", "description", "seo"}
+
+# Regenerations allowed per mode (None = caller's default)
+MAX_REGENERATIONS = {MODE_FULL: None, MODE_LEAN: 1, MODE_CHEAP: 0, MODE_REDUCED: 0}
+
+# Counters that don't name an AI provider (pre-v18.7 router bookkeeping,
+# YouTube Data API units from the analytics refresh)
+PSEUDO_PROVIDERS = {"smart_router", "youtube_data_api"}
+
+# Until enough videos have been measured
+DEFAULT_CALLS_PER_VIDEO = 12
+MIN_HISTORY = 3
+MAX_HISTORY = 50
+COST_PERCENTILE = 0.8  # Plan for a bad-but-typical video, not the average
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, math.ceil(pct * len(values)) - 1))
+    return values[index]
+
+
+def _task_calls(entry) -> int:
+    return entry.get("calls", 0) if isinstance(entry, dict) else entry
+
+
+def _task_tokens(entry) -> int:
+    if not isinstance(entry, dict):
+        return 0
+    return entry.get("prompt_tokens", 0) + entry.get("completion_tokens", 0)
+
+
+class SkippedPrompt(str):
+    """
+    What MasterAI.call_ai returns for a prompt the planner skipped.
+
+    Empty like a failed call, so `if result:` callers fall through, but a
+    skip is the planner's choice - not an error to log, retry or score.
+    """
+
+
+def was_skipped(result) -> bool:
+    """True if call_ai skipped the prompt instead of failing to answer it."""
+    return isinstance(result, SkippedPrompt)
+
+
+class BatchPlanner:
+    """
+    Learns per-video quota cost and decides how many videos a batch can finish.
+    """
+
+    def __init__(self):
+        self.state = self._load()
+        self.mode = MODE_FULL
+        self.plan: Dict = {}
+        self._video: Optional[Dict] = None
+
+    def _load(self) -> Dict:
+        try:
+            if state_exists(PLANNER_FILE):
+                data = load_state(PLANNER_FILE)
+                data.setdefault("videos", [])
+                return data
+        except Exception:
+            pass
+        return {"videos": [], "plans": []}
+
+    def _save(self):
+        try:
+            save_state(PLANNER_FILE, self.state)
+        except Exception as e:
+            safe_print(f"[PLANNER] Save failed: {e}")
+
+    # =========================================================================
+    # MEASURING
+    # =========================================================================
+
+    def _usage_snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Today's calls/tokens per real provider from the quota ledger."""
+        if not QUOTA_LEDGER_AVAILABLE:
+            return {}
+        ledger = get_quota_ledger()
+        snapshot: Dict[str, Dict[str, int]] = {}
+        for provider in ledger.providers():
+            if provider in PSEUDO_PROVIDERS:
+                continue
+            usage = ledger.usage(provider)
+            entry = snapshot.setdefault(provider, {"calls": 0, "tokens": 0})
+            entry["calls"] += usage["calls"]
+            entry["tokens"] += usage["tokens"]
+        return snapshot
+
+    def start_video(self):
+        """Snapshot quota usage before a video starts."""
+        self._video = {
+            "started": datetime.now().isoformat(),
+            "before": self._usage_snapshot(),
+            "tasks": {}
+        }
+
+    def record_call(self, task: str, response=None):
+        """
+        Count one AI prompt of a task for the current video, with the tokens
+        its response reports (token_usage.AIResponse; cache hits cost 0).
+        """
+        if self._video is not None:
+            deadline = current_deadline()
+            while deadline is not None:
+                if deadline.stage == "regenerate":
+                    task = "regenerate"
+                    break
+                deadline = deadline.parent
+            entry = self._video["tasks"].setdefault(
+                task, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            entry["calls"] += 1
+            entry["prompt_tokens"] += getattr(response, "prompt_tokens", 0)
+            entry["completion_tokens"] += getattr(response, "completion_tokens", 0)
+
+    def finish_video(self, completed: bool) -> Optional[Dict]:
+        """Store what the video cost (per provider and per task)."""
+        if self._video is None:
+            return None
+        before, after = self._video["before"], self._usage_snapshot()
+        providers = {}
+        for provider, usage in after.items():
+            start = before.get(provider, {"calls": 0, "tokens": 0})
+            # A counter that went down was reset at midnight UTC
+            calls = usage["calls"] - start["calls"] if usage["calls"] >= start["calls"] else usage["calls"]
+            tokens = usage["tokens"] - start["tokens"] if usage["tokens"] >= start["tokens"] else usage["tokens"]
+            if calls or tokens:
+                providers[provider] = {"calls": calls, "tokens": tokens}
+
+        record = {
+            "time": self._video["started"],
+            "completed": completed,
+            "mode": self.mode,
+            "providers": providers,
+            "tasks": self._video["tasks"],
+        }
+        self._video = None
+        self.state["videos"] = (self.state.get("videos", []) + [record])[-MAX_HISTORY:]
+        self._save()
+        total = sum(p["calls"] for p in providers.values())
+        breakdown = ", ".join(f"{p}={c['calls']}" for p, c in providers.items())
+        safe_print(f"[PLANNER] Video cost: {total} AI calls ({breakdown or 'none measured'})")
+        self.print_token_report(record)
+        return record
+
+    @staticmethod
+    def print_token_report(record: Dict):
+        """Per-stage token report for one video."""
+        tasks = record.get("tasks", {})
+        if not tasks:
+            return
+        safe_print(f"   {'Stage':<14} {'Calls':>5} {'Prompt':>8} {'Output':>8}")
+        for task, entry in sorted(tasks.items(), key=lambda kv: -_task_tokens(kv[1])):
+            if isinstance(entry, dict):
+                safe_print(f"   {task:<14} {entry['calls']:>5} {entry['prompt_tokens']:>8} "
+                           f"{entry['completion_tokens']:>8}")
+        safe_print(f"   {'TOTAL':<14} {'':>5} {sum(_task_tokens(e) for e in tasks.values()):>17}")
+
+    # =========================================================================
+    # COST MODEL
+    # =========================================================================
+
+    def cost_per_video(self) -> Dict:
+        """
+        Expected per-video cost: 80th-percentile calls per provider and
+        tokens over completed videos, plus the share spent on optional tasks.
+        """
+        videos = [v for v in self.state.get("videos", []) if v.get("completed")]
+        if len(videos) < MIN_HISTORY:
+            return {
+                "providers": {},
+                "calls": DEFAULT_CALLS_PER_VIDEO,
+                "tokens": self._default_tokens(),
+                "optional_share": 0.2,
+                "samples": len(videos),
+            }
+
+        provider_names = {p for v in videos for p in v.get("providers", {})}
+        per_provider = {
+            p: _percentile([v["providers"].get(p, {}).get("calls", 0) for v in videos], COST_PERCENTILE)
+            for p in provider_names
+        }
+        totals = [sum(c["calls"] for c in v["providers"].values()) for v in videos]
+        tokens = [sum(c["tokens"] for c in v["providers"].values()) for v in videos]
+
+        optional = sum(_task_calls(e) for v in videos for t, e in v.get("tasks", {}).items()
+                       if t in OPTIONAL_TASKS)
+        counted = sum(_task_calls(e) for v in videos for e in v.get("tasks", {}).values())
+        return {
+            "providers": per_provider,
+            "calls": _percentile(totals, COST_PERCENTILE) or DEFAULT_CALLS_PER_VIDEO,
+            "tokens": _percentile(tokens, COST_PERCENTILE),
+            "optional_share": optional / counted if counted else 0.2,
+            "samples": len(videos),
+        }
+
+    @staticmethod
+    def _default_tokens() -> int:
+        try:
+            from token_budget_manager import TokenBudgetManager
+        except ImportError:
+            try:
+                from src.quota.token_budget_manager import TokenBudgetManager
+            except ImportError:
+                return 0
+        costs = TokenBudgetManager.TASK_COSTS
+        return sum(costs[t] for t in ("concept", "content", "evaluate", "broll", "metadata"))
+
+    # =========================================================================
+    # CAPACITY
+    # =========================================================================
+
+    def remaining_calls(self) -> Dict[str, int]:
+        """Calls left today per provider across the router's available models."""
+        try:
+            try:
+                from smart_model_router import get_smart_router
+            except ImportError:
+                from src.ai.smart_model_router import get_smart_router
+            router = get_smart_router()
+        except Exception:
+            return {}
+        remaining: Dict[str, int] = {}
+        for key, model in router.models.items():
+            if not model.available:
+                continue
+            left = max(0, model.daily_limit - router._calls_today(key, model))
+            provider = key.split(":", 1)[0]
+            remaining[provider] = remaining.get(provider, 0) + left
+        return remaining
+
+    def remaining_tokens(self) -> Optional[int]:
+        try:
+            try:
+                from token_budget_manager import get_budget_manager
+            except ImportError:
+                from src.quota.token_budget_manager import get_budget_manager
+            manager = get_budget_manager()
+        except Exception:
+            return None
+        return sum(max(0, manager.get_available_tokens(p)) for p in manager.budgets)
+
+    def videos_that_fit(self, cost: Dict = None, remaining: Dict[str, int] = None,
+                        tokens_left: Optional[int] = None) -> Dict[str, int]:
+        """Complete videos that fit in today's quota, per mode."""
+        cost = cost or self.cost_per_video()
+        remaining = self.remaining_calls() if remaining is None else remaining
+        lean_factor = 1.0 - cost["optional_share"]
+
+        def per_provider_fit(factor: float) -> int:
+            # Every provider a typical video leans on must have room
+            fits = []
+            for provider, calls in cost["providers"].items():
+                need = calls * factor
+                if need > 0 and provider in remaining:
+                    fits.append(int(remaining[provider] // need))
+            return min(fits) if fits else pooled_fit(factor)
+
+        def pooled_fit(factor: float) -> int:
+            need = max(1.0, cost["calls"] * factor)
+            return int(sum(remaining.values()) // need) if remaining else 10 ** 6
+
+        fit = {
+            MODE_FULL: per_provider_fit(1.0),
+            MODE_LEAN: per_provider_fit(lean_factor),
+            # Bulk tasks go wherever there is headroom - only the pool matters
+            MODE_CHEAP: pooled_fit(lean_factor),
+        }
+        if tokens_left is not None and cost["tokens"]:
+            for mode, factor in ((MODE_FULL, 1.0), (MODE_LEAN, lean_factor), (MODE_CHEAP, lean_factor)):
+                fit[mode] = min(fit[mode], int(tokens_left // max(1.0, cost["tokens"] * factor)))
+        return fit
+
+    # =========================================================================
+    # PLANNING / ADMISSION
+    # =========================================================================
+
+    def plan_batch(self, requested: int) -> Dict:
+        """Pick the cheapest mode that finishes the requested count."""
+        cost = self.cost_per_video()
+        fit = self.videos_that_fit(cost, tokens_left=self.remaining_tokens())
+
+        if fit[MODE_FULL] >= requested:
+            mode, count = MODE_FULL, requested
+        elif fit[MODE_LEAN] >= requested:
+            mode, count = MODE_LEAN, requested
+        elif fit[MODE_CHEAP] >= requested:
+            mode, count = MODE_CHEAP, requested
+        else:
+            # Always attempt one video - the estimate may be pessimistic
+            mode, count = MODE_REDUCED, max(1, min(requested, fit[MODE_CHEAP]))
+
+        self.mode = mode
+        self.plan = {
+            "time": datetime.now().isoformat(),
+            "requested": requested,
+            "count": count,
+            "mode": mode,
+            "fits": fit,
+            "cost_calls": round(cost["calls"], 1),
+            "cost_tokens": int(cost["tokens"]),
+            "samples": cost["samples"],
+        }
+        self.state["plans"] = (self.state.get("plans", []) + [self.plan])[-MAX_HISTORY:]
+        self._save()
+
+        safe_print(f"[PLANNER] ~{cost['calls']:.0f} calls/video ({cost['samples']} measured); "
+                   f"fits full={fit[MODE_FULL]} lean={fit[MODE_LEAN]} cheap={fit[MODE_CHEAP]}")
+        if count < requested:
+            safe_print(f"[PLANNER] Reducing batch {requested} -> {count} video(s) (cheap mode)")
+        else:
+            safe_print(f"[PLANNER] {count} video(s) in {mode} mode")
+        return self.plan
+
+    def admit_next(self, videos_left: int) -> bool:
+        """
+        Before each further video: stop if one more complete video no longer
+        fits; drop to a cheaper mode if the remaining ones don't fit as planned.
+        """
+        fit = self.videos_that_fit(tokens_left=self.remaining_tokens())
+        if fit[MODE_CHEAP] < 1:
+            safe_print("[PLANNER] Quota left is not enough for a complete video - stopping batch")
+            return False
+        order = [MODE_FULL, MODE_LEAN, MODE_CHEAP]
+        if self.mode not in order:
+            return True  # Already reduced to the cheapest mode
+        current = order.index(self.mode)
+        mode = MODE_CHEAP
+        for candidate in order[current:]:
+            if fit[candidate] >= videos_left:
+                mode = candidate
+                break
+        if order.index(mode) > current:
+            safe_print(f"[PLANNER] Quota running low - switching {self.mode} -> {mode} mode")
+            self.mode = mode
+        return True
+
+    # =========================================================================
+    # DEGRADATION HOOKS (used by MasterAI.call_ai and the regeneration loop)
+    # =========================================================================
+
+    def allows_task(self, task: str) -> bool:
+        return self.mode == MODE_FULL or task not in SKIPPABLE_TASKS
+
+    def routing_for(self, task: str, policy: str, prefer_gemini: bool) -> Tuple[str, bool]:
+        """Bulk tasks use the fastest acceptable model (and Gemini first) in cheap modes."""
+        if self.mode in (MODE_CHEAP, MODE_REDUCED) and task in BULK_TASKS:
+            return "fastest_acceptable", True
+        return policy, prefer_gemini
+
+    def max_regenerations(self, default: int) -> int:
+        limit = MAX_REGENERATIONS.get(self.mode)
+        return default if limit is None else min(default, limit)
+
+    def get_status(self) -> Dict:
+        return {"mode": self.mode, "plan": self.plan, "cost": self.cost_per_video()}
+
+
+# Singleton
+_planner = None
+
+
+def get_batch_planner() -> BatchPlanner:
+    """Get the global BatchPlanner instance."""
+    global _planner
+    if _planner is None:
+        _planner = BatchPlanner()
+    return _planner
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" BATCH PLANNER")
+    safe_print("=" * 60)
+    planner = get_batch_planner()
+    plan = planner.plan_batch(4)
+    safe_print(f"Plan: {plan}")
+    safe_print(f"Skip hook rewrites: {not planner.allows_task('hook_improve')}")
+    safe_print(f"Max regenerations: {planner.max_regenerations(2)}")
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Circuit Breakers v18.7
+=============================================
+
+Per-provider and per-model circuit breakers for the AI router.
+
+Without breakers, a provider outage or a deprecated model was still tried
+for every prompt (with up to three retries and 5s -> 10s backoff), and
+failures only lowered its score at the next ranking refresh. Now:
+
+1. CLOSED   - calls flow; outcomes fill a rolling window
+2. OPEN     - tripped by failure rate, consecutive failures or slow calls;
+              the endpoint is skipped instantly until its cooldown ends
+3. HALF_OPEN - after the cooldown ONE probe request is let through;
+              success closes the breaker, failure reopens it with a
+              doubled cooldown (capped)
+
+A 404 / "not found" / "deprecated" response trips the model breaker at
+once with a long cooldown. Network errors and 5xx count against the
+provider as well as the model; 429s only against the model (quotas are
+handled by the quota ledger).
+
+Breaker states and recent transitions are saved to
+data/persistent/circuit_breakers.json for the quota dashboard, and provider
+transitions are mirrored into robustness.ServiceHealthMonitor.
+
+Usage:
+    from circuit_breaker import get_breaker_registry
+
+    breakers = get_breaker_registry()
+    if breakers.allow("groq:llama-3.3-70b-versatile"):
+        ...
+        breakers.record_failure("groq:llama-3.3-70b-versatile", error=str(e))
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+try:
+    from state_store import load_state, save_state
+except ImportError:
+    from src.utils.state_store import load_state, save_state
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+BREAKER_FILE = STATE_DIR / "circuit_breakers.json"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Error kinds (see classify_error)
+ERROR_NOT_FOUND = "not_found"     # Model deprecated / removed
+ERROR_RATE_LIMIT = "rate_limit"   # 429 - model quota, not an outage
+ERROR_NETWORK = "network"         # Timeouts, connection errors, 5xx
+ERROR_OTHER = "other"
+
+
+def classify_error(error: str) -> str:
+    """Map a provider exception message onto a breaker error kind."""
+    text = (error or "").lower()
+    if "404" in text or "not found" in text or "deprecated" in text or "decommissioned" in text:
+        return ERROR_NOT_FOUND
+    if "429" in text or "rate limit" in text or "quota" in text:
+        return ERROR_RATE_LIMIT
+    if re.search(r"\b5\d\d\b", text) or any(
+            s in text for s in ("timeout", "timed out", "connection", "network",
+                                "unavailable", "overloaded")):
+        return ERROR_NETWORK
+    return ERROR_OTHER
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a rolling window of calls.
+
+    Trips when, over the last `window` calls (at least `min_calls`):
+    - the failure rate reaches `failure_rate`, or
+    - the slow-call rate (latency > `slow_seconds`) reaches `slow_rate`
+    or after `max_consecutive` failures in a row.
+    """
+
+    # A claimed probe that never reports back stops blocking after this
+    PROBE_TIMEOUT_SECONDS = 180.0
+
+    def __init__(self, name: str, window: int = 10, min_calls: int = 4,
+                 failure_rate: float = 0.5, max_consecutive: int = 3,
+                 slow_seconds: float = 45.0, slow_rate: float = 0.8,
+                 open_seconds: float = 60.0, max_open_seconds: float = 900.0):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.max_consecutive = max_consecutive
+        self.slow_seconds = slow_seconds
+        self.slow_rate = slow_rate
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self.state = CLOSED
+        self.outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (ok, slow)
+        self.consecutive_failures = 0
+        self.open_seconds = open_seconds
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.probe_started = 0.0
+        self.last_reason = ""
+
+    @property
+    def retry_at(self) -> float:
+        return self.opened_at + self.open_seconds
+
+    def _probe_busy(self, now: float) -> bool:
+        return self.probe_in_flight and now - self.probe_started < self.PROBE_TIMEOUT_SECONDS
+
+    def _transition(self, state: str, reason: str) -> Tuple[str, str, str]:
+        previous, self.state = self.state, state
+        self.last_reason = reason
+        return previous, state, reason
+
+    def available(self, now: float = None) -> bool:
+        """True if a call could go through now (no side effects)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return (now or time.time()) >= self.retry_at
+        return not self._probe_busy(now or time.time())
+
+    def allow(self, now: float = None) -> Tuple[bool, Optional[Tuple]]:
+        """
+        Claim permission for one call.
+
+        Returns:
+            (allowed, transition or None)
+        """
+        now = now or time.time()
+        if self.state == CLOSED:
+            return True, None
+        if self.state == OPEN:
+            if now < self.retry_at:
+                return False, None
+            self.probe_in_flight, self.probe_started = True, now
+            return True, self._transition(HALF_OPEN, "cooldown elapsed - probing")
+        if self._probe_busy(now):
+            return False, None
+        self.probe_in_flight, self.probe_started = True, now
+        return True, None
+
+    def record_success(self, latency: float = None) -> Optional[Tuple]:
+        slow = latency is not None and latency > self.slow_seconds
+        self.outcomes.append((True, slow))
+        self.consecutive_failures = 0
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            self.outcomes.clear()
+            self.open_seconds = self.base_open_seconds
+            return self._transition(CLOSED, "probe succeeded")
+        if self.state == CLOSED and slow:
+            return self._check_rates()
+        return None
+
+    def record_failure(self, reason: str = "", hard: bool = False,
+                       open_seconds: float = None) -> Optional[Tuple]:
+        """
+        Args:
+            reason: Short error description for the transition log
+            hard: Trip immediately (e.g. model not found)
+            open_seconds: Cooldown override for a hard trip
+        """
+        self.outcomes.append((False, False))
+        self.consecutive_failures += 1
+        now = time.time()
+
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            self.open_seconds = min(self.open_seconds * 2, self.max_open_seconds)
+            self.opened_at = now
+            return self._transition(OPEN, f"probe failed: {reason}"[:120])
+        if self.state == OPEN:
+            return None
+
+        if hard:
+            self.open_seconds = open_seconds or self.max_open_seconds
+            self.opened_at = now
+            return self._transition(OPEN, reason[:120])
+        if self.consecutive_failures >= self.max_consecutive:
+            self.opened_at = now
+            return self._transition(
+                OPEN, f"{self.consecutive_failures} consecutive failures: {reason}"[:120])
+        return self._check_rates(reason)
+
+    def _check_rates(self, reason: str = "") -> Optional[Tuple]:
+        if len(self.outcomes) < self.min_calls:
+            return None
+        total = len(self.outcomes)
+        failures = sum(1 for ok, _ in self.outcomes if not ok)
+        slow = sum(1 for _, is_slow in self.outcomes if is_slow)
+        if failures / total >= self.failure_rate:
+            why = f"failure rate {failures}/{total}"
+        elif slow / total >= self.slow_rate:
+            why = f"slow calls {slow}/{total} over {self.slow_seconds:.0f}s"
+        else:
+            return None
+        self.opened_at = time.time()
+        return self._transition(OPEN, f"{why}: {reason}"[:120] if reason else why)
+
+    def to_dict(self) -> Dict:
+        return {
+            "state": self.state,
+            "opened_at": self.opened_at,
+            "open_seconds": self.open_seconds,
+            "consecutive_failures": self.consecutive_failures,
+            "last_reason": self.last_reason,
+        }
+
+    def restore(self, data: Dict):
+        """Resume an open breaker from a previous run (closed ones start fresh)."""
+        if data.get("state") in (OPEN, HALF_OPEN):
+            self.state = OPEN
+            self.opened_at = data.get("opened_at", 0.0)
+            self.open_seconds = data.get("open_seconds", self.base_open_seconds)
+            self.last_reason = data.get("last_reason", "")
+
+
+class BreakerRegistry:
+    """
+    Provider and model breakers for every routed AI call.
+
+    Keys: "provider:<name>" and "model:<provider>:<model_id>".
+    """
+
+    # Deprecated models stay skipped for a day
+    NOT_FOUND_OPEN_SECONDS = 24 * 3600
+    MAX_TRANSITIONS = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.transitions: List[Dict] = []
+        self._saved = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            data = load_state(BREAKER_FILE, default={})
+            self.transitions = data.get("transitions", [])[-self.MAX_TRANSITIONS:]
+            return data.get("breakers", {})
+        except Exception:
+            return {}
+
+    def _save(self):
+        try:
+            save_state(BREAKER_FILE, self.get_report())
+        except Exception as e:
+            safe_print(f"[BREAKER] Save failed: {e}")
+
+    def _breaker(self, key: str) -> CircuitBreaker:
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            if key.startswith("provider:"):
+                # Providers trip on outages only, so they need more evidence
+                breaker = CircuitBreaker(key, window=20, min_calls=6, max_consecutive=5)
+            else:
+                breaker = CircuitBreaker(key)
+            if key in self._saved:
+                breaker.restore(self._saved[key])
+            elif key.startswith("provider:") and not _provider_healthy(key[9:]):
+                breaker.restore({"state": OPEN, "opened_at": time.time(),
+                                 "last_reason": "unhealthy in ServiceHealthMonitor"})
+            self.breakers[key] = breaker
+        return breaker
+
+    @staticmethod
+    def _keys(model_key: str) -> Tuple[str, str]:
+        provider = model_key.split(":", 1)[0]
+        return f"provider:{provider}", f"model:{model_key}"
+
+    def _log(self, key: str, transition: Optional[Tuple]):
+        if not transition:
+            return
+        previous, state, reason = transition
+        self.transitions.append({
+            "time": datetime.now().isoformat(),
+            "breaker": key,
+            "from": previous,
+            "to": state,
+            "reason": reason
+        })
+        self.transitions = self.transitions[-self.MAX_TRANSITIONS:]
+        safe_print(f"   [BREAKER] {key}: {previous} -> {state} ({reason})")
+        if key.startswith("provider:"):
+            _mirror_to_health_monitor(key[9:], state, reason)
+        self._save()
+
+    # =========================================================================
+    # ROUTER API
+    # =========================================================================
+
+    def is_available(self, model_key: str) -> bool:
+        """Non-claiming check used to filter the fallback chain."""
+        with self._lock:
+            now = time.time()
+            return all(self._breaker(k).available(now) for k in self._keys(model_key))
+
+    def allow(self, model_key: str) -> bool:
+        """Claim a call through the provider and model breakers."""
+        with self._lock:
+            provider_key, breaker_key = self._keys(model_key)
+            provider = self._breaker(provider_key)
+            model = self._breaker(breaker_key)
+            if not (provider.available() and model.available()):
+                return False
+            for key, breaker in ((provider_key, provider), (breaker_key, model)):
+                _, transition = breaker.allow()
+                self._log(key, transition)
+            return True
+
+    def record_success(self, model_key: str, latency: float = None):
+        with self._lock:
+            for key in self._keys(model_key):
+                self._log(key, self._breaker(key).record_success(latency))
+
+    def record_failure(self, model_key: str, error: str = ""):
+        """Record a failed call; the error text decides which breakers it counts against."""
+        kind = classify_error(error)
+        reason = f"{kind}: {error[:60]}" if error else kind
+        with self._lock:
+            provider_key, breaker_key = self._keys(model_key)
+            model = self._breaker(breaker_key)
+            if kind == ERROR_NOT_FOUND:
+                transition = model.record_failure(reason, hard=True,
+                                                  open_seconds=self.NOT_FOUND_OPEN_SECONDS)
+            else:
+                transition = model.record_failure(reason)
+            self._log(breaker_key, transition)
+
+            provider = self._breaker(provider_key)
+            if kind == ERROR_NETWORK:
+                self._log(provider_key, provider.record_failure(reason))
+            elif provider.state == HALF_OPEN:
+                # The provider answered - it is up, even if this model failed
+                self._log(provider_key, provider.record_success())
+
+    def get_report(self) -> Dict:
+        """Breaker states and recent transitions (dashboard export)."""
+        return {
+            "updated_at": datetime.now().isoformat(),
+            "breakers": {key: b.to_dict() for key, b in sorted(self.breakers.items())},
+            "open": [key for key, b in sorted(self.breakers.items()) if b.state != CLOSED],
+            "transitions": self.transitions[-self.MAX_TRANSITIONS:]
+        }
+
+
+def _provider_healthy(provider: str) -> bool:
+    """robustness.ServiceHealthMonitor's view of a provider (True if unknown)."""
+    try:
+        try:
+            from robustness import get_health_monitor
+        except ImportError:
+            from src.core.robustness import get_health_monitor
+        return get_health_monitor().is_healthy(provider)
+    except Exception:
+        return True
+
+
+def _mirror_to_health_monitor(provider: str, state: str, reason: str):
+    try:
+        try:
+            from robustness import get_health_monitor
+        except ImportError:
+            from src.core.robustness import get_health_monitor
+        monitor = get_health_monitor()
+        if state == CLOSED:
+            monitor.record_success(provider)
+        elif state == OPEN:
+            monitor.record_failure(provider, f"circuit open: {reason}")
+    except Exception:
+        pass
+
+
+# Singleton
+_breaker_registry = None
+
+
+def get_breaker_registry() -> BreakerRegistry:
+    """Get the shared BreakerRegistry instance."""
+    global _breaker_registry
+    if _breaker_registry is None:
+        _breaker_registry = BreakerRegistry()
+    return _breaker_registry
+
+
+if __name__ == "__main__":
+    safe_print("Testing Circuit Breakers...")
+
+    registry = BreakerRegistry()
+    key = "demo:dead-model"
+
+    for _ in range(3):
+        if registry.allow(key):
+            registry.record_failure(key, error="Connection reset by peer")
+    safe_print(f"After 3 network errors: available={registry.is_available(key)}")
+
+    breaker = registry.breakers[f"model:{key}"]
+    breaker.opened_at -= breaker.open_seconds
+    safe_print(f"After cooldown: probe allowed={registry.allow(key)}, "
+               f"second caller allowed={registry.allow(key)}")
+    registry.record_success(key, latency=1.2)
+    safe_print(f"Probe succeeded: state={breaker.state}")
+
+    registry.record_failure("demo:old-model", error="404 model not found")
+    safe_print(f"Deprecated model available: {registry.is_available('demo:old-model')}")
+    safe_print(f"Open breakers: {registry.get_report()['open']}")
+    safe_print("\nTest complete!")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Model Discovery Cache v18.7
+==================================================
+
+Stale-while-revalidate cache for provider model discovery.
+
+Model discovery (Groq/Gemini/OpenRouter/HuggingFace model lists, router
+rankings) used to run synchronously on every workflow start, before the
+first useful AI call. This module:
+
+1. Serves the LAST KNOWN model list instantly from one on-disk snapshot
+2. Refreshes stale entries in a background thread (one per key)
+3. Only blocks on a true cold start (no snapshot entry at all)
+4. Is shared by quota_optimizer, model_helper and smart_model_router
+
+Snapshot: data/persistent/model_discovery.json (persisted with the other
+workflow state, so cold starts are rare).
+
+Usage:
+    from discovery_cache import get_discovery_cache
+
+    models = get_discovery_cache().get(
+        "model_helper:groq", fetch=_discover_groq_models, ttl=24 * 3600
+    )
+"""
+
+import os
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+DISCOVERY_FILE = STATE_DIR / "model_discovery.json"
+
+# Set DISCOVERY_SYNC=1 to refresh inline (debugging / one-off scripts)
+SYNC_REFRESH = os.environ.get("DISCOVERY_SYNC", "") == "1"
+
+
+class DiscoveryCache:
+    """
+    One shared snapshot of discovered models with background revalidation.
+
+    Entries: {key: {"data": ..., "refreshed_at": epoch_seconds}}
+    Empty fetch results never replace a known-good entry.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else DISCOVERY_FILE
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, threading.Thread] = {}
+        self.snapshot = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    return json.load(f).get("entries", {})
+        except:
+            pass
+        return {}
+
+    def _save(self):
+        """Atomic write - a killed background thread can't corrupt the snapshot."""
+        data = {
+            "updated_at": datetime.now().isoformat(),
+            "entries": self.snapshot
+        }
+        tmp = self.path.with_suffix(".json.tmp")
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            safe_print(f"[DISCOVERY] Snapshot save failed: {e}")
+
+    # =========================================================================
+    # CACHE API
+    # =========================================================================
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since the entry was refreshed (None if unknown)."""
+        entry = self.snapshot.get(key)
+        if not entry:
+            return None
+        return time.time() - entry.get("refreshed_at", 0)
+
+    def is_stale(self, key: str, ttl: float) -> bool:
+        age = self.age(key)
+        return age is None or age > ttl
+
+    def peek(self, key: str) -> Any:
+        """Last known data for a key, without triggering a refresh."""
+        entry = self.snapshot.get(key)
+        return entry.get("data") if entry else None
+
+    def put(self, key: str, data: Any, refreshed_at: float = None):
+        """Store fresh discovery results (ignored if empty)."""
+        if not data:
+            return
+        with self._lock:
+            self.snapshot[key] = {
+                "data": data,
+                "refreshed_at": refreshed_at or time.time()
+            }
+            self._save()
+
+    def invalidate(self, key: str):
+        """Drop an entry known to be wrong (e.g. its model started returning 404)."""
+        with self._lock:
+            if self.snapshot.pop(key, None) is not None:
+                self._save()
+
+    def get(self, key: str, fetch: Callable[[], Any], ttl: float,
+            seed: Any = None, seed_time: float = 0) -> Any:
+        """
+        Get discovered data, never waiting on the network if anything is known.
+
+        Args:
+            key: Snapshot key (e.g. "quota_optimizer:groq_models")
+            fetch: Network discovery function returning the data
+            ttl: Seconds before the entry is revalidated in the background
+            seed: Legacy cached data to import when the snapshot lacks the key
+            seed_time: Epoch time the seed was cached
+
+        Returns:
+            Cached data (possibly stale), or fetched data on a cold start
+        """
+        if key not in self.snapshot and seed:
+            self.put(key, seed, refreshed_at=seed_time or 1)
+
+        entry = self.snapshot.get(key)
+        if entry is None:
+            # Cold start - nothing to serve, so discovery has to block once
+            safe_print(f"[DISCOVERY] Cold start for {key} - discovering now")
+            data = fetch()
+            self.put(key, data)
+            return data
+
+        if self.is_stale(key, ttl):
+            self.refresh_async(key, fetch)
+        return entry["data"]
+
+    def refresh_async(self, key: str, fetch: Callable[[], Any]) -> bool:
+        """
+        Revalidate an entry in a daemon thread.
+
+        Returns:
+            True if a refresh was started (False if one is already running)
+        """
+        with self._lock:
+            running = self._in_flight.get(key)
+            if running and running.is_alive():
+                return False
+
+            def worker():
+                try:
+                    self.put(key, fetch())
+                except Exception as e:
+                    safe_print(f"[DISCOVERY] Background refresh of {key} failed: {e}")
+                finally:
+                    with self._lock:
+                        self._in_flight.pop(key, None)
+
+            if SYNC_REFRESH:
+                thread = None
+            else:
+                thread = threading.Thread(target=worker, name=f"discovery:{key}", daemon=True)
+                self._in_flight[key] = thread
+
+        if thread is None:
+            worker()
+        else:
+            safe_print(f"[DISCOVERY] Serving cached {key}, refreshing in background")
+            thread.start()
+        return True
+
+    def wait(self, timeout: float = None):
+        """Block until background refreshes finish (scripts and tests)."""
+        deadline = time.time() + timeout if timeout else None
+        for thread in list(self._in_flight.values()):
+            remaining = max(0.0, deadline - time.time()) if deadline else None
+            thread.join(remaining)
+
+    def get_status(self) -> Dict:
+        """Age of every snapshot entry and which ones are refreshing."""
+        return {
+            key: {
+                "age_hours": round((self.age(key) or 0) / 3600, 1),
+                "refreshing": key in self._in_flight
+            }
+            for key in self.snapshot
+        }
+
+
+# Singleton
+_discovery_cache = None
+
+
+def get_discovery_cache() -> DiscoveryCache:
+    """Get the shared DiscoveryCache instance."""
+    global _discovery_cache
+    if _discovery_cache is None:
+        _discovery_cache = DiscoveryCache()
+    return _discovery_cache
+
+
+if __name__ == "__main__":
+    safe_print("Testing Discovery Cache...")
+
+    cache = get_discovery_cache()
+    calls = []
+
+    def slow_fetch():
+        time.sleep(1.0)
+        calls.append(1)
+        return ["model-a", "model-b"]
+
+    # Cold start blocks once
+    start = time.time()
+    models = cache.get("demo:models", slow_fetch, ttl=3600)
+    safe_print(f"Cold start: {models} in {time.time() - start:.2f}s")
+
+    # Stale entry is served instantly and refreshed in the background
+    cache.snapshot["demo:models"]["refreshed_at"] = 0
+    start = time.time()
+    models = cache.get("demo:models", slow_fetch, ttl=3600)
+    safe_print(f"Stale read: {models} in {time.time() - start:.3f}s")
+    cache.wait(timeout=5)
+    safe_print(f"Fetches: {len(calls)}, status: {cache.get_status()['demo:models']}")
+
+    safe_print("\nTest complete!")
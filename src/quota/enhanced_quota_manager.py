@@ -29,6 +29,17 @@ STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 QUOTA_STATE_FILE = STATE_DIR / "enhanced_quota_state.json"
 
+# v18.7: Request counts come from the shared quota ledger
+try:
+    from quota_ledger import get_quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.quota_ledger import get_quota_ledger
+        QUOTA_LEDGER_AVAILABLE = True
+    except ImportError:
+        QUOTA_LEDGER_AVAILABLE = False
+
 
 def safe_print(msg: str):
     try:
@@ -73,6 +84,7 @@ class EnhancedQuotaManager:
     }
     
     def __init__(self):
+        self.ledger = get_quota_ledger() if QUOTA_LEDGER_AVAILABLE else None
         self.state = self._load_state()
         self.groq_key = os.environ.get("GROQ_API_KEY")
         self.gemini_key = os.environ.get("GEMINI_API_KEY")
@@ -97,7 +109,25 @@ class EnhancedQuotaManager:
             "last_discovery": None
         }
     
+    def _sync_usage(self):
+        """v18.7: Mirror today's ledger call counts into state["usage"]."""
+        if self.ledger:
+            self.state["usage"] = {
+                provider: self.ledger.usage(provider)["calls"]
+                for provider in self.ledger.providers()
+            }
+            self.state["last_reset"] = datetime.now().strftime("%Y-%m-%d")
+    
+    def _snapshot(self) -> Dict:
+        self._sync_usage()
+        self.state["last_updated"] = datetime.now().isoformat()
+        return dict(self.state)
+    
     def _save_state(self):
+        if self.ledger:
+            # Write-behind - the dashboard reads this file
+            self.ledger.write_behind(QUOTA_STATE_FILE, self._snapshot)
+            return
         self.state["last_updated"] = datetime.now().isoformat()
         with open(QUOTA_STATE_FILE, 'w') as f:
             json.dump(self.state, f, indent=2)
@@ -166,10 +196,16 @@ class EnhancedQuotaManager:
     
     def get_usage(self, provider: str) -> int:
         """Get current usage for provider."""
+        if self.ledger:
+            return self.ledger.usage(provider)["calls"]
         return self.state.get("usage", {}).get(provider, 0)
     
     def record_usage(self, provider: str, count: int = 1):
         """Record API usage."""
+        if self.ledger:
+            self.ledger.record_usage(provider, 0, calls=count)
+            self._save_state()
+            return
         if "usage" not in self.state:
             self.state["usage"] = {}
         self.state["usage"][provider] = self.state["usage"].get(provider, 0) + count
@@ -264,6 +300,7 @@ class EnhancedQuotaManager:
     def get_utilization_report(self) -> Dict:
         """Get current quota utilization report."""
         quotas = self.state.get("quotas", self.DEFAULT_QUOTAS)
+        self._sync_usage()
         usage = self.state.get("usage", {})
         
         report = {
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-ViralShorts Factory - Prompt Cache v17.8
+ViralShorts Factory - Prompt Cache v18.7
 =========================================
 
 Caches AI responses to reduce quota usage.
@@ -13,9 +13,16 @@ Many prompts are similar or identical:
 This module:
 1. Creates hash of prompts
 2. Checks cache before making API calls
-3. Stores responses with TTL
+3. Stores responses with per-namespace TTLs
 4. Saves significant quota
 
+v18.7: SQLite (WAL) storage instead of one big JSON dict:
+- O(1) indexed lookups and single-row writes (no full-file rewrites)
+- True LRU eviction by last access, bounded by entries AND bytes
+- Per-namespace TTLs (evaluation results expire faster than keywords)
+- Hit/miss stats counted in memory and flushed in batches
+- Explicit per-task `cacheable` policy used by MasterAI/smart_call_ai
+
 Estimated savings: 30-50% reduction in API calls!
 """
 
@@ -23,7 +30,11 @@ import os
 import json
 import hashlib
 import re
-from datetime import datetime, timedelta
+import sqlite3
+import threading
+import atexit
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict
 
@@ -39,177 +50,349 @@ def safe_print(msg: str):
 STATE_DIR = Path("./data/cache")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
+CACHE_DB = STATE_DIR / "prompt_cache.db"
+# Legacy JSON files (migrated into the database on first run)
 CACHE_FILE = STATE_DIR / "prompt_cache.json"
 STATS_FILE = STATE_DIR / "cache_stats.json"
 
 # Default cache settings
 DEFAULT_TTL_HOURS = 24
-MAX_CACHE_SIZE = 1000
+MAX_CACHE_SIZE = 1000                 # Max entries
+MAX_CACHE_BYTES = 20 * 1024 * 1024    # Max total response size (20 MB)
+STATS_FLUSH_EVERY = 25                # Flush stats every N lookups/writes
+
+# v18.7: TTL per namespace (hours). Namespace = task/context of the call.
+NAMESPACE_TTL_HOURS = {
+    "default": DEFAULT_TTL_HOURS,
+    "evaluation": 6,       # Scoring the same content again should agree
+    "simple": 72,          # Hashtags, keywords, SEO, B-roll terms
+    "analysis": 24,        # Analytics/trend analysis
+    "critical": 24,        # enhancements_v9 priorities
+    "normal": 24,
+    "bulk": 48,
+}
+
+# v18.7: Which tasks may be served from cache.
+# Creative tasks must stay fresh (variety!), structured ones can be reused.
+TASK_CACHE_POLICY = {
+    # Creative - never cached
+    "concept": False, "topic": False, "content": False, "hook": False,
+    "hook_improve": False, "cta": False, "title": False, "creative": False,
+    "script": False, "general": False,
+    # Structured / deterministic - cached
+    "evaluate": True, "evaluation": True, "broll": True, "hashtag": True,
+    "seo": True, "keyword": True, "description": True, "analysis": True,
+    "simple": True, "metadata": True, "sentiment": True,
+}
+
+# Map tasks onto TTL namespaces
+TASK_NAMESPACE = {
+    "evaluate": "evaluation", "evaluation": "evaluation",
+    "broll": "simple", "hashtag": "simple", "seo": "simple", "keyword": "simple",
+    "description": "simple", "metadata": "simple", "sentiment": "simple",
+    "simple": "simple", "analysis": "analysis",
+}
+
+
+def is_cacheable(task: Optional[str]) -> bool:
+    """v18.7: Default cache policy for a task (False for unknown tasks)."""
+    if not task:
+        return False
+    return TASK_CACHE_POLICY.get(task.lower(), False)
+
+
+def namespace_for_task(task: Optional[str]) -> str:
+    """v18.7: TTL namespace for a task."""
+    if not task:
+        return "default"
+    task = task.lower()
+    if task in NAMESPACE_TTL_HOURS:
+        return task
+    return TASK_NAMESPACE.get(task, "default")
 
 
 class PromptCache:
     """
     Caches AI prompt responses to reduce API quota usage.
+
+    v18.7: Backed by SQLite in WAL mode with LRU eviction.
     """
-    
-    def __init__(self, ttl_hours: int = DEFAULT_TTL_HOURS):
+
+    def __init__(self, ttl_hours: int = DEFAULT_TTL_HOURS, db_path: Path = None,
+                 max_entries: int = MAX_CACHE_SIZE, max_bytes: int = MAX_CACHE_BYTES):
         self.ttl_hours = ttl_hours
-        self.cache = self._load_cache()
+        self.db_path = Path(db_path) if db_path else CACHE_DB
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._pending_ops = 0
+
         self.stats = self._load_stats()
-    
-    def _load_cache(self) -> Dict:
-        """Load cache from disk."""
-        try:
-            if CACHE_FILE.exists():
-                with open(CACHE_FILE, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return {}
-    
-    def _save_cache(self):
-        """Save cache to disk."""
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(self.cache, f)
-    
+        self._entries, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+        self._migrate_legacy_json()
+        atexit.register(self.flush)
+
+    # =========================================================================
+    # STORAGE
+    # =========================================================================
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                               isolation_level=None, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                expires REAL NOT NULL,
+                prompt_preview TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries(last_access)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries(expires)")
+        conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value TEXT)")
+        return conn
+
     def _load_stats(self) -> Dict:
         """Load cache stats."""
-        try:
-            if STATS_FILE.exists():
-                with open(STATS_FILE, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return {
+        stats = {
             "hits": 0,
             "misses": 0,
             "saved_calls": 0,
             "saved_tokens_estimate": 0,
+            "evictions": 0,
+            "namespaces": {},
             "created": datetime.now().isoformat()
         }
-    
+        try:
+            row = self._conn.execute("SELECT value FROM stats WHERE name = 'stats'").fetchone()
+            if row:
+                stats.update(json.loads(row[0]))
+            elif STATS_FILE.exists():
+                with open(STATS_FILE, 'r') as f:
+                    stats.update(json.load(f))
+        except:
+            pass
+        return stats
+
     def _save_stats(self):
         """Save stats to disk."""
         self.stats["last_updated"] = datetime.now().isoformat()
-        with open(STATS_FILE, 'w') as f:
-            json.dump(self.stats, f, indent=2)
-    
+        self._conn.execute(
+            "INSERT OR REPLACE INTO stats (name, value) VALUES ('stats', ?)",
+            (json.dumps(self.stats),)
+        )
+        self._pending_ops = 0
+
+    def _mark_dirty(self):
+        """Batch stat writes instead of rewriting on every lookup."""
+        self._pending_ops += 1
+        if self._pending_ops >= STATS_FLUSH_EVERY:
+            self._save_stats()
+
+    def flush(self):
+        """Persist pending stats (called automatically at exit)."""
+        with self._lock:
+            if self._pending_ops:
+                try:
+                    self._save_stats()
+                except Exception:
+                    pass
+
+    def _migrate_legacy_json(self):
+        """Import entries from the pre-v18.7 prompt_cache.json once."""
+        if self.stats.get("legacy_migrated") or not CACHE_FILE.exists() or self.db_path != CACHE_DB:
+            return
+        try:
+            with open(CACHE_FILE, 'r') as f:
+                legacy = json.load(f)
+            now = time.time()
+            ttl = self.ttl_hours * 3600
+            migrated = 0
+            for key, item in legacy.items():
+                try:
+                    created = datetime.fromisoformat(item["timestamp"]).timestamp()
+                except Exception:
+                    continue
+                if created + ttl <= now:
+                    continue
+                self._insert(key, "default", item.get("response", ""), created,
+                             created + ttl, item.get("prompt_preview", ""))
+                migrated += 1
+            self.stats["legacy_migrated"] = True
+            self._evict_old_entries()
+            self._save_stats()
+            safe_print(f"[CACHE] Migrated {migrated} entries from prompt_cache.json")
+        except Exception as e:
+            safe_print(f"[CACHE] Legacy migration skipped: {e}")
+
+    # =========================================================================
+    # CACHE API
+    # =========================================================================
+
     def _hash_prompt(self, prompt: str, context: str = "") -> str:
         """Create a hash of the prompt for cache key."""
         # Normalize prompt
         normalized = prompt.lower().strip()
         full_key = f"{normalized}:{context}"
         return hashlib.sha256(full_key.encode()).hexdigest()[:32]
-    
-    def _is_expired(self, cached_item: Dict) -> bool:
-        """Check if cached item has expired."""
-        if "timestamp" not in cached_item:
-            return True
-        
-        try:
-            cached_time = datetime.fromisoformat(cached_item["timestamp"])
-            expiry = cached_time + timedelta(hours=self.ttl_hours)
-            return datetime.now() > expiry
-        except:
-            return True
-    
-    def get(self, prompt: str, context: str = "") -> Optional[str]:
+
+    def _ttl_seconds(self, namespace: str) -> float:
+        hours = NAMESPACE_TTL_HOURS.get(namespace)
+        if hours is None or namespace == "default":
+            hours = self.ttl_hours
+        return hours * 3600
+
+    def _count(self, namespace: str, field: str):
+        ns = self.stats.setdefault("namespaces", {}).setdefault(namespace, {"hits": 0, "misses": 0})
+        ns[field] = ns.get(field, 0) + 1
+
+    def get(self, prompt: str, context: str = "", key: str = None) -> Optional[str]:
         """
         Get cached response for a prompt.
-        
+
         Args:
             prompt: The prompt text
-            context: Optional context (e.g., category, task type)
-        
+            context: Optional context (e.g., category, task type) - also the TTL namespace
+            key: Optional precomputed cache key (skips prompt hashing)
+
         Returns:
             Cached response or None if not found/expired
         """
-        key = self._hash_prompt(prompt, context)
-        
-        if key in self.cache:
-            cached = self.cache[key]
-            
-            if not self._is_expired(cached):
-                self.stats["hits"] += 1
-                self.stats["saved_calls"] += 1
-                self.stats["saved_tokens_estimate"] += len(cached.get("response", ""))
-                self._save_stats()
-                return cached.get("response")
-            else:
+        key = key or self._hash_prompt(prompt, context)
+        namespace = namespace_for_task(context)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, size, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row:
+                response, size, expires = row
+                if expires > now:
+                    self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+                    self.stats["hits"] += 1
+                    self.stats["saved_calls"] += 1
+                    self.stats["saved_tokens_estimate"] += len(response) // 4
+                    self._count(namespace, "hits")
+                    self._mark_dirty()
+                    return response
                 # Expired - remove from cache
-                del self.cache[key]
-                self._save_cache()
-        
-        self.stats["misses"] += 1
-        self._save_stats()
-        return None
-    
-    def set(self, prompt: str, response: str, context: str = ""):
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._entries -= 1
+                self._bytes -= size
+
+            self.stats["misses"] += 1
+            self._count(namespace, "misses")
+            self._mark_dirty()
+            return None
+
+    def _insert(self, key: str, namespace: str, response: str, created: float,
+                expires: float, preview: str):
+        size = len(response.encode("utf-8"))
+        old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(key, namespace, response, size, created, last_access, expires, prompt_preview) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, namespace, response, size, created, created, expires, preview)
+        )
+        if old:
+            self._bytes += size - old[0]
+        else:
+            self._entries += 1
+            self._bytes += size
+
+    def set(self, prompt: str, response: str, context: str = "", key: str = None):
         """
         Cache a prompt response.
-        
+
         Args:
             prompt: The prompt text
             response: The AI response
-            context: Optional context
+            context: Optional context - also the TTL namespace
+            key: Optional precomputed cache key (skips prompt hashing)
         """
-        key = self._hash_prompt(prompt, context)
-        
-        self.cache[key] = {
-            "response": response,
-            "timestamp": datetime.now().isoformat(),
-            "prompt_preview": prompt[:100]  # For debugging
-        }
-        
-        # Enforce max cache size
-        if len(self.cache) > MAX_CACHE_SIZE:
-            self._evict_old_entries()
-        
-        self._save_cache()
-    
+        if not response:
+            return
+        key = key or self._hash_prompt(prompt, context)
+        namespace = namespace_for_task(context)
+        now = time.time()
+
+        with self._lock:
+            self._insert(key, namespace, response, now, now + self._ttl_seconds(namespace),
+                         prompt[:100])  # Preview for debugging
+
+            # Enforce max cache size (entries and bytes)
+            if self._entries > self.max_entries or self._bytes > self.max_bytes:
+                self._evict_old_entries()
+            self._mark_dirty()
+
     def _evict_old_entries(self):
-        """Remove oldest entries to stay under max size."""
-        # Sort by timestamp
-        sorted_items = sorted(
-            self.cache.items(),
-            key=lambda x: x[1].get("timestamp", ""),
-            reverse=True
-        )
-        
-        # Keep newest entries
-        self.cache = dict(sorted_items[:MAX_CACHE_SIZE - 100])
-    
+        """Remove least-recently-used entries until under both limits."""
+        # Expired entries go first (indexed range delete)
+        cur = self._conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+        evicted = max(cur.rowcount, 0)
+        self._entries, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+        # Then LRU by last access, leaving 10% headroom so we don't evict on every set
+        target_entries = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+        while self._entries > target_entries or self._bytes > target_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if not row:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            self._entries -= 1
+            self._bytes -= row[1]
+            evicted += 1
+
+        self.stats["evictions"] = self.stats.get("evictions", 0) + evicted
+
     def clear_expired(self) -> int:
         """Remove all expired entries. Returns count removed."""
-        expired_keys = [
-            k for k, v in self.cache.items()
-            if self._is_expired(v)
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
-        
-        if expired_keys:
-            self._save_cache()
-        
-        return len(expired_keys)
-    
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+            removed = max(cur.rowcount, 0)
+            self._entries, self._bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return removed
+
     def get_stats(self) -> Dict:
         """Get cache statistics."""
         total = self.stats["hits"] + self.stats["misses"]
         hit_rate = self.stats["hits"] / total if total > 0 else 0
-        
+
         return {
             **self.stats,
-            "cache_size": len(self.cache),
+            "cache_size": self._entries,
+            "cache_bytes": self._bytes,
             "hit_rate": f"{hit_rate:.1%}",
             "total_requests": total
         }
-    
+
     def clear(self):
         """Clear the entire cache."""
-        self.cache = {}
-        self._save_cache()
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._entries, self._bytes = 0, 0
 
 
 # Singleton
@@ -237,32 +420,36 @@ def cache_ai_response(prompt: str, response: str, context: str = ""):
 if __name__ == "__main__":
     # Test
     safe_print("Testing Prompt Cache...")
-    
+
     cache = get_prompt_cache()
-    
+
     # Test set and get
     test_prompt = "Generate a viral hook for productivity content"
     test_response = "STOP - This 2-minute habit will change your life"
-    
+
     cache.set(test_prompt, test_response, context="hook")
-    
+
     # Test retrieval
     result = cache.get(test_prompt, context="hook")
     assert result == test_response, "Cache get failed!"
-    safe_print(f"[PASS] Cache set/get works")
-    
+    safe_print("[PASS] Cache set/get works")
+
     # Test cache miss
     result = cache.get("nonexistent prompt")
     assert result is None, "Cache should return None for miss"
-    safe_print(f"[PASS] Cache miss works")
-    
+    safe_print("[PASS] Cache miss works")
+
+    # Test policy
+    assert is_cacheable("broll") and not is_cacheable("concept")
+    safe_print("[PASS] Task cache policy works")
+
     # Get stats
     stats = cache.get_stats()
-    safe_print(f"\nCache Stats:")
+    safe_print("\nCache Stats:")
     safe_print(f"  Hits: {stats['hits']}")
     safe_print(f"  Misses: {stats['misses']}")
     safe_print(f"  Hit Rate: {stats['hit_rate']}")
-    safe_print(f"  Cache Size: {stats['cache_size']}")
-    
-    safe_print("\nTest complete!")
+    safe_print(f"  Cache Size: {stats['cache_size']} ({stats['cache_bytes']} bytes)")
 
+    cache.flush()
+    safe_print("\nTest complete!")
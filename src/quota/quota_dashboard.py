@@ -8,11 +8,16 @@ Generates HTML dashboard for monitoring.
 """
 
 import os
-import json
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, state_exists
+
 STATE_DIR = Path("./data/persistent")
 OUTPUT_DIR = Path("./data")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,13 +39,14 @@ class QuotaDashboard:
     def __init__(self):
         self.router_cache = self._load_router_cache()
         self.quota_state = self._load_quota_state()
+        self.ledger = self._load_ledger()
+        self.breakers = self._load_breakers()
     
     def _load_router_cache(self) -> Dict:
         try:
             cache_file = STATE_DIR / "smart_router_cache.json"
-            if cache_file.exists():
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
+            if state_exists(cache_file):
+                return load_state(cache_file)
         except:
             pass
         return {}
@@ -48,9 +54,28 @@ class QuotaDashboard:
     def _load_quota_state(self) -> Dict:
         try:
             quota_file = STATE_DIR / "enhanced_quota_state.json"
-            if quota_file.exists():
-                with open(quota_file, 'r') as f:
-                    return json.load(f)
+            if state_exists(quota_file):
+                return load_state(quota_file)
+        except:
+            pass
+        return {}
+    
+    def _load_ledger(self) -> Dict:
+        """v18.7: Per-model calls from the quota ledger (the router cache lags)."""
+        try:
+            ledger_file = STATE_DIR / "quota_ledger.json"
+            if state_exists(ledger_file):
+                return load_state(ledger_file)
+        except:
+            pass
+        return {}
+    
+    def _load_breakers(self) -> Dict:
+        """v18.7: Circuit breaker states exported by the router."""
+        try:
+            breaker_file = STATE_DIR / "circuit_breakers.json"
+            if state_exists(breaker_file):
+                return load_state(breaker_file)
         except:
             pass
         return {}
@@ -63,7 +88,7 @@ class QuotaDashboard:
         for key, model in models.items():
             if isinstance(model, dict):
                 usage[key] = {
-                    "calls_today": model.get("calls_today", 0),
+                    "calls_today": self._ledger_calls(key, model.get("calls_today", 0)),
                     "daily_limit": model.get("daily_limit", 100),
                     "consecutive_failures": model.get("consecutive_failures", 0),
                     "available": model.get("available", True),
@@ -77,6 +102,13 @@ class QuotaDashboard:
         
         return usage
     
+    def _ledger_calls(self, model_key: str, default: int) -> int:
+        counter = self.ledger.get("models", {}).get(model_key)
+        if not counter:
+            return default
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        return counter.get("calls", 0) if counter.get("day") == today else 0
+    
     def generate_html(self) -> str:
         """Generate HTML dashboard."""
         usage = self.get_model_usage()
@@ -235,13 +267,44 @@ class QuotaDashboard:
 '''
             html += '        </div>\n'
         
+        html += '    </div>\n'
+        html += self._breaker_section()
         html += '''
-    </div>
 </body>
 </html>'''
         
         return html
     
+    def _breaker_section(self) -> str:
+        """v18.7: Open circuit breakers and their recent transitions."""
+        breakers = self.breakers.get("breakers", {})
+        open_keys = [k for k, b in breakers.items() if b.get("state") != "closed"]
+        transitions = self.breakers.get("transitions", [])[-10:]
+        if not open_keys and not transitions:
+            return ""
+        
+        html = '''
+    <div class="summary" style="margin-top: 30px; text-align: left;">
+        <h2 style="color: #00d4ff; margin-bottom: 10px;">Circuit Breakers</h2>
+'''
+        for key in sorted(open_keys):
+            b = breakers[key]
+            retry_at = b.get("opened_at", 0) + b.get("open_seconds", 0)
+            retry = datetime.fromtimestamp(retry_at).strftime("%H:%M:%S") if retry_at else "-"
+            status_class = "error" if b.get("state") == "open" else "warn"
+            html += f'''
+        <div class="model">
+            <div class="model-name">{key}<span class="status {status_class}">{b.get("state", "").upper()}</span></div>
+            <div class="stats"><span>{b.get("last_reason", "")}</span><span>retry at {retry}</span></div>
+        </div>
+'''
+        for t in reversed(transitions):
+            html += f'''
+        <div class="stats"><span>{t.get("time", "")[:19]} {t.get("breaker", "")}</span><span>{t.get("from", "")} -> {t.get("to", "")} ({t.get("reason", "")})</span></div>
+'''
+        html += '    </div>\n'
+        return html
+    
     def save_dashboard(self, filename: str = "quota_dashboard.html"):
         """Save dashboard to file."""
         html = self.generate_html()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Unified Quota Ledger v18.7
+=================================================
+
+One in-memory record of AI usage, shared by every quota tracker.
+
+Before this module, each AI call rewrote several JSON files synchronously
+(token_budget.json, quota_monitor.json, ...), and each tracker kept its
+own copy of the same counters. The ledger:
+
+1. Holds per-provider AND per-model usage (day / hour / minute windows)
+2. Owns 429 cooldowns and the daily reset (midnight UTC)
+3. Persists with write-behind: a record is one dict update, and dirty
+   state is flushed atomically every QUOTA_LEDGER_FLUSH_SECONDS and at exit
+4. Flushes the legacy tracker files the same way, so dashboards and
+   older readers keep working
+
+TokenBudgetManager, QuotaMonitor, QuotaPoolManager, EnhancedQuotaManager
+and SmartModelRouter are adapters over this ledger - their public APIs
+are unchanged.
+
+Set QUOTA_LEDGER_FLUSH_SECONDS=0 to write through on every record
+(debugging / one-off scripts).
+
+Usage:
+    from quota_ledger import get_quota_ledger
+
+    ledger = get_quota_ledger()
+    ledger.record_usage("groq", 1200, model="groq:llama-3.3-70b-versatile")
+    ledger.record_429("gemini", retry_seconds=45)
+    if ledger.in_cooldown("gemini"): ...
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+LEDGER_FILE = STATE_DIR / "quota_ledger.json"
+
+# Seconds between write-behind flushes (0 = write through)
+FLUSH_INTERVAL = float(os.environ.get("QUOTA_LEDGER_FLUSH_SECONDS", 5))
+
+
+def _windows(now: datetime) -> Dict[str, str]:
+    """Window labels a counter is rolled against (UTC, like provider resets)."""
+    return {
+        "day": now.strftime("%Y-%m-%d"),
+        "hour": now.strftime("%Y-%m-%d %H"),
+        "minute": now.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def _new_counter(now: datetime) -> Dict:
+    counter = _windows(now)
+    counter.update({
+        "tokens": 0, "calls": 0,
+        "hour_tokens": 0, "hour_calls": 0,
+        "minute_tokens": 0, "minute_calls": 0,
+        "cooldown_until": 0.0,
+        "last_429": None,
+    })
+    return counter
+
+
+def write_json_atomic(path: Path, data: Any):
+    """Write JSON via tmp file + rename so a killed process can't truncate it."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class QuotaLedger:
+    """
+    In-memory usage ledger with periodic atomic write-behind.
+
+    State: {"providers": {name: counter}, "models": {key: counter}}
+    Counters roll their day/hour/minute windows lazily on access.
+    """
+
+    def __init__(self, path: Path = None, flush_interval: float = None):
+        self.path = Path(path) if path else LEDGER_FILE
+        self.flush_interval = FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._documents: Dict[Path, Callable[[], Any]] = {}
+        self._dirty_documents = set()
+        self._timer: Optional[threading.Timer] = None
+        self.flushes = 0
+        self.state = self._load()
+        atexit.register(self.flush)
+
+    def _load(self) -> Dict:
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                return {
+                    "providers": data.get("providers", {}),
+                    "models": data.get("models", {})
+                }
+        except Exception as e:
+            safe_print(f"[LEDGER] Load error: {e}")
+        return {"providers": {}, "models": {}}
+
+    # =========================================================================
+    # COUNTERS
+    # =========================================================================
+
+    def _roll(self, counter: Dict, now: datetime) -> Dict:
+        """Reset any window that has ended since the counter was last touched."""
+        labels = _windows(now)
+        if counter.get("day") != labels["day"]:
+            counter["tokens"] = counter["calls"] = 0
+            counter["day"] = labels["day"]
+        if counter.get("hour") != labels["hour"]:
+            counter["hour_tokens"] = counter["hour_calls"] = 0
+            counter["hour"] = labels["hour"]
+        if counter.get("minute") != labels["minute"]:
+            counter["minute_tokens"] = counter["minute_calls"] = 0
+            counter["minute"] = labels["minute"]
+        return counter
+
+    def _counter(self, section: str, name: str, now: datetime = None) -> Dict:
+        now = now or datetime.now(timezone.utc)
+        counters = self.state[section]
+        if name not in counters:
+            counters[name] = _new_counter(now)
+        return self._roll(counters[name], now)
+
+    def _add(self, counter: Dict, tokens: int, calls: int):
+        counter["tokens"] += tokens
+        counter["calls"] += calls
+        counter["hour_tokens"] += tokens
+        counter["hour_calls"] += calls
+        counter["minute_tokens"] += tokens
+        counter["minute_calls"] += calls
+
+    def record_usage(self, provider: str, tokens: int = 0, model: str = None,
+                     calls: int = 1):
+        """
+        Record one AI call (or `calls` calls) against a provider.
+
+        Args:
+            provider: Provider name ("groq", "gemini", ...)
+            tokens: Tokens consumed
+            model: Optional model key, tracked alongside the provider
+            calls: Number of calls to count
+        """
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            self._add(self._counter("providers", provider, now), tokens, calls)
+            if model:
+                self._add(self._counter("models", model, now), tokens, calls)
+            self.mark_dirty()
+
+    def record_model_call(self, model: str, tokens: int = 0):
+        """Count a call against one model only (its provider is tracked elsewhere)."""
+        with self._lock:
+            self._add(self._counter("models", model), tokens, 1)
+            self.mark_dirty()
+
+    def seed_usage(self, provider: str, tokens: int, calls: int) -> bool:
+        """
+        Import today's usage from a legacy tracker file.
+
+        Only applies to providers the ledger has never seen, so the first
+        run after an upgrade doesn't forget what was already spent today.
+        """
+        with self._lock:
+            if provider in self.state["providers"] or (tokens <= 0 and calls <= 0):
+                return False
+            self._add(self._counter("providers", provider), tokens, calls)
+            self.mark_dirty()
+            return True
+
+    def record_429(self, provider: str, retry_seconds: float = 60, model: str = None):
+        """Start (or extend) a cooldown after a rate-limit response."""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            until = time.time() + retry_seconds
+            targets = [self._counter("providers", provider, now)]
+            if model:
+                targets.append(self._counter("models", model, now))
+            for counter in targets:
+                counter["cooldown_until"] = max(counter.get("cooldown_until", 0.0), until)
+                counter["last_429"] = now.isoformat()
+            self.mark_dirty()
+
+    def clear_cooldown(self, provider: str):
+        with self._lock:
+            counter = self.state["providers"].get(provider)
+            if counter and counter.get("cooldown_until"):
+                counter["cooldown_until"] = 0.0
+                self.mark_dirty()
+
+    def cooldown_remaining(self, provider: str, section: str = "providers") -> float:
+        """Seconds until the provider (or model) may be called again."""
+        counter = self.state[section].get(provider)
+        if not counter:
+            return 0.0
+        return max(0.0, counter.get("cooldown_until", 0.0) - time.time())
+
+    def in_cooldown(self, provider: str) -> bool:
+        return self.cooldown_remaining(provider) > 0
+
+    def _peek(self, section: str, name: str) -> Dict:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            counter = self.state[section].get(name)
+            if counter is None:
+                return _new_counter(now)
+            return dict(self._roll(counter, now))
+
+    def usage(self, provider: str) -> Dict:
+        """Copy of a provider's counter with expired windows reset."""
+        return self._peek("providers", provider)
+
+    def model_usage(self, model: str) -> Dict:
+        """Copy of a model's counter with expired windows reset."""
+        return self._peek("models", model)
+
+    def providers(self) -> List[str]:
+        return list(self.state["providers"].keys())
+
+    # =========================================================================
+    # WRITE-BEHIND
+    # =========================================================================
+
+    def mark_dirty(self):
+        """Note that the ledger changed; it is flushed on the next tick."""
+        with self._lock:
+            self._dirty = True
+        self._schedule_flush()
+
+    def write_behind(self, path: Path, snapshot: Callable[[], Any]):
+        """
+        Persist a tracker's own file through the write-behind flush.
+
+        Args:
+            path: JSON file the tracker used to rewrite synchronously
+            snapshot: Returns the data to write (called at flush time)
+        """
+        path = Path(path)
+        with self._lock:
+            self._documents[path] = snapshot
+            self._dirty_documents.add(path)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_interval, self._tick)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _tick(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all dirty state now.
+
+        Returns:
+            Number of files written
+        """
+        with self._lock:
+            documents = [(p, self._documents[p]) for p in self._dirty_documents]
+            self._dirty_documents.clear()
+            ledger_dirty, self._dirty = self._dirty, False
+            ledger_data = None
+            if ledger_dirty:
+                ledger_data = {
+                    "updated_at": datetime.now().isoformat(),
+                    "providers": json.loads(json.dumps(self.state["providers"])),
+                    "models": json.loads(json.dumps(self.state["models"]))
+                }
+
+        written = 0
+        if ledger_data is not None:
+            try:
+                write_json_atomic(self.path, ledger_data)
+                written += 1
+            except Exception as e:
+                safe_print(f"[LEDGER] Save error: {e}")
+        for path, snapshot in documents:
+            try:
+                write_json_atomic(path, snapshot())
+                written += 1
+            except Exception as e:
+                # e.g. the tracker mutated mid-snapshot - retry next flush
+                safe_print(f"[LEDGER] Save error for {path.name}: {e}")
+                with self._lock:
+                    self._dirty_documents.add(path)
+        if written:
+            self.flushes += 1
+        return written
+
+    def get_status(self) -> Dict:
+        """Today's usage per provider and model, plus active cooldowns."""
+        with self._lock:
+            status = {}
+            for section in ("providers", "models"):
+                status[section] = {}
+                for name in list(self.state[section]):
+                    counter = self._counter(section, name)
+                    status[section][name] = {
+                        "tokens": counter["tokens"],
+                        "calls": counter["calls"],
+                        "cooldown_seconds": int(self.cooldown_remaining(name, section))
+                    }
+            status["pending_writes"] = len(self._dirty_documents) + int(self._dirty)
+            return status
+
+
+# Singleton
+_quota_ledger = None
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """Get the shared QuotaLedger instance."""
+    global _quota_ledger
+    if _quota_ledger is None:
+        _quota_ledger = QuotaLedger()
+    return _quota_ledger
+
+
+if __name__ == "__main__":
+    safe_print("Testing Quota Ledger...")
+
+    ledger = get_quota_ledger()
+
+    start = time.time()
+    for _ in range(1000):
+        ledger.record_usage("demo", 100, model="demo:model")
+    elapsed = time.time() - start
+    safe_print(f"1000 records in {elapsed * 1000:.1f}ms (files written so far: {ledger.flushes})")
+
+    ledger.record_429("demo", retry_seconds=30)
+    safe_print(f"Usage: {ledger.usage('demo')['calls']} calls, "
+               f"cooldown {ledger.cooldown_remaining('demo'):.0f}s")
+
+    safe_print(f"Flushed {ledger.flush()} file(s)")
+    safe_print("\nTest complete!")
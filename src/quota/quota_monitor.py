@@ -30,6 +30,17 @@ STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 QUOTA_FILE = STATE_DIR / "quota_monitor.json"
 
+# v18.7: Usage windows and 429 cooldowns live in the shared quota ledger
+try:
+    from quota_ledger import get_quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.quota_ledger import get_quota_ledger
+        QUOTA_LEDGER_AVAILABLE = True
+    except ImportError:
+        QUOTA_LEDGER_AVAILABLE = False
+
 
 @dataclass
 class ProviderQuotaStatus:
@@ -52,6 +63,9 @@ class ProviderQuotaStatus:
 class QuotaMonitor:
     """
     Monitors API quotas and provides intelligent recommendations.
+    
+    v18.7: An adapter over the quota ledger - the day/hour/minute counters
+    are views of it, and quota_monitor.json is write-behind.
     """
     
     # Provider limits
@@ -74,6 +88,7 @@ class QuotaMonitor:
     }
     
     def __init__(self):
+        self.ledger = get_quota_ledger() if QUOTA_LEDGER_AVAILABLE else None
         self.status = self._load()
         self._check_resets()
     
@@ -107,8 +122,40 @@ class QuotaMonitor:
             for name, limits in self.LIMITS.items()
         }
     
+    def _sync(self):
+        """v18.7: Refresh counters and exhaustion from the quota ledger."""
+        now = datetime.now(timezone.utc)
+        for name, status in self.status.items():
+            usage = self.ledger.usage(name)
+            status.used_today = usage["tokens"]
+            status.used_this_hour = usage["hour_tokens"]
+            status.used_this_minute = usage["minute_tokens"]
+            status.last_reset_day = usage["day"]
+            status.last_reset_hour = usage["hour"]
+            status.last_reset_minute = usage["minute"]
+            status.last_429_time = usage["last_429"] or status.last_429_time
+            
+            cooldown = self.ledger.cooldown_remaining(name)
+            if cooldown > 0:
+                status.is_exhausted = True
+                status.estimated_recovery_time = (now + timedelta(seconds=cooldown)).isoformat()
+            elif status.used_today >= status.daily_limit:
+                status.is_exhausted = True
+                midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+                status.estimated_recovery_time = midnight.isoformat()
+            else:
+                status.is_exhausted = False
+                status.estimated_recovery_time = None
+    
+    def _snapshot(self) -> Dict:
+        self._sync()
+        return {name: asdict(status) for name, status in self.status.items()}
+    
     def _save(self):
-        """Save quota status to disk."""
+        """Save quota status to disk (write-behind through the ledger)."""
+        if self.ledger:
+            self.ledger.write_behind(QUOTA_FILE, self._snapshot)
+            return
         try:
             data = {name: asdict(status) for name, status in self.status.items()}
             with open(QUOTA_FILE, 'w') as f:
@@ -118,6 +165,11 @@ class QuotaMonitor:
     
     def _check_resets(self):
         """Check and apply quota resets."""
+        if self.ledger:
+            # The ledger rolls its windows on read - nothing to rewrite
+            self._sync()
+            return
+        
         now = datetime.now(timezone.utc)
         now_day = now.strftime("%Y-%m-%d")
         now_hour = now.strftime("%Y-%m-%d %H")
@@ -149,6 +201,13 @@ class QuotaMonitor:
         if provider not in self.status:
             return
         
+        if self.ledger:
+            # v18.7: Same ledger as TokenBudgetManager - record each call once
+            self.ledger.record_usage(provider, tokens)
+            self._sync()
+            self._save()
+            return
+        
         status = self.status[provider]
         status.used_today += tokens
         status.used_this_hour += tokens
@@ -169,6 +228,13 @@ class QuotaMonitor:
         if provider not in self.status:
             return
         
+        if self.ledger:
+            self.ledger.record_429(provider, retry_seconds)
+            self._sync()
+            self._save()
+            print(f"[QuotaMonitor] {provider} hit 429 - recovery in {retry_seconds}s")
+            return
+        
         now = datetime.now(timezone.utc)
         status = self.status[provider]
         status.last_429_time = now.isoformat()
@@ -1,23 +1,40 @@
 #!/usr/bin/env python3
 """
-ViralShorts Factory - Quota Optimizer v16.6
+ViralShorts Factory - Quota Optimizer v18.7
 ============================================
 
 This module optimizes API quota usage by:
 1. Caching reusable data (trending topics, categories)
 2. Dynamically fetching available free models
 3. Tracking usage per provider/model
+4. v18.7: Serving model lists stale-while-revalidate (discovery_cache)
 
 PRINCIPLE: Call AI APIs as FEW times as possible while maintaining quality.
 """
 
-import json
 import os
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime, timezone
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Shared stale-while-revalidate snapshot for model discovery
+try:
+    from discovery_cache import get_discovery_cache
+    DISCOVERY_CACHE_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.discovery_cache import get_discovery_cache
+        DISCOVERY_CACHE_AVAILABLE = True
+    except ImportError:
+        DISCOVERY_CACHE_AVAILABLE = False
+
 # Persistent storage directory
 CACHE_DIR = Path("data/persistent")
 CACHE_FILE = CACHE_DIR / "quota_cache.json"
@@ -54,9 +71,8 @@ class QuotaOptimizer:
     def _load_cache(self) -> Dict:
         """Load cache from disk."""
         try:
-            if CACHE_FILE.exists():
-                with open(CACHE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(CACHE_FILE):
+                return load_state(CACHE_FILE)
         except:
             pass
         return {
@@ -70,8 +86,7 @@ class QuotaOptimizer:
     def _save_cache(self):
         """Save cache to disk."""
         try:
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            save_state(CACHE_FILE, self.cache)
         except Exception as e:
             safe_print(f"[!] Cache save failed: {e}")
     
@@ -94,6 +109,10 @@ class QuotaOptimizer:
             self.cache["groq_models"] = {"data": None, "timestamp": 0}
         if provider is None or provider == "openrouter":
             self.cache["openrouter_free_models"] = {"data": None, "timestamp": 0}
+        if DISCOVERY_CACHE_AVAILABLE:
+            for key in ("gemini_models", "groq_models", "openrouter_free_models"):
+                if provider is None or key.startswith(provider):
+                    get_discovery_cache().invalidate(f"quota_optimizer:{key}")
         self._save_cache()
         safe_print(f"[CACHE] Cleared model cache for: {provider or 'all'}")
     
@@ -168,6 +187,40 @@ class QuotaOptimizer:
         
         return []
     
+    # ========================================================================
+    # v18.7: STALE-WHILE-REVALIDATE MODEL DISCOVERY
+    # ========================================================================
+    def _discovered(self, key: str, discover, api_key: str = None,
+                    force_refresh: bool = False) -> List[str]:
+        """
+        Serve a model list from the shared discovery snapshot.
+        
+        Stale lists are returned immediately and refreshed in the background;
+        only force_refresh (model 404) or a cold start waits on the network.
+        """
+        if not DISCOVERY_CACHE_AVAILABLE:
+            if not force_refresh and self._is_valid(key, self.TTL_MODELS):
+                return self.cache[key]["data"]
+            return discover(api_key)
+        
+        discovery = get_discovery_cache()
+        snapshot_key = f"quota_optimizer:{key}"
+        
+        if force_refresh:
+            safe_print(f"[CACHE] Force refreshing {key} (model not found)")
+            models = discover(api_key)
+            discovery.put(snapshot_key, models)
+            return models
+        
+        legacy = self.cache.get(key) or {}
+        return discovery.get(
+            snapshot_key,
+            fetch=lambda: discover(api_key),
+            ttl=self.TTL_MODELS,
+            seed=legacy.get("data"),
+            seed_time=legacy.get("timestamp", 0)
+        )
+    
     # ========================================================================
     # GROQ MODELS - Dynamic discovery with LAZY LOADING
     # ========================================================================
@@ -175,19 +228,16 @@ class QuotaOptimizer:
         """
         Get available Groq models dynamically.
         
-        Uses Groq API to discover available models.
-        Cached for 24 hours.
+        v18.7: Served from the shared discovery snapshot, revalidated in the
+        background when older than TTL_MODELS.
         
         LAZY LOADING: Only fetches when current model fails, not on every call.
         Set force_refresh=True when a model returns 404.
         """
-        if not force_refresh and self._is_valid("groq_models", self.TTL_MODELS):
-            safe_print("[CACHE] Using cached Groq models")
-            return self.cache["groq_models"]["data"]
-        
-        if force_refresh:
-            safe_print("[CACHE] Force refreshing Groq models (model not found)")
-        
+        return self._discovered("groq_models", self._discover_groq_models, api_key, force_refresh)
+    
+    def _discover_groq_models(self, api_key: str = None) -> List[str]:
+        """Query the Groq API for active models (network)."""
         # v17.9.12: NO hardcoded fallbacks! All via API discovery.
         
         if not api_key:
@@ -244,13 +294,10 @@ class QuotaOptimizer:
         
         LAZY LOADING: Set force_refresh=True when a model returns 404.
         """
-        if not force_refresh and self._is_valid("gemini_models", self.TTL_MODELS):
-            safe_print("[CACHE] Using cached Gemini models")
-            return self.cache["gemini_models"]["data"]
-        
-        if force_refresh:
-            safe_print("[CACHE] Force refreshing Gemini models (model not found)")
-        
+        return self._discovered("gemini_models", self._discover_gemini_models, api_key, force_refresh)
+    
+    def _discover_gemini_models(self, api_key: str = None) -> List[str]:
+        """List Gemini models and probe their quotas (network)."""
         if not api_key:
             safe_print("[!] No GEMINI_API_KEY - cannot discover models")
             return []
@@ -277,9 +324,8 @@ class QuotaOptimizer:
             quota_cache = {}
             QUOTA_TTL_HOURS = 24  # Re-check quotas daily
             try:
-                if quota_cache_file.exists():
-                    with open(quota_cache_file, 'r') as f:
-                        raw_cache = json.load(f)
+                if state_exists(quota_cache_file):
+                    raw_cache = load_state(quota_cache_file)
                     # Filter to only fresh entries
                     for key, value in raw_cache.items():
                         if "_discovered_at" in key:
@@ -345,8 +391,7 @@ class QuotaOptimizer:
             # Save updated quota cache
             try:
                 quota_cache_file.parent.mkdir(parents=True, exist_ok=True)
-                with open(quota_cache_file, 'w') as f:
-                    json.dump(quota_cache, f, indent=2)
+                save_state(quota_cache_file, quota_cache)
             except:
                 pass
             
@@ -383,13 +428,11 @@ class QuotaOptimizer:
         
         LAZY LOADING: Set force_refresh=True when a model returns 404.
         """
-        if not force_refresh and self._is_valid("openrouter_free_models", self.TTL_MODELS):
-            safe_print("[CACHE] Using cached OpenRouter free models")
-            return self.cache["openrouter_free_models"]["data"]
-        
-        if force_refresh:
-            safe_print("[CACHE] Force refreshing OpenRouter models (model not found)")
-        
+        return self._discovered("openrouter_free_models", self._discover_openrouter_free_models,
+                                api_key, force_refresh)
+    
+    def _discover_openrouter_free_models(self, api_key: str = None) -> List[str]:
+        """Query the OpenRouter /models endpoint for free models (network)."""
         # Default fallback models (known free models as of 2024)
         default_models = [
             "meta-llama/llama-3.2-3b-instruct:free",
@@ -444,10 +487,11 @@ class QuotaOptimizer:
         Uses HuggingFace API to discover popular instruction-tuned models.
         Cached for 6 hours.
         """
-        if not force_refresh and self._is_valid("huggingface_models", self.TTL_MODELS):
-            safe_print("[CACHE] Using cached HuggingFace models")
-            return self.cache["huggingface_models"]["data"]
-        
+        return self._discovered("huggingface_models", self._discover_huggingface_models,
+                                api_key, force_refresh)
+    
+    def _discover_huggingface_models(self, api_key: str = None) -> List[str]:
+        """Query the HuggingFace Hub for instruction-tuned models (network)."""
         # Default fallback models - NON-GATED models only!
         # Note: meta-llama and mistralai models are GATED (require license acceptance)
         default_models = [
@@ -572,17 +616,15 @@ class ScheduleAdvisor:
     
     def _load(self) -> Dict:
         try:
-            if self.SCHEDULE_FILE.exists():
-                with open(self.SCHEDULE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(self.SCHEDULE_FILE):
+                return load_state(self.SCHEDULE_FILE)
         except:
             pass
         return self.DEFAULTS.copy()
     
     def _save(self):
         try:
-            with open(self.SCHEDULE_FILE, 'w') as f:
-                json.dump(self.recommendations, f, indent=2)
+            save_state(self.SCHEDULE_FILE, self.recommendations)
         except:
             pass
     
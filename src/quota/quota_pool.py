@@ -28,6 +28,17 @@ POOL_STATE_FILE = Path("data/persistent/quota_pools.json")
 # Safety margin (10%)
 SAFETY_MARGIN = 0.10
 
+# v18.7: Pool state is flushed write-behind by the shared quota ledger
+try:
+    from quota_ledger import get_quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.quota_ledger import get_quota_ledger
+        QUOTA_LEDGER_AVAILABLE = True
+    except ImportError:
+        QUOTA_LEDGER_AVAILABLE = False
+
 
 @dataclass
 class ModelQuota:
@@ -150,18 +161,23 @@ class QuotaPoolManager:
         except Exception as e:
             print(f"[QUOTA_POOL] Failed to load state: {e}")
     
+    def _state_snapshot(self) -> Dict:
+        return {
+            "last_reset": self.last_reset,
+            "last_updated": datetime.now().isoformat(),
+            "models": [asdict(m) for m in self.models.values()],
+            "pools": {name: asdict(pool) for name, pool in self.pools.items()},
+        }
+    
     def _save_state(self):
-        """Save state to persistent storage."""
+        """Save state to persistent storage (v18.7: write-behind via the ledger)."""
+        if QUOTA_LEDGER_AVAILABLE:
+            get_quota_ledger().write_behind(POOL_STATE_FILE, self._state_snapshot)
+            return
         try:
             POOL_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            data = {
-                "last_reset": self.last_reset,
-                "last_updated": datetime.now().isoformat(),
-                "models": [asdict(m) for m in self.models.values()],
-                "pools": {name: asdict(pool) for name, pool in self.pools.items()},
-            }
             with open(POOL_STATE_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+                json.dump(self._state_snapshot(), f, indent=2)
         except Exception as e:
             print(f"[QUOTA_POOL] Failed to save state: {e}")
     
@@ -12,12 +12,23 @@ This module orchestrates all v15.0 intelligent systems:
 It provides a single interface for the video generator to use all these systems.
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Learned prompt boosts built once per state version
+try:
+    from boost_snapshots import get_boost_snapshots
+except ImportError:
+    from src.ai.boost_snapshots import get_boost_snapshots
+
 # State directory
 STATE_DIR = Path("data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -73,9 +84,8 @@ class SmartOrchestrator:
     def _load(self) -> Dict:
         """Load session data from disk."""
         try:
-            if ORCHESTRATOR_FILE.exists():
-                with open(ORCHESTRATOR_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(ORCHESTRATOR_FILE):
+                return load_state(ORCHESTRATOR_FILE)
         except:
             pass
         return {
@@ -90,8 +100,7 @@ class SmartOrchestrator:
     def _save(self):
         """Save session data to disk."""
         try:
-            with open(ORCHESTRATOR_FILE, 'w') as f:
-                json.dump(self.session_data, f, indent=2)
+            save_state(ORCHESTRATOR_FILE, self.session_data)
         except:
             pass
     
@@ -146,14 +155,15 @@ class SmartOrchestrator:
             Combined prompt boost string
         """
         boosts = []
+        snapshots = get_boost_snapshots()
         
         if self.first_attempt:
-            boost = self.first_attempt.get_quality_boost_prompt()
+            boost = snapshots.first_attempt(self.first_attempt)
             if boost:
                 boosts.append(boost)
         
         if self.learning_engine:
-            boost = self.learning_engine.get_prompt_boost()
+            boost = snapshots.learning(self.learning_engine)
             if boost:
                 boosts.append(boost)
         
@@ -211,21 +221,22 @@ class SmartOrchestrator:
                 was_regeneration=was_regeneration
             )
         
-        # Record token usage
+        # Record token usage (v18.7: both trackers read the shared quota ledger - record once)
         if self.budget_manager:
             self.budget_manager.record_usage(provider, tokens_used)
-        
-        if self.quota_monitor:
+        elif self.quota_monitor:
             self.quota_monitor.record_usage(provider, tokens_used)
         
         print(f"[Orchestrator] Recorded video result: score={score}, tokens={tokens_used}")
     
     def record_api_error(self, provider: str, error_type: str, retry_seconds: int = 60):
         """Record an API error (e.g., 429)."""
-        if self.budget_manager and error_type == "429":
+        if error_type != "429":
+            return
+        # v18.7: Both trackers read the shared quota ledger - record once
+        if self.budget_manager:
             self.budget_manager.record_429(provider, retry_seconds)
-        
-        if self.quota_monitor and error_type == "429":
+        elif self.quota_monitor:
             self.quota_monitor.record_429(provider, retry_seconds)
     
     def get_session_summary(self) -> str:
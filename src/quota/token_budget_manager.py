@@ -40,6 +40,29 @@ except ImportError:
     def get_best_gemini_model(api_key=None):
         return "gemini-2.5-flash"  # Fallback only if import fails
 
+# v18.7: Usage and cooldowns live in the shared quota ledger
+try:
+    from quota_ledger import get_quota_ledger
+    QUOTA_LEDGER_AVAILABLE = True
+except ImportError:
+    try:
+        from src.quota.quota_ledger import get_quota_ledger
+        QUOTA_LEDGER_AVAILABLE = True
+    except ImportError:
+        QUOTA_LEDGER_AVAILABLE = False
+
+# v18.7: Charge actual prompt + completion tokens, not the max_tokens ceiling
+try:
+    from token_usage import make_response
+except ImportError:
+    from src.quota.token_usage import make_response
+
+# v18.7: FirstAttemptMaximizer history lives in the shared state store
+try:
+    from state_store import load_state, save_state
+except ImportError:
+    from src.utils.state_store import load_state, save_state
+
 # State directory
 STATE_DIR = Path("data/persistent")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
@@ -65,6 +88,9 @@ class TokenBudgetManager:
     """
     Manages token budgets across all AI providers.
     Ensures we never hit rate limits by smart distribution.
+    
+    v18.7: An adapter over the quota ledger - used_today, calls_today and
+    cooldowns are read from it, and token_budget.json is write-behind.
     """
     
     # Provider limits (configurable via environment - no hardcoding)
@@ -88,8 +114,14 @@ class TokenBudgetManager:
     }
     
     def __init__(self):
+        self.ledger = get_quota_ledger() if QUOTA_LEDGER_AVAILABLE else None
         self.budgets = self._load()
         self._check_daily_reset()
+        if self.ledger:
+            # First run on the ledger: carry over what was already spent today
+            for name, budget in self.budgets.items():
+                self.ledger.seed_usage(name, budget.used_today, budget.calls_today)
+            self._sync()
     
     def _load(self) -> Dict[str, ProviderBudget]:
         """Load budget state from disk."""
@@ -136,8 +168,34 @@ class TokenBudgetManager:
             )
         }
     
+    def _sync(self, provider: str = None):
+        """v18.7: Refresh budget counters from the quota ledger."""
+        if not self.ledger:
+            return
+        names = [provider] if provider else list(self.budgets)
+        for name in names:
+            budget = self.budgets.get(name)
+            if budget is None:
+                continue
+            usage = self.ledger.usage(name)
+            budget.used_today = usage["tokens"]
+            budget.calls_today = usage["calls"]
+            budget.last_429_time = usage["last_429"] or budget.last_429_time
+            remaining = self.ledger.cooldown_remaining(name)
+            budget.cooldown_until = (
+                (datetime.now() + timedelta(seconds=remaining)).isoformat()
+                if remaining > 0 else None
+            )
+    
+    def _snapshot(self) -> Dict:
+        self._sync()
+        return {name: asdict(budget) for name, budget in self.budgets.items()}
+    
     def _save(self):
-        """Save budget state to disk."""
+        """Save budget state to disk (write-behind through the ledger)."""
+        if self.ledger:
+            self.ledger.write_behind(BUDGET_FILE, self._snapshot)
+            return
         try:
             data = {name: asdict(budget) for name, budget in self.budgets.items()}
             with open(BUDGET_FILE, 'w') as f:
@@ -165,6 +223,7 @@ class TokenBudgetManager:
         """Get available tokens for a provider."""
         if provider not in self.budgets:
             return 0
+        self._sync(provider)
         budget = self.budgets[provider]
         return budget.daily_limit - budget.used_today - budget.reserved
     
@@ -172,6 +231,8 @@ class TokenBudgetManager:
         """Check if provider is in cooldown from 429."""
         if provider not in self.budgets:
             return False
+        if self.ledger:
+            return self.ledger.in_cooldown(provider)
         budget = self.budgets[provider]
         if not budget.cooldown_until:
             return False
@@ -184,6 +245,12 @@ class TokenBudgetManager:
     def record_429(self, provider: str, retry_seconds: int = 60):
         """Record a 429 error and set cooldown."""
         if provider in self.budgets:
+            if self.ledger:
+                self.ledger.record_429(provider, retry_seconds)
+                self._sync(provider)
+                self._save()
+                print(f"[TokenBudget] {provider} in cooldown for {retry_seconds}s")
+                return
             now = datetime.now()
             self.budgets[provider].last_429_time = now.isoformat()
             self.budgets[provider].cooldown_until = (
@@ -193,10 +260,14 @@ class TokenBudgetManager:
             print(f"[TokenBudget] {provider} in cooldown for {retry_seconds}s")
     
     def record_usage(self, provider: str, tokens: int):
-        """Record token usage."""
+        """Record token usage (v18.7: one ledger update, shared with QuotaMonitor)."""
         if provider in self.budgets:
-            self.budgets[provider].used_today += tokens
-            self.budgets[provider].calls_today += 1
+            if self.ledger:
+                self.ledger.record_usage(provider, tokens)
+                self._sync(provider)
+            else:
+                self.budgets[provider].used_today += tokens
+                self.budgets[provider].calls_today += 1
             # Update running average
             calls = self.budgets[provider].calls_today
             avg = self.budgets[provider].avg_tokens_per_call
@@ -259,6 +330,7 @@ class TokenBudgetManager:
     
     def get_status(self) -> Dict:
         """Get current budget status."""
+        self._sync()
         return {
             name: {
                 "available": self.get_available_tokens(name),
@@ -422,8 +494,9 @@ class BudgetAwareAICaller:
                         max_tokens=max_tokens,
                         temperature=temperature
                     )
-                    result = response.choices[0].message.content
-                    self.budget.record_usage("groq", max_tokens)
+                    result = make_response(response.choices[0].message.content, prompt,
+                                           f"groq:{model_name}", response)
+                    self.budget.record_usage("groq", getattr(result, "total_tokens", 0))
                     return result
                 except Exception as e:
                     error_str = str(e)
@@ -445,8 +518,9 @@ class BudgetAwareAICaller:
             if self.gemini_model:
                 try:
                     response = self.gemini_model.generate_content(prompt)
-                    self.budget.record_usage("gemini", max_tokens)
-                    return response.text
+                    result = make_response(response.text, prompt, "gemini", response)
+                    self.budget.record_usage("gemini", getattr(result, "total_tokens", 0))
+                    return result
                 except Exception as e:
                     error_str = str(e)
                     if '429' in error_str:
@@ -479,7 +553,8 @@ class BudgetAwareAICaller:
                     result = response.json()
                     content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
                     if content:
-                        self.budget.record_usage("openrouter", max_tokens)
+                        content = make_response(content, prompt, "openrouter", result)
+                        self.budget.record_usage("openrouter", content.total_tokens)
                         return content
             except Exception as e:
                 print(f"[BudgetAI] OpenRouter error: {e}")
@@ -509,9 +584,7 @@ class FirstAttemptMaximizer:
     
     def _load(self) -> Dict:
         try:
-            if self.HISTORY_FILE.exists():
-                with open(self.HISTORY_FILE, 'r') as f:
-                    return json.load(f)
+            return load_state(self.HISTORY_FILE)
         except:
             pass
         return {
@@ -524,8 +597,7 @@ class FirstAttemptMaximizer:
     
     def _save(self):
         try:
-            with open(self.HISTORY_FILE, 'w') as f:
-                json.dump(self.history, f, indent=2)
+            save_state(self.HISTORY_FILE, self.history)
         except:
             pass
     
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Token Usage v18.7
+========================================
+
+Actual prompt/completion token counts for every AI call.
+
+Budgets used to be charged the requested ceiling (`max_tokens`) and never
+the prompt, so quota and "videos remaining" estimates were systematically
+wrong. Provider callers now return an AIResponse:
+
+- a plain str subclass (existing callers keep working unchanged)
+- carrying prompt_tokens / completion_tokens taken from the provider's
+  usage fields (OpenAI-style `usage`, Gemini `usage_metadata`, or the
+  `usage` object of a JSON body)
+- falling back to a local tokenizer estimate when a provider (or a stream)
+  reports no usage - tiktoken if installed, otherwise a word-piece count
+- plus latency and the model key that produced it
+"""
+
+import re
+from typing import Any, Optional, Tuple
+
+# Optional: a real BPE tokenizer for estimates (close enough for Llama/Gemini)
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+    TIKTOKEN_AVAILABLE = True
+except Exception:
+    _ENCODING = None
+    TIKTOKEN_AVAILABLE = False
+
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token estimate for text the provider didn't count."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    # BPE vocabularies keep common words whole and split long ones ~4 chars a piece
+    return sum(max(1, (len(piece) + 3) // 4) if piece.isalpha() else
+               max(1, (len(piece) + 2) // 3) if piece.isdigit() else 1
+               for piece in _PIECES.findall(text))
+
+
+class AIResponse(str):
+    """
+    Response text that also carries what the call cost.
+
+    Behaves exactly like a str; callers that care read the attributes.
+    """
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated: bool = False  # True if any count came from estimate_tokens()
+    latency: Optional[float] = None
+    model_key: Optional[str] = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+def usage_from_response(response: Any) -> Tuple[Optional[int], Optional[int]]:
+    """(prompt_tokens, completion_tokens) from a provider response, or Nones."""
+    if response is None:
+        return None, None
+    usage = response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    if usage is not None:
+        get = usage.get if isinstance(usage, dict) else lambda k: getattr(usage, k, None)
+        prompt, completion = get("prompt_tokens"), get("completion_tokens")
+        if prompt is not None or completion is not None:
+            return prompt, completion
+    metadata = getattr(response, "usage_metadata", None)  # Gemini
+    if metadata is not None:
+        prompt = getattr(metadata, "prompt_token_count", None)
+        completion = getattr(metadata, "candidates_token_count", None)
+        if prompt is not None or completion is not None:
+            return prompt, completion
+    return None, None
+
+
+def make_response(text: Optional[str], prompt: str, model_key: str = None,
+                  response: Any = None, latency: float = None) -> Optional[AIResponse]:
+    """
+    Wrap response text with its token usage.
+
+    Args:
+        text: The response text (None/empty passes through as None)
+        prompt: The prompt that was sent (for the estimate fallback)
+        model_key: "provider:model_id" that answered
+        response: Raw provider response/JSON body to read usage fields from
+        latency: Seconds the call took
+    """
+    if not text:
+        return None
+    if isinstance(text, AIResponse) and response is None:
+        result = text
+    else:
+        result = AIResponse(text)
+        prompt_tokens, completion_tokens = usage_from_response(response)
+        result.estimated = prompt_tokens is None or completion_tokens is None
+        result.prompt_tokens = prompt_tokens if prompt_tokens is not None else estimate_tokens(prompt)
+        result.completion_tokens = (completion_tokens if completion_tokens is not None
+                                    else estimate_tokens(text))
+    if model_key:
+        result.model_key = model_key
+    if latency is not None:
+        result.latency = latency
+    return result
+
+
+def response_tokens(text: Any) -> Tuple[int, int]:
+    """(prompt, completion) tokens of a response; 0s for cache hits / plain strings."""
+    if isinstance(text, AIResponse):
+        return text.prompt_tokens, text.completion_tokens
+    return 0, 0
+
+
+if __name__ == "__main__":
+    sample = "Here are 7 psychology facts that will change how you think about habits."
+    print(f"tiktoken available: {TIKTOKEN_AVAILABLE}")
+    print(f"Estimate: {estimate_tokens(sample)} tokens for {len(sample)} chars")
+    r = make_response("{\"topic\": \"habits\"}", sample, "groq:llama-3.3-70b-versatile",
+                      {"usage": {"prompt_tokens": 18, "completion_tokens": 7}})
+    print(f"From usage: {r.prompt_tokens}+{r.completion_tokens}={r.total_tokens} "
+          f"(estimated={r.estimated}) {r.model_key}")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Call Deadlines v18.7
+==========================================
+
+Time budgets that every layer of the AI call stack respects.
+
+Retries used to nest: a stage loops around MasterAI.call_ai, call_ai falls
+back from the smart router to the legacy chain, and the router tries every
+model with up to three retries and 5s -> 10s backoff. One bad stretch could
+stall a single video for many minutes.
+
+Now each stage runs under a deadline:
+
+    with stage_deadline("concept"):      # or @stage_deadline("concept")
+        response = self.call_ai(...)
+
+- Deadlines nest; an inner stage never outlives the stage around it.
+- Rate-limit waits and retry backoff go through sleep_within(), which
+  refuses to sleep past the deadline (the caller moves on instead).
+- Model chains stop once deadline_expired() and return None, so the stage
+  uses its existing fallback (pre-generated concept, best content so far...).
+- Each stage logs the time it spent against its budget on exit.
+
+Without an active deadline every helper behaves like before (plain sleeps,
+unlimited retries), so code outside the pipeline is unaffected.
+"""
+
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def safe_print(msg: str):
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        import re
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+# Seconds each pipeline stage may spend on AI calls
+STAGE_BUDGETS = {
+    "concept": 60,
+    "content": 90,
+    "evaluate": 30,
+    "regenerate": 180,
+    "broll": 20,
+    "metadata": 30,
+}
+
+# Multiplies every budget (e.g. 2.0 on a slow runner, 0.5 for quick tests)
+DEADLINE_SCALE = float(os.environ.get("AI_DEADLINE_SCALE", "1.0"))
+
+# Provider requests shorter than this are not worth starting
+MIN_REQUEST_SECONDS = 5.0
+
+_current = contextvars.ContextVar("ai_deadline", default=None)
+
+
+class Deadline:
+    """A stage's time budget (capped by any enclosing deadline)."""
+
+    def __init__(self, stage: str, seconds: float, parent: "Deadline" = None):
+        self.stage = stage
+        self.budget = seconds
+        self.started = time.time()
+        self.expires = self.started + seconds
+        if parent is not None:
+            self.expires = min(self.expires, parent.expires)
+        self.parent = parent
+        self.gave_up = 0  # Sleeps/retries/models skipped because of this deadline
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.time())
+
+    def expired(self) -> bool:
+        return time.time() >= self.expires
+
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+
+class StageTimings:
+    """Time spent per stage against its budget (this run)."""
+
+    def __init__(self):
+        self.records: List[Dict] = []
+
+    def record(self, deadline: Deadline):
+        elapsed = deadline.elapsed()
+        entry = {
+            "stage": deadline.stage,
+            "elapsed": round(elapsed, 1),
+            "budget": deadline.budget,
+            "over": elapsed > deadline.budget,
+            "gave_up": deadline.gave_up,
+        }
+        self.records.append(entry)
+        status = "OVER" if entry["over"] else "ok"
+        extra = f", {deadline.gave_up} retries/models cut" if deadline.gave_up else ""
+        safe_print(f"   [DEADLINE] {deadline.stage}: {elapsed:.1f}s of "
+                   f"{deadline.budget:.0f}s ({status}{extra})")
+
+    def get_report(self) -> Dict:
+        stages = {}
+        for entry in self.records:
+            stage = stages.setdefault(entry["stage"], {
+                "runs": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                "budget": entry["budget"], "overruns": 0
+            })
+            stage["runs"] += 1
+            stage["total_seconds"] = round(stage["total_seconds"] + entry["elapsed"], 1)
+            stage["max_seconds"] = max(stage["max_seconds"], entry["elapsed"])
+            stage["overruns"] += int(entry["over"])
+        return stages
+
+
+_timings = StageTimings()
+
+
+@contextmanager
+def stage_deadline(stage: str, seconds: float = None):
+    """
+    Run a block (or, as a decorator, a function) under a deadline.
+
+    Args:
+        stage: Stage name - also picks the default budget from STAGE_BUDGETS
+        seconds: Explicit budget in seconds (overrides STAGE_BUDGETS)
+    """
+    if seconds is None:
+        seconds = STAGE_BUDGETS.get(stage, 60) * DEADLINE_SCALE
+    deadline = Deadline(stage, seconds, parent=_current.get())
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+        _timings.record(deadline)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def time_left(default: float = None) -> Optional[float]:
+    """Seconds left in the current deadline (default if there is none)."""
+    deadline = _current.get()
+    return deadline.remaining() if deadline else default
+
+
+def deadline_expired() -> bool:
+    deadline = _current.get()
+    return deadline is not None and deadline.expired()
+
+
+def sleep_within(seconds: float, reserve: float = MIN_REQUEST_SECONDS) -> bool:
+    """
+    Sleep unless that would leave less than `reserve` seconds for the call
+    that follows. Returns False (without sleeping) when the caller should
+    give up instead of waiting.
+    """
+    deadline = _current.get()
+    if deadline is not None and deadline.remaining() - reserve < seconds:
+        deadline.gave_up += 1
+        return False
+    if seconds > 0:
+        time.sleep(seconds)
+    return True
+
+
+def request_timeout(default: float) -> float:
+    """HTTP timeout for one provider request, capped by the deadline."""
+    left = time_left()
+    if left is None:
+        return default
+    return max(1.0, min(default, left))
+
+
+def give_up(reason: str):
+    """Log that a layer stopped early because the deadline ran out."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.gave_up += 1
+        safe_print(f"   [DEADLINE] {deadline.stage}: {reason}")
+
+
+def get_deadline_report() -> Dict:
+    """Per-stage time spent against each budget in this run."""
+    return _timings.get_report()
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" CALL DEADLINES")
+    safe_print("=" * 60)
+
+    with stage_deadline("regenerate", 3) as outer:
+        with stage_deadline("concept") as inner:
+            safe_print(f"Inner remaining (capped by outer): {inner.remaining():.1f}s")
+            safe_print(f"Backoff 10s allowed: {sleep_within(10)}")
+            safe_print(f"Request timeout: {request_timeout(60):.1f}s")
+
+    safe_print(f"Report: {get_deadline_report()}")
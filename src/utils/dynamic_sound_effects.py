@@ -22,6 +22,12 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 try:
     import requests
 except ImportError:
@@ -65,17 +71,15 @@ class DynamicSoundEffectSelector:
     
     def _load_learning(self) -> Dict:
         try:
-            if SFX_LEARNING_FILE.exists():
-                with open(SFX_LEARNING_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(SFX_LEARNING_FILE):
+                return load_state(SFX_LEARNING_FILE)
         except:
             pass
         return {"sfx_performance": {}, "category_preferences": {}}
     
     def _save_learning(self):
         self.learning_data["last_updated"] = datetime.now().isoformat()
-        with open(SFX_LEARNING_FILE, 'w') as f:
-            json.dump(self.learning_data, f, indent=2)
+        save_state(SFX_LEARNING_FILE, self.learning_data)
     
     def get_ai_sfx_recommendation(self, content: str, category: str, video_moment: str) -> Dict:
         """Ask AI to recommend ideal sound effects."""
@@ -10,12 +10,17 @@ Centralized error logging that:
 """
 
 import os
-import json
 import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Create logs directory
 LOGS_DIR = Path("./data/logs")
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -43,9 +48,8 @@ class ErrorLogger:
     def _load_errors(self) -> Dict:
         """Load existing error log."""
         try:
-            if ERROR_LOG_FILE.exists():
-                with open(ERROR_LOG_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(ERROR_LOG_FILE):
+                return load_state(ERROR_LOG_FILE)
         except:
             pass
         return {
@@ -60,8 +64,7 @@ class ErrorLogger:
         try:
             # Keep only last 500 errors
             self.errors["errors"] = self.errors["errors"][-500:]
-            with open(ERROR_LOG_FILE, 'w') as f:
-                json.dump(self.errors, f, indent=2)
+            save_state(ERROR_LOG_FILE, self.errors)
         except:
             pass  # Don't fail on logging failure
     
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Lazy Import Registry v18.7
+=================================================
+
+Defers optional modules until their stage actually runs.
+
+pro_video_generator used to import ~80 optional modules (enhancements_v9/v12,
+moviepy, google.generativeai, edge_tts, ...) at module load, many of which
+create state directories or read JSON on import. A `--help`, test, or
+analytics-only run paid for all of them.
+
+With the registry, each name is still an ordinary module-level binding (so
+static checkers see every definition), but its import is deferred:
+
+    LAZY = LazyRegistry()
+    np = LAZY.module("numpy")
+
+    _VIRAL = LAZY.register("VIRAL_PATTERNS_AVAILABLE", "viral_channel_analyzer")
+    VIRAL_PATTERNS_AVAILABLE = _VIRAL.available
+    get_viral_prompt_boost = _VIRAL.symbol("get_viral_prompt_boost",
+                                           fallback=lambda **_: "")
+
+    if VIRAL_PATTERNS_AVAILABLE:      # first truth test imports the module
+        boost = get_viral_prompt_boost()
+
+A feature's symbols must all import for its flag to be True. Symbols are
+proxies that cache the real object (or fallback) on first use; constants
+used in comparisons are read with .get(). `profile_imports()` backs the
+`--import-profile` CLI option.
+"""
+
+import importlib
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+_NO_FALLBACK = object()
+
+
+class LazyFeature:
+    """
+    One optional import block: a set of modules, the symbols taken from
+    them, the *_AVAILABLE flag describing the outcome, and fallbacks.
+    """
+
+    def __init__(self, registry: "LazyRegistry", flag: str, modules: Iterable[str],
+                 packages: Iterable[str] = ("",), on_load: Callable[[Dict], None] = None,
+                 loaded_msg: str = None, missing_msg: str = None):
+        self.registry = registry
+        self.flag = flag
+        self.imports: Dict[str, List[str]] = {name: [] for name in modules}
+        self.packages = tuple(packages)
+        self.on_load = on_load
+        self.loaded_msg = loaded_msg
+        self.missing_msg = missing_msg
+        self.available = LazyFlag(self)
+
+        self.loaded: Optional[bool] = None  # None = not resolved yet
+        self.values: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.seconds = 0.0
+
+    def symbol(self, name: str, module: str = None, fallback: Any = _NO_FALLBACK) -> "LazySymbol":
+        """
+        Declare a name imported from `module` (default: the feature's first
+        module). `fallback` is used instead if the feature is unavailable.
+        """
+        module = module or next(iter(self.imports))
+        self.imports.setdefault(module, []).append(name)
+        return LazySymbol(self, name, fallback)
+
+    def _import_from(self, package: str) -> Dict:
+        """Import every module under one package prefix (all or nothing)."""
+        prefix = f"{package}." if package else ""
+        bound = {}
+        for module_name, names in self.imports.items():
+            module = importlib.import_module(prefix + module_name)
+            bound[module_name] = module
+            for name in names:
+                if not hasattr(module, name):
+                    try:  # Submodule, e.g. `from PIL import Image`
+                        importlib.import_module(f"{module.__name__}.{name}")
+                    except ImportError:
+                        raise ImportError(f"cannot import name '{name}' from '{module.__name__}'")
+                bound[name] = getattr(module, name)
+        return bound
+
+    def load(self) -> bool:
+        """Resolve the feature (once)."""
+        if self.loaded is not None:
+            return self.loaded
+
+        with self.registry.lock:
+            if self.loaded is not None:
+                return self.loaded
+
+            start = time.perf_counter()
+            bound, error = None, None
+            for package in self.packages:
+                try:
+                    bound = self._import_from(package)
+                    break
+                except ImportError as e:
+                    error = e
+            self.seconds = time.perf_counter() - start
+
+            if bound is not None:
+                if self.on_load:
+                    self.on_load(bound)
+                self.values = bound
+            else:
+                self.error = str(error)
+            self.loaded = bound is not None
+
+        if self.loaded:
+            if self.loaded_msg:
+                safe_print(self.loaded_msg)
+        elif self.missing_msg:
+            safe_print(self.missing_msg.format(e=self.error))
+        return self.loaded
+
+
+class LazyFlag:
+    """Stand-in for a *_AVAILABLE boolean; the first truth test loads the feature."""
+
+    __slots__ = ("_feature",)
+
+    def __init__(self, feature: LazyFeature):
+        self._feature = feature
+
+    def __bool__(self) -> bool:
+        return self._feature.load()
+
+    def __eq__(self, other) -> bool:
+        return bool(self) == other
+
+    __hash__ = object.__hash__
+
+    def __str__(self) -> str:
+        return str(bool(self))
+
+    def __repr__(self) -> str:
+        state = "unresolved" if self._feature.loaded is None else self._feature.loaded
+        return f"<lazy flag {self._feature.flag}: {state}>"
+
+
+class LazySymbol:
+    """
+    Stand-in for an imported name. Calling it, reading an attribute or testing
+    its truth loads the feature and forwards to the real object (or fallback),
+    which is cached on first use.
+    """
+
+    __slots__ = ("_feature", "_name", "_fallback", "_value")
+
+    def __init__(self, feature: LazyFeature, name: str, fallback: Any = _NO_FALLBACK):
+        self._feature = feature
+        self._name = name
+        self._fallback = fallback
+        self._value = _NO_FALLBACK
+
+    def get(self) -> Any:
+        """The real object (or fallback) - use for constants in comparisons."""
+        value = self._value
+        if value is _NO_FALLBACK:
+            if self._feature.load():
+                value = self._feature.values[self._name]
+            elif self._fallback is not _NO_FALLBACK:
+                value = self._fallback
+            else:
+                raise ImportError(f"{self._name} is unavailable ({self._feature.flag} is False: "
+                                  f"{self._feature.error})")
+            self._value = value
+        return value
+
+    def __call__(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
+
+    def __bool__(self) -> bool:
+        try:
+            return bool(self.get())
+        except ImportError:
+            return False
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._name} from {self._feature.flag}>"
+
+
+class LazyRegistry:
+    """All lazy features of one module."""
+
+    def __init__(self):
+        self.features: Dict[str, LazyFeature] = {}
+        self.lock = threading.RLock()
+
+    def register(self, flag: str, modules: Union[str, Iterable[str]], **options) -> LazyFeature:
+        """
+        Declare an optional import block; bind its flag (feature.available)
+        and names (feature.symbol(...)) to module-level names.
+
+        Args:
+            flag: *_AVAILABLE name reported by get_report()
+            modules: Module(s) that must all import for the flag to be True
+            packages: Prefixes to try in order, e.g. ("", "src.ai")
+            on_load: Callback({name: object}) after a successful load
+            loaded_msg / missing_msg: Printed on resolution ({e} = error)
+        """
+        if isinstance(modules, str):
+            modules = (modules,)
+        feature = LazyFeature(self, flag, modules, **options)
+        self.features[flag] = feature
+        return feature
+
+    def module(self, module_name: str, **options) -> LazySymbol:
+        """A lazily imported third-party module (`np = LAZY.module("numpy")`)."""
+        feature = self.register(f"_{module_name.upper().replace('.', '_')}_MODULE_AVAILABLE",
+                                module_name, **options)
+        return LazySymbol(feature, module_name)
+
+    def load_all(self) -> Dict[str, bool]:
+        """Resolve every feature now (import profiling, full pipeline runs)."""
+        return {flag: feature.load() for flag, feature in self.features.items()}
+
+    def get_report(self) -> Dict[str, Dict]:
+        """State and load time of every feature."""
+        report = {}
+        for flag, feature in self.features.items():
+            if feature.loaded is None:
+                state = "deferred"
+            else:
+                state = "loaded" if feature.loaded else "missing"
+            report[flag] = {"state": state, "ms": round(feature.seconds * 1000, 1),
+                            "error": feature.error}
+        return report
+
+    def print_report(self, title: str = "LAZY FEATURES"):
+        report = self.get_report()
+        loaded = sum(1 for r in report.values() if r["state"] == "loaded")
+        deferred = sum(1 for r in report.values() if r["state"] == "deferred")
+        safe_print(f"\n=== {title}: {loaded} loaded, {deferred} never needed, "
+                   f"{len(report) - loaded - deferred} missing ===")
+        for flag, r in sorted(report.items(), key=lambda x: -x[1]["ms"]):
+            if r["state"] != "deferred":
+                safe_print(f"  {r['ms']:8.1f} ms  {r['state']:<8}  {flag}")
+
+
+# =============================================================================
+# IMPORT PROFILING (python -X importtime)
+# =============================================================================
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s+)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Turn `-X importtime` output into a tree.
+
+    Children are printed before their parent, so nodes are collected per depth
+    until the enclosing import's line arrives.
+    """
+    pending: Dict[int, List[Dict]] = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        node = {
+            "name": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "children": pending.pop(depth + 1, [])
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def measure_import(module: str, paths: Iterable[str] = (), statement: str = None,
+                   cwd: str = None) -> Dict:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        {"seconds": wall time, "tree": parse_importtime(...), "error": stderr tail or None}
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(list(paths) + [env.get("PYTHONPATH", "")]).strip(os.pathsep)
+    env["PYTHONIOENCODING"] = "utf-8"
+    code = statement or f"import {module}"
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=cwd, timeout=300
+    )
+    seconds = time.perf_counter() - start
+
+    error = None
+    if result.returncode != 0:
+        error = "\n".join(line for line in result.stderr.splitlines()
+                          if not line.startswith("import time:"))[-2000:]
+    return {"seconds": seconds, "tree": parse_importtime(result.stderr), "error": error}
+
+
+def print_import_tree(tree: List[Dict], threshold_ms: float = 5.0, max_depth: int = 4,
+                      depth: int = 0):
+    """Print imports above threshold_ms, heaviest first."""
+    for node in sorted(tree, key=lambda n: -n["cumulative_ms"]):
+        if node["cumulative_ms"] < threshold_ms:
+            continue
+        safe_print(f"  {node['cumulative_ms']:9.1f} ms {node['self_ms']:8.1f} ms  "
+                   f"{'  ' * depth}{node['name']}")
+        if depth + 1 < max_depth:
+            print_import_tree(node["children"], threshold_ms, max_depth, depth + 1)
+
+
+def profile_imports(module: str, paths: Iterable[str] = (), threshold_ms: float = 5.0,
+                    max_depth: int = 4) -> Dict:
+    """
+    Startup benchmark: per-module import time tree for `import module`.
+
+    Runs in a subprocess so already-imported modules don't hide the cost.
+    """
+    result = measure_import(module, paths)
+    safe_print(f"\n=== IMPORT PROFILE: {module} ({result['seconds'] * 1000:.0f} ms wall) ===")
+    safe_print(f"  {'cumulative':>12} {'self':>11}  module")
+    print_import_tree(result["tree"], threshold_ms, max_depth)
+    if result["error"]:
+        safe_print(f"[!] Import failed:\n{result['error']}")
+    return result
+
+
+if __name__ == "__main__":
+    safe_print("Testing Lazy Import Registry...")
+
+    registry = LazyRegistry()
+    json_feature = registry.register("JSON_AVAILABLE", "json", loaded_msg="[OK] json loaded")
+    JSON_AVAILABLE = json_feature.available
+    dumps = json_feature.symbol("dumps")
+    missing = registry.register("MISSING_AVAILABLE", "not_a_real_module",
+                                missing_msg="[!] missing: {e}")
+    thing = missing.symbol("thing", fallback=lambda: "fallback")
+
+    safe_print(f"Before use: {JSON_AVAILABLE!r}")
+    safe_print(f"dumps via proxy: {dumps({'a': 1})}")
+    safe_print(f"After use: {JSON_AVAILABLE!r}")
+    safe_print(f"Fallback: {thing()} (flag={bool(missing.available)})")
+    registry.print_report()
+
+    profile_imports("json", threshold_ms=0.1)
+
+    safe_print("\nTest complete!")
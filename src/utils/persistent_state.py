@@ -25,13 +25,29 @@ This is the CORE fix for analytics feedback and upload management!
 """
 
 import os
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict, field
 import hashlib
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
+# v18.7: Per-video facts are shared through the indexed video table
+try:
+    from video_metadata_db import record_video_facts
+    VIDEO_DB_AVAILABLE = True
+except ImportError:
+    try:
+        from src.analytics.video_metadata_db import record_video_facts
+        VIDEO_DB_AVAILABLE = True
+    except ImportError:
+        VIDEO_DB_AVAILABLE = False
+
 # v17.8: Import AI Pattern Generator for AI-first architecture
 try:
     from src.ai.ai_pattern_generator import get_pattern_generator, AIPatternGenerator
@@ -80,9 +96,8 @@ class UploadStateManager:
     def _load_state(self) -> Dict:
         """Load upload state from file."""
         try:
-            if UPLOAD_STATE_FILE.exists():
-                with open(UPLOAD_STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(UPLOAD_STATE_FILE):
+                return load_state(UPLOAD_STATE_FILE)
         except Exception as e:
             safe_print(f"[!] Error loading upload state: {e}")
         
@@ -96,8 +111,7 @@ class UploadStateManager:
         """Save state to file."""
         self.state["last_updated"] = datetime.now().isoformat()
         try:
-            with open(UPLOAD_STATE_FILE, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            save_state(UPLOAD_STATE_FILE, self.state)
         except Exception as e:
             safe_print(f"[!] Error saving upload state: {e}")
     
@@ -193,9 +207,8 @@ class VarietyStateManager:
     def _load_state(self) -> Dict:
         """Load variety state from file."""
         try:
-            if VARIETY_STATE_FILE.exists():
-                with open(VARIETY_STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(VARIETY_STATE_FILE):
+                return load_state(VARIETY_STATE_FILE)
         except Exception as e:
             safe_print(f"[!] Error loading variety state: {e}")
         
@@ -212,8 +225,7 @@ class VarietyStateManager:
         """Save state to file."""
         self.state["last_updated"] = datetime.now().isoformat()
         try:
-            with open(VARIETY_STATE_FILE, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            save_state(VARIETY_STATE_FILE, self.state)
         except Exception as e:
             safe_print(f"[!] Error saving variety state: {e}")
     
@@ -355,9 +367,8 @@ class AnalyticsStateManager:
     def _load_state(self) -> Dict:
         """Load analytics state from file."""
         try:
-            if ANALYTICS_STATE_FILE.exists():
-                with open(ANALYTICS_STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(ANALYTICS_STATE_FILE):
+                return load_state(ANALYTICS_STATE_FILE)
         except Exception as e:
             safe_print(f"[!] Error loading analytics state: {e}")
         
@@ -372,8 +383,7 @@ class AnalyticsStateManager:
         """Save state to file."""
         self.state["last_updated"] = datetime.now().isoformat()
         try:
-            with open(ANALYTICS_STATE_FILE, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            save_state(ANALYTICS_STATE_FILE, self.state)
         except Exception as e:
             safe_print(f"[!] Error saving analytics state: {e}")
     
@@ -396,6 +406,11 @@ class AnalyticsStateManager:
         }
         
         self.state["videos"].append(video_entry)
+        if VIDEO_DB_AVAILABLE:
+            record_video_facts(video_entry["id"], category=video_entry["category"],
+                               topic=video_entry["topic"], title=video_entry["title"],
+                               score=video_entry["score"], youtube_id=video_entry["youtube_id"],
+                               dailymotion_id=video_entry["dailymotion_id"])
         # Keep last 100 videos
         self.state["videos"] = self.state["videos"][-100:]
         self._save_state()
@@ -408,6 +423,10 @@ class AnalyticsStateManager:
             if video.get("id") == video_id or video.get("youtube_id") == video_id:
                 video["performance"] = performance
                 self._save_state()
+                if VIDEO_DB_AVAILABLE:
+                    record_video_facts(video["id"], views=performance.get("views"),
+                                       likes=performance.get("likes"),
+                                       comments=performance.get("comments"))
                 return True
         return False
     
@@ -466,12 +485,11 @@ class ViralPatternsManager:
         
         # Fall back to file cache
         try:
-            if VIRAL_PATTERNS_FILE.exists():
-                with open(VIRAL_PATTERNS_FILE, 'r') as f:
-                    data = json.load(f)
-                    if data.get("title_patterns") and len(data.get("title_patterns", [])) > 0:
-                        safe_print("[OK] Viral patterns loaded from cache")
-                        return data
+            if state_exists(VIRAL_PATTERNS_FILE):
+                data = load_state(VIRAL_PATTERNS_FILE)
+                if data.get("title_patterns") and len(data.get("title_patterns", [])) > 0:
+                    safe_print("[OK] Viral patterns loaded from cache")
+                    return data
         except Exception as e:
             safe_print(f"[!] Error loading viral patterns: {e}")
         
@@ -498,8 +516,7 @@ class ViralPatternsManager:
         """Save patterns to file."""
         self.patterns["last_updated"] = datetime.now().isoformat()
         try:
-            with open(VIRAL_PATTERNS_FILE, 'w') as f:
-                json.dump(self.patterns, f, indent=2)
+            save_state(VIRAL_PATTERNS_FILE, self.patterns)
         except Exception as e:
             safe_print(f"[!] Error saving viral patterns: {e}")
     
@@ -565,9 +582,8 @@ class SeriesStateManager:
     def _load_state(self) -> Dict:
         """Load series state from file."""
         try:
-            if SERIES_STATE_FILE.exists():
-                with open(SERIES_STATE_FILE, 'r') as f:
-                    return json.load(f)
+            if state_exists(SERIES_STATE_FILE):
+                return load_state(SERIES_STATE_FILE)
         except Exception as e:
             safe_print(f"[!] Error loading series state: {e}")
         
@@ -582,8 +598,7 @@ class SeriesStateManager:
         """Save state to file."""
         self.state["last_updated"] = datetime.now().isoformat()
         try:
-            with open(SERIES_STATE_FILE, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            save_state(SERIES_STATE_FILE, self.state)
         except Exception as e:
             safe_print(f"[!] Error saving series state: {e}")
     
@@ -721,6 +736,13 @@ class PerformanceAggregator:
         except:
             pass
         
+        # v18.7: Group-by performance stats maintained incrementally
+        try:
+            from performance_aggregates import get_performance_aggregates
+            insights["performance_aggregates"] = get_performance_aggregates().get_summary()
+        except:
+            pass
+        
         # v9.5 Trackers (from enhancements_v9.py)
         try:
             from enhancements_v9 import (
@@ -25,6 +25,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+# v18.7: State files live in the shared SQLite state store
+try:
+    from state_store import load_state, save_state, state_exists
+except ImportError:
+    from src.utils.state_store import load_state, save_state, state_exists
+
 # Suppress google.generativeai deprecation warning (will migrate to google.genai later)
 warnings.filterwarnings("ignore", category=FutureWarning, module="google.generativeai")
 
@@ -288,8 +294,7 @@ JSON ONLY."""
         }
         
         # Save to file
-        with open(CONCEPTS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        save_state(CONCEPTS_FILE, data)
         
         safe_print(f"\n{'=' * 60}")
         safe_print(f"   PRE-WORK COMPLETE!")
@@ -304,11 +309,10 @@ JSON ONLY."""
 
 def get_next_concept() -> Dict:
     """Get the next unused concept from pre-generated data."""
-    if not CONCEPTS_FILE.exists():
+    if not state_exists(CONCEPTS_FILE):
         return None
     
-    with open(CONCEPTS_FILE, 'r') as f:
-        data = json.load(f)
+    data = load_state(CONCEPTS_FILE)
     
     concepts = data.get('concepts', [])
     used = data.get('concepts_used', 0)
@@ -320,19 +324,17 @@ def get_next_concept() -> Dict:
     
     # Update usage counter
     data['concepts_used'] = used + 1
-    with open(CONCEPTS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    save_state(CONCEPTS_FILE, data)
     
     return concept
 
 
 def get_next_voice_music() -> Dict:
     """Get the next unused voice/music pair."""
-    if not CONCEPTS_FILE.exists():
+    if not state_exists(CONCEPTS_FILE):
         return None
     
-    with open(CONCEPTS_FILE, 'r') as f:
-        data = json.load(f)
+    data = load_state(CONCEPTS_FILE)
     
     pairs = data.get('voice_music_pairs', [])
     used = data.get('pairs_used', 0)
@@ -344,20 +346,18 @@ def get_next_voice_music() -> Dict:
     
     # Update usage counter
     data['pairs_used'] = used + 1
-    with open(CONCEPTS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    save_state(CONCEPTS_FILE, data)
     
     return pair
 
 
 def has_valid_data() -> bool:
     """Check if we have valid pre-generated data."""
-    if not CONCEPTS_FILE.exists():
+    if not state_exists(CONCEPTS_FILE):
         return False
     
     try:
-        with open(CONCEPTS_FILE, 'r') as f:
-            data = json.load(f)
+        data = load_state(CONCEPTS_FILE)
         
         # Check if data is still valid (same day)
         generated = datetime.fromisoformat(data['generated_at'])
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+ViralShorts Factory - Persistent State Store v18.7
+===================================================
+
+One embedded SQLite store for everything under data/persistent.
+
+Before this module, dozens of classes each owned a JSON file, loaded it on
+construction and rewrote the whole file (indent=2) on every mutation. The
+store keeps each of those files as one document row:
+
+1. Namespaces - one document per legacy file ("variety_state", ...)
+2. Atomic, crash-safe commits (SQLite WAL) - a killed run never leaves a
+   half-written file behind
+3. Cross-process locking - concurrent workflow steps serialize on the
+   database write lock instead of clobbering each other's files
+4. transaction() - several namespaces committed together or not at all
+5. JSON mirrors - changed documents are exported to their legacy .json
+   files ONCE at exit, so workflows, dashboards and `git add` keep working.
+   A mirror edited outside Python (e.g. inline workflow scripts) is newer
+   than its row and is re-imported on the next read.
+
+Modules migrate with the thin adapters:
+
+    from state_store import load_state, save_state, state_exists
+
+    if state_exists(STATE_FILE):
+        data = load_state(STATE_FILE)
+    save_state(STATE_FILE, data)
+
+state_version(STATE_FILE) changes whenever the file's data does, so caches
+of derived values (prompt snippets, ...) can skip rebuilding until then.
+
+Paths outside data/persistent are read and written as plain JSON files
+(atomically), so an adapter never changes where non-persistent data lives.
+
+Set STATE_STORE_JSON_MIRROR=0 to skip the exit-time JSON export.
+"""
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def safe_print(msg: str):
+    """Print with Unicode fallback."""
+    try:
+        print(msg)
+    except UnicodeEncodeError:
+        print(re.sub(r'[^\x00-\x7F]+', '', msg))
+
+
+STATE_DIR = Path("./data/persistent")
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+STATE_DB = STATE_DIR / "state.db"
+
+# Export changed documents to their legacy JSON files at exit
+JSON_MIRROR = os.environ.get("STATE_STORE_JSON_MIRROR", "1") != "0"
+
+
+class StateStore:
+    """
+    Namespaced JSON documents in SQLite.
+
+    documents: namespace -> data (JSON text), updated_at, version,
+    mirror_mtime (mtime of the JSON mirror when it was last synced).
+    """
+
+    def __init__(self, db_path: Path = None, state_dir: Path = None):
+        self.state_dir = Path(state_dir) if state_dir else STATE_DIR
+        self.db_path = Path(db_path) if db_path else self.state_dir / STATE_DB.name
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._dirty_mirrors = set()
+        self.writes = 0
+        self._conn = self._connect()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                               isolation_level=None, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                namespace TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                mirror_mtime REAL NOT NULL DEFAULT 0
+            )
+        """)
+        return conn
+
+    # =========================================================================
+    # NAMESPACES
+    # =========================================================================
+
+    def namespace_for(self, path: Path) -> Optional[str]:
+        """Namespace of a legacy file, or None if it isn't under the state dir."""
+        path = Path(path)
+        try:
+            relative = path.resolve().relative_to(self.state_dir.resolve())
+        except ValueError:
+            return None
+        if relative.suffix != ".json":
+            return None
+        return relative.with_suffix("").as_posix()
+
+    def mirror_path(self, namespace: str) -> Path:
+        return self.state_dir / f"{namespace}.json"
+
+    # =========================================================================
+    # DOCUMENT API
+    # =========================================================================
+
+    def _row(self, namespace: str):
+        return self._conn.execute(
+            "SELECT data, updated_at, mirror_mtime FROM documents WHERE namespace = ?",
+            (namespace,)
+        ).fetchone()
+
+    def _import_mirror(self, namespace: str, row) -> bool:
+        """Pull in a JSON file that is new, or was edited since it was synced."""
+        path = self.mirror_path(namespace)
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return False
+        if row is not None and (mtime <= row[1] or mtime == row[2]):
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            safe_print(f"[STATE] Skipping unreadable {path.name}: {e}")
+            return False
+        self._write(namespace, data, mirror_mtime=mtime)
+        return True
+
+    def get(self, namespace: str, default: Any = None) -> Any:
+        """Load a document (importing its legacy JSON file when needed)."""
+        with self._lock:
+            row = self._row(namespace)
+            if self._import_mirror(namespace, row):
+                row = self._row(namespace)
+            if row is None:
+                return default
+            return json.loads(row[0])
+
+    def version(self, namespace: str) -> int:
+        """Write counter of a document (0 if missing) - bumps on every change."""
+        with self._lock:
+            row = self._row(namespace)
+            self._import_mirror(namespace, row)
+            found = self._conn.execute(
+                "SELECT version FROM documents WHERE namespace = ?", (namespace,)
+            ).fetchone()
+            return found[0] if found else 0
+
+    def exists(self, namespace: str) -> bool:
+        with self._lock:
+            return self._row(namespace) is not None or self.mirror_path(namespace).exists()
+
+    def _write(self, namespace: str, data: Any, mirror_mtime: float = None):
+        text = json.dumps(data, separators=(',', ':'), default=str)
+        now = time.time()
+        if mirror_mtime is None:
+            self._conn.execute("""
+                INSERT INTO documents (namespace, data, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(namespace) DO UPDATE SET
+                    data = excluded.data, updated_at = excluded.updated_at,
+                    version = version + 1
+            """, (namespace, text, now))
+            self._dirty_mirrors.add(namespace)
+        else:
+            self._conn.execute("""
+                INSERT INTO documents (namespace, data, updated_at, mirror_mtime)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(namespace) DO UPDATE SET
+                    data = excluded.data, updated_at = excluded.updated_at,
+                    version = version + 1, mirror_mtime = excluded.mirror_mtime
+            """, (namespace, text, max(now, mirror_mtime), mirror_mtime))
+        self.writes += 1
+
+    def put(self, namespace: str, data: Any):
+        """Replace a document (one small row write, committed atomically)."""
+        with self._lock:
+            self._write(namespace, data)
+
+    def delete(self, namespace: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM documents WHERE namespace = ?", (namespace,))
+            self._dirty_mirrors.discard(namespace)
+
+    def namespaces(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                "SELECT namespace FROM documents ORDER BY namespace")]
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit every put inside the block together (or roll all back).
+
+        Takes the database write lock immediately, so a concurrent process
+        waits instead of interleaving its writes.
+        """
+        with self._lock:
+            outer = self._depth == 0
+            if outer:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if outer:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._depth -= 1
+                if outer:
+                    self._conn.execute("COMMIT")
+
+    # =========================================================================
+    # JSON MIRRORS
+    # =========================================================================
+
+    def export_json(self, namespaces: List[str] = None) -> int:
+        """
+        Write documents to their legacy JSON files.
+
+        Args:
+            namespaces: Which to export (default: those changed this run)
+
+        Returns:
+            Number of files written
+        """
+        with self._lock:
+            targets = list(namespaces) if namespaces is not None else sorted(self._dirty_mirrors)
+            written = 0
+            for namespace in targets:
+                row = self._row(namespace)
+                if row is None:
+                    continue
+                path = self.mirror_path(namespace)
+                tmp = path.with_suffix(".json.tmp")
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(tmp, 'w', encoding='utf-8') as f:
+                        json.dump(json.loads(row[0]), f, indent=2)
+                    os.replace(tmp, path)
+                    self._conn.execute(
+                        "UPDATE documents SET mirror_mtime = ? WHERE namespace = ?",
+                        (path.stat().st_mtime, namespace)
+                    )
+                    written += 1
+                except Exception as e:
+                    safe_print(f"[STATE] Mirror export failed for {namespace}: {e}")
+                self._dirty_mirrors.discard(namespace)
+            return written
+
+    def close(self):
+        """Export changed mirrors and checkpoint the WAL (runs at exit)."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                if JSON_MIRROR:
+                    self.export_json()
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.close()
+            except Exception as e:
+                safe_print(f"[STATE] Close failed: {e}")
+            self._conn = None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM documents"
+            ).fetchone()
+            return {
+                "documents": count,
+                "bytes": size,
+                "writes_this_run": self.writes,
+                "pending_mirrors": len(self._dirty_mirrors),
+                "updated_at": datetime.now().isoformat()
+            }
+
+
+# Singleton
+_state_store = None
+
+
+def get_state_store() -> StateStore:
+    """Get the shared StateStore instance."""
+    global _state_store
+    if _state_store is None:
+        _state_store = StateStore()
+    return _state_store
+
+
+# =============================================================================
+# ADAPTERS - drop-in replacements for per-module _load/_save file I/O
+# =============================================================================
+
+_MISSING = object()
+
+
+def load_state(path: Path, default: Any = _MISSING) -> Any:
+    """
+    Load a state file's data.
+
+    Like `json.load(open(path))`, raises FileNotFoundError if it was never
+    saved - unless a default is given.
+    """
+    store = get_state_store()
+    namespace = store.namespace_for(path)
+    if namespace is not None:
+        data = store.get(namespace, _MISSING)
+    else:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = _MISSING
+    if data is _MISSING:
+        if default is _MISSING:
+            raise FileNotFoundError(f"No saved state for {path}")
+        return default
+    return data
+
+
+def save_state(path: Path, data: Any):
+    """Save a state file's data (one store row instead of a full-file rewrite)."""
+    store = get_state_store()
+    namespace = store.namespace_for(path)
+    if namespace is not None:
+        store.put(namespace, data)
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def state_exists(path: Path) -> bool:
+    """Replacement for `path.exists()` before a load."""
+    store = get_state_store()
+    namespace = store.namespace_for(path)
+    if namespace is not None:
+        return store.exists(namespace)
+    return Path(path).exists()
+
+
+def state_version(path: Path) -> int:
+    """
+    Cheap change marker for a state file - compare it to skip rebuilding
+    anything derived from the file. Store documents use their write counter,
+    plain files their mtime (ns); 0 means it was never saved.
+    """
+    store = get_state_store()
+    namespace = store.namespace_for(path)
+    if namespace is not None:
+        return store.version(namespace)
+    try:
+        return Path(path).stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+if __name__ == "__main__":
+    safe_print("Testing State Store...")
+
+    store = get_state_store()
+    demo = STATE_DIR / "state_store_demo.json"
+
+    start = time.time()
+    for i in range(200):
+        save_state(demo, {"counter": i, "history": list(range(50))})
+    safe_print(f"200 saves in {(time.time() - start) * 1000:.1f}ms")
+    safe_print(f"Loaded: counter={load_state(demo)['counter']}")
+
+    try:
+        with store.transaction():
+            store.put("state_store_demo", {"counter": -1})
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    safe_print(f"After rolled-back transaction: counter={load_state(demo)['counter']}")
+
+    store.delete("state_store_demo")
+    safe_print(f"Stats: {store.get_stats()}")
+    safe_print("\nTest complete!")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Batch Planner Tests (v18.7)
+============================
+
+Covers quota-aware admission control:
+1. plan_batch picks full / lean / cheap / reduced from what fits today
+2. admit_next only ever steps down a mode, and stops when no video fits
+3. Hook rewrites are skipped below full mode; regenerations are capped, never skipped
+4. Bulk tasks move to the fastest acceptable models in cheap modes
+5. call_ai returns a SkippedPrompt for skipped prompts, which stage 3 treats
+   as a skip rather than a failed rewrite
+
+Run directly or via pytest.
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for _src in ("utils", "analytics", "enhancements", "quota", "ai", "core"):
+    sys.path.insert(0, str(ROOT / "src" / _src))
+import pro_video_generator as pvg
+import batch_planner
+from batch_planner import (BatchPlanner, MODE_FULL, MODE_LEAN, MODE_CHEAP, MODE_REDUCED,
+                           was_skipped)
+
+# A measured video: 10 Groq + 2 Gemini calls, a quarter of them optional
+COST = {"providers": {"groq": 10, "gemini": 2}, "calls": 12, "tokens": 0,
+        "optional_share": 0.25, "samples": 5}
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+class _Planner(BatchPlanner):
+    """Fixed cost, settable remaining calls, no token budget and no saved state."""
+
+    def __init__(self, mode=MODE_FULL, groq=0, gemini=0):
+        super().__init__()
+        self.mode = mode
+        self.remaining = {"groq": groq, "gemini": gemini}
+
+    def _load(self):
+        return {"videos": [], "plans": []}
+
+    def _save(self):
+        pass
+
+    def cost_per_video(self):
+        return COST
+
+    def remaining_calls(self):
+        return dict(self.remaining)
+
+    def remaining_tokens(self):
+        return None
+
+
+def test_plan_modes():
+    """The cheapest mode that still finishes the whole batch wins."""
+    cases = [
+        ((40, 100), MODE_FULL, 4),      # 4 full videos fit on Groq
+        ((30, 100), MODE_LEAN, 4),      # Only 3 full, but 4 without optional prompts
+        ((20, 100), MODE_CHEAP, 4),     # Groq is short; bulk work can move to Gemini
+        ((5, 13), MODE_REDUCED, 2),     # 18 calls pooled = 2 lean videos
+        ((0, 0), MODE_REDUCED, 1),      # Always attempt one
+    ]
+    for (groq, gemini), mode, count in cases:
+        planner = _Planner(groq=groq, gemini=gemini)
+        plan = planner.plan_batch(4)
+        assert (plan["mode"], plan["count"]) == (mode, count), (groq, gemini, plan)
+        assert planner.mode == mode
+
+
+def test_admit_next_steps_down():
+    """Modes only get cheaper as quota drains; an empty pool stops the batch."""
+    planner = _Planner(groq=30, gemini=100)
+    assert planner.admit_next(3) and planner.mode == MODE_FULL
+
+    planner.remaining["groq"] = 25
+    assert planner.admit_next(3) and planner.mode == MODE_LEAN
+
+    planner.remaining["groq"] = 10
+    assert planner.admit_next(3) and planner.mode == MODE_CHEAP
+
+    planner.remaining["groq"] = 100  # Never switches back up mid-batch
+    assert planner.admit_next(3) and planner.mode == MODE_CHEAP
+
+    planner.remaining = {"groq": 0, "gemini": 8}
+    assert not planner.admit_next(1)
+
+    reduced = _Planner(mode=MODE_REDUCED, groq=100, gemini=100)
+    assert reduced.admit_next(5) and reduced.mode == MODE_REDUCED
+
+
+def test_optional_tasks_per_mode():
+    """Hook rewrites run only in full mode; regenerations are capped instead."""
+    allowed = {mode: _Planner(mode=mode).allows_task("hook_improve")
+               for mode in (MODE_FULL, MODE_LEAN, MODE_CHEAP, MODE_REDUCED)}
+    assert allowed == {MODE_FULL: True, MODE_LEAN: False, MODE_CHEAP: False, MODE_REDUCED: False}
+
+    for mode, regenerations in ((MODE_FULL, 2), (MODE_LEAN, 1), (MODE_CHEAP, 0), (MODE_REDUCED, 0)):
+        planner = _Planner(mode=mode)
+        assert planner.allows_task("regenerate") and planner.allows_task("content")
+        assert planner.max_regenerations(2) == regenerations
+
+
+def test_routing_for_bulk_tasks():
+    """Only bulk tasks in cheap modes are rerouted."""
+    for mode in (MODE_FULL, MODE_LEAN):
+        assert _Planner(mode=mode).routing_for("broll", "best_quality", False) == ("best_quality", False)
+    for mode in (MODE_CHEAP, MODE_REDUCED):
+        planner = _Planner(mode=mode)
+        assert planner.routing_for("broll", "best_quality", False) == ("fastest_acceptable", True)
+        assert planner.routing_for("content", "best_quality", False) == ("best_quality", False)
+
+
+@contextmanager
+def _master_ai(planner, **overrides):
+    """MasterAI using the given planner, with every other optional feature off."""
+    overrides = {
+        "BATCH_PLANNER_AVAILABLE": True, "get_batch_planner": lambda: planner,
+        "ENHANCEMENTS_V11_AVAILABLE": False, "VIRAL_SCIENCE_AVAILABLE": False,
+        "CRITICAL_FIXES_AVAILABLE": False, "SCRIPT_ANALYZER_AVAILABLE": False,
+        "RETENTION_PREDICTOR_AVAILABLE": False, "ENGAGEMENT_PREDICTOR_AVAILABLE": False,
+        "VIRALITY_CALCULATOR_AVAILABLE": False, "EVALUATION_CASCADE_AVAILABLE": False,
+        "MASTER_EVALUATOR_AVAILABLE": False,
+        "tag_prompt": lambda template_id, text, **cache_vars: text,
+        **overrides,
+    }
+    previous = {name: getattr(pvg, name) for name in overrides}
+    previous_ledger = batch_planner.QUOTA_LEDGER_AVAILABLE
+    for name, value in overrides.items():
+        setattr(pvg, name, value)
+    batch_planner.QUOTA_LEDGER_AVAILABLE = False
+    try:
+        ai = pvg.MasterAI.__new__(pvg.MasterAI)
+        ai.routed = []
+
+        def call_ai_routed(prompt, max_tokens, temperature, prefer_gemini, task, *args):
+            ai.routed.append(task)
+            return "A sharper hook that stops the scroll"
+
+        ai._call_ai_routed = call_ai_routed
+        yield ai
+    finally:
+        for name, value in previous.items():
+            setattr(pvg, name, value)
+        batch_planner.QUOTA_LEDGER_AVAILABLE = previous_ledger
+
+
+def test_call_ai_skip_is_not_a_failure():
+    """A skipped prompt is empty, marked as skipped, never sent and never counted."""
+    planner = _Planner(mode=MODE_LEAN)
+    planner.start_video()
+    with _master_ai(planner) as ai:
+        skipped = ai.call_ai("Rewrite this hook", 100, task="hook_improve")
+        assert skipped == "" and not skipped and was_skipped(skipped)
+        assert ai.routed == [] and planner._video["tasks"] == {}
+
+        answer = ai.call_ai("Write the script", 100, task="content")
+        assert answer and not was_skipped(answer) and ai.routed == ["content"]
+        assert planner._video["tasks"]["content"]["calls"] == 1
+        assert not was_skipped("") and not was_skipped(None)
+
+
+def _weak_hook_content():
+    return {"phrases": ["You won't believe this", "Point one", "Point two"],
+            "hook_needs_improvement": True, "power_words_available": ["secret"]}
+
+
+class _StopAtEvaluation(Exception):
+    pass
+
+
+def test_stage3_keeps_hook_when_skipped():
+    """Stage 3 records the skip and keeps the hook; in full mode it rewrites it."""
+    for mode, improved in ((MODE_LEAN, False), (MODE_FULL, True)):
+        with _master_ai(_Planner(mode=mode)) as ai:
+            routed = ai._call_ai_routed
+
+            def call_ai_routed(prompt, max_tokens, temperature, prefer_gemini, task, *args):
+                if task != "hook_improve":
+                    raise _StopAtEvaluation(task)
+                return routed(prompt, max_tokens, temperature, prefer_gemini, task, *args)
+
+            ai._call_ai_routed = call_ai_routed
+            content = _weak_hook_content()
+            try:
+                ai.stage3_evaluate_enhance(content)
+            except _StopAtEvaluation:
+                pass
+            assert content.get("hook_was_improved", False) is improved, mode
+            assert content.get("hook_improve_skipped", False) is not improved, mode
+            if not improved:
+                assert content["phrases"][0] == "You won't believe this"
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" BATCH PLANNER")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_plan_modes, test_admit_next_steps_down, test_optional_tasks_per_mode,
+                 test_routing_for_bulk_tasks, test_call_ai_skip_is_not_a_failure,
+                 test_stage3_keeps_hook_when_skipped):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Boost Snapshot Tests (v18.7)
+=============================
+
+Covers the per-run cache of learned prompt additions:
+1. Store documents carry a write counter that bumps on every save
+2. A snapshot is built once and only rebuilt when a source file changes
+
+Run directly or via pytest.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "ai"))
+from state_store import StateStore
+from boost_snapshots import BoostSnapshots
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def test_store_versions():
+    """Every put bumps the version; an edited JSON mirror does too."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state_dir = Path(tmp) / "persistent"
+        state_dir.mkdir()
+        store = StateStore(state_dir=state_dir)
+        assert store.version("learning") == 0
+        store.put("learning", {"n": 1})
+        store.put("learning", {"n": 2})
+        assert store.version("learning") == 2
+
+        mirror = store.mirror_path("learning")
+        mirror.write_text('{"n": 3}')
+        os.utime(mirror, (mirror.stat().st_atime, mirror.stat().st_mtime + 60))
+        assert store.version("learning") == 3
+        assert store.get("learning") == {"n": 3}
+        store.close()
+
+
+def test_rebuilt_only_on_change():
+    """Repeat gets hand out the same string until a source is saved again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state_dir = Path(tmp) / "persistent"
+        state_dir.mkdir()
+        store = StateStore(state_dir=state_dir)
+        source = state_dir / "history.json"
+        builds = []
+
+        def build():
+            builds.append(1)
+            return f"boost #{len(builds)}"
+
+        snapshots = BoostSnapshots(version=lambda path: store.version(store.namespace_for(path)))
+        first = snapshots.get("demo", build, (source,))
+        assert snapshots.get("demo", build, (source,)) is first
+        assert len(builds) == 1
+
+        store.put("history", {"scores": [9]})
+        assert snapshots.get("demo", build, (source,)) == "boost #2"
+        assert snapshots.get_stats() == {"snapshots": ["demo"], "builds": 2, "hits": 1}
+
+        snapshots.invalidate("demo")
+        assert snapshots.get("demo", build, (source,)) == "boost #3"
+        store.close()
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" BOOST SNAPSHOTS")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_store_versions, test_rebuilt_only_on_change):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
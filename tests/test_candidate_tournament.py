@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Candidate Tournament Tests (v18.7)
+===================================
+
+Covers selecting one of K generated candidates locally:
+1. Candidate lists are read from every response shape the AI returns
+2. Near-copies of recent topics and of better candidates are dropped,
+   and filtered-out candidates rank last
+
+Run directly or via pytest.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for package in ("ai", "utils", "analytics", "enhancements"):
+    sys.path.insert(0, str(ROOT / "src" / package))
+import candidate_tournament
+from candidate_tournament import CandidateTournament, parse_candidates, similarity_matrix
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+class _Tournament(CandidateTournament):
+    """No state writes from tests."""
+
+    def __init__(self):
+        self.data = {"kinds": {}, "last_updated": None}
+
+    def _save(self):
+        pass
+
+
+def test_parse_candidates_shapes():
+    """Wrapped, bare, fenced and single-object answers all parse."""
+    assert parse_candidates({"candidates": [{"title": "a"}, {}, {"title": "b"}]}) == [{"title": "a"}, {"title": "b"}]
+    assert parse_candidates('```json\n[{"title": "a"}]\n```') == [{"title": "a"}]
+    assert parse_candidates('Here you go: ["x", "y"]') == ["x", "y"]
+    assert parse_candidates({"title": "only"}) == [{"title": "only"}]
+    assert parse_candidates("not json") == []
+
+
+def test_select_drops_duplicates():
+    """Recent topics and twins are filtered; disallowed candidates rank last."""
+    sims = similarity_matrix(["Sleep habits of rich people"], ["Rich people's sleep habits", "Ocean facts"])
+    assert sims[0][0] >= 0.5 > sims[0][1]
+
+    candidates = [
+        {"topic": "Why you forget names instantly", "category": "psychology"},
+        {"topic": "Why you forget names so instantly", "category": "psychology"},
+        {"topic": "Rich people's sleep habits", "category": "money"},
+        {"topic": "3 ocean facts that sound fake", "category": "science"},
+    ]
+    model_available = candidate_tournament.PERFORMANCE_MODEL_AVAILABLE
+    candidate_tournament.PERFORMANCE_MODEL_AVAILABLE = False  # Hook scores only
+    try:
+        result = _Tournament().select(
+            "concept", candidates, text=lambda c: c["topic"],
+            recent=["Sleep habits of rich people"],
+            allowed=lambda c: c["category"] != "science")
+    finally:
+        candidate_tournament.PERFORMANCE_MODEL_AVAILABLE = model_available
+
+    ranked = [entry["candidate"]["topic"] for entry in result["ranked"]]
+    assert len(ranked) == 2
+    assert ranked[-1] == "3 ocean facts that sound fake"
+    assert {d["candidate"]["category"] for d in result["duplicates"]} == {"money", "psychology"}
+    assert result["winner"]["category"] == "psychology"
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" CANDIDATE TOURNAMENT")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_parse_candidates_shapes, test_select_drops_duplicates):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
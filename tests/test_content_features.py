@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Content Feature Service Tests (v18.7)
+======================================
+
+Covers the shared text features behind the local content scorers:
+1. The one-pass phrase matcher finds exactly what `phrase in text` finds,
+   including for script sections read from the full-script scan
+2. Features are memoised per text; the matcher only rebuilds on change
+
+Run directly or via pytest.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "analytics"))
+from content_features import ContentFeatureService, count_syllables
+
+WORDS = ["stop", "wait", "hold on", "how", "how to", "however", "do", "don't",
+         "?", "3x", "tag someone", "mind-blowing", "why", "secret", "secrets"]
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def _text(n: int) -> str:
+    pieces = WORDS + ["the", "window", "Howdy", "stopwatch", "x", "STOP!"]
+    return " ".join(random.choice(pieces) for _ in range(n))
+
+
+def test_matches_substring_semantics():
+    """Every list and every script section matches like `w in text.lower()`."""
+    random.seed(5)
+    service = ContentFeatureService()
+    service.register_many({"a": WORDS[:8], "b": WORDS[6:]})
+    for _ in range(300):
+        hook, cta = _text(random.randint(0, 6)), _text(random.randint(0, 4))
+        phrases = [_text(random.randint(1, 8)) for _ in range(random.randint(0, 4))]
+        service.script(hook, phrases, cta)
+        for text in [hook, cta, " ".join(phrases), f"{hook} {' '.join(phrases)}"] + phrases:
+            features = service.extract(text)
+            for name in ("a", "b"):
+                expected = [w for w in service.lexicon(name) if w in text.lower()]
+                assert features.matched(name) == expected, (text, name)
+                assert features.has(name) == bool(expected)
+
+    assert count_syllables("Rhythm of the beautiful queue, 3x") == 8
+
+
+def test_memoised_and_rebuilt_on_change():
+    """Repeat texts hit the cache; re-registering a list only rebuilds if it changed."""
+    service = ContentFeatureService()
+    service.register("triggers", ["stop", "wait"])
+    first = service.extract("Wait, STOP scrolling")
+    assert first.matched("triggers") == ["stop", "wait"]
+    assert service.extract("Wait, STOP scrolling") is first
+
+    service.register("triggers", ["STOP", "wait"])  # Same list after lowercasing
+    assert service.get_stats()["rebuilds"] == 1
+    assert service.extract("Wait, STOP scrolling") is first
+
+    service.register("triggers", ["stop", "wait", "scroll"])  # Learned trigger added
+    assert service.extract("Wait, STOP scrolling").count("triggers") == 3
+    assert service.get_stats()["rebuilds"] == 2
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" CONTENT FEATURE SERVICE")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_matches_substring_semantics, test_memoised_and_rebuilt_on_change):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Call Deadline Tests (v18.7)
+============================
+
+Covers the stage deadlines used across the AI call stack:
+1. Nested deadlines never outlive the enclosing stage
+2. sleep_within() refuses waits that would overrun the deadline
+3. Per-stage time is recorded against the budget
+
+Run directly or via pytest.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+from deadline import (
+    stage_deadline, deadline_expired, sleep_within, request_timeout,
+    time_left, get_deadline_report
+)
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def test_nested_deadline_is_capped():
+    """An inner stage with a bigger budget still ends with its parent."""
+    with stage_deadline("outer_test", 2) as outer:
+        with stage_deadline("inner_test", 60) as inner:
+            assert inner.expires == outer.expires
+            assert time_left() <= 2
+            assert request_timeout(60) <= 2
+    assert time_left() is None
+    assert request_timeout(60) == 60
+
+
+def test_sleep_within_gives_up():
+    """Backoff longer than the time left is skipped, not slept."""
+    assert sleep_within(0) is True  # No deadline - plain sleep
+    with stage_deadline("sleep_test", 1) as deadline:
+        started = time.time()
+        assert sleep_within(10) is False
+        assert time.time() - started < 0.5
+        assert deadline.gave_up == 1
+        assert not deadline_expired()
+
+
+def test_stage_timings_reported():
+    """Each stage's elapsed time is logged against its budget."""
+    @stage_deadline("report_test", 0.05)
+    def slow_stage():
+        time.sleep(0.1)
+        return deadline_expired()
+
+    assert slow_stage() is True
+    report = get_deadline_report()["report_test"]
+    assert report["runs"] == 1
+    assert report["overruns"] == 1
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" CALL DEADLINES")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_nested_deadline_is_capped, test_sleep_within_gives_up,
+                 test_stage_timings_reported):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Model Discovery Cache Tests (v18.7)
+====================================
+
+Covers the stale-while-revalidate discovery snapshot:
+1. A cold start blocks on discovery once; fresh entries never refetch
+2. Stale entries are served at once and revalidated in one background thread
+3. An empty discovery result never replaces a known-good entry
+4. The router adopts a fresh snapshot without probing providers
+5. The router serves a stale snapshot and swaps the new pool in later
+
+Run directly or via pytest.
+"""
+
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "quota"))
+sys.path.insert(0, str(ROOT / "src" / "ai"))
+import smart_model_router
+from discovery_cache import DiscoveryCache
+from smart_model_router import DEFAULT_MODELS, DISCOVERY_KEY, SmartModelRouter
+
+KEY = "test:models"
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+@contextmanager
+def _cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        yield DiscoveryCache(path=Path(tmp) / "model_discovery.json")
+
+
+def test_cold_start_then_fresh():
+    """Only a missing entry blocks; a fresh one is served from the snapshot."""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return ["model-a"]
+
+    with _cache() as cache:
+        assert cache.get(KEY, fetch, ttl=3600) == ["model-a"] and len(calls) == 1
+        assert cache.get(KEY, fetch, ttl=3600) == ["model-a"] and len(calls) == 1
+        assert not cache._in_flight
+
+        # The snapshot survives a restart
+        assert DiscoveryCache(path=cache.path).peek(KEY) == ["model-a"]
+
+
+def test_stale_served_while_revalidating():
+    """A stale read returns the old list while one background fetch runs."""
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(5)
+        return ["model-b"]
+
+    with _cache() as cache:
+        cache.put(KEY, ["model-a"], refreshed_at=1)
+        assert cache.is_stale(KEY, ttl=3600)
+        assert cache.get(KEY, slow_fetch, ttl=3600) == ["model-a"]
+        assert cache.get(KEY, slow_fetch, ttl=3600) == ["model-a"]
+        assert not cache.refresh_async(KEY, slow_fetch)  # Already in flight
+
+        release.set()
+        cache.wait(timeout=5)
+        assert len(calls) == 1
+        assert cache.peek(KEY) == ["model-b"] and not cache.is_stale(KEY, ttl=3600)
+
+
+def test_empty_result_keeps_entry():
+    """Failed or empty discovery leaves the last good list in place."""
+    with _cache() as cache:
+        cache.put(KEY, ["model-a"], refreshed_at=1)
+        cache.refresh_async(KEY, lambda: [])
+        cache.wait(timeout=5)
+        assert cache.peek(KEY) == ["model-a"] and cache.is_stale(KEY, ttl=3600)
+
+        def broken():
+            raise RuntimeError("HTTP 503")
+
+        cache.refresh_async(KEY, broken)
+        cache.wait(timeout=5)
+        assert cache.peek(KEY) == ["model-a"]
+
+
+def _pool(*keys):
+    return {key: asdict(DEFAULT_MODELS[key]) for key in keys}
+
+
+@contextmanager
+def _router(cache):
+    """An empty router wired to the given snapshot, without saving, ledger or breakers."""
+    overrides = {"get_discovery_cache": lambda: cache, "DISCOVERY_CACHE_AVAILABLE": True,
+                 "QUOTA_LEDGER_AVAILABLE": False, "CIRCUIT_BREAKERS_AVAILABLE": False}
+    previous = {name: getattr(smart_model_router, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(smart_model_router, name, value)
+    try:
+        router = SmartModelRouter.__new__(SmartModelRouter)
+        router.models, router.rankings, router.last_refresh = {}, {}, None
+        router._save_cache = lambda: None
+        yield router
+    finally:
+        for name, value in previous.items():
+            setattr(smart_model_router, name, value)
+
+
+def test_router_adopts_fresh_snapshot():
+    """Another run's fresh pool is used as-is; no provider is probed."""
+    with _cache() as cache, _router(cache) as router:
+        cache.put(DISCOVERY_KEY, _pool("groq:llama-3.1-8b-instant"))
+
+        def probe():
+            raise AssertionError("probed providers despite a fresh snapshot")
+
+        router._discover_model_pool = probe
+        router._refresh_in_background()
+        assert list(router.models) == ["groq:llama-3.1-8b-instant"]
+        assert router.rankings and not cache._in_flight
+
+
+def test_router_revalidates_stale_snapshot():
+    """The stale pool is served until the background probe swaps the new one in."""
+    release = threading.Event()
+    stale = _pool("groq:llama-3.1-8b-instant")
+    fresh = _pool("groq:llama-3.1-8b-instant", "groq:llama-3.3-70b-versatile")
+
+    with _cache() as cache, _router(cache) as router:
+        cache.put(DISCOVERY_KEY, stale, refreshed_at=1)
+
+        def probe():
+            release.wait(5)
+            return fresh
+
+        router._discover_model_pool = probe
+        router._refresh_in_background()
+        assert list(router.models) == ["groq:llama-3.1-8b-instant"]
+
+        release.set()
+        cache.wait(timeout=5)
+        assert set(router.models) == set(fresh)
+        assert cache.peek(DISCOVERY_KEY) == fresh
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" MODEL DISCOVERY CACHE")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_cold_start_then_fresh, test_stale_served_while_revalidating,
+                 test_empty_result_keeps_entry, test_router_adopts_fresh_snapshot,
+                 test_router_revalidates_stale_snapshot):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
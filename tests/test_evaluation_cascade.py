@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Evaluation Cascade Tests (v18.7)
+=================================
+
+Covers the local-first evaluation cascade and its use in stage 3:
+1. Scores on the band edges map to accept / AI / reject
+2. Too few local scorers always defer to the AI tier
+3. The AI evaluation only runs inside the band
+4. Decisions are persisted once per video, in finish_video()
+5. Stage 3 returns early on a local verdict and calls the AI otherwise
+
+Run directly or via pytest.
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for _src in ("utils", "analytics", "enhancements", "quota", "ai", "core"):
+    sys.path.insert(0, str(ROOT / "src" / _src))
+import pro_video_generator
+from evaluation_cascade import EvaluationCascade, LOCAL_ACCEPT, LOCAL_REJECT, AI_TIER
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+class _Cascade(EvaluationCascade):
+    """Starts empty and counts saves instead of writing data/persistent."""
+
+    def _load(self):
+        return {"sites": {}, "videos": [], "band_overrides": {}, "last_updated": None}
+
+    def _save(self):
+        self.saves = getattr(self, "saves", 0) + 1
+
+
+def _local(cascade, score, components=2):
+    return cascade.combine({f"scorer{i}": score for i in range(components)})
+
+
+def test_band_edges():
+    """accept is inclusive, reject is exclusive, the rest goes to the AI."""
+    cascade = _Cascade()
+    band = cascade.get_band("stage3")
+    assert band == {"reject": 40, "accept": 78}
+    assert cascade.decide("stage3", _local(cascade, 78)) == LOCAL_ACCEPT
+    assert cascade.decide("stage3", _local(cascade, 77.9)) == AI_TIER
+    assert cascade.decide("stage3", _local(cascade, 40)) == AI_TIER
+    assert cascade.decide("stage3", _local(cascade, 39.9)) == LOCAL_REJECT
+    assert cascade.decide("post_render", _local(cascade, 70)) == LOCAL_ACCEPT
+    assert cascade.decide("unknown_site", _local(cascade, 79.9)) == AI_TIER
+
+
+def test_too_few_components_use_ai():
+    """A single scorer, or none at all, is never trusted on its own."""
+    cascade = _Cascade()
+    assert cascade.decide("stage3", _local(cascade, 100, components=1)) == AI_TIER
+    assert cascade.decide("stage3", _local(cascade, 0, components=1)) == AI_TIER
+    assert cascade.decide("stage3", cascade.combine({"a": None, "b": None})) == AI_TIER
+
+
+def test_ai_only_called_inside_band():
+    """evaluate() runs the AI callable for uncertain scores only."""
+    cascade = _Cascade()
+    calls = []
+
+    def ai_evaluate():
+        calls.append(1)
+        return {"final_score": 7}
+
+    accepted = cascade.evaluate("master", ai_evaluate=ai_evaluate, local=_local(cascade, 80))
+    rejected = cascade.evaluate("master", ai_evaluate=ai_evaluate, local=_local(cascade, 20))
+    uncertain = cascade.evaluate("master", ai_evaluate=ai_evaluate, local=_local(cascade, 60))
+    assert (accepted["decision"], rejected["decision"], uncertain["decision"]) == ("accept", "reject", "ai")
+    assert accepted["ai_result"] is None and rejected["ai_result"] is None
+    assert uncertain["ai_result"] == {"final_score": 7} and len(calls) == 1
+
+
+def test_saved_once_per_video():
+    """record() only counts; finish_video() writes the whole video once."""
+    cascade = _Cascade()
+    cascade.start_video("v1")
+    for score in (90, 10, 60):
+        cascade.evaluate("stage3", local=_local(cascade, score))
+    assert getattr(cascade, "saves", 0) == 0
+
+    summary = cascade.finish_video()
+    assert cascade.saves == 1
+    assert summary["ai_calls_saved"] == 2 and summary[AI_TIER] == 1
+    assert cascade.get_stats()["sites"]["stage3"]["local_rate"] == 66.7
+
+
+class _ReachedAI(Exception):
+    pass
+
+
+@contextmanager
+def _stage3_with(cascade):
+    """Stage 3 with only the cascade enabled and the AI review replaced by a tripwire."""
+    overrides = {
+        "VIRAL_SCIENCE_AVAILABLE": False, "CRITICAL_FIXES_AVAILABLE": False,
+        "SCRIPT_ANALYZER_AVAILABLE": False, "RETENTION_PREDICTOR_AVAILABLE": False,
+        "ENGAGEMENT_PREDICTOR_AVAILABLE": False, "VIRALITY_CALCULATOR_AVAILABLE": False,
+        "MASTER_EVALUATOR_AVAILABLE": False, "EVALUATION_CASCADE_AVAILABLE": True,
+        "get_evaluation_cascade": lambda: cascade,
+        "tag_prompt": lambda template_id, text, **cache_vars: text,
+    }
+    previous = {name: getattr(pro_video_generator, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(pro_video_generator, name, value)
+
+    ai = pro_video_generator.MasterAI.__new__(pro_video_generator.MasterAI)
+
+    def call_ai(*args, **kwargs):
+        raise _ReachedAI(kwargs.get("task"))
+
+    ai.call_ai = call_ai
+    try:
+        yield ai
+    finally:
+        for name, value in previous.items():
+            setattr(pro_video_generator, name, value)
+
+
+def _stage3_content(score):
+    return {
+        "phrases": ["Hook line here", "Point one", "Point two"],
+        "script_analysis": {"overall_score": score},
+        "retention_prediction": {"overall_retention": score},
+        "engagement_prediction": {"overall_engagement": score},
+        "virality_score": {"overall_score": score, "recommendations": ["Add a number"]},
+    }
+
+
+def test_stage3_local_verdicts_return_early():
+    """Accept and reject are decided locally; the band edge goes to the AI review."""
+    cascade = _Cascade()
+    with _stage3_with(cascade) as ai:
+        accepted = ai.stage3_evaluate_enhance(_stage3_content(78))
+        assert accepted["evaluation_tier"] == LOCAL_ACCEPT
+        assert accepted["evaluation_score"] == 7.8
+        assert not accepted.get("needs_regeneration")
+
+        rejected = ai.stage3_evaluate_enhance(_stage3_content(39))
+        assert rejected["evaluation_tier"] == LOCAL_REJECT
+        assert rejected["needs_regeneration"] is True
+        assert rejected["quality_issues"] == [{"issue": "Add a number"}]
+
+        try:
+            ai.stage3_evaluate_enhance(_stage3_content(77))
+            assert False, "uncertain content skipped the AI review"
+        except _ReachedAI as reached:
+            assert str(reached) == "evaluate"
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" EVALUATION CASCADE")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_band_edges, test_too_few_components_use_ai,
+                 test_ai_only_called_inside_band, test_saved_once_per_video,
+                 test_stage3_local_verdicts_return_early):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Import-Time Budget Test (v18.7)
+================================
+
+Guards the lazy feature registry in pro_video_generator:
+1. No heavy optional module is imported until a stage needs it
+2. Testing one feature flag imports that feature's module and nothing heavy
+
+Run directly or via pytest. For the full per-module tree:
+    python pro_video_generator.py --import-profile
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC_DIRS = ["src", "src/core", "src/enhancements", "src/analytics",
+            "src/quota", "src/platforms", "src/utils", "src/ai"]
+PATHS = [str(ROOT / d) for d in SRC_DIRS] + [str(ROOT)]
+
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+from lazy_imports import measure_import
+
+# Must only load when their stage runs
+HEAVY_MODULES = [
+    "moviepy", "numpy", "PIL", "edge_tts", "google.generativeai",
+    "groq", "requests", "enhancements_v9", "enhancements_v12",
+]
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def _import_generator(statement: str = None) -> dict:
+    # Fresh working directory so import-time directory creation stays out of the repo
+    with tempfile.TemporaryDirectory() as cwd:
+        return measure_import("pro_video_generator", PATHS, statement=statement, cwd=cwd)
+
+
+def test_heavy_modules_stay_deferred():
+    """Heavy optional modules must not be imported by `import pro_video_generator`."""
+    statement = (
+        "import sys, pro_video_generator\n"
+        f"eager = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "assert not eager, f'imported at startup: {eager}'"
+    )
+    result = _import_generator(statement)
+    assert result["error"] is None, result["error"]
+
+
+def test_flag_loads_only_its_module():
+    """A flag's truth test imports its own module; the heavy ones stay deferred."""
+    statement = (
+        "import sys, pro_video_generator as pvg\n"
+        "assert 'prompt_cache' not in sys.modules\n"
+        "assert pvg.PROMPT_CACHE_AVAILABLE\n"
+        "assert 'prompt_cache' in sys.modules\n"
+        "assert pvg.is_cacheable('fact_check') in (True, False)\n"
+        f"eager = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "assert not eager, f'imported with prompt_cache: {eager}'"
+    )
+    result = _import_generator(statement)
+    assert result["error"] is None, result["error"]
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" IMPORT BUDGET")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_heavy_modules_stay_deferred, test_flag_loads_only_its_module):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Latency-Aware Routing Tests (v18.7)
+====================================
+
+Covers per-model latency tracking in SmartModelRouter:
+1. Percentiles and tokens/sec come from a rolling sample window
+2. Only successful calls with a latency feed the samples
+3. fastest_acceptable puts the quickest model above the quality floor first
+4. Expected completion time uses throughput, capped by the measured p90
+
+Run directly or via pytest.
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "quota"))
+sys.path.insert(0, str(ROOT / "src" / "ai"))
+import smart_model_router
+from smart_model_router import (ModelInfo, SmartModelRouter,
+                                POLICY_BEST_QUALITY, POLICY_FASTEST)
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def _model(name, structured, speed):
+    return ModelInfo(provider="groq", model_id=name, daily_limit=1000, rate_limit=30, delay=2.0,
+                     quality_general=8.0, quality_creative=8.0, quality_structured=structured,
+                     quality_speed=speed, robustness=0.95, available=True)
+
+
+@contextmanager
+def _router():
+    """A router over three known models, without the shared ledger, breakers or state."""
+    previous = (smart_model_router.QUOTA_LEDGER_AVAILABLE,
+                smart_model_router.CIRCUIT_BREAKERS_AVAILABLE)
+    smart_model_router.QUOTA_LEDGER_AVAILABLE = False
+    smart_model_router.CIRCUIT_BREAKERS_AVAILABLE = False
+    try:
+        router = SmartModelRouter.__new__(SmartModelRouter)
+        router.models = {
+            "groq:strong": _model("strong", structured=9.5, speed=5),
+            "groq:quick": _model("quick", structured=8.0, speed=9),
+            "groq:sloppy": _model("sloppy", structured=5.0, speed=10),
+        }
+        router.rankings = {}
+        router.latency = {}
+        router.stats = {"calls": 0, "successes": 0, "fallbacks": 0}
+        router._compute_rankings()
+        yield router
+    finally:
+        (smart_model_router.QUOTA_LEDGER_AVAILABLE,
+         smart_model_router.CIRCUIT_BREAKERS_AVAILABLE) = previous
+
+
+def test_percentiles_and_window():
+    """p50/p90/p99 over the last LATENCY_WINDOW samples; tokens/sec over sized ones."""
+    with _router() as router:
+        for seconds in range(1, 11):
+            router.record_latency("groq:strong", float(seconds), output_tokens=100)
+        router.record_latency("groq:strong", 2.0)  # No size - latency only
+        stats = router.get_latency_stats("groq:strong")
+        assert stats["samples"] == 11
+        assert (stats["p50"], stats["p90"], stats["p99"]) == (5.0, 9.0, 10.0)
+        assert stats["tokens_per_sec"] == round(1000 / 55, 1)
+        assert router.get_latency_stats("groq:quick") is None
+
+        for _ in range(router.LATENCY_WINDOW):
+            router.record_latency("groq:strong", 0.5, output_tokens=50)
+        stats = router.get_latency_stats("groq:strong")
+        assert stats["samples"] == router.LATENCY_WINDOW and stats["p99"] == 0.5
+
+
+def test_only_successes_feed_latency():
+    """Failed calls count as calls but never as latency samples."""
+    with _router() as router:
+        router.record_result("groq:quick", success=False, latency=30.0, error="timeout")
+        router.record_result("groq:quick", success=True, latency=0.8, output_tokens=40)
+        router.record_result("groq:quick", success=True)
+        assert router.latency["groq:quick"] == [[0.8, 40]]
+        assert router.stats["models"]["groq:quick"] == {"calls": 3, "successes": 2}
+
+
+def test_fastest_acceptable_order():
+    """The fastest model above the floor leads; models below it stay as fallbacks."""
+    with _router() as router:
+        ranked = [key for key, _ in router.get_model_chain("evaluation", POLICY_BEST_QUALITY)]
+        assert ranked[0] == "groq:strong"
+
+        # Measured: strong is slow, quick is fast, sloppy is fastest but below the 7.5 floor
+        for _ in range(5):
+            router.record_latency("groq:strong", 6.0, output_tokens=300)
+            router.record_latency("groq:quick", 1.0, output_tokens=300)
+            router.record_latency("groq:sloppy", 0.2, output_tokens=300)
+        fastest = [key for key, _ in router.get_model_chain("evaluation", POLICY_FASTEST)]
+        assert fastest == ["groq:quick", "groq:strong", "groq:sloppy"]
+
+        # A broken model is never promoted, however fast it was
+        router.models["groq:quick"].consecutive_failures = 3
+        fastest = [key for key, _ in router.get_model_chain("evaluation", POLICY_FASTEST)]
+        assert fastest == ["groq:strong"] + [key for key in ranked if key != "groq:strong"]
+
+
+def test_expected_latency():
+    """Throughput estimates are capped at p90; unmeasured models use quality_speed."""
+    with _router() as router:
+        assert router.expected_latency("groq:quick") == 1.0 + (10 - 9) * 1.5
+        for seconds in (1.0, 2.0, 3.0):
+            router.record_latency("groq:quick", seconds, output_tokens=int(seconds * 50))
+        assert router.expected_latency("groq:quick") == 2.0  # p50
+        assert router.expected_latency("groq:quick", max_tokens=100) == 1.0  # 50 tokens at 50/s
+        assert router.expected_latency("groq:quick", max_tokens=10000) == 3.0  # Capped at p90
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" LATENCY-AWARE ROUTING")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_percentiles_and_window, test_only_successes_feed_latency,
+                 test_fastest_acceptable_order, test_expected_latency):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Performance Aggregates Tests (v18.7)
+=====================================
+
+Covers the running group-by stats behind the analytics insights:
+1. Incremental updates match a full recomputation (mean and variance)
+2. The change feed only returns videos updated since a consumer's cursor
+
+Run directly or via pytest.
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "analytics"))
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+from video_metadata_db import VideoMetadataDB
+from performance_aggregates import PerformanceAggregates
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def _record(i: int, views: int) -> dict:
+    return {
+        "video_id": f"vid_{i}",
+        "video_type": ["money", "health"][i % 2],
+        "hook": "Did you know this?" if i % 3 else "STOP scrolling now",
+        "uploaded_at": f"2026-03-0{1 + i % 7}T{8 + i % 4:02d}:00:00",
+        "has_captions": i % 2 == 0,
+        "performance": {"views": views, "likes": views // 20},
+    }
+
+
+def test_incremental_matches_recompute():
+    """Replacing a video's stats gives the same numbers as starting over."""
+    random.seed(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        aggregates = PerformanceAggregates(db)
+        records = [_record(i, random.randint(10, 5000)) for i in range(40)]
+        aggregates.observe_many(records)
+
+        # Stats of 10 videos change after a refresh
+        for record in records[:10]:
+            record["performance"] = {"views": random.randint(10, 5000), "likes": 3}
+        aggregates.observe_many(records[:10])
+
+        money = [r["performance"]["views"] for r in records if r["video_type"] == "money"]
+        stats = aggregates.group("category", "views")["money"]
+        assert stats["n"] == len(money)
+        assert abs(stats["mean"] - statistics.mean(money)) < 1e-6
+        assert abs(stats["std"] - statistics.stdev(money)) < 1e-6
+        assert aggregates.overall("views")["total"] == sum(r["performance"]["views"] for r in records)
+        db.close()
+
+
+def test_change_feed_cursor():
+    """Consumers see each change once; unchanged saves don't reappear."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        aggregates = PerformanceAggregates(db)
+        aggregates.observe_many([_record(i, 100) for i in range(5)])
+
+        changed, cursor = aggregates.changed_since("hook_words")
+        assert len(changed) == 5
+        aggregates.mark_consumed("hook_words", cursor)
+
+        aggregates.observe(_record(2, 100))  # Same stats - not a change
+        aggregates.observe(_record(3, 900))
+        changed, cursor = aggregates.changed_since("hook_words")
+        assert changed == ["vid_3"]
+        assert len(aggregates.changed_since("analysis")[0]) == 5  # Independent cursor
+        db.close()
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" PERFORMANCE AGGREGATES")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_incremental_matches_recompute, test_change_feed_cursor):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Performance Model Tests (v18.7)
+================================
+
+Covers the trained view model behind batch candidate scoring:
+1. Incremental retraining gives the same weights as training from scratch
+2. score_batch/rank learn a planted title word; fits are versioned
+3. A feature change drops the samples and flags a rebuild from every record
+
+Run directly or via pytest.
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "analytics"))
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+from video_metadata_db import VideoMetadataDB
+import performance_model
+from performance_model import PerformanceModel
+
+WORDS = ["money", "secret", "brain", "sleep", "habit", "rich", "trick", "daily", "fast", "truth"]
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def _records(n: int) -> list:
+    random.seed(21)
+    records = []
+    for i in range(n):
+        title = " ".join(random.sample(WORDS, 3))
+        views = int(random.lognormvariate(6 + (1.0 if "secret" in title else 0), 0.4))
+        records.append({"video_id": f"vid_{i}", "topic": title, "hook": f"Why {title}?",
+                        "video_type": ["money", "health"][i % 2],
+                        "performance": {"views": views, "title": title.title()}})
+    return records
+
+
+def test_incremental_matches_full_retrain():
+    """Replacing 10 videos' stats == fitting the final data from scratch."""
+    with tempfile.TemporaryDirectory() as tmp:
+        records = _records(120)
+        db = VideoMetadataDB(Path(tmp) / "a.db")
+        incremental = PerformanceModel(db)
+        incremental.train(records)
+        for record in records[:10]:
+            record["performance"] = dict(record["performance"], views=record["performance"]["views"] * 3)
+        assert incremental.observe_many(records) == 10
+        incremental.fit()
+
+        fresh_db = VideoMetadataDB(Path(tmp) / "b.db")
+        fresh = PerformanceModel(fresh_db)
+        fresh.train(records)
+        assert incremental.samples == fresh.samples == 120
+        assert np.allclose(incremental.weights["w"], fresh.weights["w"], atol=1e-6)
+        db.close()
+        fresh_db.close()
+
+
+def test_rank_and_versions():
+    """Titles with the planted word rank first; older versions can be pinned."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        model = PerformanceModel(db)
+        assert model.score_batch(["anything"]) is None
+        model.train(_records(200))
+
+        candidates = [{"title": t.title(), "hook": f"Why {t}?", "topic": t}
+                      for t in ("secret brain habit", "sleep daily fast", "rich trick truth")]
+        ranked = model.rank(candidates)
+        assert ranked[0]["index"] == 0
+        assert ranked[0]["score"] > ranked[-1]["score"]
+
+        first = model.version
+        model.train(_records(200)[:50] + [dict(_records(1)[0], video_id="extra",
+                                               performance={"views": 5, "title": "x"})])
+        assert model.version == first + 1
+        assert PerformanceModel(db).version == first + 1  # Persisted
+        assert model.use_version(first) and model.version == first
+        db.close()
+
+
+def test_feature_change_needs_rebuild():
+    """Old samples are dropped once; the next train() must bring them all back."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        records = _records(60)
+        PerformanceModel(db).train(records)
+        assert not PerformanceModel(db).needs_rebuild
+
+        previous = performance_model.FEATURE_VERSION
+        performance_model.FEATURE_VERSION = previous + 1
+        try:
+            model = PerformanceModel(db)
+            assert model.needs_rebuild and model.samples == 0
+            assert PerformanceModel(db).needs_rebuild  # Until a train() stores new stats
+
+            model.train(records)
+            assert not model.needs_rebuild and model.samples == 60
+            reloaded = PerformanceModel(db)
+            assert not reloaded.needs_rebuild and reloaded.samples == 60
+        finally:
+            performance_model.FEATURE_VERSION = previous
+            db.close()
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" PERFORMANCE MODEL")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_incremental_matches_full_retrain, test_rank_and_versions,
+                 test_feature_change_needs_rebuild):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Prompt Cache Tests (v18.7)
+===========================
+
+Covers the SQLite prompt cache and its per-task policy:
+1. A repeated prompt is served from cache and counted as a hit
+2. Entries expire after their namespace TTL
+3. The least recently used entry is evicted first
+4. Creative and unknown tasks are never cached, by policy or by call_ai
+
+Run directly or via pytest.
+"""
+
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for _src in ("utils", "analytics", "enhancements", "quota", "ai", "core"):
+    sys.path.insert(0, str(ROOT / "src" / _src))
+import pro_video_generator as pvg
+import prompt_cache
+from prompt_cache import PromptCache, TASK_CACHE_POLICY, is_cacheable
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+class _Clock:
+    """Stands in for the time module so TTLs can pass instantly."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+@contextmanager
+def _temp_cache(**options):
+    clock = _Clock()
+    previous = prompt_cache.time, prompt_cache.STATS_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        # Fresh stats too - the legacy cache_stats.json is only read without a db row
+        prompt_cache.time, prompt_cache.STATS_FILE = clock, Path(tmp) / "cache_stats.json"
+        cache = PromptCache(db_path=Path(tmp) / "prompt_cache.db", **options)
+        try:
+            yield cache, clock
+        finally:
+            cache._conn.close()
+            prompt_cache.time, prompt_cache.STATS_FILE = previous
+
+
+def test_hit():
+    """The second lookup of the same prompt is a hit."""
+    with _temp_cache() as (cache, clock):
+        assert cache.get("Score this hook", "evaluate") is None
+        cache.set("Score this hook", '{"score": 8}', "evaluate")
+        assert cache.get("  score THIS hook ", "evaluate") == '{"score": 8}'  # Normalised
+        assert cache.get("Score this hook", "broll") is None  # Context is part of the key
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        assert stats["namespaces"]["evaluation"] == {"hits": 1, "misses": 1}
+
+
+def test_ttl_expiry():
+    """Evaluation entries live 6 hours, simple ones 72."""
+    with _temp_cache() as (cache, clock):
+        cache.set("rate it", "7", "evaluate")
+        cache.set("broll terms", "ocean, waves", "broll")
+        clock.now += 6 * 3600 - 1
+        assert cache.get("rate it", "evaluate") == "7"
+        clock.now += 2
+        assert cache.get("rate it", "evaluate") is None
+        assert cache.get("broll terms", "broll") == "ocean, waves"
+        assert cache.get_stats()["cache_size"] == 1
+
+
+def test_lru_eviction():
+    """Going over max_entries drops the least recently read entries."""
+    with _temp_cache(max_entries=3) as (cache, clock):
+        for name in ("a", "b", "c"):
+            clock.now += 1
+            cache.set(f"prompt {name}", f"answer {name}", "seo")
+        clock.now += 1
+        assert cache.get("prompt a", "seo") == "answer a"  # a is now the most recent
+
+        clock.now += 1
+        cache.set("prompt d", "answer d", "seo")  # 4 > 3: trim to 90% = 2 entries
+        assert cache.get("prompt b", "seo") is None
+        assert cache.get("prompt c", "seo") is None
+        assert cache.get("prompt a", "seo") == "answer a"
+        assert cache.get("prompt d", "seo") == "answer d"
+        assert cache.get_stats()["evictions"] == 2
+
+
+def test_uncacheable_tasks():
+    """Creative and unknown tasks stay fresh even when a cache is available."""
+    assert not any(is_cacheable(task) for task in ("concept", "hook", "script", "made_up", "", None))
+    assert all(is_cacheable(task) for task, cached in TASK_CACHE_POLICY.items() if cached)
+    assert is_cacheable("BROLL")
+
+    with _temp_cache() as (cache, clock):
+        overrides = {"SMART_ROUTER_AVAILABLE": False, "PROMPT_CACHE_AVAILABLE": True,
+                     "get_prompt_cache": lambda: cache}
+        previous = {name: getattr(pvg, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(pvg, name, value)
+        try:
+            ai = pvg.MasterAI.__new__(pvg.MasterAI)
+            calls = []
+            ai._call_ai_legacy = lambda prompt, *args: calls.append(prompt) or f"answer {len(calls)}"
+
+            def call(task):
+                return ai._call_ai_routed("same prompt", 100, 0.7, False, task, None,
+                                          "normal", False, False)
+
+            assert call("concept") == "answer 1" and call("concept") == "answer 2"
+            assert cache.get_stats()["cache_size"] == 0
+            assert call("broll") == "answer 3" and call("broll") == "answer 3"
+            assert len(calls) == 3
+        finally:
+            for name, value in previous.items():
+                setattr(pvg, name, value)
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" PROMPT CACHE")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_hit, test_ttl_expiry, test_lru_eviction, test_uncacheable_tasks):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
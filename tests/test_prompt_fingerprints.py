@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Prompt Fingerprint Tests (v18.7)
+=================================
+
+Covers template fingerprinting in the prompts registry:
+1. Only a template's cache_vars change its cache key - volatile fragments don't
+2. Equivalent values (case, whitespace, dict order) fingerprint the same
+3. A saved registry gains new templates and takes cache_vars from code
+4. Per-template cache hits/misses feed the cache report
+
+Run directly or via pytest.
+"""
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "ai"))
+import prompts_registry
+import state_store
+from state_store import StateStore, save_state
+from prompts_registry import DEFAULT_PROMPTS, PromptsRegistry, TemplatedPrompt, template_cache_key
+
+BROLL_TEMPLATE = "Keywords for: {content}\nMood: {mood}\nToday is {date}. Avoid: {avoid}"
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+@contextmanager
+def _registry(saved_prompts=None):
+    """A registry over a temp state store, optionally loaded from saved prompts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = state_store._state_store, prompts_registry.REGISTRY_FILE
+        state_store._state_store = StateStore(state_dir=Path(tmp))
+        prompts_registry.REGISTRY_FILE = Path(tmp) / "prompts_registry.json"
+        try:
+            if saved_prompts is None:
+                saved_prompts = [asdict(p) for p in DEFAULT_PROMPTS]
+            save_state(prompts_registry.REGISTRY_FILE, {"version": "17.9.9", "prompts": saved_prompts})
+            yield PromptsRegistry()
+        finally:
+            state_store._state_store.close()
+            state_store._state_store, prompts_registry.REGISTRY_FILE = previous
+
+
+def test_volatile_fragments_keep_key():
+    """Dates and avoid-lists change the text but not the key; content does."""
+    with _registry() as registry:
+        monday = registry.render("BROLL_KEYWORDS_PROMPT", BROLL_TEMPLATE, content="ocean facts",
+                                 mood="calm", date="Monday", avoid="sharks")
+        tuesday = registry.render("BROLL_KEYWORDS_PROMPT", BROLL_TEMPLATE, content="ocean facts",
+                                  mood="calm", date="Tuesday", avoid="whales, sharks")
+        other = registry.render("BROLL_KEYWORDS_PROMPT", BROLL_TEMPLATE, content="space facts",
+                                mood="calm", date="Monday", avoid="sharks")
+
+        assert isinstance(monday, TemplatedPrompt) and isinstance(monday, str)
+        assert monday != tuesday and "Tuesday" in tuesday
+        assert monday.template_id == "BROLL_KEYWORDS_PROMPT"
+        assert monday.cache_key == tuesday.cache_key
+        assert monday.cache_key != other.cache_key
+
+        # Same variables under another template never share a key
+        tagged = registry.tag("VOICEOVER_PROMPT", str(monday), content="ocean facts")
+        assert tagged.cache_key != monday.cache_key
+
+        # Unregistered templates fingerprint every variable
+        first = registry.tag("UNKNOWN_PROMPT", "x", topic="a", date="Monday")
+        second = registry.tag("UNKNOWN_PROMPT", "x", topic="a", date="Tuesday")
+        assert first.cache_key != second.cache_key
+
+
+def test_canonical_values():
+    """Case, whitespace and key order don't split the cache."""
+    assert (template_cache_key("T", {"hook": "  Stop  Scrolling ", "meta": {"b": 1, "a": 2.00001}})
+            == template_cache_key("T", {"meta": {"a": 2.0, "b": 1}, "hook": "stop scrolling"}))
+    assert (template_cache_key("T", {"tags": {"b", "a"}})
+            == template_cache_key("T", {"tags": ["a", "b"]}))
+    assert template_cache_key("T", {"phrases": ["a", "b"]}) != template_cache_key("T", {"phrases": ["b", "a"]})
+
+
+def test_saved_registry_merges_defaults():
+    """Templates added in code appear in an old registry; cache_vars follow the code."""
+    saved = [asdict(p) for p in DEFAULT_PROMPTS if p.name != "STAGE4_BROLL_PROMPT"]
+    for prompt in saved:
+        if prompt["name"] == "BROLL_KEYWORDS_PROMPT":
+            prompt["cache_vars"] = ["content", "mood", "date"]
+            prompt["times_used"] = 12
+    with _registry(saved) as registry:
+        assert "STAGE4_BROLL_PROMPT" in registry.prompts
+        broll = registry.prompts["BROLL_KEYWORDS_PROMPT"]
+        assert broll.cache_vars == ["content", "mood"] and broll.times_used == 12
+        assert registry.get_prompt_type("STAGE4_BROLL_PROMPT") == "simple"
+
+
+def test_cache_report():
+    """Hits and misses are counted per template."""
+    with _registry() as registry:
+        for hit in (False, True, True, True):
+            registry.record_cache_result("STAGE3_EVALUATION_PROMPT", hit)
+        registry.record_cache_result("NOT_REGISTERED", True)
+        report = registry.get_cache_report()
+        assert report == {"STAGE3_EVALUATION_PROMPT": {"hits": 3, "misses": 1, "hit_rate": 0.75}}
+        assert registry.get_summary()["cache_hit_rates"] == report
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" PROMPT FINGERPRINTS")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_volatile_fragments_keep_key, test_canonical_values,
+                 test_saved_registry_merges_defaults, test_cache_report):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Quota Ledger Tests (v18.7)
+===========================
+
+Covers the shared usage ledger:
+1. Records stay in memory until the write-behind flush writes them once
+2. A zero flush interval writes through on every record
+3. Tracker files are snapshotted at flush time and retried after a failure
+4. seed_usage only imports providers the ledger has never seen
+5. Counters reset when their day/hour/minute window ends
+
+Run directly or via pytest.
+"""
+
+import json
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "quota"))
+from quota_ledger import QuotaLedger
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+@contextmanager
+def _ledger(flush_interval=60):
+    """A ledger in a temp dir; the long interval keeps the timer from firing mid-test."""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = QuotaLedger(path=Path(tmp) / "quota_ledger.json", flush_interval=flush_interval)
+        try:
+            yield ledger, Path(tmp)
+        finally:
+            if ledger._timer is not None:
+                ledger._timer.cancel()
+            ledger._dirty = False
+            ledger._dirty_documents.clear()
+
+
+def test_write_behind_batches_records():
+    """A thousand records are one pending write until flush()."""
+    with _ledger() as (ledger, tmp):
+        for _ in range(1000):
+            ledger.record_usage("groq", 10, model="groq:llama-3.1-8b-instant")
+        assert not ledger.path.exists() and ledger.flushes == 0
+        assert ledger.get_status()["pending_writes"] == 1
+
+        assert ledger.flush() == 1 and ledger.flushes == 1
+        saved = json.loads(ledger.path.read_text())
+        assert saved["providers"]["groq"]["calls"] == 1000
+        assert saved["models"]["groq:llama-3.1-8b-instant"]["tokens"] == 10000
+        assert ledger.flush() == 0  # Nothing new
+
+        reloaded = QuotaLedger(path=ledger.path, flush_interval=60)
+        assert reloaded.usage("groq")["tokens"] == 10000
+
+
+def test_zero_interval_writes_through():
+    """With QUOTA_LEDGER_FLUSH_SECONDS=0 every record is on disk at once."""
+    with _ledger(flush_interval=0) as (ledger, tmp):
+        ledger.record_usage("gemini", 5)
+        ledger.record_usage("gemini", 5)
+        assert ledger.flushes == 2 and ledger._timer is None
+        assert json.loads(ledger.path.read_text())["providers"]["gemini"]["calls"] == 2
+
+
+def test_tracker_documents():
+    """Snapshots run at flush time; a failed snapshot is retried on the next flush."""
+    with _ledger() as (ledger, tmp):
+        counts = {"calls": 1}
+        broken = {"fail": True}
+
+        def snapshot():
+            if broken["fail"]:
+                raise RuntimeError("dict changed size during iteration")
+            return dict(counts)
+
+        path = tmp / "token_budget.json"
+        ledger.write_behind(path, lambda: dict(counts))
+        counts["calls"] = 2
+        assert ledger.flush() == 1
+        assert json.loads(path.read_text()) == {"calls": 2}
+
+        ledger.write_behind(path, snapshot)
+        assert ledger.flush() == 0
+        assert ledger.get_status()["pending_writes"] == 1
+        broken["fail"] = False
+        counts["calls"] = 3
+        assert ledger.flush() == 1
+        assert json.loads(path.read_text()) == {"calls": 3}
+
+
+def test_seed_usage_only_for_new_providers():
+    """Legacy usage fills in unknown providers and never double-counts known ones."""
+    with _ledger() as (ledger, tmp):
+        assert ledger.seed_usage("groq", 4000, 12)
+        assert (ledger.usage("groq")["tokens"], ledger.usage("groq")["calls"]) == (4000, 12)
+        assert not ledger.seed_usage("groq", 4000, 12)
+        assert ledger.usage("groq")["calls"] == 12
+
+        ledger.record_usage("gemini", 100)
+        assert not ledger.seed_usage("gemini", 9000, 30)
+        assert ledger.usage("gemini")["tokens"] == 100
+
+        assert not ledger.seed_usage("openrouter", 0, 0)
+        assert "openrouter" not in ledger.providers()
+
+
+def test_windows_roll_over():
+    """A counter from an earlier day or hour starts that window from zero."""
+    with _ledger() as (ledger, tmp):
+        ledger.record_usage("groq", 500)
+        counter = ledger.state["providers"]["groq"]
+        counter["hour"] = "2000-01-01 00"
+        assert ledger.usage("groq")["hour_tokens"] == 0
+        assert ledger.usage("groq")["tokens"] == 500
+
+        counter["day"] = "2000-01-01"
+        usage = ledger.usage("groq")
+        assert (usage["tokens"], usage["calls"]) == (0, 0)
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" QUOTA LEDGER")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_write_behind_batches_records, test_zero_interval_writes_through,
+                 test_tracker_documents, test_seed_usage_only_for_new_providers,
+                 test_windows_roll_over):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Research Crawler Tests (v18.7)
+===============================
+
+Covers the quota-budgeted YouTube research crawler:
+1. The OAuth token is refreshed once; cached video details cost nothing
+2. A repeated query only asks for videos published since its last run
+3. Concurrent searches stop at the unit budget and fall back to old results
+4. A channel's uploads are read only up to the newest one already seen
+
+Run directly or via pytest.
+"""
+
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "analytics"))
+import state_store
+from state_store import StateStore
+from research_crawler import ResearchCrawler
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.text = ""
+
+    def json(self):
+        return self.data
+
+
+class FakeYouTube:
+    """Just enough of the Data API for the crawler, recording every call."""
+
+    def __init__(self, videos):
+        self.videos = videos  # id -> publishedAt
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def post(self, url, data=None, timeout=None):
+        with self._lock:
+            self.calls.append(("token", {}))
+        return FakeResponse({"access_token": "tok", "expires_in": 3600})
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        endpoint = url.rsplit("/", 1)[-1]
+        with self._lock:
+            self.calls.append((endpoint, dict(params)))
+        assert headers == {"Authorization": "Bearer tok"}
+        after = params.get("publishedAfter", "")
+        if endpoint == "search":
+            ids = [v for v, published in self.videos.items() if published > after]
+            return FakeResponse({"items": [
+                {"id": {"videoId": v}, "snippet": {"title": f"Title {v}", "publishedAt": self.videos[v]}}
+                for v in ids[:params["maxResults"]]]})
+        if endpoint == "videos":
+            return FakeResponse({"items": [
+                {"id": v, "snippet": {"title": f"Title {v}"}, "statistics": {"viewCount": "10"},
+                 "contentDetails": {"duration": "PT30S"}} for v in params["id"].split(",")]})
+        if endpoint == "playlistItems":
+            newest_first = sorted(self.videos, key=self.videos.get, reverse=True)
+            return FakeResponse({"items": [
+                {"snippet": {"resourceId": {"videoId": v}, "publishedAt": self.videos[v]}}
+                for v in newest_first[:params["maxResults"]]]})
+        return FakeResponse({}, 404)
+
+    def count(self, endpoint):
+        return sum(1 for name, _ in self.calls if name == endpoint)
+
+
+@contextmanager
+def _temp_state():
+    """A temp directory whose store stands in for data/persistent."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = state_store._state_store
+        state_store._state_store = StateStore(state_dir=Path(tmp))
+        try:
+            yield tmp
+        finally:
+            state_store._state_store.close()
+            state_store._state_store = previous
+
+
+def _crawler(tmp, api, units=1000):
+    crawler = ResearchCrawler(budget_units=units, state_file=Path(tmp) / "research_crawler.json",
+                              http=api)
+    crawler.client_id, crawler.client_secret, crawler.refresh_token = "id", "secret", "refresh"
+    return crawler
+
+
+def test_token_and_details_cached():
+    """One token refresh per run; a second details lookup sends nothing."""
+    with _temp_state() as tmp:
+        api = FakeYouTube({"a": "2024-01-01T00:00:00Z", "b": "2024-01-02T00:00:00Z"})
+        crawler = _crawler(tmp, api)
+        first = crawler.video_details(["a", "b", "a"])
+        assert [d["id"] for d in first] == ["a", "b"]
+        assert crawler.video_details(["b", "a"])[1] == first[0]
+        assert api.count("token") == 1 and api.count("videos") == 1
+
+        again = _crawler(tmp, api)  # Next run reads the saved cache
+        again.video_details(["a", "b"])
+        assert api.count("videos") == 1
+        assert again.get_stats()["cache_hits"] == 2
+
+
+def test_query_cursor_only_fetches_new():
+    """The second run of a query asks for videos published after the first."""
+    with _temp_state() as tmp:
+        api = FakeYouTube({"a": "2024-01-01T00:00:00Z"})
+        crawler = _crawler(tmp, api)
+        assert [i["id"]["videoId"] for i in crawler.search("Facts Shorts")] == ["a"]
+
+        api.videos["b"] = "2999-01-01T00:00:00Z"  # Published after the first run
+        crawler = _crawler(tmp, api)
+        assert [i["id"]["videoId"] for i in crawler.search("facts shorts")] == ["b"]
+        assert api.calls[-1][1]["publishedAfter"] > "2024"
+        seen = crawler.search("facts shorts", include_seen=True)
+        assert [i["id"]["videoId"] for i in seen] == ["b", "a"]  # Nothing newer, then earlier
+
+
+def test_budget_limits_concurrent_searches():
+    """Searches past the unit budget are skipped and return earlier results."""
+    with _temp_state() as tmp:
+        api = FakeYouTube({"a": "2999-01-01T00:00:00Z"})
+        _crawler(tmp, api).search("q0")
+
+        crawler = _crawler(tmp, api, units=250)
+        results = crawler.search_many(["q0", "q1", "q2", "q3", "q4"], workers=4)
+        stats = crawler.get_stats()
+        assert api.count("search") == 1 + 2
+        assert stats["units_spent"] == 200 and stats["requests_skipped"] == 3
+        assert [i["id"]["videoId"] for i in results[0]] == ["a"]  # Searched or from the cursor
+
+
+def test_channel_cursor():
+    """Uploads already seen end the read; the full list comes from the cursor."""
+    with _temp_state() as tmp:
+        api = FakeYouTube({"a": "2024-01-01T00:00:00Z", "b": "2024-01-02T00:00:00Z"})
+        crawler = _crawler(tmp, api)
+        assert crawler.channel_uploads("UU1") == ["b", "a"]
+        api.videos["c"] = "2024-01-03T00:00:00Z"
+        assert crawler.channel_uploads("UU1") == ["c", "b", "a"]
+        assert crawler.state["channels"]["UU1"]["last_seen"] == "2024-01-03T00:00:00Z"
+        crawler.video_details(["c", "b", "a"])
+        crawler.video_details(crawler.channel_uploads("UU1"))
+        assert api.count("videos") == 1 and api.count("playlistItems") == 3
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" RESEARCH CRAWLER")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_token_and_details_cached, test_query_cursor_only_fetches_new,
+                 test_budget_limits_concurrent_searches, test_channel_cursor):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Smart AI Caller Tests (v18.7)
+==============================
+
+Covers SmartAICaller's request handling:
+1. A hedged race records only the winner; the abandoned request is charged
+   (quota, breaker) when it finishes but never counts as the winner
+2. A request that fails before the race is decided is still recorded
+3. The hedge timer starts when the primary is sent, not before its
+   rate-limit wait, and a loser stops retrying once the race is decided
+4. The streaming JSON parser copes with chunk splits, escapes, nesting,
+   truncation and bracketed citations in the preamble
+5. Provider errors reach the circuit breakers: a 404 trips the model at
+   once, timeouts are retried and count against the provider, 429s only
+   against the model
+
+Run directly or via pytest.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "quota"))
+sys.path.insert(0, str(ROOT / "src" / "ai"))
+import smart_ai_caller
+from smart_ai_caller import HedgeTracker, IncrementalJSONParser, SmartAICaller
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+class FakeRouter:
+    """Records what the caller reports; every model is available and has p90 = 50ms."""
+
+    def __init__(self):
+        self.results = []
+        self.abandoned = []
+
+    def record_result(self, model_key, success, was_fallback=False, latency=None,
+                      output_tokens=None, error=None, tokens=None):
+        self.results.append((model_key, success, error))
+
+    def record_abandoned(self, model_key, success, tokens=0, latency=None, error=None):
+        self.abandoned.append((model_key, success, error))
+
+    def is_model_available(self, model_key):
+        return True
+
+    def expected_latency(self, model_key, max_tokens=None):
+        return 0.05
+
+    def get_latency_stats(self, model_key):
+        return {"p90": 0.05}
+
+
+class _Tracker(HedgeTracker):
+    def _load(self):
+        return {"date": None, "hedges_today": 0, "total_hedges": 0, "backup_wins": 0,
+                "primary_wins": 0, "both_failed": 0, "seconds_saved": 0.0, "recent": []}
+
+    def _save(self):
+        pass
+
+
+@contextmanager
+def _caller(callers):
+    """A caller over a FakeRouter with the given provider functions and no delays."""
+    previous = (smart_ai_caller.PROVIDER_CALLERS, smart_ai_caller.get_smart_delay,
+                smart_ai_caller._hedge_tracker, smart_ai_caller.CIRCUIT_BREAKERS_AVAILABLE)
+    smart_ai_caller.PROVIDER_CALLERS = callers
+    smart_ai_caller.get_smart_delay = lambda model_name, provider=None: 0
+    smart_ai_caller._hedge_tracker = _Tracker()
+    smart_ai_caller.CIRCUIT_BREAKERS_AVAILABLE = False
+    try:
+        caller = SmartAICaller.__new__(SmartAICaller)
+        caller.router = FakeRouter()
+        caller.last_call_time = {}
+        caller.last_model_key = None
+        yield caller
+    finally:
+        (smart_ai_caller.PROVIDER_CALLERS, smart_ai_caller.get_smart_delay,
+         smart_ai_caller._hedge_tracker, smart_ai_caller.CIRCUIT_BREAKERS_AVAILABLE) = previous
+
+
+CHAIN = [("groq:primary", None), ("gemini:backup", None)]
+
+
+def test_hedge_records_only_winner():
+    """The slow primary finishes after the backup won and is only charged."""
+    release, finished = threading.Event(), threading.Event()
+
+    def slow(model_id, prompt, max_tokens, temperature):
+        release.wait(5)
+        finished.set()
+        return '{"answer": "late"}'
+
+    def fast(model_id, prompt, max_tokens, temperature):
+        return '{"answer": "fast"}'
+
+    with _caller({"groq": slow, "gemini": fast}) as caller:
+        result, tried = caller._call_hedged(CHAIN, "prompt", 100, 0.7)
+        assert result == '{"answer": "fast"}' and tried == {"groq:primary", "gemini:backup"}
+
+        release.set()
+        assert finished.wait(5)
+        time.sleep(0.05)  # Let the abandoned worker return
+        assert caller.router.results == [("gemini:backup", True, None)]
+        assert caller.router.abandoned == [("groq:primary", True, None)]
+        assert caller.last_model_key == "gemini:backup"
+        assert smart_ai_caller.get_hedge_tracker().data["backup_wins"] == 1
+
+
+def test_hedge_records_early_failure():
+    """A primary failing before the hedge deadline is recorded with its error."""
+    def broken(model_id, prompt, max_tokens, temperature):
+        raise RuntimeError("Error code: 400 - bad request")
+
+    with _caller({"groq": broken, "gemini": broken}) as caller:
+        result, tried = caller._call_hedged(CHAIN, "prompt", 100, 0.7)
+        assert result is None and tried == {"groq:primary"}
+        assert caller.router.results == [("groq:primary", False, "Error code: 400 - bad request")]
+        assert caller.last_model_key is None
+
+
+def test_hedge_timer_skips_rate_limit_wait():
+    """A primary that waits out its rate limit but answers quickly isn't hedged."""
+    backup_calls = []
+
+    def fast(model_id, prompt, max_tokens, temperature):
+        time.sleep(0.01)
+        return '{"answer": "primary"}'
+
+    def backup(model_id, prompt, max_tokens, temperature):
+        backup_calls.append(1)
+        return '{"answer": "backup"}'
+
+    with _caller({"groq": fast, "gemini": backup}) as caller:
+        smart_ai_caller.get_smart_delay = lambda model_name, provider=None: 0.2
+        caller.last_call_time["groq:primary"] = time.time()
+        result, tried = caller._call_hedged(CHAIN, "prompt", 100, 0.7)
+        assert result == '{"answer": "primary"}' and tried == {"groq:primary"}
+        assert backup_calls == [] and smart_ai_caller.get_hedge_tracker().data["total_hedges"] == 0
+
+
+def test_hedge_loser_stops_retrying():
+    """A primary timing out after the backup won makes no second request."""
+    release, calls = threading.Event(), []
+
+    def flaky(model_id, prompt, max_tokens, temperature):
+        calls.append(1)
+        release.wait(5)
+        raise TimeoutError("Read timeout")
+
+    def fast(model_id, prompt, max_tokens, temperature):
+        return '{"answer": "fast"}'
+
+    with _caller({"groq": flaky, "gemini": fast}) as caller:
+        result, _ = caller._call_hedged(CHAIN, "prompt", 100, 0.7)
+        assert result == '{"answer": "fast"}'
+
+        release.set()
+        for _ in range(100):
+            if caller.router.abandoned:
+                break
+            time.sleep(0.01)
+        assert calls == [1]
+        assert caller.router.abandoned == [("groq:primary", False, "Read timeout")]
+
+
+def _feed(chunks):
+    """Feed chunks in order; return the answer and the index of the chunk that completed it."""
+    parser = IncrementalJSONParser()
+    for i, chunk in enumerate(chunks):
+        result = parser.feed(chunk)
+        if result is not None:
+            return result, i
+    return None, None
+
+
+def test_parser_chunk_splits_string():
+    """A string value split across chunks, mid-escape included, completes on the last chunk."""
+    chunks = ['```json\n{"hook": "Stop scr', 'olling \\', '"now\\""', ', "score": 8}', '\n```']
+    result, index = _feed(chunks)
+    assert index == 3
+    assert json.loads(result) == {"hook": 'Stop scrolling "now"', "score": 8}
+
+
+def test_parser_brackets_inside_strings():
+    """Quotes, braces and brackets inside strings don't change the depth."""
+    text = '{"a": "}{ ][ \\"}\\" {", "b": "\\\\"}'
+    result, _ = _feed([text[i:i + 3] for i in range(0, len(text), 3)])
+    assert result == text
+    assert json.loads(result) == {"a": '}{ ][ "}" {', "b": "\\"}
+
+
+def test_parser_nested_objects():
+    """Only the outer object ends the scan; trailing text is ignored."""
+    text = 'Sure! {"video": {"phrases": ["one", {"two": [2]}]}, "ok": true} Hope this helps {"x": 1}'
+    result, _ = _feed(list(text))
+    assert json.loads(result) == {"video": {"phrases": ["one", {"two": [2]}]}, "ok": True}
+
+
+def test_parser_truncated_and_citations():
+    """Unclosed JSON never completes; numeric citations are skipped."""
+    assert _feed(['{"phrases": ["one", "tw', 'o"'])[0] is None
+    assert _feed(['{"a": "unterminated }'])[0] is None
+
+    result, _ = _feed(["As shown in [1] and [2, 3], ", '["first", "second"]'])
+    assert json.loads(result) == ["first", "second"]
+
+    parser = IncrementalJSONParser()
+    parser.feed('{"done": 1}')
+    assert parser.feed(' {"later": 2}') == '{"done": 1}'
+
+
+# The caller may have imported the router and breakers as src.* modules
+router_module = sys.modules[smart_ai_caller.ModelInfo.__module__]
+breaker_module = sys.modules[smart_ai_caller.get_breaker_registry.__module__]
+
+
+class _Breakers(breaker_module.BreakerRegistry):
+    def _load(self):
+        return {}
+
+    def _save(self):
+        pass
+
+
+@contextmanager
+def _patched(module, **overrides):
+    previous = {name: getattr(module, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(module, name, value)
+
+
+@contextmanager
+def _routed(callers):
+    """A caller over a real router and a fresh breaker registry; backoff never sleeps."""
+    registry, backoffs = _Breakers(), []
+
+    def sleep_within(seconds):
+        backoffs.append(seconds)
+        return True
+
+    with _patched(breaker_module, _provider_healthy=lambda provider: True,
+                  _mirror_to_health_monitor=lambda provider, state, reason: None), \
+         _patched(router_module, QUOTA_LEDGER_AVAILABLE=False, CIRCUIT_BREAKERS_AVAILABLE=True,
+                  get_breaker_registry=lambda: registry), \
+         _patched(smart_ai_caller, PROVIDER_CALLERS=callers, CIRCUIT_BREAKERS_AVAILABLE=True,
+                  get_breaker_registry=lambda: registry, sleep_within=sleep_within,
+                  get_smart_delay=lambda model_name, provider=None: 0):
+        router = router_module.SmartModelRouter.__new__(router_module.SmartModelRouter)
+        router.models, router.latency = {}, {}
+        router.stats = {"calls": 0, "successes": 0, "fallbacks": 0}
+        caller = SmartAICaller.__new__(SmartAICaller)
+        caller.router = router
+        caller.last_call_time = {}
+        caller.last_model_key = None
+        yield caller, registry, backoffs
+
+
+def _breaker(registry, key):
+    return registry.breakers[key]
+
+
+def test_not_found_trips_model_breaker():
+    """A 404 from OpenRouter is raised, not retried, and opens the model breaker for a day."""
+    posts = []
+
+    def post(url, **kwargs):
+        posts.append(url)
+        return SimpleNamespace(status_code=404, text='{"error": "No endpoints found for old/model"}')
+
+    previous_requests, previous_key = sys.modules.get("requests"), os.environ.get("OPENROUTER_API_KEY")
+    sys.modules["requests"] = SimpleNamespace(post=post)
+    os.environ["OPENROUTER_API_KEY"] = "test-key"
+    try:
+        with _routed({"openrouter": smart_ai_caller._call_openrouter}) as (caller, registry, backoffs):
+            assert caller._try_model("openrouter:old/model", "prompt", 100, 0.7) is None
+            assert len(posts) == 1 and backoffs == []
+            model = _breaker(registry, "model:openrouter:old/model")
+            assert model.state == breaker_module.OPEN
+            assert model.open_seconds == registry.NOT_FOUND_OPEN_SECONDS
+            assert "HTTP 404" in model.last_reason
+            assert _breaker(registry, "provider:openrouter").state == breaker_module.CLOSED
+            assert not registry.is_available("openrouter:old/model")
+            assert registry.is_available("openrouter:other/model")
+    finally:
+        if previous_requests is None:
+            sys.modules.pop("requests")
+        else:
+            sys.modules["requests"] = previous_requests
+        if previous_key is None:
+            os.environ.pop("OPENROUTER_API_KEY")
+        else:
+            os.environ["OPENROUTER_API_KEY"] = previous_key
+
+
+def test_timeouts_count_against_provider():
+    """A timeout is retried with backoff, then recorded once on both breakers."""
+    calls = []
+
+    def timing_out(model_id, prompt, max_tokens, temperature):
+        calls.append(model_id)
+        raise TimeoutError("Read timed out. (read timeout=60)")
+
+    with _routed({"groq": timing_out}) as (caller, registry, backoffs):
+        assert caller._try_model("groq:slow", "prompt", 100, 0.7) is None
+        assert len(calls) == 3 and backoffs == [5, 10]
+        model = _breaker(registry, "model:groq:slow")
+        provider = _breaker(registry, "provider:groq")
+        assert model.state == breaker_module.CLOSED and model.consecutive_failures == 1
+        assert provider.consecutive_failures == 1
+
+        caller._try_model("groq:slow", "prompt", 100, 0.7)
+        caller._try_model("groq:slow", "prompt", 100, 0.7)
+        assert model.state == breaker_module.OPEN
+        assert "network" in model.last_reason
+        assert provider.state == breaker_module.CLOSED  # Needs 5 in a row
+
+        # An open breaker skips the model without calling it
+        calls.clear()
+        assert caller._try_model("groq:slow", "prompt", 100, 0.7) is None and calls == []
+
+
+def test_rate_limit_counts_against_model_only():
+    """A 429 is retried and recorded against the model, never the provider."""
+    calls = []
+
+    def limited(model_id, prompt, max_tokens, temperature):
+        calls.append(model_id)
+        raise RuntimeError("HTTP 429: rate limit exceeded")
+
+    with _routed({"gemini": limited}) as (caller, registry, backoffs):
+        assert caller._try_model("gemini:flash", "prompt", 100, 0.7) is None
+        assert len(calls) == 3 and backoffs == [5, 10]
+        model = _breaker(registry, "model:gemini:flash")
+        assert model.state == breaker_module.CLOSED and model.consecutive_failures == 1
+        assert _breaker(registry, "provider:gemini").consecutive_failures == 0
+        assert caller.router.stats["models"]["gemini:flash"] == {"calls": 1, "successes": 0}
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" SMART AI CALLER")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_hedge_records_only_winner, test_hedge_records_early_failure,
+                 test_hedge_timer_skips_rate_limit_wait, test_hedge_loser_stops_retrying,
+                 test_parser_chunk_splits_string, test_parser_brackets_inside_strings,
+                 test_parser_nested_objects, test_parser_truncated_and_citations,
+                 test_not_found_trips_model_breaker, test_timeouts_count_against_provider,
+                 test_rate_limit_counts_against_model_only):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+State Store Tests (v18.7)
+==========================
+
+Covers the SQLite store behind data/persistent:
+1. Documents round-trip and legacy JSON files are imported on first read
+2. JSON mirrors are exported once, and external edits are re-imported
+3. transaction() commits all namespaces or none
+
+Run directly or via pytest.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+from state_store import StateStore
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def _store(tmp: str) -> StateStore:
+    state_dir = Path(tmp) / "persistent"
+    state_dir.mkdir()
+    return StateStore(state_dir=state_dir)
+
+
+def test_round_trip_and_legacy_import():
+    """Saved documents load back; a pre-existing JSON file seeds its namespace."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        legacy = store.state_dir / "variety_state.json"
+        legacy.write_text(json.dumps({"topics": ["a"]}))
+
+        assert store.namespace_for(legacy) == "variety_state"
+        assert store.get("variety_state") == {"topics": ["a"]}
+
+        store.put("variety_state", {"topics": ["a", "b"]})
+        assert store.get("variety_state") == {"topics": ["a", "b"]}
+        assert store.namespace_for(Path(tmp) / "elsewhere.json") is None
+        store.close()
+
+
+def test_mirror_export_and_external_edit():
+    """Changed documents are mirrored at close; a newer mirror wins on the next read."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        store.put("viral_patterns", {"hooks": [1]})
+        mirror = store.state_dir / "viral_patterns.json"
+        assert not mirror.exists(), "mirrors are written at exit, not per save"
+
+        assert store.export_json() == 1
+        assert json.loads(mirror.read_text()) == {"hooks": [1]}
+        assert store.get("viral_patterns") == {"hooks": [1]}
+
+        # A workflow step edits the JSON file directly
+        mirror.write_text(json.dumps({"hooks": [1, 2]}))
+        future = time.time() + 5
+        os.utime(mirror, (future, future))
+        assert store.get("viral_patterns") == {"hooks": [1, 2]}
+        store.close()
+
+
+def test_transaction_rolls_back_all_namespaces():
+    """An exception inside transaction() discards every write in the block."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        store.put("a", {"v": 1})
+        try:
+            with store.transaction():
+                store.put("a", {"v": 2})
+                store.put("b", {"v": 2})
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        assert store.get("a") == {"v": 1}
+        assert store.get("b") is None
+
+        with store.transaction():
+            store.put("a", {"v": 3})
+            store.put("b", {"v": 3})
+        assert store.get("a") == {"v": 3} and store.get("b") == {"v": 3}
+        store.close()
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" STATE STORE")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_round_trip_and_legacy_import, test_mirror_export_and_external_edit,
+                 test_transaction_rolls_back_all_namespaces):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Token Usage Tests (v18.7)
+==========================
+
+Covers real token accounting for AI responses:
+1. Usage is read from OpenAI-style objects, JSON bodies and Gemini metadata
+2. Missing counts fall back to a local estimate and are flagged as estimated
+3. AIResponse behaves like a str and keeps its counts when re-wrapped
+4. The router charges a success's real tokens to its model and provider
+
+Run directly or via pytest.
+"""
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "quota"))
+sys.path.insert(0, str(ROOT / "src" / "ai"))
+import smart_model_router
+import token_usage
+from quota_ledger import QuotaLedger
+from smart_model_router import DEFAULT_MODELS, SmartModelRouter
+from token_usage import AIResponse, estimate_tokens, make_response, response_tokens, usage_from_response
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+@contextmanager
+def _word_pieces():
+    """Use the built-in estimate even where tiktoken is installed."""
+    previous = token_usage._ENCODING
+    token_usage._ENCODING = None
+    try:
+        yield
+    finally:
+        token_usage._ENCODING = previous
+
+
+def test_usage_fields():
+    """Each provider's usage shape yields (prompt, completion)."""
+    groq = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+    openrouter = {"choices": [], "usage": {"prompt_tokens": 80, "completion_tokens": 20}}
+    gemini = SimpleNamespace(usage_metadata=SimpleNamespace(prompt_token_count=64,
+                                                            candidates_token_count=16))
+    assert usage_from_response(groq) == (120, 30)
+    assert usage_from_response(openrouter) == (80, 20)
+    assert usage_from_response(gemini) == (64, 16)
+    assert usage_from_response({"choices": []}) == (None, None)
+    assert usage_from_response(None) == (None, None)
+
+
+def test_estimate_fallback():
+    """Counts the provider didn't report are estimated locally."""
+    with _word_pieces():
+        assert estimate_tokens("Hello world 2024!") == 2 + 2 + 2 + 1
+        assert estimate_tokens("") == 0
+
+        result = make_response("Hello world 2024!", "Say hi", "huggingface:zephyr")
+        assert (result.prompt_tokens, result.completion_tokens) == (1 + 1, 7)
+        assert result.estimated and result.model_key == "huggingface:zephyr"
+
+        partial = make_response("ok", "prompt", response={"usage": {"prompt_tokens": 50}})
+        assert (partial.prompt_tokens, partial.completion_tokens) == (50, 1)
+        assert partial.estimated
+
+        exact = make_response("ok", "prompt", response={"usage": {"prompt_tokens": 50,
+                                                                  "completion_tokens": 3}})
+        assert not exact.estimated and exact.total_tokens == 53
+
+
+def test_response_is_a_str():
+    """Callers see plain text; re-wrapping keeps the counts and adds latency."""
+    body = {"usage": {"prompt_tokens": 40, "completion_tokens": 10}}
+    result = make_response('{"topic": "sleep"}', "prompt", "groq:llama", body)
+    assert isinstance(result, str) and result == '{"topic": "sleep"}'
+    assert result.strip().startswith("{")
+
+    timed = make_response(result, "prompt", "groq:llama", latency=1.5)
+    assert timed is result and timed.latency == 1.5 and timed.total_tokens == 50
+
+    assert make_response("", "prompt") is None and make_response(None, "prompt") is None
+    assert response_tokens(result) == (40, 10)
+    assert response_tokens("cached answer") == (0, 0)
+    assert AIResponse("x").total_tokens == 0
+
+
+@contextmanager
+def _router_with_ledger():
+    """A router charging a temp ledger, without breakers or saved stats."""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = QuotaLedger(path=Path(tmp) / "quota_ledger.json", flush_interval=60)
+        previous = (smart_model_router.QUOTA_LEDGER_AVAILABLE, smart_model_router.get_quota_ledger,
+                    smart_model_router.CIRCUIT_BREAKERS_AVAILABLE)
+        smart_model_router.QUOTA_LEDGER_AVAILABLE = True
+        smart_model_router.get_quota_ledger = lambda: ledger
+        smart_model_router.CIRCUIT_BREAKERS_AVAILABLE = False
+        try:
+            router = SmartModelRouter.__new__(SmartModelRouter)
+            router.models = {"groq:llama-3.1-8b-instant": replace(DEFAULT_MODELS["groq:llama-3.1-8b-instant"])}
+            router.latency = {}
+            router.stats = {"calls": 0, "successes": 0, "fallbacks": 0}
+            yield router, ledger
+        finally:
+            if ledger._timer is not None:
+                ledger._timer.cancel()
+            ledger._dirty = False
+            (smart_model_router.QUOTA_LEDGER_AVAILABLE, smart_model_router.get_quota_ledger,
+             smart_model_router.CIRCUIT_BREAKERS_AVAILABLE) = previous
+
+
+def test_router_charges_real_tokens():
+    """Prompt + completion tokens go to the model and its provider; failures cost a call."""
+    with _router_with_ledger() as (router, ledger):
+        key = "groq:llama-3.1-8b-instant"
+        result = make_response("answer", "prompt", key,
+                               {"usage": {"prompt_tokens": 900, "completion_tokens": 100}})
+        router.record_result(key, success=True, latency=0.4,
+                             output_tokens=result.completion_tokens, tokens=result.total_tokens)
+        assert ledger.usage("groq")["tokens"] == 1000
+        assert ledger.model_usage(key)["tokens"] == 1000
+
+        router.record_result(key, success=False, error="HTTP 503: overloaded")
+        assert ledger.usage("groq")["calls"] == 1
+        assert ledger.model_usage(key)["calls"] == 2
+        assert router.models[key].calls_today == 2
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" TOKEN USAGE")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_usage_fields, test_estimate_fallback, test_response_is_a_str,
+                 test_router_charges_real_tokens):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
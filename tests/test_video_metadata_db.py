@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Video Metadata Index Tests (v18.7)
+===================================
+
+Covers the SQLite table behind VideoMetadataStore:
+1. The legacy video_metadata.json is imported exactly once
+2. Time-window, top-k and per-category queries use the indexed columns
+3. Facts from other trackers never erase what is already known
+
+Run directly or via pytest.
+"""
+
+import json
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "analytics"))
+from video_metadata_db import VideoMetadataDB
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def _record(i: int, category: str, hours_ago: float, views: int = None) -> dict:
+    return {
+        "video_id": f"vid_{i}",
+        "video_type": category,
+        "topic": f"Topic {i}",
+        "generated_at": (datetime.now() - timedelta(hours=hours_ago)).isoformat(),
+        "youtube_video_id": f"yt_{i}",
+        "performance": {"views": views} if views is not None else None,
+    }
+
+
+def test_legacy_json_migrates_once():
+    """Records from the old JSON file are imported on first open only."""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / "video_metadata.json"
+        legacy.write_text(json.dumps({"vid_1": _record(1, "money", 1, 500)}))
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        assert db.migrate_json(legacy) == 1
+        assert db.migrate_json(legacy) == 0
+        assert db.get_record("vid_1")["performance"]["views"] == 500
+        assert db.find_by_platform_id("youtube", "yt_1")["video_id"] == "vid_1"
+        db.close()
+
+
+def test_indexed_queries():
+    """recent / top / category queries return the right slices."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        db.put_many([
+            _record(1, "money", 2, 900),
+            _record(2, "money", 30, 100),
+            _record(3, "health", 200, 5000),
+            _record(4, "health", 1),  # Not measured yet
+        ])
+        assert {r["video_id"] for r in db.recent_records(days=2)} == {"vid_1", "vid_2", "vid_4"}
+        assert [r["video_id"] for r in db.top_records(2)] == ["vid_3", "vid_1"]
+        assert [r["video_id"] for r in db.top_records(5, category="money")] == ["vid_1", "vid_2"]
+        summary = db.category_summary()
+        assert summary["health"]["videos"] == 2
+        assert summary["health"]["measured"] == 1
+        db.close()
+
+
+def test_merged_facts_keep_known_values():
+    """A tracker reporting partial facts doesn't blank out other columns."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VideoMetadataDB(Path(tmp) / "videos.db")
+        db.put(_record(1, "money", 1, 900))
+        db.merge_facts("vid_1", engagement_rate=4.5, views=None)
+        row = db.get_row("vid_1")
+        assert row["views"] == 900
+        assert row["engagement_rate"] == 4.5
+        assert row["category"] == "money"
+        db.merge_facts("revenue_only", views=10, category="money")
+        assert db.count() == 1  # Fact-only rows are not full records
+        assert db.category_summary()["money"] == {"videos": 1, "measured": 1, "views": 900,
+                                                  "avg_views": 900.0, "avg_score": None}
+        db.close()
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" VIDEO METADATA INDEX")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_legacy_json_migrates_once, test_indexed_queries,
+                 test_merged_facts_keep_known_values):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Workflow Log Parser Tests (v18.7)
+==================================
+
+Covers the single-pass parser behind scripts/analyze_workflows.py:
+1. Streaming a log line by line (across block boundaries) gives the same
+   facts as whole-log regex searches
+2. The analyzers read the same results from the facts
+3. Only a complete --log parse is cached; truncated logs and --log-failed
+   fallbacks are downloaded again next time
+4. A gh process flooding stderr doesn't stall the stdout stream
+
+Run directly or via pytest.
+"""
+
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import analyze_workflows
+from analyze_workflows import LogParser, WorkflowRun, analyze_workflow_run, parse_log
+
+LOG = "".join(f"gen\tRun generator\t2024-01-01T00:00:{i:02d}Z {text}\n" for i, text in enumerate([
+    "[MODEL] Best Gemini: gemini-2.5-flash (1500/day)",
+    "Loaded 4 pre-generated concepts",
+    "[AI] Using gemini:gemini-2.5-flash",
+    "POST .../models/gemini-2.5-flash:generateContent",
+    "Virality Score: 8.5",
+    "[AI] Using groq:llama-3.1-8b-instant",
+    "api.groq.com/openai/v1/chat/completions -> GROQ 429 rate limit",
+    "Saved output/pro_money_123.mp4 (12MB)",
+    "Quality Gate: PASSED - strong hook",
+    "[YOUTUBE] Uploading: Why rich people wake up early",
+    "https://youtube.com/shorts/abc_123",
+    "CRITICAL: disk almost full",
+]))
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+def test_streamed_blocks_match_whole_log():
+    """Tiny blocks and one big block give the same facts as re.findall on the log."""
+    block_chars = analyze_workflows.BLOCK_CHARS
+    analyze_workflows.BLOCK_CHARS = 64  # Several lines per block, many blocks
+    try:
+        parser = LogParser()
+        for line in LOG.splitlines(keepends=True):
+            parser.feed(line)
+        streamed = parser.facts()
+    finally:
+        analyze_workflows.BLOCK_CHARS = block_chars
+    facts = parse_log(LOG)
+    assert streamed == facts
+
+    assert facts["gemini_uses"] == re.findall(r'\[AI\] Using gemini:([\w\.-]+)', LOG)
+    assert facts["gemini_generate"] == len(re.findall(r'generateContent', LOG))
+    assert facts["virality_score"] == ["8.5"]
+    assert facts["rate_limited_groq"] and not facts["rate_limited_pexels"]
+    assert facts["before_restored"] is None and facts["uploaded"]
+
+
+def test_analyzers_read_facts():
+    """Video, quota and model metrics come out of the parsed facts."""
+    run = WorkflowRun(1, "ViralShorts Factory - Auto Video Generator", "completed", "success",
+                      datetime(2024, 1, 1), "schedule", log_facts=parse_log(LOG))
+    result = analyze_workflow_run(run)
+
+    video = result.videos[0]
+    assert (video.title, video.file_size_mb, video.uploaded) == ("pro_money_123.mp4", 12.0, True)
+    assert video.quality_gate_passed and video.quality_gate_reason.startswith("- strong hook")
+    assert result.key_metrics["prework_concepts_used"] == 4
+    assert result.key_metrics["models_used"] == {"gemini:gemini-2.5-flash": 1, "groq:llama-3.1-8b-instant": 1}
+    assert result.errors == ["disk almost full"]
+    groq = [q for q in result.quota_usage if q.provider == "GROQ"]
+    assert groq and all(q.error_429 for q in groq)
+
+    failed = WorkflowRun(2, run.name, "completed", "failure", datetime(2024, 1, 1), "schedule")
+    assert analyze_workflow_run(failed).errors == ["Failed to download log"]
+
+
+def test_only_complete_logs_are_cached():
+    """A truncated log or a --log-failed fallback is reused for this report only."""
+    run = WorkflowRun(3, "ViralShorts Factory - Auto Video Generator", "completed", "success",
+                      datetime(2024, 1, 1), "schedule")
+    full = parse_log(LOG)
+    downloads = []
+    replies = {}
+
+    def stream(run_id, args, timeout, max_output_mb):
+        downloads.append(args[0])
+        return replies[args[0]]
+
+    previous = analyze_workflows.LOG_CACHE_DIR, analyze_workflows.stream_log_facts
+    analyze_workflows.stream_log_facts = stream
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            analyze_workflows.LOG_CACHE_DIR = Path(tmp)
+            fetch = analyze_workflows.fetch_log_facts
+
+            replies.update({"--log": (None, False), "--log-failed": ({"errors": ["x"]}, True)})
+            assert fetch(run) == {"errors": ["x"]}
+            replies["--log"] = (full, False)  # Truncated
+            assert fetch(run) == full
+            assert downloads == ["--log", "--log-failed", "--log"]
+            assert analyze_workflows.load_cached_facts(run) is None
+
+            replies["--log"] = (full, True)
+            assert fetch(run) == full
+            downloads.clear()
+            assert fetch(run) == full and downloads == []
+    finally:
+        analyze_workflows.LOG_CACHE_DIR, analyze_workflows.stream_log_facts = previous
+
+
+def test_stderr_flood_does_not_stall():
+    """200KB of stderr before any stdout is drained while the log streams."""
+    script = ("import sys; sys.stderr.write('progress ' * 25000); sys.stderr.flush(); "
+              "sys.stdout.write(sys.argv[1])")
+    popen = subprocess.Popen
+
+    def fake_gh(command, **kwargs):
+        return popen([sys.executable, "-c", script, LOG], **kwargs)
+
+    analyze_workflows.subprocess.Popen = fake_gh
+    try:
+        started = time.time()
+        facts, complete = analyze_workflows.stream_log_facts(4, ["--log"], timeout=10, max_output_mb=1)
+    finally:
+        analyze_workflows.subprocess.Popen = popen
+    assert time.time() - started < 5
+    assert complete and facts == parse_log(LOG)
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" WORKFLOW LOG PARSER")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_streamed_blocks_match_whole_log, test_analyzers_read_facts,
+                 test_only_complete_logs_are_cached, test_stderr_flood_does_not_stall):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
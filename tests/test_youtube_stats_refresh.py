@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+YouTube Stats Refresh Tests (v18.7)
+====================================
+
+Covers the batched, conditional YouTube statistics refresh:
+1. Stats go stale faster for young videos than for old ones
+2. One videos.list request per block of 50 IDs, cut in upload order
+3. Fresh blocks are skipped; a due block resends its ETag and a 304
+   only moves the freshness timestamp
+4. Requests are capped by today's Data API units, most stale block first
+5. get_videos_stats sends If-None-Match and parses a 200 / 304
+
+Run directly or via pytest.
+"""
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "utils"))
+sys.path.insert(0, str(ROOT / "src" / "quota"))
+sys.path.insert(0, str(ROOT / "src" / "analytics"))
+import analytics_feedback
+from analytics_feedback import (FeedbackLoopController, VideoMetadata, VideoMetadataStore,
+                                YouTubeAnalyticsFetcher, YOUTUBE_DAILY_QUOTA,
+                                YOUTUBE_LEDGER_NAME, YOUTUBE_UPLOAD_RESERVE)
+from quota_ledger import QuotaLedger
+
+
+def safe_print(msg):
+    try:
+        print(msg)
+    except:
+        print(msg.encode('ascii', 'ignore').decode())
+
+
+NOW = datetime.now()
+
+
+def _video(i: int, age: timedelta, fetched_ago: timedelta = None) -> VideoMetadata:
+    performance = None
+    if fetched_ago is not None:
+        performance = {"views": 100 * i, "fetched_at": (NOW - fetched_ago).isoformat()}
+    uploaded = (NOW - age).isoformat()
+    return VideoMetadata(
+        video_id=f"vid_{i:03d}", local_path="", filename=f"vid_{i:03d}.mp4",
+        topic=f"Topic {i}", video_type="facts", hook="", content_summary="",
+        broll_keywords=[], music_mood="", voiceover_style="", theme_name="",
+        value_check_score=0, virality_score=0, timeliness_score=0,
+        platforms_uploaded=["youtube"], youtube_video_id=f"yt_{i:03d}",
+        dailymotion_video_id=None, generated_at=uploaded, uploaded_at=uploaded,
+        performance=performance,
+    )
+
+
+class FakeFetcher:
+    """Answers videos.list like YouTube: a new ETag per block, 304 when it still matches."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_videos_stats(self, video_ids, etag=None):
+        self.requests.append((list(video_ids), etag))
+        current = "etag:" + video_ids[0]
+        if etag == current:
+            return {"status": "not_modified", "stats": {}, "etag": etag, "units": 1}
+        stats = {y: {"views": 1000, "likes": 10, "comments": 1,
+                     "fetched_at": datetime.now().isoformat()} for y in video_ids}
+        return {"status": "ok", "stats": stats, "etag": current, "units": 1}
+
+
+@contextmanager
+def _controller(videos, ledger_units=None):
+    """A controller over a temp video table, a fake fetcher and (optionally) a temp ledger."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VideoMetadataStore(store_path=str(Path(tmp) / "video_metadata.json"),
+                                   db_path=str(Path(tmp) / "videos.db"))
+        for meta in videos:
+            store.save(meta)
+        controller = FeedbackLoopController.__new__(FeedbackLoopController)
+        controller.metadata_store = store
+        controller.youtube_fetcher = FakeFetcher()
+        controller.etags_path = Path(tmp) / "youtube_stats_etags.json"
+        controller.last_refresh_report = {}
+
+        ledger = QuotaLedger(path=Path(tmp) / "quota_ledger.json", flush_interval=60)
+        if ledger_units:
+            ledger.record_usage(YOUTUBE_LEDGER_NAME, tokens=ledger_units, calls=ledger_units)
+        previous = analytics_feedback.QUOTA_LEDGER_AVAILABLE, analytics_feedback.get_quota_ledger
+        analytics_feedback.QUOTA_LEDGER_AVAILABLE = True
+        analytics_feedback.get_quota_ledger = lambda: ledger
+        try:
+            yield controller, ledger
+        finally:
+            analytics_feedback.QUOTA_LEDGER_AVAILABLE, analytics_feedback.get_quota_ledger = previous
+            if ledger._timer is not None:
+                ledger._timer.cancel()
+            ledger._dirty = False
+            store.db.close()
+
+
+def test_freshness_by_age():
+    """Hourly for new videos, daily at a month, weekly after that; unmeasured is always due."""
+    due = FeedbackLoopController._stats_due
+    cases = [
+        (timedelta(days=1), timedelta(minutes=30), False),
+        (timedelta(days=1), timedelta(hours=2), True),
+        (timedelta(days=20), timedelta(hours=12), False),
+        (timedelta(days=20), timedelta(hours=25), True),
+        (timedelta(days=60), timedelta(days=6), False),
+        (timedelta(days=60), timedelta(days=8), True),
+    ]
+    for age, fetched_ago, expected in cases:
+        assert due(_video(1, age, fetched_ago), NOW) is expected, (age, fetched_ago)
+    assert due(_video(1, timedelta(days=60)), NOW)
+
+
+def test_blocks_and_etags():
+    """120 videos take 3 requests, then none, then one conditional request."""
+    videos = [_video(i, timedelta(days=200 - i)) for i in range(120)]
+    with _controller(videos) as (controller, ledger):
+        fetcher = controller.youtube_fetcher
+        assert controller.update_all_performance() == 120
+        assert [len(ids) for ids, _ in fetcher.requests] == [50, 50, 20]
+        assert fetcher.requests[0][0][:2] == ["yt_000", "yt_001"]  # Upload order
+        assert all(etag is None for _, etag in fetcher.requests)
+        assert controller.last_refresh_report["quota_units"] == 3
+        assert ledger.usage(YOUTUBE_LEDGER_NAME)["tokens"] == 3
+
+        fetcher.requests.clear()
+        assert controller.update_all_performance() == 0
+        assert fetcher.requests == []
+        assert controller.last_refresh_report["fresh_skipped"] == 120
+
+        # One stale video brings its whole block back, with the block's ETag
+        stale = controller.metadata_store.get("vid_060")
+        stale.performance = dict(stale.performance, fetched_at=(NOW - timedelta(days=8)).isoformat())
+        controller.metadata_store.save(stale)
+        assert controller.update_all_performance() == 50
+        assert fetcher.requests == [([f"yt_{i:03d}" for i in range(50, 100)], "etag:yt_050")]
+        report = controller.last_refresh_report
+        assert (report["not_modified"], report["fresh_skipped"]) == (50, 70)
+        refreshed = controller.metadata_store.get("vid_060").performance
+        assert refreshed["views"] == 1000
+        assert datetime.fromisoformat(refreshed["fetched_at"]) >= NOW
+
+
+def test_quota_caps_requests():
+    """With one unit left, only the block with the most due videos is fetched."""
+    # Block 2 has 10 unmeasured videos, block 3 has 5
+    videos = [_video(i, timedelta(days=200 - i), timedelta(hours=1)) for i in range(110)]
+    for meta in videos[50:60] + videos[100:105]:
+        meta.performance = None
+    spent = YOUTUBE_DAILY_QUOTA - YOUTUBE_UPLOAD_RESERVE - 1
+    with _controller(videos, ledger_units=spent) as (controller, ledger):
+        controller.update_all_performance()
+        fetcher = controller.youtube_fetcher
+        assert [ids[0] for ids, _ in fetcher.requests] == ["yt_050"]
+        report = controller.last_refresh_report
+        assert (report["requests"], report["deferred_by_quota"], report["fresh_skipped"]) == (1, 1, 50)
+        assert controller._youtube_units_available() == 0
+
+        fetcher.requests.clear()
+        controller.update_all_performance()
+        assert fetcher.requests == [] and controller.last_refresh_report["deferred_by_quota"] == 1
+
+
+def test_conditional_request():
+    """The ETag goes out as If-None-Match; 304 and 200 are told apart."""
+    sent = []
+    replies = [
+        SimpleNamespace(status_code=304, headers={}),
+        SimpleNamespace(status_code=200, headers={}, json=lambda: {"etag": "new", "items": [
+            {"id": "yt_1", "statistics": {"viewCount": "42", "likeCount": "4"},
+             "snippet": {"title": "Sleep facts", "publishedAt": "2026-01-01T00:00:00Z"}}]}),
+    ]
+
+    def get(url, params=None, headers=None, timeout=None):
+        sent.append((params, headers))
+        return replies.pop(0)
+
+    fetcher = YouTubeAnalyticsFetcher.__new__(YouTubeAnalyticsFetcher)
+    fetcher.access_token = "token"
+    previous = analytics_feedback.requests
+    analytics_feedback.requests = SimpleNamespace(get=get)
+    try:
+        unchanged = fetcher.get_videos_stats(["yt_1", "yt_2"], etag="old")
+        assert (unchanged["status"], unchanged["etag"], unchanged["units"]) == ("not_modified", "old", 1)
+        assert sent[0][0]["id"] == "yt_1,yt_2" and sent[0][1]["If-None-Match"] == "old"
+
+        changed = fetcher.get_videos_stats(["yt_1"])
+        assert changed["status"] == "ok" and changed["etag"] == "new"
+        assert "If-None-Match" not in sent[1][1]
+        assert changed["stats"]["yt_1"]["views"] == 42 and changed["stats"]["yt_1"]["comments"] == 0
+    finally:
+        analytics_feedback.requests = previous
+
+
+if __name__ == "__main__":
+    safe_print("=" * 60)
+    safe_print(" YOUTUBE STATS REFRESH")
+    safe_print("=" * 60)
+    failed = 0
+    for test in (test_freshness_by_age, test_blocks_and_etags, test_quota_caps_requests,
+                 test_conditional_request):
+        try:
+            test()
+            safe_print(f"  [OK] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            safe_print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)